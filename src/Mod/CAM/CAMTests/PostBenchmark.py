@@ -0,0 +1,504 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Benchmarks of the post processor on synthetic jobs.
+
+These are not part of the test suite, run them in FreeCAD (or FreeCADCmd):
+
+    from CAMTests import PostBenchmark
+    PostBenchmark.main()
+
+The suite runs export2() of the maintained postprocessors on synthetic jobs
+(3D surface, adaptive clearing, drilling, rotary) of several sizes, and
+compares the results with a baseline file:
+
+    results = PostBenchmark.suite(sizes=(100000, 1000000, 5000000))
+    PostBenchmark.compare_with_baseline(results, "post_baseline.json")
+    PostBenchmark.save_baseline(results, "post_baseline.json")
+"""
+
+import json
+import math
+import os
+import time
+import tracemalloc
+
+import FreeCAD
+import Path
+import Path.Post.scripts
+from Path.Post.PostList import Postable
+from Path.Post.Processor import PostProcessor, PostProcessorFactory
+from Machine.models.machine import Machine, Toolhead, ToolheadType
+
+
+def make_machine(rotary=False):
+    """3-axis (or XYZA) machine with all command expansion stages enabled"""
+    machine = Machine.create_4axis_A_config() if rotary else Machine.create_3axis_config()
+    machine.name = "BenchmarkMachine"
+    machine.toolheads = [
+        Toolhead(
+            name="Spindle",
+            toolhead_type=ToolheadType.ROTARY,
+            id="toolhead1",
+            max_rpm=24000,
+            min_rpm=6000,
+            coolant_delay=0.5,
+            toolhead_wait=1.0,
+        )
+    ]
+    machine.processing.split_arcs = True
+    machine.processing.translate_rapid_moves = True
+    machine.processing.translate_drill_cycles = True
+    machine.processing.xy_before_z_after_tool_change = True
+    machine.output.output_tool_length_offset = True
+    return machine
+
+
+def make_postprocessor(machine):
+    post = PostProcessor(None, "", "", "mm")
+    post._machine = machine
+    post.apply_configuration_bundle()
+    return post
+
+
+def make_script_postprocessor(postname, machine):
+    """A postprocessor of Path/Post/scripts, without a job"""
+    post = PostProcessorFactory.get_post_processor(None, postname)
+    post._machine = machine
+    post.apply_configuration_bundle()
+    return post
+
+
+def surface_commands(n_commands, row_length=200):
+    """About n_commands moves of a dense 3D surface raster, with arcs between the rows"""
+    commands = [Path.Command("G0", {"X": 0.0, "Y": 0.0, "Z": 10.0})]
+    step = 0.1
+    row = 0
+    while len(commands) < n_commands:
+        y = row * step
+        direction = 1 if row % 2 == 0 else -1
+        for i in range(row_length):
+            x = (i if direction > 0 else row_length - i) * step
+            z = math.sin(x * 0.2) * math.cos(y * 0.2) - 2.0
+            commands.append(Path.Command("G1", {"X": x, "Y": y, "Z": z, "F": 1500.0}))
+        x = row_length * step if direction > 0 else 0.0
+        arc = "G3" if direction > 0 else "G2"
+        commands.append(
+            Path.Command(arc, {"X": x, "Y": y + step, "I": 0.0, "J": step / 2, "F": 1500.0})
+        )
+        row += 1
+    commands.append(Path.Command("G0", {"Z": 10.0}))
+    return commands
+
+
+def adaptive_commands(n_commands, loops_per_pass=100):
+    """About n_commands moves of adaptive clearing: passes of trochoidal half circles
+    and links, with a retract and a rapid to the start of the next pass
+    """
+    commands = [Path.Command("G0", {"X": 0.0, "Y": 0.0, "Z": 10.0})]
+    radius = 1.5
+    y = 0.0
+    while len(commands) < n_commands:
+        commands.append(Path.Command("G0", {"X": 0.0, "Y": y, "Z": 1.0}))
+        commands.append(Path.Command("G1", {"Z": -3.0, "F": 300.0}))
+        x = 0.0
+        for _ in range(loops_per_pass):
+            commands.append(
+                Path.Command("G2", {"X": x + 2 * radius, "Y": y, "I": radius, "J": 0.0, "F": 1200})
+            )
+            commands.append(
+                Path.Command("G2", {"X": x + 0.4, "Y": y, "I": 0.2 - radius, "J": 0.0, "F": 1200})
+            )
+            x += 0.4
+            commands.append(Path.Command("G1", {"X": x, "Y": y + 0.05, "F": 1200.0}))
+            commands.append(Path.Command("G1", {"X": x, "Y": y, "F": 1200.0}))
+        commands.append(Path.Command("G0", {"Z": 10.0}))
+        y += 2 * radius
+    return commands
+
+
+def drilling_commands(n_commands):
+    """About n_commands canned drilling cycles on a grid of holes"""
+    cycles = (
+        ("G81", {}),
+        ("G82", {"P": 0.5}),
+        ("G83", {"Q": 1.0}),
+        ("G73", {"Q": 0.5}),
+    )
+    commands = [Path.Command("G0", {"X": 0.0, "Y": 0.0, "Z": 10.0})]
+    for i in range(n_commands):
+        name, extra = cycles[(i // 100) % len(cycles)]
+        params = {"X": (i % 100) * 3.0, "Y": (i // 100) * 3.0, "Z": -8.0, "R": 2.0, "F": 200.0}
+        params.update(extra)
+        hole = Path.Command(name, params)
+        hole.Annotations = {"RetractMode": "G99" if i % 100 < 99 else "G98"}
+        commands.append(hole)
+    commands.append(Path.Command("G80"))
+    commands.append(Path.Command("G0", {"Z": 10.0}))
+    return commands
+
+
+def rotary_commands(n_commands, steps_per_turn=180):
+    """About n_commands moves of a rotary (XYZA) wrapped engraving, with retracts"""
+    commands = [Path.Command("G0", {"X": 0.0, "Y": 0.0, "Z": 30.0, "A": 0.0})]
+    x = 0.0
+    while len(commands) < n_commands:
+        commands.append(Path.Command("G1", {"Z": 20.0, "F": 300.0}))
+        for i in range(steps_per_turn):
+            a = -90.0 + 180.0 * i / steps_per_turn
+            z = 20.0 - 0.5 * math.sin(math.radians(a * 4))
+            commands.append(Path.Command("G1", {"X": x, "Z": z, "A": a, "F": 800.0}))
+        commands.append(Path.Command("G0", {"Z": 30.0}))
+        commands.append(Path.Command("G0", {"X": x + 0.5, "A": 0.0}))
+        x += 0.5
+    return commands
+
+
+# the synthetic jobs {name: (function n_commands -> commands, rotary machine)}
+JOBS = {
+    "surface": (surface_commands, False),
+    "adaptive": (adaptive_commands, False),
+    "drilling": (drilling_commands, False),
+    "rotary": (rotary_commands, True),
+}
+
+
+def maintained_posts():
+    """The postprocessors of Path/Post/scripts, but the *_legacy ones,
+    which are not maintained, and dxf and svg, which don't output G-code"""
+    scripts = os.path.dirname(Path.Post.scripts.__file__)
+    return tuple(
+        sorted(
+            name[: -len("_post.py")]
+            for name in os.listdir(scripts)
+            if name.endswith("_post.py")
+            and not name.endswith("_legacy_post.py")
+            and name not in ("dxf_post.py", "svg_post.py")
+        )
+    )
+
+
+MAINTAINED_POSTS = maintained_posts()
+
+
+def make_finishing_postables(post, n_commands, row_length=200):
+    """One section: a tool change, a 3D finishing raster of about n_commands moves
+    with arcs between the rows, and a drilling operation with canned cycles
+    """
+    tool_change = Postable(
+        item_type="tool_controller",
+        label="TC: Ball end mill",
+        path=Path.Path(
+            [
+                Path.Command("M6", {"T": 1}),
+                Path.Command("M3", {"S": 18000.0}),
+                Path.Command("M8"),
+            ]
+        ),
+        source=None,
+        data={"tool_number": 1},
+    )
+
+    finishing = Postable(
+        item_type="operation",
+        label="3D finishing",
+        path=Path.Path(surface_commands(n_commands, row_length)),
+        source=None,
+        data={},
+    )
+
+    holes = []
+    for i in range(max(1, n_commands // 1000)):
+        cycle = "G83" if i % 3 == 0 else "G81"
+        hole = Path.Command(
+            cycle,
+            {"X": (i % 50) * 2.0, "Y": (i // 50) * 2.0, "Z": -5.0, "R": 2.0, "Q": 1.0, "F": 200},
+        )
+        hole.Annotations = {"RetractMode": "G98"}
+        holes.append(hole)
+    drilling = Postable(
+        item_type="operation",
+        label="Drilling",
+        path=Path.Path([Path.Command("G0", {"X": 0.0, "Y": 0.0, "Z": 10.0})] + holes),
+        source=None,
+        data={},
+    )
+
+    start = post._make_postable("Post: start optimizable", [], {"optimizable": True})
+    return [("allitems", [start, tool_change, finishing, drilling])]
+
+
+def benchmark_command_expansion(n_commands=1000000, repeat=3):
+    """Time the command expansion of export2(), with the stages run one after
+    another and fused into one pass, on a synthetic 3D finishing job.
+
+    The G-code of both must be the same, byte for byte.
+    Returns a dict of the best times in seconds.
+    """
+    machine = make_machine()
+    times = {}
+    gcode = {}
+    for fused in (False, True):
+        best = None
+        for _ in range(repeat):
+            post = make_postprocessor(machine)
+            postables = make_finishing_postables(post, n_commands)
+            start = time.perf_counter()
+            post._expand_commands(postables, fused=fused)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        times["fused" if fused else "staged"] = best
+        gcode[fused] = post._convert_job_sections(postables)
+
+    if gcode[True] != gcode[False]:
+        raise AssertionError("G-code of the fused and the staged command expansion differ")
+
+    return {
+        "commands": n_commands,
+        "staged": times["staged"],
+        "fused": times["fused"],
+        "speedup": times["staged"] / times["fused"],
+        "gcode_bytes": sum(len(section) for _, section in gcode[True]),
+    }
+
+
+def _convert_commands(post, postables, modal_state):
+    post._modal_state = dict(modal_state)
+    return [
+        post.convert_command_to_gcode(command)
+        for _, sublist in postables
+        for item in sublist
+        if item.path
+        for command in item.path.Commands
+    ]
+
+
+def benchmark_command_conversion(
+    postnames=("generic", "linuxcnc", "grbl"), n_commands=200000, repeat=3
+):
+    """Time the conversion of the commands to G-code (STAGE 3 of export2()) with
+    the postprocessors of Path/Post/scripts, on a synthetic 3D finishing job.
+
+    The commands are converted with the formatting tables compiled once, as
+    export2() does, and, as the reference, compiled again for each command, as
+    a call of convert_command_to_gcode() outside of an export does.
+    The G-code of both must be the same.
+
+    Returns {postname: {"per_command": commands per second, "compiled": commands
+    per second, "speedup": ...}} of the best times.
+    """
+    machine = make_machine()
+    machine.output.output_tool_length_offset = False  # no G43 for grbl
+    results = {}
+    for postname in postnames:
+        post = make_script_postprocessor(postname, machine)
+        postables = make_finishing_postables(post, n_commands)
+        post._expand_commands(postables)
+        n = sum(
+            len(item.path.Commands) for _, sublist in postables for item in sublist if item.path
+        )
+        modal_state = dict(post._modal_state)
+        times = {}
+        gcode = {}
+        for mode in ("per_command", "compiled"):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                if mode == "compiled":
+                    with post._command_formatting():
+                        gcode[mode] = _convert_commands(post, postables, modal_state)
+                else:
+                    gcode[mode] = _convert_commands(post, postables, modal_state)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            times[mode] = best
+
+        if gcode["compiled"] != gcode["per_command"]:
+            raise AssertionError(f"{postname}: G-code of the compiled formatter differs")
+
+        results[postname] = {
+            "per_command": n / times["per_command"],
+            "compiled": n / times["compiled"],
+            "speedup": times["per_command"] / times["compiled"],
+        }
+    return results
+
+
+def make_benchmark_job(doc):
+    """A job with a tool controller and an operation, its Path is set by the suite"""
+    import Path.Main.Job as PathJob
+    import Path.Tool.Controller as PathToolController
+    from Path.Tool.toolbit import ToolBit
+
+    box = doc.addObject("Part::Box", "Stock")
+    box.Length = 300
+    box.Width = 300
+    box.Height = 40
+
+    job = PathJob.Create("BenchmarkJob", [box], None)
+    job.PostProcessorOutputFile = ""
+    job.SplitOutput = False
+    job.OrderOutputBy = "Operation"
+    job.Fixtures = ["G54"]
+
+    toolbit = ToolBit.from_dict(
+        {
+            "name": "BenchmarkTool",
+            "shape": "endmill.fcstd",
+            "parameter": {"Diameter": 3.0},
+            "attribute": {},
+        }
+    )
+    tool = toolbit.attach_to_doc(doc=doc)
+    tc = PathToolController.Create("TC_Benchmark", tool, 1)
+    job.Proxy.addToolController(tc)
+
+    op = doc.addObject("Path::FeaturePython", "BenchmarkOp")
+    job.Operations.addObject(op)
+    doc.recompute()
+    return job, op
+
+
+def run_export2(post, n_commands, measure_memory=True):
+    """export2() of a postprocessor: the commands/s of the n_commands of the job,
+    the times of its stages and the peak memory of the Python objects (tracemalloc)
+    """
+    start = time.perf_counter()
+    sections = post.export2()
+    seconds = time.perf_counter() - start
+    result = {
+        "commands": n_commands,
+        "seconds": seconds,
+        "commands_per_second": n_commands / seconds,
+        "gcode_bytes": sum(len(gcode) for _, gcode in sections),
+        "stages": dict(post.stage_times),
+        "peak_memory_mb": None,
+    }
+
+    if measure_memory:
+        # again, as tracemalloc slows down the export
+        del sections
+        tracemalloc.start()
+        try:
+            post.export2()
+            result["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / 1024**2
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def suite(
+    sizes=(10000, 100000, 1000000),
+    jobs=tuple(JOBS),
+    postnames=MAINTAINED_POSTS,
+    measure_memory=True,
+):
+    """Run export2() of each postprocessor on each synthetic job of each size.
+
+    Returns a list of dicts with job, size, post and the results of run_export2(),
+    or the error of a postprocessor that can't post the job.
+    """
+    doc = FreeCAD.newDocument("PostBenchmark")
+    results = []
+    try:
+        job, op = make_benchmark_job(doc)
+        for job_name in jobs:
+            make_commands, rotary = JOBS[job_name]
+            machine = make_machine(rotary)
+            machine.output.output_tool_length_offset = False  # no G43 for grbl, marlin
+            for size in sizes:
+                op.Path = Path.Path(make_commands(size))
+                n_commands = op.Path.Size
+                for postname in postnames:
+                    entry = {"job": job_name, "size": size, "post": postname}
+                    try:
+                        post = PostProcessorFactory.get_post_processor(job, postname)
+                        post._machine = machine
+                        post.apply_configuration_bundle()
+                        entry.update(run_export2(post, n_commands, measure_memory))
+                    except Exception as e:
+                        entry["error"] = f"{type(e).__name__}: {e}"
+                    results.append(entry)
+                    print_result(entry)
+    finally:
+        FreeCAD.closeDocument(doc.Name)
+    return results
+
+
+def print_result(entry):
+    name = f"{entry['job']:>9} {entry['size']:>9} {entry['post']:>12}"
+    if "error" in entry:
+        print(f"{name}  failed: {entry['error']}")
+        return
+    stages = " ".join(f"{stage} {seconds:.2f}s" for stage, seconds in entry["stages"].items())
+    memory = entry["peak_memory_mb"]
+    memory = "" if memory is None else f" {memory:.0f} MB"
+    print(f"{name} {entry['commands_per_second']:>10.0f} commands/s{memory}  {stages}")
+
+
+def save_baseline(results, filename):
+    """Store the results of suite() as the baseline to compare with"""
+    with open(filename, "w") as f:
+        json.dump(results, f, indent=1)
+
+
+def compare_with_baseline(results, filename, tolerance=0.1):
+    """Print the change of the commands/s and peak memory against the baseline.
+
+    Returns the (job, size, post) whose commands/s is more than tolerance slower.
+    """
+    with open(filename) as f:
+        baseline = {(b["job"], b["size"], b["post"]): b for b in json.load(f)}
+
+    slower = []
+    for entry in results:
+        key = (entry["job"], entry["size"], entry["post"])
+        base = baseline.get(key)
+        if base is None or "error" in entry or "error" in base:
+            continue
+        ratio = entry["commands_per_second"] / base["commands_per_second"]
+        line = f"{key[0]:>9} {key[1]:>9} {key[2]:>12} commands/s {ratio:6.2f}x"
+        if entry["peak_memory_mb"] and base["peak_memory_mb"]:
+            line += f"  memory {entry['peak_memory_mb'] / base['peak_memory_mb']:6.2f}x"
+        print(line)
+        if ratio < 1.0 - tolerance:
+            slower.append(key)
+    return slower
+
+
+def main(sizes=(10000, 100000, 1000000)):
+    print("command expansion, staged vs fused (same G-code)")
+    print(f"{'commands':>10} {'staged s':>10} {'fused s':>10} {'speedup':>8}")
+    for n_commands in sizes:
+        result = benchmark_command_expansion(n_commands)
+        print(
+            f"{result['commands']:>10} {result['staged']:>10.3f} "
+            f"{result['fused']:>10.3f} {result['speedup']:>8.2f}"
+        )
+
+    print("command conversion, commands/s, formatting compiled per command vs once")
+    print(f"{'post':>10} {'per command':>12} {'compiled':>12} {'speedup':>8}")
+    for postname, result in benchmark_command_conversion().items():
+        print(
+            f"{postname:>10} {result['per_command']:>12.0f} "
+            f"{result['compiled']:>12.0f} {result['speedup']:>8.2f}"
+        )
@@ -28,7 +28,12 @@ from Path.Post.GcodeProcessingUtils import (
     suppress_redundant_axes_words,
     filter_inefficient_moves,
     deduplicate_repeated_commands,
+    filter_gcode_lines,
+    InefficientMoveFilter,
+    LineNumberInserter,
     NumberGenerator,
+    RedundantAxesWordSuppressor,
+    RepeatedCommandDeduplicator,
 )
 
 
@@ -533,3 +538,53 @@ class TestDeduplicateRepeatedCommands(unittest.TestCase):
         # Blockdelete commands should still follow modal rules
         expected = ["/G1 X10.0", "/G1 X20.0"]  # Full line kept (blockdelete handling)
         self.assertEqual(result, expected)
+
+
+class TestFilterGcodeLines(unittest.TestCase):
+    """Test the incremental line filters, fed in chunks."""
+
+    gcode = [
+        "(header)",
+        "G0 X0.0 Y0.0 Z5.0",
+        "G0 X10.0 Y0.0 Z5.0",
+        "G0 X20.0 Y10.0 Z5.0",
+        "G1 Z-1.0 F100.0",
+        "G1 Z-1.0 F100.0",
+        "G1 X30.0 Y10.0 Z-1.0",
+        "G0 Z5.0",
+        "G0 X0.0 Y0.0",
+        "M5",
+    ]
+
+    def _make_filters(self):
+        return [
+            RepeatedCommandDeduplicator(),
+            RedundantAxesWordSuppressor(),
+            InefficientMoveFilter(),
+            LineNumberInserter(start=100, increment=5),
+        ]
+
+    def test_chunks_match_whole_list(self):
+        """Test that feeding the lines in chunks gives the whole-list result."""
+        expected = insert_line_numbers(
+            filter_inefficient_moves(
+                suppress_redundant_axes_words(deduplicate_repeated_commands(self.gcode))
+            ),
+            start=100,
+            increment=5,
+        )
+        for size in (1, 2, 3, len(self.gcode)):
+            filters = self._make_filters()
+            result = []
+            for i in range(0, len(self.gcode), size):
+                result.extend(filter_gcode_lines(filters, self.gcode[i : i + size]))
+            result.extend(filter_gcode_lines(filters, [], final=True))
+            self.assertEqual(result, expected, f"chunk size {size}")
+
+    def test_rapid_chain_held_until_flush(self):
+        """Test that a trailing chain of rapids is only output when flushed."""
+        filters = [InefficientMoveFilter()]
+        gcode = ["G0 X0.0 Y0.0 Z5.0", "G0 X10.0 Y0.0 Z5.0", "G0 X20.0 Y0.0 Z5.0"]
+        self.assertEqual(list(filter_gcode_lines(filters, gcode)), [])
+        result = list(filter_gcode_lines(filters, [], final=True))
+        self.assertEqual(result, filter_inefficient_moves(gcode))
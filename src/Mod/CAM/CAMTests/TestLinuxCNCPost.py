@@ -511,6 +511,41 @@ class TestLinuxCNCPost(PathTestUtils.PathTestBase):
         # Verify - should not be None (not suppressed)
         self.assertIsNotNone(result)
 
+    def test_rigid_tapping_modal_state_for_parallel_conversion(self):
+        """
+        Test that the modal state pass of the parallel conversion follows the
+        conversion of the drill cycles and modal commands.
+
+        Rigid tapping is converted without the modal state, thus the Z of the
+        G84 is not the modal Z afterwards, while a standard G84 changes it.
+        """
+        self.post.values["OUTPUT_DOUBLES"] = False
+        rigid_tap = Path.Command("G84", {"X": 1.0, "Y": 2.0, "Z": -10.0, "R": 2.0, "F": 1.5})
+        rigid_tap.Annotations = {"rigid": "True", "operation": "tapping"}
+        rigid_cancel = Path.Command("G80", {})
+        rigid_cancel.Annotations = {"rigid": "True", "operation": "tapping"}
+        commands = [
+            Path.Command("G0", {"X": 1.0, "Y": 2.0, "Z": 5.0}),
+            rigid_tap,
+            rigid_cancel,
+            Path.Command("G84", {"X": 3.0, "Y": 2.0, "Z": -4.0, "R": 2.0, "F": 100.0}),
+            Path.Command("G80", {}),
+        ]
+
+        modal_state = dict(self.post._modal_state)
+        serial_states = []
+        for command in commands:
+            self.post.convert_command_to_gcode(command)
+            serial_states.append(dict(self.post._modal_state))
+        self.assertEqual(serial_states[2]["Z"], 5.0)
+        self.assertEqual(serial_states[4]["Z"], -4.0)
+
+        stateless_hooks = self.post._parallel_conversion_hooks()
+        self.assertIsNotNone(stateless_hooks, "linuxcnc converts the items in parallel")
+        for command, serial_state in zip(commands, serial_states):
+            self.post._advance_modal_state(command, modal_state, stateless_hooks)
+            self.assertEqual(modal_state, serial_state, command.Name)
+
     def test_schema_defaults_applied_for_sparse_config(self):
         """
         Test that LinuxCNC schema defaults are applied when postprocessor_properties
@@ -0,0 +1,62 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import os
+import tempfile
+import unittest
+
+from CAMTests import PostBenchmark
+
+
+class TestPostBenchmark(unittest.TestCase):
+    """Smoke tests of the post processor benchmark suite, on tiny jobs."""
+
+    def test_maintained_posts(self):
+        """All the G-code postprocessors of Path/Post/scripts, but the legacy ones."""
+        posts = PostBenchmark.MAINTAINED_POSTS
+        for postname in ("generic", "generic_plasma", "linuxcnc", "opensbp", "smoothie"):
+            self.assertIn(postname, posts)
+        for postname in ("dxf", "svg", "linuxcnc_legacy"):
+            self.assertNotIn(postname, posts)
+
+    def test_baseline_round_trip(self):
+        """A suite run saved as the baseline compares with itself, without slowdowns."""
+        results = PostBenchmark.suite(
+            sizes=(100,), jobs=("surface",), postnames=("generic",), measure_memory=False
+        )
+        self.assertEqual(len(results), 1)
+        self.assertNotIn("error", results[0])
+        self.assertGreater(results[0]["gcode_bytes"], 0)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "post_baseline.json")
+            PostBenchmark.save_baseline(results, filename)
+            self.assertEqual(PostBenchmark.compare_with_baseline(results, filename), [])
+
+            slower = [dict(results[0], commands_per_second=results[0]["commands_per_second"] / 2)]
+            self.assertEqual(
+                PostBenchmark.compare_with_baseline(slower, filename),
+                [("surface", 100, "generic")],
+            )
+
+            failed = [{"job": "surface", "size": 100, "post": "generic", "error": "CAMError"}]
+            self.assertEqual(PostBenchmark.compare_with_baseline(failed, filename), [])
@@ -23,6 +23,7 @@
 # ***************************************************************************
 
 import os
+import sys
 import unittest
 
 import FreeCAD
@@ -1369,6 +1370,213 @@ class TestExport2Integration(unittest.TestCase):
                 len(g43_lines), 0, "Should have no G43 commands when tool length offset is disabled"
             )
 
+    # ===== 115-119: _expand_commands tests =====
+
+    def test115_fused_command_expansion_matches_staged(self):
+        """
+        Test that the fused command expansion produces the same G-code as
+        running the _expand_* stages one after another.
+
+        All stages are enabled, the operation path has arcs, drill cycles,
+        spindle/coolant starts, a tool change and bCNC comments.
+        """
+        config = self._get_full_machine_config()
+        config["machine"]["spindles"][0]["spindle_wait"] = 2.5
+        config["machine"]["spindles"][0]["coolant_delay"] = 1.5
+        config["output"]["output_tool_length_offset"] = True
+        config["processing"]["split_arcs"] = True
+        config["processing"]["translate_rapid_moves"] = True
+        config["processing"]["xy_before_z_after_tool_change"] = True
+        config["processing"]["translate_drill_cycles"] = True
+        machine = Machine.from_dict(config)
+
+        drill = Path.Command(
+            "G83", {"X": 10.0, "Y": 10.0, "Z": -8.0, "R": 2.0, "Q": 2.0, "F": 50.0}
+        )
+        drill.Annotations = {"RetractMode": "G98"}
+        canned = Path.Command("G85", {"X": 20.0, "Y": 10.0, "Z": -8.0, "R": 2.0, "F": 50.0})
+        canned.Annotations = {"RetractMode": "G99"}
+
+        from Path.Post.Processor import PostProcessor
+
+        class StagedPostProcessor(PostProcessor):
+            def _expand_commands(self, postables, fused=True):
+                super()._expand_commands(postables, fused=False)
+
+        with self._modify_operation_path(
+            [
+                Path.Command("M6", {"T": 1}),
+                Path.Command("M3", {"S": 1000.0}),
+                Path.Command("M8"),
+                Path.Command("G0", {"X": 0.0, "Y": 0.0, "Z": 5.0}),
+                Path.Command("G1", {"Z": -1.0, "F": 100.0}),
+                Path.Command("G2", {"X": 10.0, "Y": 0.0, "I": 5.0, "J": 0.0, "F": 100.0}),
+                Path.Command("G0", {"Z": 5.0}),
+                drill,
+                canned,
+                Path.Command("(Block-name: stale)"),
+                Path.Command("G0", {"Z": 20.0}),
+            ]
+        ):
+            fused = self._run_export2(machine)
+
+            post = StagedPostProcessor(self.job, "", "", "mm")
+            post._machine = machine
+            post.apply_configuration_bundle()
+            staged = post.export2()
+
+        self.assertEqual(fused, staged)
+        gcode = self._get_all_gcode(fused)
+        self.assertIn("G4 P2.5", gcode)
+        self.assertIn("G43", gcode)
+        self.assertNotIn("G2 ", gcode)
+        self.assertNotIn("G83", gcode)
+
+    def test116_streamed_gcode_matches_export2(self):
+        """
+        Test that export2_stream() and export2_to_files() produce the same
+        G-code as export2(), with line numbers and CRLF line endings.
+        """
+        import tempfile
+
+        machine = self._create_machine(
+            line_numbers=True, line_number_start=100, line_increment=5, end_of_line_chars="\r\n"
+        )
+        results = self._run_export2(machine)
+
+        post = self._create_postprocessor(machine)
+        streamed = [
+            (section_name, "\r\n".join(lines)) for section_name, lines in post.export2_stream()
+        ]
+        self.assertEqual(streamed, results)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            post = self._create_postprocessor(machine)
+            written = post.export2_to_files(
+                lambda section_name: os.path.join(tmpdir, f"{section_name}.nc"), buffer_lines=3
+            )
+            self.assertEqual([name for name, _ in written], [name for name, _ in results])
+            for (_, filename), (_, gcode) in zip(written, results):
+                with open(filename, newline="") as f:
+                    self.assertEqual(f.read(), gcode)
+
+    def test117_parallel_conversion_matches_serial(self):
+        """
+        Test that converting the items in worker processes produces the same
+        G-code as converting them one after another, for the postprocessors
+        in Path/Post/scripts. opensbp overrides the command conversion, its
+        items are always converted serially.
+        """
+        machine = self._create_machine(output_header=False)
+        rigid_tap = Path.Command("G84", {"X": 5.0, "Y": 5.0, "Z": -3.0, "R": 2.0, "F": 1.5})
+        rigid_tap.Annotations = {"rigid": "True", "operation": "tapping"}
+        rigid_cancel = Path.Command("G80", {})
+        rigid_cancel.Annotations = {"rigid": "True", "operation": "tapping"}
+
+        with self._modify_operation_path(
+            [
+                Path.Command("G0", {"X": 0.0, "Y": 0.0, "Z": 5.0}),
+                Path.Command("G1", {"Z": -1.0, "F": 100.0}),
+                Path.Command("G2", {"X": 10.0, "Y": 0.0, "I": 5.0, "J": 0.0, "F": 100.0}),
+                Path.Command("G4", {"P": 2.5}),
+                Path.Command("G1", {"X": 10.0, "Y": 10.0, "F": 100.0}),
+                Path.Command("G0", {"Z": 5.0}),
+                Path.Command("G0", {"X": 5.0, "Y": 5.0}),
+                rigid_tap,
+                rigid_cancel,
+                Path.Command("G1", {"Z": -3.0, "F": 100.0}),
+                Path.Command("G0", {"Z": 5.0}),
+            ]
+        ):
+            for postname in (
+                "centroid",
+                "generic",
+                "generic_plasma",
+                "grbl",
+                "linuxcnc",
+                "mach3_mach4",
+                "marlin",
+                "masso_g3",
+                "smoothie",
+                "test",
+            ):
+                with self.subTest(postname=postname):
+                    results = {}
+                    parallel = {}
+                    for workers in (0, 2):
+                        post = PostProcessorFactory.get_post_processor(self.job, postname)
+                        post._machine = machine
+                        post.apply_configuration_bundle({"conversion_workers": workers})
+                        post._bundle_applied = True  # export2() keeps the workers
+                        post.values["OUTPUT_DOUBLES"] = False
+                        post.PARALLEL_BATCH_COMMANDS = 1
+
+                        def record(
+                            postables, n, convert=post._convert_items_in_parallel, key=workers
+                        ):
+                            converted = convert(postables, n)
+                            parallel[key] = converted is not None
+                            return converted
+
+                        post._convert_items_in_parallel = record
+                        results[workers] = post.export2()
+
+                    self.assertFalse(parallel[0])
+                    if sys.platform.startswith("linux") and not FreeCAD.GuiUp:
+                        self.assertTrue(parallel[2], "items should be converted by the workers")
+                    else:
+                        self.assertFalse(parallel[2], "forking is only used headless on Linux")
+                    self.assertEqual(results[2], results[0])
+
+        post = PostProcessorFactory.get_post_processor(self.job, "opensbp")
+        self.assertIsNone(post._parallel_conversion_hooks(), "opensbp is converted serially")
+
+    def test118_compiled_formatter_uses_overrides(self):
+        """
+        Test that the formatter compiled for an export uses the current .values
+        and a format_parameter() override of a postprocessor.
+        """
+        from Path.Post.Processor import PostProcessor
+
+        class HalfPostProcessor(PostProcessor):
+            def format_parameter(self, param_name, value):
+                if param_name == "X":
+                    value = value / 2
+                return super().format_parameter(param_name, value)
+
+        machine = self._create_machine(output_header=False)
+        with self._modify_operation_path(
+            [
+                Path.Command("G0", {"X": 10.0, "Y": 20.0, "Z": 5.0}),
+                Path.Command("G1", {"X": 30.0, "Y": 20.0, "Z": -1.0, "F": 100.0}),
+            ]
+        ):
+            post = HalfPostProcessor(self.job, "", "", "mm")
+            post._machine = machine
+            post.apply_configuration_bundle()
+            post.values["AXIS_PRECISION"] = 1
+            post._bundle_applied = True  # export2() keeps the precision
+            gcode = self._get_all_gcode(post.export2())
+
+        self.assertIn("G0 X5.0 Y20.0 Z5.0", gcode)
+        self.assertIn("G1 X15.0", gcode)
+
+        cmd = Path.Command("G0", {"X": 1.0})
+        post.values["AXIS_PRECISION"] = 2
+        self.assertEqual(post.convert_command_to_gcode(cmd), "G0 X0.50")
+        self.assertIsNone(post._command_formatter, "compiled only for the call")
+
+    def test119_stage_times(self):
+        """
+        Test that export2() keeps the seconds of its stages in stage_times.
+        """
+        post = self._create_postprocessor(self._create_machine())
+        post.export2()
+
+        for stage in ("ordering", "expansion", "conversion", "remote_post"):
+            self.assertIn(stage, post.stage_times)
+            self.assertGreaterEqual(post.stage_times[stage], 0.0)
+
     # ===== 120-139: Output formatting tests =====
 
     def test120_line_numbers_exclude_header(self):
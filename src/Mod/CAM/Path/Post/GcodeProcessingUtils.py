@@ -26,9 +26,13 @@
 Various utilities for handling G-code.
 These utilities do NOT operate on Path.Command objects. They
 operate on strings of pre-processed G-code.
+
+The optimizations are incremental line filters (GcodeLineFilter), so that
+G-code can be streamed through them chunk by chunk, e.g. per operation.
+The whole-list functions are kept for the simple case.
 """
 
-from typing import List
+from typing import Iterable, Iterator, List
 
 
 class NumberGenerator:
@@ -59,9 +63,70 @@ class NumberGenerator:
         self._current = self._start
 
 
+class GcodeLineFilter:
+    """Base class of the incremental G-code line filters.
+
+    The state of a filter is kept between calls of filter(), so the G-code
+    can be fed chunk by chunk and gives the same result as a single list.
+    Lines a filter holds back (to decide on later lines) are returned by
+    flush() at the end of the G-code.
+    """
+
+    def filter(self, lines: Iterable[str]) -> Iterator[str]:
+        """Generator of the filtered lines, as far as they are decided."""
+        raise NotImplementedError
+
+    def flush(self) -> List[str]:
+        """Return the lines held back, at the end of the G-code."""
+        return []
+
+    def filter_all(self, lines: Iterable[str]) -> List[str]:
+        """Filter lines as the complete G-code, including flush()."""
+        result = list(self.filter(lines))
+        result.extend(self.flush())
+        return result
+
+
+def filter_gcode_lines(
+    filters: List[GcodeLineFilter], lines: Iterable[str], final: bool = False
+) -> Iterator[str]:
+    """Chain the filters over lines, in order.
+
+    With final=True the end of the G-code is reached: each filter is flushed
+    after its lines, and its held back lines go through the later filters.
+    """
+    for line_filter in filters:
+        lines = _filter_and_flush(line_filter, lines) if final else line_filter.filter(lines)
+    return iter(lines)
+
+
+def _filter_and_flush(line_filter, lines):
+    yield from line_filter.filter(lines)
+    yield from line_filter.flush()
+
+
 # Insert Line Numbers
 
 
+class LineNumberInserter(GcodeLineFilter):
+    """Insert line numbers (N-codes), see insert_line_numbers()."""
+
+    def __init__(self, start: int = 10, increment: int = 10):
+        self._line_generator = NumberGenerator(template="N{}", start=start, increment=increment)
+
+    def filter(self, lines: Iterable[str]) -> Iterator[str]:
+        get_number = self._line_generator.get
+        for line in lines:
+            # Skip empty lines and comments
+            stripped = line.strip()
+            if not stripped or stripped.startswith("("):
+                yield line
+                continue
+
+            # Insert line number at the beginning
+            yield f"{get_number()} {line}"
+
+
 def insert_line_numbers(gcode: List[str], start: int = 10, increment: int = 10) -> List[str]:
     """Insert line numbers (N-codes) into G-code lines.
 
@@ -73,84 +138,83 @@ def insert_line_numbers(gcode: List[str], start: int = 10, increment: int = 10)
     Returns:
         List of G-code strings with line numbers inserted
     """
-    result = []
-    line_generator = NumberGenerator(template="N{}", start=start, increment=increment)
-
-    for line in gcode:
-        # Skip empty lines and comments
-        stripped = line.strip()
-        if not stripped or stripped.startswith("("):
-            result.append(line)
-            continue
-
-        # Insert line number at the beginning
-        line_number = line_generator.get()
-        result.append(f"{line_number} {line}")
-
-    return result
+    return LineNumberInserter(start=start, increment=increment).filter_all(gcode)
 
 
 # Suppress redundant axes words
 
 
-def suppress_redundant_axes_words(gcode: List[str]) -> List[str]:
-    """Suppress redundant axis and feed rate words by tracking current machine state.
-
-    Removes axis words where the value matches the current machine position,
-    and F words where the feed rate matches the current feed rate.
-
-    Args:
-        gcode: List of G-code strings
+class RedundantAxesWordSuppressor(GcodeLineFilter):
+    """Suppress redundant axis and feed rate words, see suppress_redundant_axes_words().
 
-    Returns:
-        List of G-code strings with redundant words suppressed
+    The current machine position and feed rate are the state.
     """
-    result = []
-    current_pos = {
-        "X": None,
-        "Y": None,
-        "Z": None,
-        "U": None,
-        "V": None,
-        "W": None,
-        "A": None,
-        "B": None,
-        "C": None,
-    }
-    current_feed = None  # Track current feed rate
 
-    for line in gcode:
-        stripped = line.strip()
-
-        # Keep comments and empty lines unchanged
-        if not stripped or stripped.startswith("("):
-            result.append(line)
-            continue
-
-        # Reset tracked state on tool change so post-change commands are not
-        # suppressed as redundant (the new tool may need the same position/feed).
-        if any(stripped.startswith(cmd) for cmd in ["M6", "M06"]):
-            current_pos = {k: None for k in current_pos}
-            current_feed = None
-            result.append(line)
-            continue
-
-        # Check for drill cycle commands - these need ALL parameters, don't suppress
-        # G80, G98, G99 have no parameters but should pass through
-        is_parametric_drill_cycle = any(
-            stripped.startswith(cmd)
-            for cmd in ["G73", "G74", "G81", "G82", "G83", "G84", "G85", "G86", "G87", "G88", "G89"]
-        )
-        is_drill_mode_command = any(stripped.startswith(cmd) for cmd in ["G80", "G98", "G99"])
-
-        if is_parametric_drill_cycle:
-            # Parametric drill cycles need all parameters preserved
-            result.append(line)
-            continue
-        elif is_drill_mode_command:
-            # G80 (cancel), G98 (retract to initial), G99 (retract to R) have no parameters
-            result.append(line)
-            continue
+    def __init__(self):
+        self.current_pos = {
+            "X": None,
+            "Y": None,
+            "Z": None,
+            "U": None,
+            "V": None,
+            "W": None,
+            "A": None,
+            "B": None,
+            "C": None,
+        }
+        self.current_feed = None  # Track current feed rate
+
+    def filter(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            stripped = line.strip()
+
+            # Keep comments and empty lines unchanged
+            if not stripped or stripped.startswith("("):
+                yield line
+                continue
+
+            # Reset tracked state on tool change so post-change commands are not
+            # suppressed as redundant (the new tool may need the same position/feed).
+            if any(stripped.startswith(cmd) for cmd in ["M6", "M06"]):
+                self.current_pos = {k: None for k in self.current_pos}
+                self.current_feed = None
+                yield line
+                continue
+
+            # Check for drill cycle commands - these need ALL parameters, don't suppress
+            # G80, G98, G99 have no parameters but should pass through
+            is_parametric_drill_cycle = any(
+                stripped.startswith(cmd)
+                for cmd in [
+                    "G73",
+                    "G74",
+                    "G81",
+                    "G82",
+                    "G83",
+                    "G84",
+                    "G85",
+                    "G86",
+                    "G87",
+                    "G88",
+                    "G89",
+                ]
+            )
+            is_drill_mode_command = any(stripped.startswith(cmd) for cmd in ["G80", "G98", "G99"])
+
+            if is_parametric_drill_cycle:
+                # Parametric drill cycles need all parameters preserved
+                yield line
+                continue
+            elif is_drill_mode_command:
+                # G80 (cancel), G98 (retract to initial), G99 (retract to R) have no parameters
+                yield line
+                continue
+
+            yield self._suppress(line, stripped)
+
+    def _suppress(self, line: str, stripped: str) -> str:
+        current_pos = self.current_pos
+        current_feed = self.current_feed
 
         # Check for blockdelete slash
         has_blockdelete = line.lstrip().startswith("/")
@@ -209,34 +273,42 @@ def suppress_redundant_axes_words(gcode: List[str]) -> List[str]:
                 filtered_words.append(word)
 
         # Update current state for next command
-        current_pos = new_pos
-        current_feed = new_feed
+        self.current_pos = new_pos
+        self.current_feed = new_feed
 
         # Join the filtered words back into a line with preserved blockdelete
         if filtered_words:
-            result.append(f"{blockdelete_prefix}{' '.join(filtered_words)}")
+            return f"{blockdelete_prefix}{' '.join(filtered_words)}"
         else:
             # If no words left, keep the original line (shouldn't happen for valid G-code)
-            result.append(line)
+            return line
 
-    return result
-
-
-# Filter inefficient moves
 
+def suppress_redundant_axes_words(gcode: List[str]) -> List[str]:
+    """Suppress redundant axis and feed rate words by tracking current machine state.
 
-def filter_inefficient_moves(gcode: List[str]) -> List[str]:
-    """Filter out inefficient or redundant moves from G-code.
-
-    Removes unnecessary rapid (G0) moves by collapsing chains that only move
-    along single axes or within linear/rotary groups.
+    Removes axis words where the value matches the current machine position,
+    and F words where the feed rate matches the current feed rate.
 
     Args:
         gcode: List of G-code strings
 
     Returns:
-        List of G-code strings with inefficient moves filtered out
+        List of G-code strings with redundant words suppressed
     """
+    return RedundantAxesWordSuppressor().filter_all(gcode)
+
+
+# Filter inefficient moves
+
+
+class InefficientMoveFilter(GcodeLineFilter):
+    """Collapse chains of rapid moves, see filter_inefficient_moves().
+
+    A chain of rapid moves is held back until a line that ends it,
+    or until flush().
+    """
+
     AXES = ("X", "Y", "Z", "A", "B", "C")
 
     SIDE_EFFECT_KEYS = {
@@ -252,6 +324,40 @@ def filter_inefficient_moves(gcode: List[str]) -> List[str]:
         "M",
     }
 
+    SIDE_EFFECT_COMMANDS = (
+        "G28",
+        "G30",
+        "G53",
+        "G54",
+        "G55",
+        "G56",
+        "G57",
+        "G58",
+        "G59",
+        "G92",
+        "G10",
+        "T",  # Tool change
+        "G73",
+        "G74",
+        "G80",
+        "G81",
+        "G82",
+        "G83",
+        "G84",
+        "G85",
+        "G86",
+        "G87",
+        "G88",
+        "G89",  # Drill cycles
+        "G98",
+        "G99",  # Retract modes
+    )
+
+    def __init__(self):
+        self.rapid_chain = []
+        self.last_full_pos = {ax: None for ax in self.AXES}
+
+    @staticmethod
     def parse_gcode_line(line: str) -> dict:
         """Parse a G-code line into command name and parameters."""
         stripped = line.strip()
@@ -286,61 +392,32 @@ def filter_inefficient_moves(gcode: List[str]) -> List[str]:
             "blockdelete": has_blockdelete,
         }
 
+    @staticmethod
     def is_rapid(parsed_cmd: dict) -> bool:
         """Check if command is a rapid move (G0)."""
         return parsed_cmd["name"] in ("G0", "G00")
 
-    def has_side_effects(parsed_cmd: dict) -> bool:
+    def has_side_effects(self, parsed_cmd: dict) -> bool:
         """Check if command has side effects that prevent optimization."""
         # Check for side effect parameter keys
-        if any(k in parsed_cmd["params"] for k in SIDE_EFFECT_KEYS):
+        if any(k in parsed_cmd["params"] for k in self.SIDE_EFFECT_KEYS):
             return True
 
         # Check for M-codes and other side effect commands
         cmd = parsed_cmd["name"]
-        if cmd.startswith("M") or cmd in (
-            "G28",
-            "G30",
-            "G53",
-            "G54",
-            "G55",
-            "G56",
-            "G57",
-            "G58",
-            "G59",
-            "G92",
-            "G10",
-            "T",  # Tool change
-            "G73",
-            "G74",
-            "G80",
-            "G81",
-            "G82",
-            "G83",
-            "G84",
-            "G85",
-            "G86",
-            "G87",
-            "G88",
-            "G89",  # Drill cycles
-            "G98",
-            "G99",
-        ):  # Retract modes
-            return True
+        return cmd.startswith("M") or cmd in self.SIDE_EFFECT_COMMANDS
 
-        return False
-
-    def full_position(parsed_cmd: dict, last_pos: dict) -> dict:
+    def full_position(self, parsed_cmd: dict, last_pos: dict) -> dict:
         """Compute full position from command and last position."""
         pos = {}
-        for ax in AXES:
+        for ax in self.AXES:
             if ax in parsed_cmd["params"] and parsed_cmd["params"][ax] is not None:
                 pos[ax] = parsed_cmd["params"][ax]
             else:
                 pos[ax] = last_pos.get(ax)
         return pos
 
-    def collapse_rapid_chain(chain):
+    def collapse_rapid_chain(self, chain) -> List[str]:
         """
         Collapse a chain of rapid moves.
         chain = list of dicts with 'parsed', 'pos', and 'original' keys.
@@ -350,7 +427,7 @@ def filter_inefficient_moves(gcode: List[str]) -> List[str]:
 
         # Check which axes change across the chain
         first = chain[0]["pos"]
-        axes_changed = {ax for ax in AXES if any(c["pos"][ax] != first[ax] for c in chain)}
+        axes_changed = {ax for ax in self.AXES if any(c["pos"][ax] != first[ax] for c in chain)}
 
         # If only one axis changes → keep only the last command
         if len(axes_changed) == 1:
@@ -366,41 +443,94 @@ def filter_inefficient_moves(gcode: List[str]) -> List[str]:
         # Mixed changes → can't collapse, keep all
         return [c["original"] for c in chain]
 
-    # Main optimization logic
-    result = []
-    rapid_chain = []
-    last_full_pos = {ax: None for ax in AXES}
-
-    def flush_chain():
-        nonlocal rapid_chain
-        if rapid_chain:
-            result.extend(collapse_rapid_chain(rapid_chain))
-            rapid_chain = []
-
-    for line in gcode:
-        parsed = parse_gcode_line(line)
-
-        # Skip comments and empty lines
-        if parsed["name"] in ("COMMENT", "EMPTY"):
-            flush_chain()  # Flush any pending rapid chain
-            result.append(line)
-            continue
-
-        # Get full position for this command
-        pos = full_position(parsed, last_full_pos)
-        last_full_pos = pos
-
-        # Check if this is a rapid move without side effects
-        if is_rapid(parsed) and not has_side_effects(parsed):
-            rapid_chain.append({"parsed": parsed, "pos": pos, "original": line})
-        else:
-            flush_chain()  # Flush any pending rapid chain before adding this command
-            result.append(line)
+    def flush(self) -> List[str]:
+        """Return the collapsed pending rapid chain."""
+        result = self.collapse_rapid_chain(self.rapid_chain)
+        self.rapid_chain = []
+        return result
+
+    def filter(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            parsed = self.parse_gcode_line(line)
+
+            # Skip comments and empty lines
+            if parsed["name"] in ("COMMENT", "EMPTY"):
+                yield from self.flush()  # Flush any pending rapid chain
+                yield line
+                continue
+
+            # Get full position for this command
+            pos = self.full_position(parsed, self.last_full_pos)
+            self.last_full_pos = pos
+
+            # Check if this is a rapid move without side effects
+            if self.is_rapid(parsed) and not self.has_side_effects(parsed):
+                self.rapid_chain.append({"parsed": parsed, "pos": pos, "original": line})
+            else:
+                # Flush any pending rapid chain before adding this command
+                yield from self.flush()
+                yield line
+
+
+def filter_inefficient_moves(gcode: List[str]) -> List[str]:
+    """Filter out inefficient or redundant moves from G-code.
+
+    Removes unnecessary rapid (G0) moves by collapsing chains that only move
+    along single axes or within linear/rotary groups.
+
+    Args:
+        gcode: List of G-code strings
+
+    Returns:
+        List of G-code strings with inefficient moves filtered out
+    """
+    return InefficientMoveFilter().filter_all(gcode)
 
-    # Flush any remaining rapid chain
-    flush_chain()
 
-    return result
+class RepeatedCommandDeduplicator(GcodeLineFilter):
+    """Remove the command word of repeated commands, see deduplicate_repeated_commands().
+
+    The last command word is the state.
+    """
+
+    def __init__(self):
+        self.last_cmd = None
+
+    def filter(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            stripped = line.strip()
+
+            # Keep comments and empty lines unchanged
+            if not stripped or stripped.startswith("("):
+                yield line
+                continue
+
+            # Reset modal command tracking on tool change so the first command
+            # after M6 is always output with its full command word.
+            if any(stripped.startswith(cmd) for cmd in ["M6", "M06"]):
+                self.last_cmd = None
+                yield line
+                continue
+
+            # Extract the primary command (first word)
+            words = stripped.split()
+            if words:
+                cmd = words[0]
+                # Check for blockdelete
+                if cmd.startswith("/"):
+                    cmd = cmd[1:]
+
+                if cmd == self.last_cmd:
+                    # Same command - output only parameters (remove command word)
+                    params = " ".join(words[1:])
+                    if params:  # Only if there are parameters
+                        yield params
+                else:
+                    # Different command - output full line
+                    yield line
+                    self.last_cmd = cmd
+            else:
+                yield line
 
 
 def deduplicate_repeated_commands(gcode: List[str]) -> List[str]:
@@ -421,42 +551,4 @@ def deduplicate_repeated_commands(gcode: List[str]) -> List[str]:
     Returns:
         List of G-code strings with modal command words removed
     """
-    result = []
-    last_cmd = None
-
-    for line in gcode:
-        stripped = line.strip()
-
-        # Keep comments and empty lines unchanged
-        if not stripped or stripped.startswith("("):
-            result.append(line)
-            continue
-
-        # Reset modal command tracking on tool change so the first command
-        # after M6 is always output with its full command word.
-        if any(stripped.startswith(cmd) for cmd in ["M6", "M06"]):
-            last_cmd = None
-            result.append(line)
-            continue
-
-        # Extract the primary command (first word)
-        words = stripped.split()
-        if words:
-            cmd = words[0]
-            # Check for blockdelete
-            if cmd.startswith("/"):
-                cmd = cmd[1:]
-
-            if cmd == last_cmd:
-                # Same command - output only parameters (remove command word)
-                params = " ".join(words[1:])
-                if params:  # Only if there are parameters
-                    result.append(params)
-            else:
-                # Different command - output full line
-                result.append(line)
-                last_cmd = cmd
-        else:
-            result.append(line)
-
-    return result
+    return RepeatedCommandDeduplicator().filter_all(gcode)
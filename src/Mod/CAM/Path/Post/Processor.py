@@ -28,12 +28,16 @@ The base classes for post processors in the CAM workbench.
 import argparse
 import importlib.util
 import json
+import multiprocessing
 import os
 import sys
-from typing import Any, Dict, List, Optional, Tuple, Union
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import datetime
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
-from itertools import groupby
+from functools import partial
+from itertools import chain, groupby, islice
 
 import FreeCAD
 import Constants
@@ -44,6 +48,13 @@ from Path.Post import PostList
 import Path.Post.Utils as PostUtils
 from Path.Post.PostList import Postable
 from Path.Post.DrillCycleExpander import DrillCycleExpander
+from Path.Post.GcodeProcessingUtils import (
+    InefficientMoveFilter,
+    LineNumberInserter,
+    RedundantAxesWordSuppressor,
+    RepeatedCommandDeduplicator,
+    filter_gcode_lines,
+)
 from Path.Post.CAMErrors import CAMError, CAMValueError, CAMAttributeError
 from Path.Base.MachineState import MachineState
 from Machine.models.machine import MachineFactory, OutputUnits
@@ -204,6 +215,7 @@ Defaults = Dict[str, bool]
 FormatHelp = str
 GCodeOrNone = Optional[str]
 GCodeSections = List[Tuple[str, GCodeOrNone]]
+GCodeSectionStream = Iterator[Tuple[str, Iterator[str]]]
 Parser = argparse.ArgumentParser
 ParserArgs = Union[None, str, argparse.Namespace]
 Postables = Union[List, List[Tuple[str, List]]]
@@ -287,9 +299,156 @@ def needsTcOp(oldTc, newTc):
     return PostList.needsTcOp(oldTc, newTc)
 
 
+# Parameters formatted as axis values, in the units of the output
+_AXIS_PARAMETERS = "X Y Z U V W A B C I J K R Q P".split(" ")
+# Parameters formatted as integers
+_INT_PARAMETERS = "D H L T".split(" ")
+
+
+class _CommandFormatter:
+    """The .values used to convert commands, compiled once per export.
+
+    hooks is the dispatch table {command name: bound _convert_*() hook} of the
+    supported commands converted so far, parameter_formatters has a function
+    value -> string for each parameter of PARAMETER_ORDER, with the precision
+    and units of the output.
+
+    See PostProcessor.convert_command_to_gcode().
+    """
+
+    def __init__(self, post):
+        values = post.values
+        self._post = post
+        self.supported = values.get(
+            "SUPPORTED_COMMANDS",
+            Constants.GCODE_SUPPORTED + Constants.GCODE_FIXTURES + Constants.MCODE_SUPPORTED,
+        )
+        self.parameter_order = values.get(
+            "PARAMETER_ORDER",
+            # FIXME: dry
+            ["X", "Y", "Z", "A", "B", "C", "F", "I", "J", "K", "R", "Q", "P", "S", "T"],
+        )
+        self.output_doubles = values["OUTPUT_DOUBLES"]
+        self.f_for_rapid_moves = values.get("F_FOR_RAPID_MOVES")
+        self.command_space = values["COMMAND_SPACE"]
+        self.hooks = {}
+
+        self.base_parameter_formatters = self._compile_parameter_formatters(values)
+        if type(post).format_parameter is PostProcessor.format_parameter:
+            formatters = self.base_parameter_formatters
+            self.parameter_formatters = {
+                parameter: formatters.get(parameter, partial(_format_unknown_parameter, parameter))
+                for parameter in self.parameter_order
+            }
+        else:
+            self.parameter_formatters = {
+                parameter: partial(post.format_parameter, parameter)
+                for parameter in self.parameter_order
+            }
+
+    @staticmethod
+    def _compile_parameter_formatters(values):
+        """{parameter: function(value) -> str}, see PostProcessor.format_parameter()"""
+        # mm to inches
+        is_imperial = values.get("OUTPUT_UNITS") == OutputUnits.IMPERIAL
+        axis_format = f".{values['AXIS_PRECISION']}f"
+        feed_format = f".{values['FEED_PRECISION']}f"
+        decimals = values.get("SPINDLE_DECIMALS")
+        spindle_format = f".{0 if decimals is None else decimals}f"
+
+        if is_imperial:
+
+            def format_axis_param(value):
+                return format(value / 25.4, axis_format)
+
+            def format_feed_param(value):
+                # mm/sec to inches/min
+                return format(value * 60.0 / 25.4, feed_format)
+
+        else:
+
+            def format_axis_param(value):
+                return format(value, axis_format)
+
+            def format_feed_param(value):
+                # mm/sec to mm/min
+                return format(value * 60.0, feed_format)
+
+        def format_spindle_param(value):
+            return format(value, spindle_format)
+
+        def format_int_param(value):
+            return str(int(value))
+
+        formatters = {parameter: format_axis_param for parameter in _AXIS_PARAMETERS}
+        formatters.update({parameter: format_int_param for parameter in _INT_PARAMETERS})
+        formatters["F"] = format_feed_param
+        formatters["S"] = format_spindle_param
+        return formatters
+
+    def add_hook(self, command_name):
+        """The hook of a supported command, added to the dispatch table"""
+        hook = getattr(self._post, self._post._conversion_hook_name(command_name))
+        self.hooks[command_name] = hook
+        return hook
+
+
+def _format_unknown_parameter(param_name, value):
+    # Default formatting for unhandled parameters
+    return f"{param_name}{value}"
+
+
+# (postprocessor, postables) of a parallel conversion, inherited by the forked workers
+_parallel_conversion = None
+
+
+def _convert_items_batch(batch):
+    """Worker of PostProcessor._convert_items_in_parallel()"""
+    post, postables = _parallel_conversion
+    modal_state, indexes = batch
+    return post._convert_items(postables, indexes, modal_state)
+
+
 class PostProcessor:
     """Base Class.  All non-legacy postprocessors should inherit from this class."""
 
+    # The methods used to convert the commands of an item.
+    # If a postprocessor overrides one of them, the items are converted serially, unless
+    # the method is in its STATELESS_CONVERSION_HOOKS or MODAL_STATE_CONVERSION_HOOKS,
+    # see _convert_items_in_parallel().
+    CONVERSION_METHODS = (
+        "convert_command_to_gcode",
+        "_convert_item_commands",
+        "_convert_section_item",
+        "_convert_start_section",
+        "_convert_comment",
+        "_convert_move",
+        "_output_parameters",
+        "format_parameter",
+        "_convert_rapid_move",
+        "_convert_linear_move",
+        "_convert_arc_move",
+        "_convert_drill_cycle",
+        "_convert_probe",
+        "_convert_probe_open",
+        "_convert_probe_close",
+        "_convert_dwell",
+        "_convert_tool_change",
+        "_convert_spindle_command",
+        "_convert_coolant_command",
+        "_convert_program_control",
+        "_convert_fixture",
+        "_convert_modal_command",
+        "_convert_generic_command",
+    )
+    # Overridden _convert_*() hooks that neither use nor change self._modal_state
+    STATELESS_CONVERSION_HOOKS = ()
+    # Overridden _convert_*() hooks that change no state but self._modal_state,
+    # they are called again to compute the modal state at the start of each batch
+    MODAL_STATE_CONVERSION_HOOKS = ()
+    # The minimum number of commands of a batch of items converted by a worker
+    PARALLEL_BATCH_COMMANDS = 5000
+
     @classmethod
     def get_common_property_schema(cls) -> List[Dict[str, Any]]:
         """
@@ -557,6 +716,20 @@ class PostProcessor:
                     "Whether to output the F parameter for G0 (rapid moves)",
                 ),
             },
+            {
+                "name": "conversion_workers",
+                "type": "int",
+                "label": translate("CAM", "Conversion worker processes"),
+                "default": 0,
+                "min": 0,
+                "max": 64,
+                "help": translate(
+                    "CAM",
+                    "Number of worker processes converting the operations to G-code "
+                    "in parallel, 0 or 1 converts them one after another. "
+                    "Only used by headless runs (FreeCADCmd) on Linux",
+                ),
+            },
         ]
 
     @classmethod
@@ -609,6 +782,8 @@ class PostProcessor:
         self._optimize_start = None
         self._bcnc_postamble_commands = None
         self._operation = None
+        self._command_formatter = None  # compiled .values while converting, see _CommandFormatter
+        self.stage_times = {}  # seconds of the stages of the last export2(), see _timed_stage()
 
         # Handle job: can be single job or list of jobs
         if isinstance(job, list):
@@ -1080,6 +1255,67 @@ class PostProcessor:
 
         return gcodeheader
 
+    # ===== COMMAND EXPANSION STAGES =====
+    #
+    # Each _expand_* method below has a _*_stage() method making its streaming
+    # transformer, see _edit_command_stages(). _expand_commands() fuses the stages
+    # into one pass over each item's commands.
+
+    # the _expand_* methods run by _expand_commands(), in order
+    COMMAND_EXPANSION_STAGES = (
+        "_expand_translate_drill_cycles",
+        "_expand_canned_cycles",
+        "_expand_split_arcs",
+        "_expand_spindle_wait",
+        "_expand_coolant_delay",
+        "_expand_translate_rapids",
+        "_expand_xy_before_z",
+        "_expand_bcnc_commands",
+        "_expand_tool_length_offset",
+    )
+
+    def _expand_commands(self, postables, fused=True):
+        """Run the command expansion stages over the items' Path.Commands.
+
+        With fused=True the stages are chained into one pass over the commands
+        of each item: item.Path.Commands is copied out once and the Path is
+        rebuilt once per item, instead of once per stage.
+
+        A postprocessor that overrides one of the COMMAND_EXPANSION_STAGES
+        gets them run one after another, so the override is honored.
+        fused=False does the same, e.g. to compare the output of both.
+        """
+        if fused:
+            overridden = [
+                name
+                for name in self.COMMAND_EXPANSION_STAGES
+                if getattr(type(self), name) is not getattr(PostProcessor, name)
+            ]
+            if overridden:
+                Path.Log.debug(f"Command expansion not fused, overridden: {overridden}")
+                fused = False
+
+        if not fused:
+            for name in self.COMMAND_EXPANSION_STAGES:
+                getattr(self, name)(postables)
+            return
+
+        # export2() uses only the bCNC postamble, which _bcnc_commands_stage() stores,
+        # the preop postables returned by _expand_bcnc_commands() are not part of its output
+        stages = [
+            self._translate_drill_cycles_stage(),
+            self._canned_cycles_stage(),
+            self._split_arcs_stage(),
+            self._spindle_wait_stage(),
+            self._coolant_delay_stage(),
+            self._translate_rapids_stage(),
+            self._xy_before_z_stage(),
+            self._bcnc_commands_stage(),
+            self._tool_length_offset_stage(),
+        ]
+        with self.use_machine_state():
+            self._edit_command_stages(postables, stages)
+
     def _expand_canned_cycles(self, postables):
         """Terminate canned drill cycles in postable paths.
 
@@ -1090,27 +1326,14 @@ class PostProcessor:
         Subclasses can override to customize canned cycle handling.
         """
         Path.Log.track("Expanding canned cycles")
-        for section_name, sublist in postables:
-            for item in sublist:
-                has_drill_cycles = False
-                if item.path:
-                    drill_commands = [
-                        "G73",
-                        "G74",
-                        "G81",
-                        "G82",
-                        "G83",
-                        "G84",
-                        "G85",
-                        "G86",
-                        "G87",
-                        "G88",
-                        "G89",
-                    ]
-                    has_drill_cycles = any(cmd.Name in drill_commands for cmd in item.path.Commands)
-
-                if has_drill_cycles:
-                    item.path = PostUtils.cannedCycleTerminator(item.path)
+        self._edit_command_stages(postables, [self._canned_cycles_stage()])
+
+    def _canned_cycles_stage(self):
+        def stage(section_name, item, commands, section_state):
+            # commands without a canned cycle pass through unchanged
+            return PostUtils.terminateCannedCycles(commands)
+
+        return stage
 
     def _expand_split_arcs(self, postables):
         """Split arc commands into linear segments if configured.
@@ -1120,13 +1343,16 @@ class PostProcessor:
 
         Subclasses can override to customize arc handling.
         """
+        self._edit_command_stages(postables, [self._split_arcs_stage()])
+
+    def _split_arcs_stage(self):
         if not self.values["SPLIT_ARCS"]:
-            return
+            return None
 
-        for section_name, sublist in postables:
-            for item in sublist:
-                if item.path:
-                    item.path = PostUtils.splitArcs(item.path)
+        def stage(section_name, item, commands, section_state):
+            return PostUtils.splitArcCommands(commands)
+
+        return stage
 
     def _expand_spindle_wait(self, postables):
         """Inject G4 dwell after spindle start commands (M3/M4).
@@ -1136,22 +1362,22 @@ class PostProcessor:
 
         Subclasses can override to customize spindle wait behavior.
         """
+        self._edit_command_stages(postables, [self._spindle_wait_stage()])
 
+    def _spindle_wait_stage(self):
         spindle = self._machine.get_spindle_by_index(0)  # FIXME: should be an annotation
         if not (spindle and spindle.spindle_wait > 0):
-            return
+            return None
 
         wait_time = spindle.spindle_wait
-        for section_name, sublist in postables:
-            for item in sublist:
-                if item.path:
-                    new_commands = []
-                    for cmd in item.path.Commands:
-                        new_commands.append(cmd)
-                        if cmd.Name in Constants.MCODE_SPINDLE_ON:
-                            pause_cmd = Path.Command("G4", {"P": wait_time})
-                            new_commands.append(pause_cmd)
-                    item.path = Path.Path(new_commands)
+
+        def stage(section_name, item, commands, section_state):
+            for cmd in commands:
+                yield cmd
+                if cmd.Name in Constants.MCODE_SPINDLE_ON:
+                    yield Path.Command("G4", {"P": wait_time})
+
+        return stage
 
     def _expand_coolant_delay(self, postables):
         """Inject G4 dwell after coolant on commands.
@@ -1161,20 +1387,20 @@ class PostProcessor:
 
         Subclasses can override to customize coolant delay behavior.
         """
+        self._edit_command_stages(postables, [self._coolant_delay_stage()])
+
+    def _coolant_delay_stage(self):
         spindle = self._machine.get_spindle_by_index(0)  # FIXME: needs to be in .values
         if not (spindle and spindle.coolant_delay > 0):
-            return
+            return None
 
-        for section_name, sublist in postables:
-            for item in sublist:
-                if item.path:
-                    new_commands = []
-                    for cmd in item.path.Commands:
-                        new_commands.append(cmd)
-                        if cmd.Name in Constants.MCODE_COOLANT_ON:
-                            pause_cmd = Path.Command("G4", {"P": spindle.coolant_delay})
-                            new_commands.append(pause_cmd)
-                    item.path = Path.Path(new_commands)
+        def stage(section_name, item, commands, section_state):
+            for cmd in commands:
+                yield cmd
+                if cmd.Name in Constants.MCODE_COOLANT_ON:
+                    yield Path.Command("G4", {"P": spindle.coolant_delay})
+
+        return stage
 
     def _expand_translate_rapids(self, postables):
         """Replace G0 rapid moves with G1 linear moves.
@@ -1184,19 +1410,21 @@ class PostProcessor:
 
         Subclasses can override to customize rapid move translation.
         """
+        self._edit_command_stages(postables, [self._translate_rapids_stage()])
+
+    def _translate_rapids_stage(self):
         if not self.values["TRANSLATE_RAPID_MOVES"]:
-            return
+            return None
 
-        for section_name, sublist in postables:
-            for item in sublist:
-                if item.path:
-                    new_commands = []
-                    Path.Log.debug(f"Translating rapid moves for {item.label}")
-                    for cmd in item.path.Commands:
-                        if cmd.Name in Constants.GCODE_MOVE_RAPID:
-                            cmd.Name = "G1"
-                        new_commands.append(cmd)
-                    item.path = Path.Path(new_commands)
+        def stage(section_name, item, commands, section_state):
+            if item.path:
+                Path.Log.debug(f"Translating rapid moves for {item.label}")
+            for cmd in commands:
+                if cmd.Name in Constants.GCODE_MOVE_RAPID:
+                    cmd.Name = "G1"
+                yield cmd
+
+        return stage
 
     def _expand_translate_drill_cycles(self, postables):
         """Translate canned drill cycles to G0/G1 move sequences.
@@ -1208,25 +1436,34 @@ class PostProcessor:
         Subclasses can override to customize drill cycle translation.
         """
         Path.Log.track("Translating drill cycles")
-        if not self.values["TRANSLATE_DRILL_CYCLES"]:
-            Path.Log.debug("Drill cycle translation disabled")
+        stage = self._translate_drill_cycles_stage()
+        if stage is None:
             return
 
         with self.use_machine_state():
-            for section_name, sublist in postables:
-                for item in sublist:
-                    Path.Log.track(f"Processing item: {item.label}")
-                    if item.path:
-                        has_drill = any(
-                            cmd.Name in DrillCycleExpander.EXPANDABLE_CYCLES
-                            for cmd in item.path.Commands
-                        )
-                        if has_drill:
-                            Path.Log.debug(f"Translating drill cycles for {item.label}")
-                            expander = DrillCycleExpander(self.machine_state)
-                            item.path = expander.expand_path(item.path)
-                        else:
-                            self.machine_state.addCommands(item.path.Commands)
+            self._edit_command_stages(postables, [stage])
+
+    def _translate_drill_cycles_stage(self):
+        """needs self.machine_state, see use_machine_state()"""
+        if not self.values["TRANSLATE_DRILL_CYCLES"]:
+            Path.Log.debug("Drill cycle translation disabled")
+            return None
+
+        def stage(section_name, item, commands, section_state):
+            Path.Log.track(f"Processing item: {item.label}")
+            # the expander also drops G80/G98/G99, so only items with a drill cycle are expanded
+            if not isinstance(commands, list):
+                commands = list(commands)
+            if any(cmd.Name in DrillCycleExpander.EXPANDABLE_CYCLES for cmd in commands):
+                Path.Log.debug(f"Translating drill cycles for {item.label}")
+                expander = DrillCycleExpander(self.machine_state)
+                for cmd in commands:
+                    yield from expander.expand_command(cmd)
+            else:
+                self.machine_state.addCommands(commands)
+                yield from commands
+
+        return stage
 
     @contextmanager
     def use_machine_state(self):
@@ -1249,85 +1486,82 @@ class PostProcessor:
 
         Subclasses can override to customize post-tool-change move ordering.
         """
+        self._edit_command_stages(postables, [self._xy_before_z_stage()])
+
+    def _xy_before_z_stage(self):
         if not self.values["XY_BEFORE_Z_AFTER_TOOL_CHANGE"]:
-            return
+            return None
 
         Path.Log.debug("Processing XY before Z after tool change")
-        for section_name, sublist in postables:
-            # Track whether we just saw a tool change
-            tool_change_seen = False
 
-            for item in sublist:
-                if item.item_type == "tool_controller":
-                    tool_change_seen = True
-                    Path.Log.debug(f"Tool change detected: T{item.data['tool_number']}")
-                    continue
+        def stage(section_name, item, commands, section_state):
+            # Track whether we just saw a tool change, per section
+            if "_expand_xy_before_z" not in section_state:
+                section_state["_expand_xy_before_z"] = {"tool_change_seen": False}
+            state = section_state["_expand_xy_before_z"]
 
-                if item.path:
-                    new_commands = []
+            if item.item_type == "tool_controller":
+                state["tool_change_seen"] = True
+                Path.Log.debug(f"Tool change detected: T{item.data['tool_number']}")
+                yield from commands
+                return
+
+            first_move_processed = False
+
+            for cmd in commands:
+                # Check if this is a tool change command (M6)
+                if cmd.Name in Constants.MCODE_TOOL_CHANGE:
+                    state["tool_change_seen"] = True
                     first_move_processed = False
+                    Path.Log.debug("M6 tool change detected in operation")
+                    yield cmd
+                    continue
 
-                    for cmd in item.path.Commands:
-                        # Check if this is a tool change command (M6)
-                        if cmd.Name in Constants.MCODE_TOOL_CHANGE:
-                            new_commands.append(cmd)
-                            tool_change_seen = True
-                            first_move_processed = False
-                            Path.Log.debug("M6 tool change detected in operation")
-                            continue
-
-                        # Check if this is the first move after tool change
-                        if (
-                            tool_change_seen
-                            and not first_move_processed
-                            and cmd.Name in Constants.GCODE_MOVE_ALL
-                        ):
-                            # Check if this move has both XY and Z components
-                            has_xy = "X" in cmd.Parameters or "Y" in cmd.Parameters
-                            has_z = "Z" in cmd.Parameters
-
-                            if has_xy and has_z:
-                                Path.Log.debug(
-                                    f"Decomposing first move after tool change: {cmd.Name}"
-                                )
-
-                                # Create XY-only move (first)
-                                xy_params = {}
-                                for param in ["X", "Y", "A", "B", "C"]:
-                                    if param in cmd.Parameters:
-                                        xy_params[param] = cmd.Parameters[param]
-
-                                if xy_params:
-                                    xy_cmd = Path.Command(cmd.Name, xy_params)
-                                    new_commands.append(xy_cmd)
-                                    Path.Log.debug(f"  XY move: {cmd.Name} {xy_params}")
-
-                                # Create Z-only move (second)
-                                z_params = {"Z": cmd.Parameters["Z"]}
-                                # Preserve other non-XY parameters (like F, S, etc.)
-                                for param in cmd.Parameters:
-                                    if param not in ["X", "Y", "Z", "A", "B", "C"]:
-                                        z_params[param] = cmd.Parameters[param]
-
-                                z_cmd = Path.Command(cmd.Name, z_params)
-                                new_commands.append(z_cmd)
-                                Path.Log.debug(f"  Z move: {cmd.Name} {z_params}")
-
-                                first_move_processed = True
-                                tool_change_seen = False  # Reset after decomposing the move
-                            else:
-                                # Move doesn't have both XY and Z, just add it as-is
-                                new_commands.append(cmd)
-                                if has_xy or has_z:
-                                    first_move_processed = True
-                                    tool_change_seen = False  # Reset after processing any move
-                        else:
-                            # Not the first move or not a move command
-                            new_commands.append(cmd)
+                # Check if this is the first move after tool change
+                if (
+                    state["tool_change_seen"]
+                    and not first_move_processed
+                    and cmd.Name in Constants.GCODE_MOVE_ALL
+                ):
+                    # Check if this move has both XY and Z components
+                    has_xy = "X" in cmd.Parameters or "Y" in cmd.Parameters
+                    has_z = "Z" in cmd.Parameters
+
+                    if has_xy and has_z:
+                        Path.Log.debug(f"Decomposing first move after tool change: {cmd.Name}")
+                        first_move_processed = True
+                        state["tool_change_seen"] = False  # Reset after decomposing the move
+
+                        # Create XY-only move (first)
+                        xy_params = {}
+                        for param in ["X", "Y", "A", "B", "C"]:
+                            if param in cmd.Parameters:
+                                xy_params[param] = cmd.Parameters[param]
+
+                        # Create Z-only move (second)
+                        z_params = {"Z": cmd.Parameters["Z"]}
+                        # Preserve other non-XY parameters (like F, S, etc.)
+                        for param in cmd.Parameters:
+                            if param not in ["X", "Y", "Z", "A", "B", "C"]:
+                                z_params[param] = cmd.Parameters[param]
+
+                        if xy_params:
+                            Path.Log.debug(f"  XY move: {cmd.Name} {xy_params}")
+                            yield Path.Command(cmd.Name, xy_params)
+
+                        Path.Log.debug(f"  Z move: {cmd.Name} {z_params}")
+                        yield Path.Command(cmd.Name, z_params)
+                    else:
+                        # Move doesn't have both XY and Z, just add it as-is
+                        if has_xy or has_z:
+                            first_move_processed = True
+                            state["tool_change_seen"] = False  # Reset after processing any move
+                        yield cmd
+                else:
+                    # Not the first move or not a move command
+                    yield cmd
 
-                    if len(new_commands) != len(item.path.Commands):
-                        item.path = Path.Path(new_commands)
-                        Path.Log.debug(f"Updated path for {item.label}")
+        return stage
 
     def _expand_bcnc_commands(self, postables):
         """Inject or remove bCNC block annotation commands.
@@ -1344,8 +1578,7 @@ class PostProcessor:
         """
         output_bcnc = self.values["OUTPUT_BCNC"]
         Path.Log.debug(f"OUTPUT_BCNC value: {output_bcnc}")
-        # Clear any existing bCNC postamble commands to avoid state leakage
-        self._bcnc_postamble_commands = None
+        stage = self._bcnc_commands_stage()
 
         if output_bcnc:
             Path.Log.debug("Creating bCNC commands")
@@ -1367,6 +1600,21 @@ class PostProcessor:
                 else:
                     return None, None
 
+            return self._edit_postable_list(postables, insert_op_bcnc)
+
+        else:
+            Path.Log.debug("Removing existing bCNC commands")
+            self._edit_command_stages(postables, [stage])
+            return postables
+
+    def _bcnc_commands_stage(self):
+        """Stores the bCNC postamble commands for later insertion,
+        the stage removes bCNC commands when OUTPUT_BCNC is False
+        """
+        # Clear any existing bCNC postamble commands to avoid state leakage
+        self._bcnc_postamble_commands = None
+
+        if self.values["OUTPUT_BCNC"]:
             # Create bCNC postamble commands
             # Store bCNC postamble commands for later insertion
             self._bcnc_postamble_commands = [
@@ -1374,26 +1622,21 @@ class PostProcessor:
                 Path.Command("(Block-expand: 0)", {}, {"bcnc": "postamble_meta"}),
                 Path.Command("(Block-enable: 1)", {}, {"bcnc": "postamble_meta"}),
             ]
+            return None
 
-            return self._edit_postable_list(postables, insert_op_bcnc)
+        def stage(section_name, item, commands, section_state):
+            if item.item_type != "operation":
+                yield from commands
+                return
+            for cmd in commands:
+                if not (
+                    cmd.Name.startswith("(Block-name:")
+                    or cmd.Name.startswith("(Block-expand:")
+                    or cmd.Name.startswith("(Block-enable:")
+                ):
+                    yield cmd
 
-        else:
-            Path.Log.debug("Removing existing bCNC commands")
-            for section_name, sublist in postables:
-                for item in sublist:
-                    if item.item_type == "operation" and item.path:
-                        filtered_commands = []
-                        for cmd in item.path.Commands:
-                            if not (
-                                cmd.Name.startswith("(Block-name:")
-                                or cmd.Name.startswith("(Block-expand:")
-                                or cmd.Name.startswith("(Block-enable:")
-                            ):
-                                filtered_commands.append(cmd)
-
-                        if len(filtered_commands) != len(item.path.Commands):
-                            item.path = Path.Path(filtered_commands)
-            return postables
+        return stage
 
     def _expand_tool_length_offset(self, postables):
         """Inject or remove G43 tool length offset commands.
@@ -1406,6 +1649,9 @@ class PostProcessor:
 
         Simplified single-pass implementation.
         """
+        self._edit_command_stages(postables, [self._tool_length_offset_stage()])
+
+    def _tool_length_offset_stage(self):
         output_tool_length_offset = self.values["OUTPUT_TOOL_LENGTH_OFFSET"]
         Path.Log.debug(f"OUTPUT_TOOL_LENGTH_OFFSET value: {output_tool_length_offset}")
 
@@ -1426,7 +1672,7 @@ class PostProcessor:
                 else:
                     return None, None
 
-        self._edit_command_list(postables, edit)
+        return self._edit_stage(edit)
 
     def _expand_prefix(self, postables) -> None:
         """Add prefix to each section"""
@@ -1616,8 +1862,9 @@ class PostProcessor:
         """
 
         if item.data.get("optimizable", None):
-            # we rely on gcode_lines being accumulated per-section
-            # this is for ._optimize_gcode() to bypass the header
+            # _optimize_start is an index into gcode_lines: into the whole section
+            # for ._optimize_gcode(), to bypass the header, or into this item's own
+            # lines when _convert_section_lines() passes a fresh list per item
             self._optimize_start = len(gcode_lines)
 
         if item.item_type == "str":
@@ -1745,46 +1992,79 @@ class PostProcessor:
                 None    no action
             eliding None commands in the list
         """
+        stage = self._edit_stage(edit_fn)
         for section_name, sublist in postables:
             section_state = {}
             for item in sublist:
                 if item.path:
-                    new_commands = []
-                    for cmd in item.Path.Commands:
-                        editflag, edit_commands = edit_fn(section_name, item, cmd, section_state)
+                    new_commands = list(
+                        stage(section_name, item, item.Path.Commands, section_state)
+                    )
+                    if new_commands:
+                        item.path = Path.Path(new_commands)
 
-                        # reduce None's
-                        rez = (
-                            [x for x in edit_commands if x is not None]
-                            if editflag is not None
-                            else None
-                        )
+    def _edit_stage(self, edit_fn):
+        """Make a stage for _edit_command_stages() from an edit_fn of _edit_command_list()"""
 
-                        # no-edit just leaves the command
-                        if editflag is None:
-                            new_commands.append(cmd)
+        def stage(section_name, item, commands, section_state):
+            for cmd in commands:
+                editflag, edit_commands = edit_fn(section_name, item, cmd, section_state)
 
-                        # before
-                        elif editflag == -1 and rez:
-                            new_commands.extend(rez)
-                            new_commands.append(cmd)
+                # no-edit just leaves the command
+                if editflag is None:
+                    yield cmd
+                    continue
 
-                        # replace
-                        elif editflag == 0:
-                            new_commands.extend(rez)
+                # reduce None's
+                rez = [x for x in edit_commands if x is not None]
 
-                        # after
-                        elif editflag == 1:
-                            new_commands.append(cmd)
-                            new_commands.extend(rez)
+                # before
+                if editflag == -1:
+                    yield from rez
+                    yield cmd
 
-                        else:
-                            # Not a user-level CAM error
-                            raise ValueError(
-                                f"Internal: Expected -1|0|1|None from edit_fn, saw {editflag.__class__.__name__} {editflag}"
-                            )
-                    if new_commands:
-                        item.path = Path.Path(new_commands)
+                # replace
+                elif editflag == 0:
+                    yield from rez
+
+                # after
+                elif editflag == 1:
+                    yield cmd
+                    yield from rez
+
+                else:
+                    # Not a user-level CAM error
+                    raise ValueError(
+                        f"Internal: Expected -1|0|1|None from edit_fn, saw {editflag.__class__.__name__} {editflag}"
+                    )
+
+        return stage
+
+    def _edit_command_stages(self, postables: list[Postable], stages):
+        """in place edit commands in each item.Path in postables, through a chain of stages
+        stage(section_name, item, commands, section_state) is called for each item
+            commands is an iterable of the item's commands, the output of the previous stage
+            return: an iterable of the item's new commands, usually the stage is a generator
+            section_state is reset to {} for each section, see _edit_command_list()
+            Items without a path get no commands, but a stage still sees the item.
+            A stage is done with a command when it yields it: a later stage may edit it in place.
+        None stages are skipped.
+        item.Path.Commands is copied out once, and the Path is rebuilt once, per item.
+        An item whose commands all get removed keeps its path, as in _edit_command_list().
+        """
+        stages = [stage for stage in stages if stage is not None]
+        if not stages:
+            return
+
+        for section_name, sublist in postables:
+            section_state = {}
+            for item in sublist:
+                commands = item.path.Commands if item.path else []
+                for stage in stages:
+                    commands = stage(section_name, item, commands, section_state)
+                new_commands = list(commands)
+                if item.path and new_commands:
+                    item.path = Path.Path(new_commands)
 
     def _edit_item_list(self, postables: list[Postable], edit_fn):
         """in place edit items in postables
@@ -1892,13 +2172,6 @@ class PostProcessor:
         line numbering to the body only, then reassembles with the
         configured line ending.
         """
-        from Path.Post.GcodeProcessingUtils import (
-            deduplicate_repeated_commands,
-            suppress_redundant_axes_words,
-            filter_inefficient_moves,
-            insert_line_numbers,
-        )
-
         if not gcode_lines:
             return ""
 
@@ -1912,22 +2185,28 @@ class PostProcessor:
         header_part = gcode_lines[:num_header_lines]
         body_part = gcode_lines[num_header_lines:]
 
-        if body_part:
-            if not self.values["OUTPUT_DUPLICATE_COMMANDS"]:
-                body_part = deduplicate_repeated_commands(body_part)
-            if not self.values["OUTPUT_DOUBLES"]:
-                body_part = suppress_redundant_axes_words(body_part)
+        body_part = list(filter_gcode_lines(self._make_gcode_filters(), body_part, final=True))
 
-        if body_part and self.values["FILTER_INEFFICIENT_MOVES"]:
-            body_part = filter_inefficient_moves(body_part)
+        final_lines = header_part + body_part
+        return final_lines
 
-        if body_part and self.values["OUTPUT_LINE_NUMBERS"]:
+    def _make_gcode_filters(self) -> list:
+        """New incremental G-code filters for the body of a section, in order:
+        deduplication, redundant-axis suppression, inefficient-move filtering,
+        and line numbering, as configured.
+        """
+        filters = []
+        if not self.values["OUTPUT_DUPLICATE_COMMANDS"]:
+            filters.append(RepeatedCommandDeduplicator())
+        if not self.values["OUTPUT_DOUBLES"]:
+            filters.append(RedundantAxesWordSuppressor())
+        if self.values["FILTER_INEFFICIENT_MOVES"]:
+            filters.append(InefficientMoveFilter())
+        if self.values["OUTPUT_LINE_NUMBERS"]:
             start = self.values["LINE_NUMBER_START"]
             increment = self.values["LINE_INCREMENT"]
-            body_part = insert_line_numbers(body_part, start=start, increment=increment)
-
-        final_lines = header_part + body_part
-        return final_lines
+            filters.append(LineNumberInserter(start=start, increment=increment))
+        return filters
 
     def _expand_trailing_lines(self, postables) -> None:
         """Append post_job and postamble lines, to each section."""
@@ -1960,32 +2239,99 @@ class PostProcessor:
         """Override if your PP needs to notice when each section (file) starts"""
         pass
 
-    def _convert_job_sections(self, postables):
-        """Convert each section to output-code"""
+    def _convert_section_item(self, item, gcode_lines, converted_lines=None) -> None:
+        if converted_lines is not None:
+            # already converted by _convert_items_in_parallel()
+            if item.data.get("optimizable", None):
+                self._optimize_start = len(gcode_lines)
+            gcode_lines.extend(converted_lines)
+            return
 
-        job_sections = []
-        for section_name, sublist in postables:
-            gcode_lines = []
-            self._optimize_start = None
+        # for error context
+        if item.item_type == "operation":
+            self._operation = item.source
 
-            self._operation = None
-            self._convert_start_section(section_name, sublist)
+        self._convert_item_commands(item, gcode_lines)
 
-            for item in sublist:
-                # for error context
-                if item.item_type == "operation":
-                    self._operation = item.source
+        self._operation = None  # operation `item` is over
+
+    def _convert_section_lines(self, section_name, sublist, converted=None):
+        """Generator of the final G-code lines of a section, converted item by item.
+        converted has the lines of the items converted in parallel, or None.
+
+        The lines of the items before the {optimizable:True} item are passed as is,
+        the rest goes through the incremental filters of _make_gcode_filters(),
+        as _optimize_gcode() does for the complete section.
 
-                self._convert_item_commands(item, gcode_lines)
+        A postprocessor that overrides _optimize_gcode() gets the section
+        converted completely and then optimized by its _optimize_gcode().
+        """
+        self._optimize_start = None
+        self._operation = None
+        self._convert_start_section(section_name, sublist)
 
-                self._operation = None  # operation `item` is over
+        if converted is None:
+            converted = [None] * len(sublist)
 
+        if type(self)._optimize_gcode is not PostProcessor._optimize_gcode:
+            gcode_lines = []
+            for item, converted_lines in zip(sublist, converted):
+                self._convert_section_item(item, gcode_lines, converted_lines)
             # ===== STAGE 4: G-CODE OPTIMIZATION =====
-            gcode_string = self._optimize_gcode(gcode_lines)
+            yield from self._optimize_gcode(gcode_lines)
+            return
+
+        filters = None  # until the {optimizable:True} item
+        header_lines = False
+        for item, converted_lines in zip(sublist, converted):
+            gcode_lines = []
+            self._convert_section_item(item, gcode_lines, converted_lines)
+
+            if filters is None and self._optimize_start is not None:
+                filters = self._make_gcode_filters()
+                yield from gcode_lines[: self._optimize_start]
+                gcode_lines = gcode_lines[self._optimize_start :]
+
+            if filters is None:
+                header_lines = header_lines or bool(gcode_lines)
+                yield from gcode_lines
+            else:
+                # ===== STAGE 4: G-CODE OPTIMIZATION =====
+                yield from filter_gcode_lines(filters, gcode_lines)
+
+        if filters is not None:
+            yield from filter_gcode_lines(filters, [], final=True)
+        elif header_lines:
+            # not a user-level CAM error
+            raise AttributeError(
+                "Internal: expected self._optimize_start, set by an item w/ {optimizable:True}"
+            )
 
-            if gcode_string:
+    def _convert_job_sections(self, postables):
+        """Convert each section to output-code"""
+
+        with self._command_formatting():
+            return self._convert_compiled_job_sections(postables)
+
+    def _convert_compiled_job_sections(self, postables):
+        converted = self._convert_items_in_parallel(
+            postables, self.values.get("CONVERSION_WORKERS", 0)
+        )
+
+        job_sections = []
+        for section_index, (section_name, sublist) in enumerate(postables):
+            section_converted = None
+            if converted is not None:
+                section_converted = [
+                    converted.get((section_index, item_index)) for item_index in range(len(sublist))
+                ]
+            gcode_lines = list(
+                self._convert_section_lines(section_name, sublist, section_converted)
+            )
+
+            if gcode_lines:
                 # one place for end-of-line_chars
-                gcode_string = "\n".join(gcode_string)
+                gcode_string = "\n".join(gcode_lines)
                 line_ending = self.values.get("END_OF_LINE_CHARS", "\n")
                 if line_ending != "\n":
                     gcode_string = gcode_string.replace("\n", line_ending)
@@ -1994,6 +2340,145 @@ class PostProcessor:
 
         return job_sections
 
+    def _parallel_conversion_hooks(self):
+        """The overridden STATELESS_CONVERSION_HOOKS, None if the items can't be converted in parallel"""
+        stateless = set()
+        for name in self.CONVERSION_METHODS:
+            if getattr(type(self), name) is not getattr(PostProcessor, name):
+                if name in self.STATELESS_CONVERSION_HOOKS:
+                    stateless.add(name)
+                elif name not in self.MODAL_STATE_CONVERSION_HOOKS:
+                    return None
+        return stateless
+
+    def _advance_modal_state(self, command, modal_state, stateless_hooks) -> None:
+        """Change the modal_state as converting the command would, without converting it"""
+        command_name = command.Name
+        if command_name.startswith("("):
+            return
+
+        hook_name = self._conversion_hook_name(command_name)
+        if hook_name in stateless_hooks:
+            return
+
+        if hook_name in self.MODAL_STATE_CONVERSION_HOOKS:
+            # the override decides how the modal state changes, its G-code is dropped
+            saved_state = self._modal_state
+            self._modal_state = modal_state
+            try:
+                getattr(self, hook_name)(command)
+            finally:
+                self._modal_state = saved_state
+            return
+
+        for _ in self._output_parameters(command_name, command.Parameters, modal_state):
+            pass
+
+        if hook_name == "_convert_tool_change":
+            for key in modal_state:
+                modal_state[key] = None
+
+    def _convert_items(self, postables, indexes, modal_state) -> list:
+        """The G-code lines of each item at indexes [(section index, item index)],
+        converted one after another starting with the modal_state
+        """
+        self._modal_state = modal_state
+        item_lines = []
+        for section_index, item_index in indexes:
+            gcode_lines = []
+            self._convert_section_item(postables[section_index][1][item_index], gcode_lines)
+            item_lines.append(gcode_lines)
+        return item_lines
+
+    def _convert_items_in_parallel(self, postables, workers):
+        """Convert the items with commands in a pool of worker processes.
+
+        The modal state at the start of each batch of items is computed first,
+        with _advance_modal_state(), then the batches are converted independently.
+        The G-code is the same as converting the items one after another.
+
+        Returns {(section index, item index): lines}, or None if the items have
+        to be converted serially: less than 2 workers or batches, a postprocessor
+        with other conversion state (see CONVERSION_METHODS), no safe "fork" to share
+        the postables with the workers, or an error in a worker (the serial
+        conversion reports it with its context).
+
+        Forking is only safe without the threads of the GUI, and macOS lists
+        "fork" but does not support it with its system frameworks: the workers
+        are only used by headless runs on Linux.
+        """
+        if not workers or workers < 2:
+            return None
+
+        if not sys.platform.startswith("linux") or FreeCAD.GuiUp:
+            Path.Log.debug("Forking is only safe headless on Linux, converting serially")
+            return None
+
+        stateless_hooks = self._parallel_conversion_hooks()
+        if stateless_hooks is None:
+            Path.Log.debug("Conversion hooks are overridden, converting serially")
+            return None
+
+        if "fork" not in multiprocessing.get_all_start_methods():
+            Path.Log.debug("No fork start method, converting serially")
+            return None
+
+        batches = []
+        modal_state = dict(self._modal_state)
+        batch_state = dict(modal_state)
+        batch_indexes = []
+        batch_commands = 0
+        for section_index, (section_name, sublist) in enumerate(postables):
+            for item_index, item in enumerate(sublist):
+                if item.item_type == "str" or not item.path:
+                    continue  # converted serially
+
+                if batch_commands >= self.PARALLEL_BATCH_COMMANDS:
+                    batches.append((batch_state, batch_indexes))
+                    batch_state = dict(modal_state)
+                    batch_indexes = []
+                    batch_commands = 0
+
+                commands = item.path.Commands
+                for command in commands:
+                    self._advance_modal_state(command, modal_state, stateless_hooks)
+                batch_indexes.append((section_index, item_index))
+                batch_commands += len(commands)
+        if batch_indexes:
+            batches.append((batch_state, batch_indexes))
+
+        if len(batches) < 2:
+            return None
+
+        global _parallel_conversion
+        _parallel_conversion = (self, postables)
+        try:
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                results = list(pool.map(_convert_items_batch, batches))
+        except Exception as e:
+            Path.Log.debug(f"Parallel conversion failed, converting serially: {e}")
+            return None
+        finally:
+            _parallel_conversion = None
+
+        # as after the serial conversion
+        self._modal_state = modal_state
+
+        converted = {}
+        for (_, batch_indexes), item_lines in zip(batches, results):
+            converted.update(zip(batch_indexes, item_lines))
+        return converted
+
+    def _stream_job_sections(self, postables):
+        """Generator of (section_name, lines) of the sections with G-code, see export2_stream()"""
+        with self._command_formatting():
+            for section_name, sublist in postables:
+                lines = self._convert_section_lines(section_name, sublist)
+                first_line = next(lines, None)
+                if first_line is not None:
+                    yield section_name, chain([first_line], lines)
+
     def dump_sections(self, msg, sections):
         """Print the sections
         for development/debugging
@@ -2008,6 +2493,57 @@ class PostProcessor:
                     for i, c in enumerate(p.Path.Commands):
                         print(f"        [{i}] {c.toGCode()}")
 
+    @contextmanager
+    def _timed_stage(self, stage):
+        """Add the seconds of the block to stage_times[stage]"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_times[stage] = self.stage_times.get(stage, 0.0) + (
+                time.perf_counter() - start
+            )
+
+    def _prepare_postables(self):
+        """Stages 0 to 2 of export2(): the postables with their commands expanded,
+        None if the pre-processing dialog was cancelled.
+        """
+        self.stage_times = {}
+
+        # ===== STAGE 0: PRE-PROCESSING DIALOG =====
+        if not self.pre_processing_dialog():
+            Path.Log.info("Pre-processing dialog cancelled - aborting export")
+            return None
+
+        if not getattr(self, "_bundle_applied", False):
+            with self._timed_stage("configuration"):
+                self.apply_configuration_bundle()
+
+        # ===== STAGE 1: ORDERING =====
+        with self._timed_stage("ordering"):
+            postables = self._buildPostList()
+            self._expand_postprocessor_commands(postables)
+
+        # ===== STAGE 2: COMMAND EXPANSION =====
+        with self._timed_stage("expansion"):
+            self._expand_prefix(postables)
+            # postables = self._expand_pre_job(postables) # FIXME: need an item for a job, handled by _expand_prefix for now
+            postables = self._expand_pre_item(postables)
+
+            # drill cycles, canned cycles, split arcs, ... tool length offset
+            self._expand_commands(postables)
+
+            postables = self._expand_post_item(postables)
+            self._expand_trailing_lines(postables)
+            self._expand_tool_change(postables)
+            self._expand_rotary_move(postables)
+
+            # must be last
+            self._expand_bcnc_postamble(postables)
+
+        Path.Log.debug(postables)
+        return postables
+
     def export2(self) -> Union[None, GCodeSections]:
         """
         Process jobs through all postprocessing stages to produce final G-code.
@@ -2022,52 +2558,21 @@ class PostProcessor:
         4. G-code Optimization - Deduplication, line numbering
         5. Output Production - Assemble final structure
         6. Remote Posting - Post-processing network operations
+
+        The seconds of stages 1, 2, 3 (with 4) and 6 are kept in stage_times.
         """
         Path.Log.debug("Starting export2()")
 
-        # ===== STAGE 0: PRE-PROCESSING DIALOG =====
-        if not self.pre_processing_dialog():
-            Path.Log.info("Pre-processing dialog cancelled - aborting export")
+        postables = self._prepare_postables()
+        if postables is None:
             return None
-
-        if not getattr(self, "_bundle_applied", False):
-            self.apply_configuration_bundle()
-
-        # ===== STAGE 1: ORDERING =====
         all_job_sections = []
-        postables = self._buildPostList()
-        self._expand_postprocessor_commands(postables)
-
-        # ===== STAGE 2: COMMAND EXPANSION =====
-
-        self._expand_prefix(postables)
-        # postables = self._expand_pre_job(postables) # FIXME: need an item for a job, handled by _expand_prefix for now
-        postables = self._expand_pre_item(postables)
-
-        self._expand_translate_drill_cycles(postables)
-        self._expand_canned_cycles(postables)
-        self._expand_split_arcs(postables)
-        self._expand_spindle_wait(postables)
-        self._expand_coolant_delay(postables)
-        self._expand_translate_rapids(postables)
-        self._expand_xy_before_z(postables)
-        self._expand_bcnc_commands(postables)
-        self._expand_tool_length_offset(postables)
-
-        postables = self._expand_post_item(postables)
-        self._expand_trailing_lines(postables)
-        self._expand_tool_change(postables)
-        self._expand_rotary_move(postables)
-
-        # must be last
-        self._expand_bcnc_postamble(postables)
-
-        Path.Log.debug(postables)
 
         # ===== STAGE 3: COMMAND CONVERSION =====
 
         # convert postables to machine-specific gcode
-        job_sections = self._convert_job_sections(postables)
+        with self._timed_stage("conversion"):
+            job_sections = self._convert_job_sections(postables)
 
         all_job_sections.extend(job_sections)
 
@@ -2078,7 +2583,8 @@ class PostProcessor:
 
         # ===== STAGE 6: REMOTE POSTING =====
         try:
-            self.remote_post(all_job_sections)
+            with self._timed_stage("remote_post"):
+                self.remote_post(all_job_sections)
         except Exception as e:
             # Our output still might be interesting, so continue
             # FIXME: can we make the user notice this situation?
@@ -2086,6 +2592,59 @@ class PostProcessor:
 
         return all_job_sections
 
+    def export2_stream(self) -> Union[None, GCodeSectionStream]:
+        """Like export2(), but the G-code of each section is produced while it is read.
+
+        Returns None if the pre-processing dialog was cancelled, otherwise a
+        generator of (section_name, lines), sections without G-code are skipped.
+        The lines are without end-of-line characters, and they are converted
+        and optimized operation by operation, thus the G-code of a job is never
+        held in memory completely. The lines of a section must be read before
+        the next section.
+
+        The items are converted one after another, CONVERSION_WORKERS is not used.
+        remote_post() is not called, it needs the complete G-code.
+        """
+        Path.Log.debug("Starting export2_stream()")
+
+        postables = self._prepare_postables()
+        if postables is None:
+            return None
+
+        # ===== STAGES 3 and 4: COMMAND CONVERSION, G-CODE OPTIMIZATION =====
+        return self._stream_job_sections(postables)
+
+    def export2_to_files(self, filename_for_section, buffer_lines=10000) -> Union[None, list]:
+        """Write the G-code of each section to a file while it is produced, see export2_stream().
+
+        filename_for_section(section_name) returns the name of the file of a section.
+        The lines are written in batches of buffer_lines, with the END_OF_LINE_CHARS.
+        Returns None if the pre-processing dialog was cancelled, otherwise
+        a list of (section_name, filename).
+        """
+        sections = self.export2_stream()
+        if sections is None:
+            return None
+
+        line_ending = self.values.get("END_OF_LINE_CHARS", "\n")
+        # don't translate explicit line endings, see Command._write_file
+        newline = None if line_ending == "\n" else ""
+        written = []
+        for section_name, lines in sections:
+            filename = filename_for_section(section_name)
+            with open(filename, "w", newline=newline) as f:
+                separator = ""
+                batch = list(islice(lines, buffer_lines))
+                while batch:
+                    f.write(separator)
+                    f.write(line_ending.join(batch))
+                    separator = line_ending
+                    batch = list(islice(lines, buffer_lines))
+            Path.Log.debug(f"Wrote section {section_name} to {filename}")
+            written.append((section_name, filename))
+
+        return written
+
     def export(self) -> Union[None, GCodeSections]:
         """Process the parser arguments, then postprocess the 'postables'."""
         args: ParserArgs
@@ -2349,6 +2908,15 @@ class PostProcessor:
             "squawkIcon": f"{FreeCAD.getHomePath()}Mod/CAM/Path/Main/Sanity/{icon_map.get(squawk_type, 'Sanity_Note')}.svg",
         }
 
+    @contextmanager
+    def _command_formatting(self):
+        """Compile the _CommandFormatter of the current .values for the conversions in the block"""
+        self._command_formatter = _CommandFormatter(self)
+        try:
+            yield
+        finally:
+            self._command_formatter = None
+
     def convert_command_to_gcode(self, command: Path.Command) -> str:
         """
         Converts a single-line command to gcode.
@@ -2385,11 +2953,20 @@ class PostProcessor:
                 return super()._convert_drill_cycle(command)
         """
 
+        formatter = self._command_formatter
+        if formatter is None:
+            # outside of an export: compiled once for this call and the nested ones
+            with self._command_formatting():
+                return PostProcessor.convert_command_to_gcode(self, command)
+        command_name = command.Name
+
+        # Dispatch table of the supported commands
+        hook = formatter.hooks.get(command_name)
+        if hook is not None:
+            return hook(command)
+
         # Validate command is supported
-        supported = self.values.get(
-            "SUPPORTED_COMMANDS",
-            Constants.GCODE_SUPPORTED + Constants.GCODE_FIXTURES + Constants.MCODE_SUPPORTED,
-        )
+        supported = formatter.supported
         if (
             command.Name not in supported
             and not command.Name.startswith("(")
@@ -2405,7 +2982,6 @@ class PostProcessor:
             )
 
         # Dispatch to appropriate hook method based on command type
-        command_name = command.Name
 
         # Comments
         if command_name.startswith("("):
@@ -2420,49 +2996,58 @@ class PostProcessor:
             # drop None/""
             return "\n".join(s for s in gcode if s)
 
+        if command_name in supported:
+            return formatter.add_hook(command_name)(command)
+
+        return getattr(self, self._conversion_hook_name(command_name))(command)
+
+    @staticmethod
+    def _conversion_hook_name(command_name):
+        """The name of the _convert_*() hook method for a (non-comment) command name"""
+
         # Rapid moves
         if command_name in Constants.GCODE_MOVE_RAPID:
-            return self._convert_rapid_move(command)
+            return "_convert_rapid_move"
 
         # Linear moves
         if command_name in Constants.GCODE_MOVE_STRAIGHT:
-            return self._convert_linear_move(command)
+            return "_convert_linear_move"
 
         # Arc moves
         if command_name in Constants.GCODE_MOVE_ARC:
-            return self._convert_arc_move(command)
+            return "_convert_arc_move"
 
         # Drill cycles
         if command_name in Constants.GCODE_MOVE_DRILL + Constants.GCODE_DRILL_EXTENDED:
-            return self._convert_drill_cycle(command)
+            return "_convert_drill_cycle"
 
         # Probe
         if command_name in Constants.GCODE_PROBE:
-            return self._convert_probe(command)
+            return "_convert_probe"
 
         # Dwell
         if command_name in Constants.GCODE_DWELL:
-            return self._convert_dwell(command)
+            return "_convert_dwell"
 
         # Tool change
         if command_name in Constants.MCODE_TOOL_CHANGE:
-            return self._convert_tool_change(command)
+            return "_convert_tool_change"
 
         # Spindle control
         if command_name in Constants.MCODE_SPINDLE_ON + Constants.MCODE_SPINDLE_OFF:
-            return self._convert_spindle_command(command)
+            return "_convert_spindle_command"
 
         # Coolant control
         if command_name in Constants.MCODE_COOLANT:
-            return self._convert_coolant_command(command)
+            return "_convert_coolant_command"
 
         # Program control
         if command_name in Constants.MCODE_STOP + Constants.MCODE_OPTIONAL_STOP:
-            return self._convert_program_control(command)
+            return "_convert_program_control"
 
         # Fixtures
         if command_name in Constants.GCODE_FIXTURES:
-            return self._convert_fixture(command)
+            return "_convert_fixture"
 
         # Modal commands (G43, G80, G90, G91, G92, G93, G94, G95, G96, G97, G98, G99, etc.)
         if (
@@ -2478,10 +3063,10 @@ class PostProcessor:
             + Constants.GCODE_SPINDLE_RPM
             + Constants.GCODE_RETURN_MODE
         ):
-            return self._convert_modal_command(command)
+            return "_convert_modal_command"
 
         # Fallback for any unhandled commands
-        return self._convert_generic_command(command)
+        return "_convert_generic_command"
 
     def _convert_comment(self, command: Path.Command) -> str:
         """
@@ -2529,77 +3114,12 @@ class PostProcessor:
             return f"{block_delete_string}{comment_symbol} {comment_text}"  # FIXME: no extra space
 
     def format_parameter(self, param_name, value):
-
-        def _convert_axis_param(value):
-            # Apply unit conversion based on machine units setting
-            is_imperial = self.values["OUTPUT_UNITS"] == OutputUnits.IMPERIAL
-
-            if is_imperial:
-                converted_value = value / 25.4  # Convert mm to inches
-            else:
-                converted_value = value  # Keep as mm
-            return converted_value
-
-        def format_axis_param(value):
-            """Format axis parameter with unit conversion and precision."""
-
-            converted_value = _convert_axis_param(value)
-            precision = self.values["AXIS_PRECISION"]
-            return f"{converted_value:.{precision}f}"
-
-        def format_feed_param(value):
-            """Format feed parameter with speed precision and unit conversion."""
-            # Convert from mm/sec to mm/min (multiply by 60)
-            feed_value = value * 60.0
-            feed_value = _convert_axis_param(feed_value)
-            precision = self.values["FEED_PRECISION"]
-            return f"{feed_value:.{precision}f}"
-
-        def format_spindle_param(value):
-            """Format spindle parameter with spindle decimals."""
-            decimals = self.values["SPINDLE_DECIMALS"]
-            if decimals is None:
-                decimals = 0
-            return f"{value:.{decimals}f}"
-
-        def format_int_param(value):
-            """Format integer parameter."""
-            return str(int(value))
-
-        # Parameter type mappings
-        param_formatters = {
-            # Axis parameters
-            "X": format_axis_param,
-            "Y": format_axis_param,
-            "Z": format_axis_param,
-            "U": format_axis_param,
-            "V": format_axis_param,
-            "W": format_axis_param,
-            "A": format_axis_param,
-            "B": format_axis_param,
-            "C": format_axis_param,
-            # Arc parameters
-            "I": format_axis_param,
-            "J": format_axis_param,
-            "K": format_axis_param,
-            "R": format_axis_param,
-            "Q": format_axis_param,
-            # Feed and spindle
-            "F": format_feed_param,
-            "S": format_spindle_param,
-            # P parameter - use axis formatting to support decimal values (e.g., G4 P2.5)
-            "P": format_axis_param,
-            # Integer parameters
-            "D": format_int_param,
-            "H": format_int_param,
-            "L": format_int_param,
-            "T": format_int_param,
-        }
-        if param_name in param_formatters:
-            return param_formatters[param_name](value)
-        else:
-            # Default formatting for unhandled parameters
-            return f"{param_name}{value}"
+        """Format the value of a parameter, with the precision and units of the output"""
+        formatter = self._command_formatter or _CommandFormatter(self)
+        format_param = formatter.base_parameter_formatters.get(param_name)
+        if format_param is None:
+            return _format_unknown_parameter(param_name, value)
+        return format_param(value)
 
     def _convert_move(self, command: Path.Command) -> str:
         """
@@ -2607,7 +3127,11 @@ class PostProcessor:
 
         This method can be overridden by derived postprocessors to customize rapid move handling.
         """
-        from Path.Post.UtilsParse import format_command_line
+        formatter = self._command_formatter
+        if formatter is None:
+            with self._command_formatting():
+                return PostProcessor._convert_move(self, command)
+        parameter_formatters = formatter.parameter_formatters
 
         # Extract command components
         command_name = command.Name
@@ -2621,35 +3145,11 @@ class PostProcessor:
         command_line = []
         command_line.append(command_name)
 
-        # Format parameters with clean, stateless implementation
-        parameter_order = self.values.get(
-            "PARAMETER_ORDER",
-            # FIXME: dry
-            ["X", "Y", "Z", "A", "B", "C", "F", "I", "J", "K", "R", "Q", "P", "S", "T"],
-        )
-
-        for parameter in parameter_order:
-            if parameter in params:
-                # Check if we should suppress duplicate parameters
-                current_value = params[parameter]
-                if not self.values["OUTPUT_DOUBLES"]:
-                    # Suppress parameters that haven't changed
-                    if (
-                        parameter in self._modal_state
-                        and self._modal_state[parameter] == current_value
-                    ):
-                        continue  # Skip this parameter
-                elif (
-                    parameter == "F"
-                    and command_name in Constants.GCODE_MOVE_RAPID
-                    and (not self.values["F_FOR_RAPID_MOVES"] or current_value == 0.0)
-                ):
-                    continue  # no F for G0, or the F is 0.0 which should be skipped too
-
-                formatted_value = self.format_parameter(parameter, current_value)
-                command_line.append(f"{parameter}{formatted_value}")
-
-                self._modal_state[parameter] = params[parameter]
+        for parameter, current_value in self._output_parameters(
+            command_name, params, self._modal_state
+        ):
+            formatted_value = parameter_formatters[parameter](current_value)
+            command_line.append(f"{parameter}{formatted_value}")
 
         # Suppress commands where all parameters were removed by duplicate suppression
         # or parameter_order exclusion (e.g., Z suppression for wire EDM).
@@ -2658,13 +3158,37 @@ class PostProcessor:
             return None
 
         # Format the command line
-        formatted_line = format_command_line(self.values, command_line)
+        formatted_line = formatter.command_space.join(command_line)
 
         # Combine block delete and formatted command (no line numbers)
         gcode_string = f"{block_delete_string}{formatted_line}"
 
         return gcode_string
 
+    def _output_parameters(self, command_name, params, modal_state):
+        """Generator of the (parameter, value) of a command that are output, in order.
+        Updates the modal_state with them.
+        """
+        formatter = self._command_formatter or _CommandFormatter(self)
+
+        for parameter in formatter.parameter_order:
+            if parameter in params:
+                # Check if we should suppress duplicate parameters
+                current_value = params[parameter]
+                if not formatter.output_doubles:
+                    # Suppress parameters that haven't changed
+                    if parameter in modal_state and modal_state[parameter] == current_value:
+                        continue  # Skip this parameter
+                elif (
+                    parameter == "F"
+                    and command_name in Constants.GCODE_MOVE_RAPID
+                    and (not formatter.f_for_rapid_moves or current_value == 0.0)
+                ):
+                    continue  # no F for G0, or the F is 0.0 which should be skipped too
+
+                modal_state[parameter] = current_value
+                yield parameter, current_value
+
     def _convert_rapid_move(self, command: Path.Command) -> str:
         """
         Converts a rapid move command to gcode.
@@ -385,49 +385,61 @@ def splitArcs(path, deflection=None):
     if not isinstance(path, Path.Path):
         raise TypeError("path must be a Path object")
 
+    return Path.Path(list(splitArcCommands(path.Commands, deflection)))
+
+
+def splitArcCommands(commands, deflection=None):
+    """Generator of commands with all G2/G3 moves replaced by discrete G1 moves.
+
+    The streaming form of splitArcs(), for an iterable of Path.Command.
+    """
     if not deflection:
         prefGrp = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/CAM")
         deflection = prefGrp.GetFloat("LibAreaCurveAccuracy", 0.01) or 0.01
 
-    results = []
     machine = MachineState()
 
-    for command in path.Commands:
+    for command in commands:
         if command.Name not in Path.Geom.CmdMoveArc:
-            results.append(command)
+            machine.addCommand(command)
+            yield command
         else:
             # Discretize arc into line segments
             edge = Path.Geom.edgeForCmd(command, machine.getPosition())
             pts = edge.discretize(Deflection=deflection)
+            machine.addCommand(command)
 
             # Convert points directly to G1 commands
             feed_params = {"F": command.Parameters["F"]} if "F" in command.Parameters else {}
             for pt in pts[1:]:  # Skip first point (already at that position)
                 params = {"X": pt.x, "Y": pt.y, "Z": pt.z}
                 params.update(feed_params)
-                results.append(Path.Command("G1", params))
-
-        machine.addCommand(command)
-
-    return Path.Path(results)
+                yield Path.Command("G1", params)
 
 
 def cannedCycleTerminator(path):
     """iterate through a Path object and insert G80 commands to terminate canned cycles at the correct time"""
+    return Path.Path(list(terminateCannedCycles(path.Commands)))
+
+
+def terminateCannedCycles(commands):
+    """Generator of commands with G80 inserted to terminate canned cycles at the correct time.
 
+    The streaming form of cannedCycleTerminator(), for an iterable of Path.Command.
+    Commands without a canned cycle pass through unchanged.
+    """
     # Canned cycles terminate if any parameter change other than XY coordinates.
     # - if Z depth changes
     # - if feed rate changes
     # - if retract plane changes
     # - if retract mode (G98/G99) changes
 
-    result = []
     cycle_active = False
     last_cycle_params = {}
     last_retract_mode = None
     explicit_retract_mode_set = False
 
-    for command in path.Commands:
+    for command in commands:
         if (
             command.Name == "G80"
         ):  # This shouldn't happen because cycle generators shouldn't be inserting it. Be safe anyway.
@@ -436,16 +448,16 @@ def cannedCycleTerminator(path):
             cycle_active = False
             last_retract_mode = None
             explicit_retract_mode_set = False
-            result.append(command)
+            yield command
         elif command.Name in ["G98", "G99"]:
             # Explicit retract mode in the path - track it
             if cycle_active and last_retract_mode and command.Name != last_retract_mode:
                 # Mode changed while cycle active - terminate
-                result.append(Path.Command("G80"))
+                yield Path.Command("G80")
                 cycle_active = False
             last_retract_mode = command.Name
             explicit_retract_mode_set = True
-            result.append(command)
+            yield command
         elif command.Name in CmdMoveDrill:
             # Check if this cycle has different parameters than the last one
             current_params = {k: v for k, v in command.Parameters.items() if k not in ["X", "Y"]}
@@ -458,7 +470,7 @@ def cannedCycleTerminator(path):
                 current_params != last_cycle_params or current_retract_mode != last_retract_mode
             ):
                 # Parameters or retract mode changed, terminate previous cycle
-                result.append(Path.Command("G80"))
+                yield Path.Command("G80")
                 cycle_active = False
                 explicit_retract_mode_set = False
 
@@ -467,10 +479,10 @@ def cannedCycleTerminator(path):
             if (
                 not cycle_active or current_retract_mode != last_retract_mode
             ) and not explicit_retract_mode_set:
-                result.append(Path.Command(current_retract_mode))
+                yield Path.Command(current_retract_mode)
 
             # Add the cycle command
-            result.append(command)
+            yield command
             cycle_active = True
             last_cycle_params = current_params
             last_retract_mode = current_retract_mode
@@ -479,14 +491,12 @@ def cannedCycleTerminator(path):
             # Non-cycle command (not G80 or drill cycle)
             if cycle_active:
                 # Terminate active cycle
-                result.append(Path.Command("G80"))
+                yield Path.Command("G80")
                 cycle_active = False
                 last_retract_mode = None
             explicit_retract_mode_set = False
-            result.append(command)
+            yield command
 
     # If cycle is still active at the end, terminate it
     if cycle_active:
-        result.append(Path.Command("G80"))
-
-    return Path.Path(result)
+        yield Path.Command("G80")
@@ -505,6 +505,11 @@ def init_shared_values(values: Values) -> None:
     #
     values["COMMENT_SYMBOL"] = "("
     #
+    # The number of worker processes that convert the operations to G-code
+    # in parallel.  0 or 1 converts them one after another.
+    #
+    values["CONVERSION_WORKERS"] = 0
+    #
     # Default axis precision for metric is 3 digits after the decimal point.
     # (see http://linuxcnc.org/docs/2.7/html/gcode/overview.html#_g_code_best_practices)
     #
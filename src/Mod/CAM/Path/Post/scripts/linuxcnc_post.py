@@ -62,6 +62,10 @@ class Linuxcnc(PostProcessor):
     - Blend (G64)
     """
 
+    # the rigid tapping of _convert_drill_cycle() and _convert_modal_command() skips the
+    # modal state, they are called again for the modal state of the parallel conversion
+    MODAL_STATE_CONVERSION_HOOKS = ("_convert_drill_cycle", "_convert_modal_command")
+
     @classmethod
     def get_common_property_schema(cls):
         """Override common properties with LinuxCNC-specific defaults."""
@@ -59,6 +59,10 @@ class Marlin(PostProcessor):
     machine configuration.
     """
 
+    # _convert_dwell() doesn't use the modal state, thus the operations can be
+    # converted in parallel
+    STATELESS_CONVERSION_HOOKS = ("_convert_dwell",)
+
     @classmethod
     def get_common_property_schema(cls):
         """Override common properties with Marlin-specific defaults."""
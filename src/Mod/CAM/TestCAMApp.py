@@ -76,6 +76,7 @@ from CAMTests.TestPostOutput import (
     TestFileNameGenerator,
     TestExport2Integration,
 )
+from CAMTests.TestPostBenchmark import TestPostBenchmark
 
 from CAMTests.TestPathCustom import TestPathCustomConverted
 from CAMTests.TestPathPreferences import TestPathPreferences
@@ -162,5 +163,6 @@ from CAMTests.TestGcodeProcessingUtils import (
     TestFilterInefficientMoves,
     TestNumberGenerator,
     TestDeduplicateRepeatedCommands,
+    TestFilterGcodeLines,
 )
 from CAMTests.TestPathDressupArray import TestDressupArray
@@ -2767,6 +2767,49 @@ void FemMesh::addGroupElements(int GroupId, const std::set<int>& ElementIds)
     }
 }
 
+void FemMesh::addNodes(const std::vector<int>& ids, const std::vector<double>& coords)
+{
+    if (coords.size() != 3 * ids.size()) {
+        throw std::runtime_error("addNodes: Three coordinates per node are needed.");
+    }
+    SMESHDS_Mesh* meshDS = this->myMesh->GetMeshDS();
+    for (std::size_t i = 0; i < ids.size(); ++i) {
+        if (!meshDS->AddNodeWithID(coords[3 * i], coords[3 * i + 1], coords[3 * i + 2], ids[i])) {
+            throw std::runtime_error("addNodes: Failed to add node " + std::to_string(ids[i]));
+        }
+    }
+}
+
+void FemMesh::addElements(
+    SMDSAbs_ElementType type,
+    const std::vector<int>& ids,
+    const std::vector<int>& nodes,
+    int nodesPerElement
+)
+{
+    if (nodesPerElement < 1
+        || nodes.size() != ids.size() * static_cast<std::size_t>(nodesPerElement)) {
+        throw std::runtime_error("addElements: Node count does not match the element count.");
+    }
+    SMESHDS_Mesh* meshDS = this->myMesh->GetMeshDS();
+    SMESH_MeshEditor editor(this->myMesh);
+    SMESH_MeshEditor::ElemFeatures elemFeat(type);
+    std::vector<const SMDS_MeshNode*> elemNodes(nodesPerElement);
+    auto nodeIt = nodes.begin();
+    for (int id : ids) {
+        for (auto& node : elemNodes) {
+            node = meshDS->FindNode(*nodeIt++);
+            if (!node) {
+                throw std::runtime_error("addElements: Failed to get node of the given indices.");
+            }
+        }
+        elemFeat.SetID(id);
+        if (!editor.AddElement(elemNodes, elemFeat)) {
+            throw std::runtime_error("addElements: Failed to add element " + std::to_string(id));
+        }
+    }
+}
+
 bool FemMesh::removeGroup(int GroupId)
 {
     return this->getSMesh()->RemoveGroup(GroupId);
@@ -185,6 +185,19 @@ public:
     void renameGroup(int id, const std::string& name);
     //@}
 
+    /** @name Bulk insertion */
+    //@{
+    /// Adds nodes with the given ids, coords holds x, y and z of each node
+    void addNodes(const std::vector<int>& ids, const std::vector<double>& coords);
+    /// Adds elements of one type, nodes holds the nodesPerElement node ids of each element
+    void addElements(
+        SMDSAbs_ElementType type,
+        const std::vector<int>& ids,
+        const std::vector<int>& nodes,
+        int nodesPerElement
+    );
+    //@}
+
 
     struct FemMeshInfo
     {
@@ -89,6 +89,27 @@ class FemMesh(ComplexGeoData):
         """Add list of volumes by list of node indices and list of nodes per volume."""
         ...
 
+    def addNodes(self, ids: Any, coordinates: Any, /) -> None:
+        """
+        Add nodes in bulk
+
+        ids: buffer of n int, e.g. a NumPy integer array
+        coordinates: buffer of n x 3 float, e.g. a NumPy float array of shape (n, 3)
+        """
+        ...
+
+    def addElements(self, element_type: str, ids: Any, nodes: Any, /) -> None:
+        """
+        Add elements of one type in bulk
+
+        element_type: "Edge", "Face" or "Volume"
+        ids: buffer of n int, e.g. a NumPy integer array
+        nodes: buffer of n x k int, e.g. a NumPy integer array of shape (n, k)
+            The k node ids of each element, in the node order of addVolume,
+            addFace and addEdge.
+        """
+        ...
+
     def read(self, file_name: str, vtk_cell_group_array: str) -> None:
         """
         Read in a various FEM mesh file formats.
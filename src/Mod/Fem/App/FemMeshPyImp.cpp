@@ -33,6 +33,7 @@
 #include <TopoDS_Shape.hxx>
 #include <algorithm>
 #include <stdexcept>
+#include <type_traits>
 
 
 #include "Mod/Fem/App/FemMesh.h"
@@ -1118,6 +1119,167 @@ PyObject* FemMeshPy::addVolumeList(PyObject* args)
 }
 
 
+namespace
+{
+
+std::map<std::string, SMDSAbs_ElementType> bulkElementTypePyMap = {
+    {"Edge", SMDSAbs_Edge},
+    {"Face", SMDSAbs_Face},
+    {"Volume", SMDSAbs_Volume}
+};
+
+template<typename S, typename T>
+void copyBufferItems(const void* buf, std::vector<T>& items)
+{
+    const S* src = static_cast<const S*>(buf);
+    std::transform(src, src + items.size(), items.begin(), [](S item) {
+        return static_cast<T>(item);
+    });
+}
+
+// Copies the items of a C contiguous buffer of native byte order, e.g. a NumPy array.
+// Integer items are accepted for both item types, floating point items only for double.
+template<typename T>
+bool getBufferItems(PyObject* obj, std::vector<T>& items, std::vector<Py_ssize_t>& shape)
+{
+    Py_buffer buf;
+    if (PyObject_GetBuffer(obj, &buf, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0) {
+        return false;
+    }
+
+    std::string format(buf.format ? buf.format : "B");
+    if (format.size() == 2 && (format[0] == '@' || format[0] == '=')) {
+        format.erase(0, 1);
+    }
+    items.resize(buf.itemsize > 0 ? buf.len / buf.itemsize : 0);
+    shape.assign(buf.shape, buf.shape + buf.ndim);
+
+    bool valid = format.size() == 1;
+    switch (valid ? format[0] : ' ') {
+        case 'b':
+            copyBufferItems<signed char>(buf.buf, items);
+            break;
+        case 'B':
+            copyBufferItems<unsigned char>(buf.buf, items);
+            break;
+        case 'h':
+            copyBufferItems<short>(buf.buf, items);
+            break;
+        case 'H':
+            copyBufferItems<unsigned short>(buf.buf, items);
+            break;
+        case 'i':
+            copyBufferItems<int>(buf.buf, items);
+            break;
+        case 'I':
+            copyBufferItems<unsigned int>(buf.buf, items);
+            break;
+        case 'l':
+            copyBufferItems<long>(buf.buf, items);
+            break;
+        case 'L':
+            copyBufferItems<unsigned long>(buf.buf, items);
+            break;
+        case 'q':
+            copyBufferItems<long long>(buf.buf, items);
+            break;
+        case 'Q':
+            copyBufferItems<unsigned long long>(buf.buf, items);
+            break;
+        case 'f':
+            valid = std::is_floating_point_v<T>;
+            if (valid) {
+                copyBufferItems<float>(buf.buf, items);
+            }
+            break;
+        case 'd':
+            valid = std::is_floating_point_v<T>;
+            if (valid) {
+                copyBufferItems<double>(buf.buf, items);
+            }
+            break;
+        default:
+            valid = false;
+    }
+    PyBuffer_Release(&buf);
+
+    if (!valid) {
+        PyErr_Format(
+            PyExc_TypeError,
+            "Buffer of unsupported item format '%s', %s items are needed",
+            format.c_str(),
+            std::is_floating_point_v<T> ? "number" : "integer"
+        );
+    }
+    return valid;
+}
+
+}  // namespace
+
+PyObject* FemMeshPy::addNodes(PyObject* args)
+{
+    PyObject* idsObj = nullptr;
+    PyObject* coordsObj = nullptr;
+    if (!PyArg_ParseTuple(args, "OO", &idsObj, &coordsObj)) {
+        return nullptr;
+    }
+
+    std::vector<int> ids;
+    std::vector<double> coords;
+    std::vector<Py_ssize_t> shape;
+    if (!getBufferItems(idsObj, ids, shape) || !getBufferItems(coordsObj, coords, shape)) {
+        return nullptr;
+    }
+
+    try {
+        getFemMeshPtr()->addNodes(ids, coords);
+    }
+    catch (const std::exception& e) {
+        PyErr_SetString(Base::PyExc_FC_GeneralError, e.what());
+        return nullptr;
+    }
+    Py_Return;
+}
+
+PyObject* FemMeshPy::addElements(PyObject* args)
+{
+    char* typeString = nullptr;
+    PyObject* idsObj = nullptr;
+    PyObject* nodesObj = nullptr;
+    if (!PyArg_ParseTuple(args, "sOO", &typeString, &idsObj, &nodesObj)) {
+        return nullptr;
+    }
+
+    auto type = bulkElementTypePyMap.find(typeString);
+    if (type == bulkElementTypePyMap.end()) {
+        PyErr_SetString(PyExc_ValueError, "Invalid element type, Edge, Face or Volume are allowed");
+        return nullptr;
+    }
+
+    std::vector<int> ids;
+    std::vector<int> nodes;
+    std::vector<Py_ssize_t> shape;
+    if (!getBufferItems(idsObj, ids, shape) || !getBufferItems(nodesObj, nodes, shape)) {
+        return nullptr;
+    }
+    if (shape.size() != 2) {
+        PyErr_SetString(
+            PyExc_ValueError,
+            "Element nodes of shape (elements, nodes per element) are needed"
+        );
+        return nullptr;
+    }
+
+    try {
+        getFemMeshPtr()->addElements(type->second, ids, nodes, static_cast<int>(shape[1]));
+    }
+    catch (const std::exception& e) {
+        PyErr_SetString(Base::PyExc_FC_GeneralError, e.what());
+        return nullptr;
+    }
+    Py_Return;
+}
+
 PyObject* FemMeshPy::copy(PyObject* args) const
 {
     if (!PyArg_ParseTuple(args, "")) {
@@ -105,6 +105,11 @@ FreeCAD.addTranslatableExportType(
 
 FreeCAD.addImportType("FEM result Z88 displacements (*.txt *.TXT)", "feminout.importZ88O2Results")
 
+FreeCAD.addImportType("FEM result XDMF (*.xdmf *.XDMF)", "feminout.importXDMFResults")
+FreeCAD.addTranslatableExportType(
+    translate("FileFormat", "FEM result XDMF"), ["xdmf"], "feminout.importXDMFResults"
+)
+
 if "BUILD_FEM_VTK" in FreeCAD.__cmake__:
     FreeCAD.addImportType(
         "FEM result VTK (*.vtk *.VTK *.vtu *.VTU *.pvtu *.PVTU *.vtm *.VTM *.pvd *.PVD)",
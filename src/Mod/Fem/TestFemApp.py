@@ -39,6 +39,8 @@ from femtest.app.test_solver_elmer import TestSolverElmer as FemTest13
 from femtest.app.test_solver_z88 import TestSolverZ88 as FemTest14
 from femtest.app.test_gmsh import TestGMSHTransfinite as FemTest15
 from femtest.app.test_gmsh import TestGMSHRefinements as FemTest16
+from femtest.app.test_gmsh import TestGMSHPythonApi as FemTest17
+from femtest.app.test_solver_sweep import TestSolverSweep as FemTest18
 
 # dummy usage to get flake8 and lgtm quiet
 False if FemTest01.__name__ else True
@@ -56,3 +58,5 @@ False if FemTest13.__name__ else True
 False if FemTest14.__name__ else True
 False if FemTest15.__name__ else True
 False if FemTest16.__name__ else True
+False if FemTest17.__name__ else True
+False if FemTest18.__name__ else True
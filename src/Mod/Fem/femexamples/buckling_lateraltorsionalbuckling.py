@@ -176,9 +176,7 @@ def setup(doc=None, solvertype="ccxtools"):
     analysis.addObject(con_force_rev_x)
 
     # mesh
-    from .meshes.mesh_buckling_ibeam_tria6 import create_nodes, create_elements
-
-    fem_mesh = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+    fem_mesh = generate_mesh.mesh_from_file("mesh_buckling_ibeam_tria6")
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Shape = geom_obj
@@ -120,9 +120,7 @@ def setup_cantilever_base_edge(doc=None, solvertype="ccxtools"):
     analysis.addObject(con_force)
 
     # mesh
-    from .meshes.mesh_canticcx_seg3 import create_nodes, create_elements
-
-    fem_mesh = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+    fem_mesh = generate_mesh.mesh_from_file("mesh_canticcx_seg3")
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Shape = geom_obj
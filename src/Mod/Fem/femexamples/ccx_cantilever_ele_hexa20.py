@@ -83,9 +83,7 @@ def setup(doc=None, solvertype="ccxtools", test_mode=False):
     doc.recompute()
 
     # load the hexa20 mesh
-    from .meshes.mesh_canticcx_hexa20 import create_nodes, create_elements
-
-    fem_mesh = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+    fem_mesh = generate_mesh.mesh_from_file("mesh_canticcx_hexa20")
     femmesh_obj.FemMesh = fem_mesh
 
     doc.recompute()
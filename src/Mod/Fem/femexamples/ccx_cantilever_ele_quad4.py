@@ -79,9 +79,7 @@ def setup(doc=None, solvertype="ccxtools"):
     geom_obj = doc.getObject("CanileverPlate")
 
     # load the quad4 mesh
-    from .meshes.mesh_canticcx_quad4 import create_nodes, create_elements
-
-    fem_mesh = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+    fem_mesh = generate_mesh.mesh_from_file("mesh_canticcx_quad4")
 
     # overwrite mesh with the quad4 mesh
     femmesh_obj.FemMesh = fem_mesh
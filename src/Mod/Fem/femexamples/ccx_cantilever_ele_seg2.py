@@ -79,9 +79,7 @@ def setup(doc=None, solvertype="ccxtools"):
     geom_obj = doc.getObject("CantileverLine")
 
     # load the seg2 mesh
-    from .meshes.mesh_canticcx_seg2 import create_nodes, create_elements
-
-    fem_mesh = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+    fem_mesh = generate_mesh.mesh_from_file("mesh_canticcx_seg2")
 
     # overwrite mesh with the seg2 mesh
     femmesh_obj.FemMesh = fem_mesh
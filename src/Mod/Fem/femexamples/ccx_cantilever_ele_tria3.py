@@ -79,9 +79,7 @@ def setup(doc=None, solvertype="ccxtools"):
     geom_obj = doc.getObject("CanileverPlate")
 
     # load the tria3 mesh
-    from .meshes.mesh_canticcx_tria3 import create_nodes, create_elements
-
-    fem_mesh = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+    fem_mesh = generate_mesh.mesh_from_file("mesh_canticcx_tria3")
 
     # overwrite mesh with the tria3 mesh
     femmesh_obj.FemMesh = fem_mesh
@@ -159,9 +159,7 @@ def setup(doc=None, solvertype="ccxtools"):
     analysis.addObject(con_tie)
 
     # mesh
-    from .meshes.mesh_constraint_tie_tetra10 import create_nodes, create_elements
-
-    fem_mesh = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+    fem_mesh = generate_mesh.mesh_from_file("mesh_constraint_tie_tetra10")
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, get_meshname()))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Shape = geom_obj
@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of FreeCAD.                                         *
+# *                                                                         *
+# *   FreeCAD is free software: you can redistribute it and/or modify it    *
+# *   under the terms of the GNU Lesser General Public License as           *
+# *   published by the Free Software Foundation, either version 2.1 of the  *
+# *   License, or (at your option) any later version.                       *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful, but        *
+# *   WITHOUT ANY WARRANTY; without even the implied warranty of            *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU      *
+# *   Lesser General Public License for more details.                       *
+# *                                                                         *
+# *   You should have received a copy of the GNU Lesser General Public      *
+# *   License along with FreeCAD. If not, see                               *
+# *   <https://www.gnu.org/licenses/>.                                      *
+# *                                                                         *
+# ***************************************************************************
+
+"""Binary companions of the example mesh modules.
+
+Every mesh module mesh_*.py has a NumPy file mesh_*.npz beside it, which holds
+the same nodes, elements and groups as arrays. Loading the arrays is much faster
+than compiling and running the Python module with its thousands of lines.
+The Python modules stay the source, after changing one of them run
+
+    python binary_mesh.py [mesh_name ...]
+
+to write the binary files again. This module does not need FreeCAD.
+"""
+
+import hashlib
+import importlib
+import os
+import sys
+
+import numpy as np
+
+MESH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# element kinds in the binary file, index is the kind stored per element
+ELEMENT_KINDS = ("Edge", "Face", "Volume")
+
+
+class MeshRecorder:
+    """stands in for a FemMesh and records the calls of create_nodes and create_elements"""
+
+    def __init__(self):
+        self.node_ids = []
+        self.node_coords = []
+        self.element_ids = []
+        self.element_kinds = []
+        self.element_nodes = []
+        self.groups = []
+
+    def addNode(self, x, y, z, node_id):
+        self.node_ids.append(node_id)
+        self.node_coords.append((x, y, z))
+
+    def addEdge(self, nodes, element_id):
+        self._add_element(0, nodes, element_id)
+
+    def addFace(self, nodes, element_id):
+        self._add_element(1, nodes, element_id)
+
+    def addVolume(self, nodes, element_id):
+        self._add_element(2, nodes, element_id)
+
+    def addGroup(self, name, group_type):
+        self.groups.append((name, group_type, []))
+        return len(self.groups) - 1
+
+    def addGroupElements(self, group, elements):
+        self.groups[group][2].extend(elements)
+
+    def _add_element(self, kind, nodes, element_id):
+        self.element_ids.append(element_id)
+        self.element_kinds.append(kind)
+        self.element_nodes.append(nodes)
+
+    def get_arrays(self):
+        node_counts = [len(nodes) for nodes in self.element_nodes]
+        group_sizes = [len(group[2]) for group in self.groups]
+        return {
+            "node_ids": np.array(self.node_ids, dtype=np.int64),
+            "node_coords": np.array(self.node_coords, dtype=np.float64).reshape(-1, 3),
+            "element_ids": np.array(self.element_ids, dtype=np.int64),
+            "element_kinds": np.array(self.element_kinds, dtype=np.int8),
+            "element_offsets": np.concatenate(([0], np.cumsum(node_counts, dtype=np.int64))),
+            "element_nodes": np.array(
+                [n for nodes in self.element_nodes for n in nodes], dtype=np.int64
+            ),
+            "group_names": np.array([group[0] for group in self.groups], dtype=np.str_),
+            "group_types": np.array([group[1] for group in self.groups], dtype=np.str_),
+            "group_offsets": np.concatenate(([0], np.cumsum(group_sizes, dtype=np.int64))),
+            "group_elements": np.array(
+                [e for group in self.groups for e in group[2]], dtype=np.int64
+            ),
+        }
+
+
+def get_source_digest(mesh_name):
+    with open(os.path.join(MESH_DIR, mesh_name + ".py"), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def get_binary_file(mesh_name):
+    return os.path.join(MESH_DIR, mesh_name + ".npz")
+
+
+def write_binary_mesh(mesh_name):
+    """runs the mesh module mesh_name on a MeshRecorder and saves the arrays"""
+    module = importlib.import_module(f"{__package__}.{mesh_name}" if __package__ else mesh_name)
+    recorder = MeshRecorder()
+    if not module.create_nodes(recorder) or not module.create_elements(recorder):
+        raise RuntimeError(f"Mesh module {mesh_name} failed to create the mesh")
+    arrays = recorder.get_arrays()
+    arrays["source_digest"] = np.array(get_source_digest(mesh_name))
+    np.savez_compressed(get_binary_file(mesh_name), **arrays)
+    return arrays
+
+
+def read_binary_mesh(mesh_name):
+    """returns the arrays of the binary file of mesh_name
+
+    None is returned if there is no binary file or if it was not written
+    from the current mesh module, in this case the module has to be used.
+    """
+    file_name = get_binary_file(mesh_name)
+    if not os.path.isfile(file_name):
+        return None
+    with np.load(file_name, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    if str(arrays.pop("source_digest")) != get_source_digest(mesh_name):
+        return None
+    return arrays
+
+
+def get_mesh_names():
+    return sorted(
+        f[:-3] for f in os.listdir(MESH_DIR) if f.startswith("mesh_") and f.endswith(".py")
+    )
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, MESH_DIR)
+    for name in sys.argv[1:] or get_mesh_names():
+        arrays = write_binary_mesh(name)
+        print(
+            f"{name}.npz: {len(arrays['node_ids'])} nodes, "
+            f"{len(arrays['element_ids'])} elements, {len(arrays['group_names'])} groups"
+        )
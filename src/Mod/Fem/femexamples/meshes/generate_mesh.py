@@ -21,10 +21,14 @@
 # *                                                                         *
 # ***************************************************************************
 
+import importlib
 import sys
+import numpy as np
 from FreeCAD import Console
 import Fem
 
+from . import binary_mesh
+
 
 def mesh_from_mesher(femmesh_obj, mesher=""):
     tool = None
@@ -64,3 +68,41 @@ def mesh_from_existing(create_nodes, create_elements):
         Console.PrintError("Error on creating elements.\n")
 
     return fem_mesh
+
+
+def mesh_from_file(mesh_name):
+    """create the FemMesh of the example mesh mesh_name
+
+    The binary file mesh_name.npz is used if it is up to date,
+    otherwise the Python module mesh_name.py.
+    """
+    arrays = binary_mesh.read_binary_mesh(mesh_name)
+    if arrays is None:
+        Console.PrintLog(f"No up to date binary file of {mesh_name}, the module is used.\n")
+        module = importlib.import_module(f"{__package__}.{mesh_name}")
+        return mesh_from_existing(module.create_nodes, module.create_elements)
+    return mesh_from_arrays(arrays)
+
+
+def mesh_from_arrays(arrays):
+    fem_mesh = Fem.FemMesh()
+    fem_mesh.addNodes(arrays["node_ids"], arrays["node_coords"])
+
+    # add the elements in blocks of the same kind and node count
+    kinds = arrays["element_kinds"]
+    offsets = arrays["element_offsets"]
+    node_counts = np.diff(offsets)
+    for kind, node_count in sorted(set(zip(kinds.tolist(), node_counts.tolist()))):
+        block = np.flatnonzero((kinds == kind) & (node_counts == node_count))
+        nodes = arrays["element_nodes"][offsets[block, None] + np.arange(node_count)]
+        fem_mesh.addElements(binary_mesh.ELEMENT_KINDS[kind], arrays["element_ids"][block], nodes)
+
+    offsets = arrays["group_offsets"].tolist()
+    group_elements = arrays["group_elements"].tolist()
+    for i, (name, group_type) in enumerate(
+        zip(arrays["group_names"].tolist(), arrays["group_types"].tolist())
+    ):
+        g = fem_mesh.addGroup(name, group_type)
+        fem_mesh.addGroupElements(g, group_elements[offsets[i] : offsets[i + 1]])
+
+    return fem_mesh
@@ -218,9 +218,7 @@ def setup(doc=None, solvertype="ccxtools", test_mode=False):
         success = generate_mesh.mesh_from_mesher(femmesh_obj, "gmsh")
     if not success:
         # try to create from existing rough mesh
-        from .meshes.mesh_thermomech_bimetal_tetra10 import create_nodes, create_elements
-
-        fem_mesh = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+        fem_mesh = generate_mesh.mesh_from_file("mesh_thermomech_bimetal_tetra10")
         femmesh_obj.FemMesh = fem_mesh
 
     doc.recompute()
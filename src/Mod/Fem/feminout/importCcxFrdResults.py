@@ -34,6 +34,8 @@ __url__ = "https://www.freecad.org"
 import os
 import math
 
+import numpy as np
+
 import FreeCAD
 from FreeCAD import Console
 from builtins import open as pyopen
@@ -63,7 +65,7 @@ def setupPipeline(doc, analysis, results_name, result_data):
     from . import importToolsFem
 
     if not "BUILD_FEM_VTK" in FreeCAD.__cmake__:
-        return
+        return None
 
     # create a results pipeline (dependent on user settings)
     pipeline_name = "Pipeline_" + results_name
@@ -108,41 +110,91 @@ def setupPipeline(doc, analysis, results_name, result_data):
                 res.Mesh.ViewObject.Visibility = False
         # restore pipeline visibility
         pipeline_obj.ViewObject.Visibility = pipeline_visibility
+    return pipeline_obj
+
 
+def importFrd(
+    filename,
+    analysis=None,
+    result_name_prefix="",
+    result_analysis_type="",
+    array_reader=None,
+    lazy_results=None,
+):
+    """
+    imports the results of a frd file into result objects, one per result set
 
-def importFrd(filename, analysis=None, result_name_prefix="", result_analysis_type=""):
+    array_reader: read the frd file into NumPy arrays, see read_frd_result_arrays
+    lazy_results: keep the result sets in an on-disk result store beside the frd file,
+    the result objects only load their node data if it is needed, see femresult.resultstore
+    If None the preferences of CalculiX are used.
+    """
     import ObjectsFem
     from . import importToolsFem
+    from femresult import resultstore
 
     if analysis:
         doc = analysis.Document
     else:
         doc = FreeCAD.ActiveDocument
 
-    m = read_frd_result(filename)
+    ccx_prefs = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Ccx")
+    if array_reader is None:
+        array_reader = ccx_prefs.GetBool("FrdArrayReader", False)
+    if lazy_results is None:
+        lazy_results = ccx_prefs.GetBool("FrdLazyResults", False)
+    if lazy_results:
+        # the result sets are written into the store one after the other
+        # only the mesh and the result set in work are held in memory
+        array_reader = True
+        store_dir = os.path.splitext(filename)[0] + "_results"
+        m = {}
+        resultstore.write_result_store(store_dir, iter_frd_result_arrays(filename, m))
+        store = resultstore.get_store(store_dir)
+        m["Results"] = store.result_sets
+        nodes_count = len(m["Nodes"][0])
+    elif array_reader:
+        m = read_frd_result_arrays(filename)
+        nodes_count = len(m["Nodes"][0])
+    else:
+        m = read_frd_result(filename)
+        nodes_count = len(m["Nodes"])
     result_mesh_object = None
     res_obj = None
 
-    if len(m["Nodes"]) > 0:
-        mesh = importToolsFem.make_femmesh(m)
+    if nodes_count > 0:
+        if array_reader:
+            mesh = importToolsFem.make_femmesh_from_arrays(m)
+        else:
+            mesh = importToolsFem.make_femmesh(m)
         res_mesh_is_compacted = False
         nodenumbers_for_compacted_mesh = []
 
         number_of_increments = len(m["Results"])
         Console.PrintLog("Increments: " + str(number_of_increments) + "\n")
 
+        # the lazy result objects all use the result mesh object of the first one
+        lazy_mesh_objects = []
+
         def make_result_mesh(result_name):
             res_obj = ObjectsFem.makeResultMechanical(doc, results_name)
+            if lazy_mesh_objects:
+                res_obj.Mesh = lazy_mesh_objects[0]
+                return res_obj
             # create result mesh
             result_mesh_object = ObjectsFem.makeMeshResult(doc, results_name + "_Mesh")
             result_mesh_object.FemMesh = mesh
             res_obj.Mesh = result_mesh_object
+            if lazy_results:
+                lazy_mesh_objects.append(result_mesh_object)
             return res_obj
 
         multistep_result = []
         multistep_value = []
         if len(m["Results"]) > 0:
-            for result_set in m["Results"]:
+            for index, result_set in enumerate(m["Results"]):
+                if lazy_results:
+                    result_set = store.get_result_set(index)
                 if "number" in result_set:
                     eigenmode_number = result_set["number"]
                 else:
@@ -174,7 +226,6 @@ def importFrd(filename, analysis=None, result_name_prefix="", result_analysis_ty
 
                 # more result object calculations
                 from femresult import resulttools
-                from femtools import femutils
 
                 if not res_obj.MassFlowRate:
                     # information 1:
@@ -190,57 +241,43 @@ def importFrd(filename, analysis=None, result_name_prefix="", result_analysis_ty
                     # example frd file: https://forum.freecad.org/viewtopic.php?t=32649#p274291
                     if res_mesh_is_compacted is False:
                         # first result set, compact FemMesh and NodeNumbers
-                        res_obj = resulttools.compact_result(res_obj)
+                        res_obj = resulttools.compact_result(res_obj, m if array_reader else None)
                         res_mesh_is_compacted = True
                         nodenumbers_for_compacted_mesh = res_obj.NodeNumbers
+                        if lazy_results:
+                            resultstore.set_node_numbers(store_dir, nodenumbers_for_compacted_mesh)
                     else:
                         # all other result sets, do not compact FemMesh, only set NodeNumbers
                         res_obj.NodeNumbers = nodenumbers_for_compacted_mesh
 
-                # fill DisplacementLengths
-                res_obj = resulttools.add_disp_apps(res_obj)
-                # fill vonMises
-                res_obj = resulttools.add_von_mises(res_obj)
-                # fill principal stress
-                # if material reinforced object use add additional values to the res_obj
-                if res_obj.getParentGroup():
-                    has_reinforced_mat = False
-                    for obj in res_obj.getParentGroup().Group:
-                        if femutils.is_of_type(obj, "Fem::MaterialReinforced"):
-                            has_reinforced_mat = True
-                            Console.PrintLog(
-                                "Reinforced material object detected, "
-                                "reinforced principal stresses and standard principal "
-                                "stresses will be added.\n"
-                            )
-                            resulttools.add_principal_stress_reinforced(res_obj)
-                            break
-                    if has_reinforced_mat is False:
-                        Console.PrintLog(
-                            "No reinforced material object detected, "
-                            "standard principal stresses will be added.\n"
-                        )
-                        # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                        res_obj = resulttools.add_principal_stress_std(res_obj)
-                else:
-                    Console.PrintLog(
-                        "No Analysis detected, standard principal stresses will be added.\n"
-                    )
-                    # if a pure frd file was opened no analysis and thus no parent group
-                    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                    res_obj = resulttools.add_principal_stress_std(res_obj)
+                # fill DisplacementLengths, vonMises and principal stresses
+                res_obj = resulttools.add_derived_results(res_obj)
                 # fill Stats
                 res_obj = resulttools.fill_femresult_stats(res_obj)
 
+                if lazy_results:
+                    # node data is loaded again on demand, the last one for the pipeline
+                    resultstore.set_lazy(res_obj, store_dir, index)
+                    if index < number_of_increments - 1:
+                        resultstore.unload_result(res_obj)
+                        continue
+
                 # if we have multiple results we delay the pipeline creation
-                if number_of_increments == 1:
-                    setupPipeline(doc, analysis, results_name, [res_obj])
+                if number_of_increments == 1 or lazy_results:
+                    pipeline_obj = setupPipeline(doc, analysis, results_name, [res_obj])
+                    if lazy_results and pipeline_obj is not None:
+                        # the pipeline switches between the result sets of the store
+                        resultstore.set_pipeline_store(pipeline_obj, store_dir, index)
                 else:
                     multistep_value.append(step_time)
                     multistep_result.append(res_obj)
 
-            # we have collected all result objects, lets create the multistep result pipeline
-            if number_of_increments > 1:
+            if lazy_results:
+                # a multistep pipeline would hold all result sets, the pipeline of
+                # lazy results shows one of them, see resultstore.show_pipeline_result
+                resultstore.unload_result(res_obj)
+            elif number_of_increments > 1:
+                # we have collected all result objects, lets create the multistep result pipeline
                 # figure out type and unit
                 match result_analysis_type:
                     case "frequency":
@@ -908,3 +945,402 @@ def read_frd_result(frd_input):
         "Penta15Elem": elements_penta15,
         "Results": results,
     }
+
+
+# ********* array based frd reader *********
+# The frd file is a fixed column format, see cgx manual, section "Result Format".
+# Every data record of a nodal block is " -1", a node id of 10 columns and values
+# of 12 columns. Element node records are " -2" and up to 10 node ids of 10 columns.
+
+# number of records converted at once, bounds the memory of the raw lines held in Python
+FRD_CHUNK_RECORDS = 100000
+
+# frd block name --> (result set key, number of values, factor)
+FRD_RESULT_BLOCKS = {
+    "DISP": ("disp", 3, 1.0),
+    "STRESS": ("stress", 6, 1.0),
+    "TOSTRAIN": ("strain", 6, 1.0),
+    "PE": ("peeq", 1, 1.0),
+    "NDTEMP": ("temp", 1, 1.0),
+    "FLUX": ("heatflux", 3, 1.0),
+    "MAFLOW": ("mflow", 1, 1000.0),  # convert units to kg/s from t/s
+    "STPRES": ("npressure", 1, 1.0),
+}
+
+# frd element type --> (mesh data key, FreeCAD node order as indices into the frd node order)
+# see read_frd_result for the comments on the node orders
+FRD_ELEMENT_TYPES = {
+    1: ("Hexa8Elem", (5, 6, 7, 4, 1, 2, 3, 0)),
+    2: ("Penta6Elem", (4, 5, 3, 1, 2, 0)),
+    3: ("Tetra4Elem", (1, 0, 2, 3)),
+    4: (
+        "Hexa20Elem",
+        (7, 4, 5, 6, 3, 0, 1, 2, 19, 16, 17, 18, 11, 8, 9, 10, 15, 12, 13, 14),
+    ),
+    5: ("Penta15Elem", (4, 5, 3, 1, 2, 0, 13, 14, 12, 7, 8, 6, 10, 11, 9)),
+    6: ("Tetra10Elem", (1, 0, 2, 3, 4, 6, 5, 8, 7, 9)),
+    7: ("Tria3Elem", (0, 1, 2)),
+    8: ("Tria6Elem", (0, 1, 2, 3, 4, 5)),
+    9: ("Quad4Elem", (0, 1, 2, 3)),
+    10: ("Quad8Elem", (0, 1, 2, 3, 4, 5, 6, 7)),
+    11: ("Seg2Elem", (0, 1)),
+    12: ("Seg3Elem", (0, 1, 2)),
+}
+
+
+class _FrdFile:
+    """
+    Line iterator over a frd file, which additionally reads a run of lines
+    of the same length at once into a NumPy array.
+    """
+
+    def __init__(self, frd_file):
+        self.file = frd_file
+        self.pushback = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.pushback:
+            return self.pushback.pop()
+        return next(self.file)
+
+    def read_records(self, line_length, count):
+        """
+        Returns the next count lines as (count, line_length) uint8 array, if all of them
+        are " -1" records of line_length. Otherwise None and the lines are read line by line.
+        """
+        if self.pushback:
+            # the lines of a previous fallback come first, they are read line by line
+            return None
+        text = self.file.read(line_length * count)
+        # the replacement keeps the column width, see read_frd_result for NAN(IND)
+        data = text.replace("NAN(IND)", "NAN     ").encode("ascii", "replace")
+        if len(data) == line_length * count:
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(count, line_length)
+            if (
+                (raw[:, -1] == ord("\n")).all()
+                and (raw[:, 1] == ord("-")).all()
+                and (raw[:, 2] == ord("1")).all()
+            ):
+                return raw
+        if text and not text.endswith("\n"):
+            text += self.file.readline()
+        self.pushback = text.splitlines(keepends=True)[::-1]
+        return None
+
+
+class _FrdArrayBuffer:
+    """
+    Collects the fixed width records of one frd block and converts them chunkwise
+    into preallocated NumPy arrays. A record is an id of 10 columns followed by
+    count values of value_width columns each.
+    """
+
+    def __init__(self, count, value_width, dtype, size=0):
+        self.count = count
+        self.value_width = value_width
+        self.dtype = dtype
+        self.record_width = 10 + count * value_width
+        self.ids = np.empty(size, dtype=np.int64)
+        self.values = np.empty((size, count), dtype=dtype)
+        self.size = 0
+        self.records = []
+
+    def append(self, record):
+        if len(record) != self.record_width:
+            # trailing blanks stripped or a line end inside the record
+            record = record.rstrip("\r\n").ljust(self.record_width)[: self.record_width]
+        self.records.append(record)
+        if len(self.records) >= FRD_CHUNK_RECORDS:
+            self.flush()
+
+    def append_raw(self, raw):
+        # raw records as (n, record_width) uint8 array
+        self.flush()
+        self._store(raw)
+
+    def flush(self):
+        if not self.records:
+            return
+        data = "".join(self.records).replace("NAN(IND)", "NAN     ").encode("ascii", "replace")
+        self.records = []
+        self._store(np.frombuffer(data, dtype=np.uint8).reshape(-1, self.record_width))
+
+    def _store(self, raw):
+        ids = np.ascontiguousarray(raw[:, :10]).view("S10")[:, 0].astype(np.int64)
+        values = np.ascontiguousarray(raw[:, 10:]).view(f"S{self.value_width}").astype(self.dtype)
+        end = self.size + len(ids)
+        if end > len(self.ids):
+            # header count missing or too small, grow geometrically
+            new_length = max(end, 2 * len(self.ids))
+            new_ids = np.empty(new_length, dtype=np.int64)
+            new_ids[: self.size] = self.ids[: self.size]
+            new_values = np.empty((new_length, self.count), dtype=self.dtype)
+            new_values[: self.size] = self.values[: self.size]
+            self.ids = new_ids
+            self.values = new_values
+        self.ids[self.size : end] = ids
+        self.values[self.size : end] = values
+        self.size = end
+
+    def get_arrays(self):
+        self.flush()
+        return self.ids[: self.size], self.values[: self.size]
+
+
+def _get_frd_block_size(line):
+    # the number of records is given in the block header
+    # "    2C" and "    3C" lines and the "  100C" lines of result blocks
+    try:
+        return int(line[24:36])
+    except ValueError:
+        return 0
+
+
+def _read_frd_node_block(frd_file, count, size=0, skip=False):
+    """
+    Reads the " -1" records of a nodal block up to the end of block line.
+    If the block size is known the records are read in chunks of lines.
+    """
+    buffer = _FrdArrayBuffer(count, 12, np.float64, 0 if skip else size)
+    stop = 13 + 12 * count
+    remaining = size
+    for line in frd_file:
+        if line[1:3] == "-1":
+            if not skip:
+                buffer.append(line[3:stop])
+            remaining -= 1
+            # all further records are expected to have the line length of the first one
+            while remaining > 0 and len(line) > stop:
+                chunk = min(remaining, FRD_CHUNK_RECORDS)
+                raw = frd_file.read_records(len(line), chunk)
+                if raw is None:
+                    # read line by line
+                    remaining = 0
+                    break
+                if not skip:
+                    buffer.append_raw(raw[:, 3:stop])
+                remaining -= chunk
+        elif line[1:3] == "-3":
+            break
+    if skip:
+        return None
+    return buffer.get_arrays()
+
+
+def _read_frd_element_block(frd_file, size=0):
+    """reads the element block up to the end of block line into one buffer per element type"""
+    buffers = {}
+    buffer = None
+    record = []
+    node_count = 0
+    for line in frd_file:
+        if line[1:3] == "-1":
+            elem_type = int(line[14:18])
+            if elem_type not in FRD_ELEMENT_TYPES:
+                buffer = None
+                continue
+            node_count = len(FRD_ELEMENT_TYPES[elem_type][1])
+            if elem_type not in buffers:
+                # the header count is the number of all elements, preallocate it for the first type
+                buffers[elem_type] = _FrdArrayBuffer(node_count, 10, np.int64, size)
+                size = 0
+            buffer = buffers[elem_type]
+            record = [line[3:13]]
+        elif line[1:3] == "-2":
+            if buffer is None:
+                continue
+            # up to 10 nodes per line, hexa20 and penta15 use a second line
+            line_count = min(10, node_count - 10 * (len(record) - 1))
+            record.append(line[3 : 3 + 10 * line_count].rstrip("\n").ljust(10 * line_count))
+            if len(record) - 1 == (node_count + 9) // 10:
+                buffer.append("".join(record))
+        elif line[1:3] == "-3":
+            break
+
+    elements = {}
+    for elem_type, buffer in buffers.items():
+        key, node_order = FRD_ELEMENT_TYPES[elem_type]
+        ids, nodes = buffer.get_arrays()
+        elements[key] = (ids, nodes[:, node_order])
+    return elements
+
+
+def _set_frd_inout_seg3(elements, inout_nodes):
+    # fluid inlet and outlet node numbering for D elements, see read_frd_result
+    # only elements at inlet or outlet are kept
+    ids, nodes = elements["Seg3Elem"]
+    new_nodes = nodes.copy()
+    found = np.zeros(len(ids), dtype=bool)
+    for inout in inout_nodes:
+        node = int(inout[1])
+        inout_node = int(inout[2])
+        inlet = nodes[:, 0] == node
+        outlet = ~inlet & (nodes[:, 2] == node)
+        new_nodes[inlet] = np.column_stack(
+            (np.full(inlet.sum(), inout_node), nodes[inlet, 2], nodes[inlet, 0])
+        )
+        new_nodes[outlet, 1] = inout_node
+        found |= inlet | outlet
+    elements["Seg3Elem"] = (ids[found], new_nodes[found])
+
+
+def _add_frd_inout_values(ids, values, inout_nodes):
+    # network values are copied to the inout nodes, see read_frd_result
+    # only a few nodes of 1D flow networks, thus the dict is used to keep the order
+    inout = {int(i[1]): int(i[2]) for i in inout_nodes}
+    node_values = {}
+    for node, value in zip(ids.tolist(), values.tolist()):
+        node_values[node] = value
+        if node in inout:
+            node_values[inout[node]] = value
+    return (
+        np.fromiter(node_values.keys(), dtype=np.int64, count=len(node_values)),
+        np.array(list(node_values.values()), dtype=np.float64),
+    )
+
+
+def read_frd_result_arrays(frd_input, steps=None, fields=None):
+    """
+    Reads a CalculiX frd file into NumPy arrays.
+
+    The returned dictionary has the keys of read_frd_result. Nodes and elements
+    are pairs of arrays (ids, coordinates) and (ids, nodes in FreeCAD order).
+    The fields of the result sets are pairs (node numbers, values), vector and
+    tensor fields have one row per node, stress and strain are in FreeCAD order
+    (xx, yy, zz, xy, xz, yz).
+
+    The data blocks are streamed chunkwise into preallocated arrays.
+    steps: indices of the result sets to read, all if None
+    fields: result set keys of FRD_RESULT_BLOCKS to read, all if None
+    The data of all other result sets and fields is skipped without conversion.
+    """
+    Console.PrintMessage(f"Read ccx results from frd file into arrays: {frd_input}\n")
+    mesh_data = {}
+    mesh_data["Results"] = list(iter_frd_result_arrays(frd_input, mesh_data, steps, fields))
+    return mesh_data
+
+
+def iter_frd_result_arrays(frd_input, mesh_data, steps=None, fields=None):
+    """
+    Reads a CalculiX frd file like read_frd_result_arrays, but yields the result
+    sets one after the other as soon as they are read. Thus only one result set
+    is held in memory at a time. The nodes and elements are put into the dictionary
+    mesh_data, it is complete after the last result set was yielded.
+    """
+    inout_nodes = []
+    inout_nodes_file = frd_input.rsplit(".", 1)[0] + "_inout_nodes.txt"
+    if os.path.exists(inout_nodes_file):
+        Console.PrintMessage(f"Read special 1DFlow nodes data form: {inout_nodes_file}\n")
+        with pyopen(inout_nodes_file, "r") as f:
+            inout_nodes = [line.split(",") for line in f]
+
+    empty_nodes = (np.empty(0, dtype=np.int64), np.empty((0, 3)))
+    mesh_data["Nodes"] = empty_nodes
+    for key, node_order in FRD_ELEMENT_TYPES.values():
+        mesh_data[key] = (
+            np.empty(0, dtype=np.int64),
+            np.empty((0, len(node_order)), dtype=np.int64),
+        )
+    first_results = None
+    mode_results = {"number": float("NaN"), "time": float("NaN")}
+
+    # same state machine as in read_frd_result, but on the block headers only
+    mode_time_found = False
+    end_of_section_found = False
+    end_of_frd_data_found = False
+    node_element_section = False
+    mode_eigen_changed = False
+    mode_time_changed = False
+    eigenmode = 0
+    timestep = 0
+    block_size = 0
+    result_set_index = 0
+
+    with pyopen(frd_input, "r") as f:
+        frd_file = _FrdFile(f)
+        for line in frd_file:
+            if line[4:6] == "2C":
+                mesh_data["Nodes"] = _read_frd_node_block(frd_file, 3, _get_frd_block_size(line))
+                end_of_section_found = True
+                node_element_section = True
+            elif line[4:6] == "3C":
+                mesh_data.update(_read_frd_element_block(frd_file, _get_frd_block_size(line)))
+                end_of_section_found = True
+                node_element_section = True
+            elif line[5:10] == "PMODE":
+                eigentemp = int(line[30:36])
+                if eigentemp > eigenmode:
+                    eigenmode = eigentemp
+                    mode_eigen_changed = True
+            elif line[4:10] == "1PSTEP":
+                mode_time_found = True
+            elif line[2:7] == "100CL":
+                block_size = _get_frd_block_size(line)
+                if mode_time_found:
+                    timetemp = float(line[13:25])
+                    if timetemp > timestep:
+                        timestep = timetemp
+                        mode_time_changed = True
+            elif line[1:3] == "-4":
+                for name, (key, count, factor) in FRD_RESULT_BLOCKS.items():
+                    if line[5 : 5 + len(name)] == name:
+                        break
+                else:
+                    key = None
+                skip = (
+                    key is None
+                    or (steps is not None and result_set_index not in steps)
+                    or (fields is not None and key not in fields)
+                )
+                # unknown blocks are read as scalar blocks and skipped
+                block = _read_frd_node_block(frd_file, count if key else 1, block_size, skip)
+                end_of_section_found = True
+                if key is not None:
+                    node_element_section = False
+                if block is not None:
+                    ids, values = block
+                    if key in ("stress", "strain"):
+                        # CalculiX frd files: (xx, yy, zz, xy, yz, zx)
+                        values = values[:, (0, 1, 2, 3, 5, 4)]
+                    elif count == 1:
+                        values = values[:, 0] * factor
+                        if inout_nodes and key in ("mflow", "npressure"):
+                            ids, values = _add_frd_inout_values(ids, values, inout_nodes)
+                    mode_results[key] = (ids, values)
+            elif line[1:3] == "-3":
+                end_of_section_found = True
+            elif line[1:5] == "9999":
+                end_of_frd_data_found = True
+
+            if (
+                (mode_eigen_changed or mode_time_changed or end_of_frd_data_found)
+                and end_of_section_found
+                and not node_element_section
+            ):
+                if steps is None or result_set_index in steps:
+                    if first_results is None:
+                        first_results = mode_results
+                    yield mode_results
+                result_set_index += 1
+                mode_results = {"number": float("NaN"), "time": float("NaN")}
+                end_of_section_found = False
+
+            if mode_eigen_changed:
+                mode_results["number"] = eigenmode
+                mode_eigen_changed = False
+
+            if mode_time_changed:
+                mode_results["time"] = timestep
+                mode_time_found = False
+                mode_time_changed = False
+
+    if inout_nodes:
+        _set_frd_inout_seg3(mesh_data, inout_nodes)
+    elif first_results is not None:
+        if "mflow" in first_results or "npressure" in first_results:
+            Console.PrintError("We have mflow or npressure, but no inout_nodes file.\n")
+    if not len(mesh_data["Nodes"][0]):
+        Console.PrintError("FEM: No nodes found in Frd file.\n")
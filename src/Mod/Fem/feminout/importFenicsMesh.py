@@ -35,6 +35,7 @@ import FreeCAD
 from FreeCAD import Console
 
 from . import importToolsFem
+from . import readFenicsXDMF
 from . import readFenicsXML
 from . import writeFenicsXML
 from . import writeFenicsXDMF
@@ -196,11 +197,13 @@ def export(objectslist, fileString, group_values_dict_nogui=None):
 # ********* module specific methods *********
 def import_fenics_mesh(filename, analysis=None):
     """insert a FreeCAD FEM Mesh object in the ActiveDocument"""
-    mesh_data = readFenicsXML.read_fenics_mesh_xml(filename)
-    # xdmf not operational
-
-    mesh_name = os.path.basename(os.path.splitext(filename)[0])
-    femmesh = importToolsFem.make_femmesh(mesh_data)
+    mesh_name, extension = os.path.splitext(os.path.basename(filename))
+    if extension.lower() == ".xdmf":
+        mesh_data = readFenicsXDMF.read_fenics_mesh_xdmf(filename)
+        femmesh = importToolsFem.make_femmesh_from_arrays(mesh_data)
+    else:
+        mesh_data = readFenicsXML.read_fenics_mesh_xml(filename)
+        femmesh = importToolsFem.make_femmesh(mesh_data)
     if femmesh:
         mesh_object = FreeCAD.ActiveDocument.addObject("Fem::FemMeshObject", mesh_name)
         mesh_object.FemMesh = femmesh
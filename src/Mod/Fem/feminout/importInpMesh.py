@@ -57,13 +57,73 @@ def insert(filename, docname):
 
 
 # ********* module specific methods *********
+# number of nodes or elements read into one chunk of arrays
+CHUNK_SIZE = 100000
+
+# number of lines after which the reading rate is logged
+LOG_LINES = 1000000
+
+# the inp element types of the mesh data element keys and their number of nodes
+INP_ELEMENT_TYPES = {
+    "Tria3Elem": (("S3", "CPS3", "CPE3", "CAX3"), 3),
+    "Tria6Elem": (("S6", "CPS6", "CPE6", "CAX6"), 6),
+    "Quad4Elem": (("S4", "S4R", "CPS4", "CPS4R", "CPE4", "CPE4R", "CAX4", "CAX4R"), 4),
+    "Quad8Elem": (("S8", "S8R", "CPS8", "CPS8R", "CPE8", "CPE8R", "CAX8", "CAX8R"), 8),
+    "Tetra4Elem": (("C3D4",), 4),
+    "Tetra10Elem": (("C3D10",), 10),
+    "Hexa8Elem": (("C3D8", "C3D8R", "C3D8I"), 8),
+    "Hexa20Elem": (("C3D20", "C3D20R", "C3D20RI"), 20),
+    "Penta6Elem": (("C3D6",), 6),
+    "Penta15Elem": (("C3D15",), 15),
+    "Seg2Elem": (("B31", "B31R", "T3D2"), 2),
+    "Seg3Elem": (("B32", "B32R", "T3D3"), 3),
+}
+INP_ELEMENT_KEYS = {
+    elm_type: (key, number_of_nodes)
+    for key, (elm_types, number_of_nodes) in INP_ELEMENT_TYPES.items()
+    for elm_type in elm_types
+}
+
+# switch from the CalculiX node numbering to the FreeCAD node numbering
+# numbering do not change: tria3, tria6, quad4, quad8, seg2
+FREECAD_NODE_ORDER = {
+    "Tetra4Elem": [1, 0, 2, 3],
+    "Tetra10Elem": [1, 0, 2, 3, 4, 6, 5, 8, 7, 9],
+    "Hexa8Elem": [5, 6, 7, 4, 1, 2, 3, 0],
+    "Hexa20Elem": [5, 6, 7, 4, 1, 2, 3, 0, 13, 14, 15, 12, 9, 10, 11, 8, 17, 18, 19, 16],
+    "Penta6Elem": [4, 5, 3, 1, 2, 0],
+    "Penta15Elem": [4, 5, 3, 1, 2, 0, 10, 11, 9, 7, 8, 6, 13, 14, 12],
+    "Seg3Elem": [0, 2, 1],
+}
+
+
 def read(filename):
     """read a FemMesh from a inp mesh file and return the FemMesh"""
     # no document object is created, just the FemMesh is returned
-    mesh_data = read_inp(filename)
+    # the nodes and elements are added to the mesh in chunks while the file is read
+    import Fem
     from . import importToolsFem
 
-    return importToolsFem.make_femmesh(mesh_data)
+    element_types = dict(importToolsFem.FEMMESH_ELEMENT_KEYS)
+    femmesh = Fem.FemMesh()
+    counts = {}
+    for key, ids, values in iter_inp_mesh_chunks(filename):
+        if key == "Nodes":
+            femmesh.addNodes(ids, values)
+        else:
+            femmesh.addElements(element_types[key], ids, values)
+        counts[key] = counts.get(key, 0) + len(ids)
+    if not counts.get("Nodes"):
+        Console.PrintError("No Nodes found!\n")
+    elif len(counts) == 1:
+        Console.PrintError("No Elements found!\n")
+    node_count = counts.pop("Nodes", 0)
+    Console.PrintLog(
+        "imported mesh: {} nodes, {}\n".format(
+            node_count, ", ".join(f"{count} {key[:-4].upper()}" for key, count in counts.items())
+        )
+    )
+    return femmesh
 
 
 def import_inp(filename):
@@ -76,221 +136,160 @@ def import_inp(filename):
 
 
 def read_inp(file_name):
-    """read .inp file"""
-    # ATM only mesh reading is supported (no boundary conditions)
-
-    class elements:
-
-        tria3 = {}
-        tria6 = {}
-        quad4 = {}
-        quad8 = {}
-        tetra4 = {}
-        tetra10 = {}
-        hexa8 = {}
-        hexa20 = {}
-        penta6 = {}
-        penta15 = {}
-        seg2 = {}
-        seg3 = {}
-
-    error_seg3 = False  # to print "not supported"
-    nodes = {}
-    model_definition = True
-
-    f = pyopen(file_name, "r")
-    line = "\n"
-    include = ""
-    f_include = None
-    while line != "":
-        if include:
-            line = f_include.readline()
-            if line == "":
-                f_include.close()
-                include = ""
-                line = f.readline()
-        else:
-            line = f.readline()
-        if line.strip() == "":
-            continue
-        elif line[0] == "*":  # start/end of a reading set
-            if line[0:2] == "**":  # comments
-                continue
+    """read .inp file
+
+    returns the mesh data of dicts {id: coordinates} and {id: element nodes}
+    used by importToolsFem.make_femmesh
+    """
+    mesh_data = {key: {} for key in ["Nodes"] + list(INP_ELEMENT_TYPES)}
+    for key, ids, values in iter_inp_mesh_chunks(file_name):
+        mesh_data[key].update(zip(ids.tolist(), values.tolist()))
+    return mesh_data
+
+
+def iter_inp_lines(file_name):
+    """yields the lines of an inp file
+
+    The lines of a file of an *INCLUDE are yielded at the place of the *INCLUDE,
+    the file is opened not before it is reached. Includes may be nested.
+    """
+    with pyopen(file_name, "r") as f:
+        for line in f:
             if line[:8].upper() == "*INCLUDE":
-                start = 1 + line.index("=")
-                include = line[start:].strip().strip('"')
-                include_path = os.path.normpath(include)
-                if os.path.isfile(include_path) is True:
-                    f_include = pyopen(include_path, "r")
-                else:
-                    path_start = os.path.split(file_name)[0]
-                    include_full_path = os.path.join(path_start, include_path)
-                    f_include = pyopen(include_full_path, "r")
-                continue
-            read_node = False
-            elm_category = []
-            number_of_nodes = 0
+                yield from iter_inp_lines(get_include_path(line, file_name))
+            else:
+                yield line
+
+
+def get_include_path(line, file_name):
+    """the path of the file of an *INCLUDE line of the file file_name"""
+    include = line[1 + line.index("=") :].strip().strip('"')
+    include_path = os.path.normpath(include)
+    if os.path.isfile(include_path):
+        return include_path
+    # relative to the directory of the including file
+    return os.path.join(os.path.split(file_name)[0], include_path)
+
+
+def iter_inp_mesh_chunks(file_name, chunk_size=CHUNK_SIZE):
+    """yields the nodes and elements of an inp file in chunks of NumPy arrays
+
+    Every chunk is a tuple (key, ids, values). The key is "Nodes" or a mesh data
+    element key like "Tetra10Elem". The values are the node coordinates or the
+    element nodes in the FreeCAD node order. The chunks are yielded in the order
+    of the file, every chunk is made of at most chunk_size lines, thus the whole
+    file is never held in memory. ATM only mesh reading is supported (no boundary
+    conditions), reading stops at the first *STEP.
+    """
+    import time
+
+    import numpy as np
+
+    time_start = time.perf_counter()
+    line_count = 0
+    key = None  # "Nodes", the element key of the element block or None
+    number_of_nodes = 0
+    lines = []
+    # the start of an element which is continued in the next chunk
+    rest = np.empty(0, np.int64)
+    unsupported_types = set()
+    seg3_found = False
+
+    def get_chunks():
+        # yields the chunk of the lines, if it is not empty
+        nonlocal rest
+        if key == "Nodes":
+            values = get_numbers(lines, np.float64)
+            if values.size != 4 * len(lines):
+                # blank lines
+                values = np.array(
+                    [line.split(",")[:4] for line in lines if line.strip()], np.float64
+                )
+            lines.clear()
+            values = values.reshape(-1, 4)
+            if len(values):
+                yield (key, values[:, 0].astype(np.int64), np.ascontiguousarray(values[:, 1:]))
+            return
+        # elements with many nodes are continued on the next line, thus the lines
+        # are one stream of the element ids, each followed by its nodes
+        values = np.concatenate((rest, get_numbers(lines, np.int64)))
+        lines.clear()
+        count = values.size // (number_of_nodes + 1) * (number_of_nodes + 1)
+        rest = values[count:]
+        values = values[:count].reshape(-1, number_of_nodes + 1)
+        ele_nodes = values[:, 1:]
+        if key in FREECAD_NODE_ORDER:
+            ele_nodes = ele_nodes[:, FREECAD_NODE_ORDER[key]]
+        if len(values):
+            yield (key, values[:, 0].copy(), np.ascontiguousarray(ele_nodes))
+
+    for line in iter_inp_lines(file_name):
+        line_count += 1
+        if line_count % LOG_LINES == 0:
+            Console.PrintLog(
+                "    {} lines read, {:.0f} lines/s\n".format(
+                    line_count, line_count / (time.perf_counter() - time_start)
+                )
+            )
+        if line[0] != "*":
+            if key is not None:
+                lines.append(line)
+                if len(lines) >= chunk_size:
+                    yield from get_chunks()
+            continue
+        if line[:2] == "**":  # comments
+            continue
+
+        # start/end of a reading set
+        if lines:
+            yield from get_chunks()
+        if rest.size:
+            Console.PrintWarning(f"Incomplete element {rest[0]} not added.\n")
+            rest = np.empty(0, np.int64)
+        key = None
+        keyword = line.upper()
+        if keyword[:5] == "*STEP":
+            break
+        if keyword[:5] == "*NODE":
+            key = "Nodes"
+        elif keyword[:8] == "*ELEMENT":
             elm_type = ""
-            elm_2nd_line = False
-            error_seg3 = False
-            error_not_supported_elemtype = False
-
-        # reading nodes
-        if (line[:5].upper() == "*NODE") and (model_definition is True):
-            read_node = True
-        elif read_node is True:
-            line_list = line.split(",")
-            number = int(line_list[0])
-            x = float(line_list[1])
-            y = float(line_list[2])
-            z = float(line_list[3])
-            nodes[number] = [x, y, z]
-
-        # reading elements
-        elif line[:8].upper() == "*ELEMENT":
-            line_list = line[8:].upper().split(",")
-            for line_part in line_list:
+            for line_part in keyword[8:].split(","):
                 if line_part.lstrip()[:4] == "TYPE":
                     elm_type = line_part.split("=")[1].strip()
-
-            if elm_type in ["S3", "CPS3", "CPE3", "CAX3"]:
-                elm_category = elements.tria3
-                number_of_nodes = 3
-            elif elm_type in ["S6", "CPS6", "CPE6", "CAX6"]:
-                elm_category = elements.tria6
-                number_of_nodes = 6
-            elif elm_type in ["S4", "S4R", "CPS4", "CPS4R", "CPE4", "CPE4R", "CAX4", "CAX4R"]:
-                elm_category = elements.quad4
-                number_of_nodes = 4
-            elif elm_type in ["S8", "S8R", "CPS8", "CPS8R", "CPE8", "CPE8R", "CAX8", "CAX8R"]:
-                elm_category = elements.quad8
-                number_of_nodes = 8
-            elif elm_type == "C3D4":
-                elm_category = elements.tetra4
-                number_of_nodes = 4
-            elif elm_type == "C3D10":
-                elm_category = elements.tetra10
-                number_of_nodes = 10
-            elif elm_type in ["C3D8", "C3D8R", "C3D8I"]:
-                elm_category = elements.hexa8
-                number_of_nodes = 8
-            elif elm_type in ["C3D20", "C3D20R", "C3D20RI"]:
-                elm_category = elements.hexa20
-                number_of_nodes = 20
-            elif elm_type == "C3D6":
-                elm_category = elements.penta6
-                number_of_nodes = 6
-            elif elm_type == "C3D15":
-                elm_category = elements.penta15
-                number_of_nodes = 15
-            elif elm_type in ["B31", "B31R", "T3D2"]:
-                elm_category = elements.seg2
-                number_of_nodes = 2
-            elif elm_type in ["B32", "B32R", "T3D3"]:
-                elm_category = elements.seg3
-                number_of_nodes = 3
-                error_seg3 = True  # to print "not supported"
+            if elm_type in INP_ELEMENT_KEYS:
+                key, number_of_nodes = INP_ELEMENT_KEYS[elm_type]
+                seg3_found = seg3_found or key == "Seg3Elem"
             else:
-                error_not_supported_elemtype = True
-
-        elif elm_category != [] and number_of_nodes > 0:
-            line_list = line.split(",")
-            if elm_2nd_line is False:
-                number = int(line_list[0])
-                elm_category[number] = []
-                pos = 1
-            else:
-                pos = 0
-                elm_2nd_line = False
-            for en in range(pos, pos + number_of_nodes - len(elm_category[number])):
-                try:
-                    enode = int(line_list[en])
-                    elm_category[number].append(enode)
-                except Exception:
-                    elm_2nd_line = True
-                    break
-
-        elif line[:5].upper() == "*STEP":
-            model_definition = False
-    if error_seg3 is True:  # to print "not supported"
+                unsupported_types.add(elm_type)
+    if lines:
+        yield from get_chunks()
+
+    if seg3_found:  # to print "not supported"
         Console.PrintError("Error: seg3 (3-node beam element type) not supported, yet.\n")
-    elif error_not_supported_elemtype is True:
+    for elm_type in sorted(unsupported_types):
         Console.PrintError(f"Error: {elm_type} not supported.\n")
-    f.close()
-
-    # switch from the CalculiX node numbering to the FreeCAD node numbering
-    # numbering do not change: tria3, tria6, quad4, quad8, seg2
-    for en in elements.tetra4:
-        n = elements.tetra4[en]
-        elements.tetra4[en] = [n[1], n[0], n[2], n[3]]
-    for en in elements.tetra10:
-        n = elements.tetra10[en]
-        elements.tetra10[en] = [n[1], n[0], n[2], n[3], n[4], n[6], n[5], n[8], n[7], n[9]]
-    for en in elements.hexa8:
-        n = elements.hexa8[en]
-        elements.hexa8[en] = [n[5], n[6], n[7], n[4], n[1], n[2], n[3], n[0]]
-    for en in elements.hexa20:
-        n = elements.hexa20[en]
-        elements.hexa20[en] = [
-            n[5],
-            n[6],
-            n[7],
-            n[4],
-            n[1],
-            n[2],
-            n[3],
-            n[0],
-            n[13],
-            n[14],
-            n[15],
-            n[12],
-            n[9],
-            n[10],
-            n[11],
-            n[8],
-            n[17],
-            n[18],
-            n[19],
-            n[16],
-        ]
-    for en in elements.penta6:
-        n = elements.penta6[en]
-        elements.penta6[en] = [n[4], n[5], n[3], n[1], n[2], n[0]]
-    for en in elements.penta15:
-        n = elements.penta15[en]
-        elements.penta15[en] = [
-            n[4],
-            n[5],
-            n[3],
-            n[1],
-            n[2],
-            n[0],
-            n[10],
-            n[11],
-            n[9],
-            n[7],
-            n[8],
-            n[6],
-            n[13],
-            n[14],
-            n[12],
-        ]
-    for en in elements.seg3:
-        n = elements.seg3[en]
-        elements.seg3[en] = [n[0], n[2], n[1]]
-
-    return {
-        "Nodes": nodes,
-        "Seg2Elem": elements.seg2,
-        "Seg3Elem": elements.seg3,
-        "Tria3Elem": elements.tria3,
-        "Tria6Elem": elements.tria6,
-        "Quad4Elem": elements.quad4,
-        "Quad8Elem": elements.quad8,
-        "Tetra4Elem": elements.tetra4,
-        "Tetra10Elem": elements.tetra10,
-        "Hexa8Elem": elements.hexa8,
-        "Hexa20Elem": elements.hexa20,
-        "Penta6Elem": elements.penta6,
-        "Penta15Elem": elements.penta15,
-    }
+    read_time = time.perf_counter() - time_start
+    Console.PrintMessage(
+        "Read {} lines of {} in {:.3f} seconds, {:.0f} lines/s.\n".format(
+            line_count, file_name, read_time, line_count / max(read_time, 1e-9)
+        )
+    )
+
+
+def get_numbers(lines, dtype):
+    """the comma separated numbers of lines as a flat NumPy array"""
+    import warnings
+
+    import numpy as np
+
+    text = "".join(lines).replace(",", " ")
+    # fromstring is fast, but it fails or warns at a word which is not a number
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=dtype, sep=" ")
+        except (DeprecationWarning, ValueError):
+            pass
+    # raises the ValueError of the word
+    return np.array([dtype(word) for word in text.split()], dtype)
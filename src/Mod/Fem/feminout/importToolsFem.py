@@ -134,147 +134,85 @@ def make_femmesh(mesh_data):
     """makes an FreeCAD FEM Mesh object from FEM Mesh data"""
     import Fem
 
-    mesh = Fem.FemMesh()
     m = mesh_data
     if ("Nodes" in m) and (len(m["Nodes"]) > 0):
         FreeCAD.Console.PrintLog("Found: nodes\n")
-        if (
-            ("Seg2Elem" in m)
-            or ("Seg3Elem" in m)
-            or ("Tria3Elem" in m)
-            or ("Tria6Elem" in m)
-            or ("Quad4Elem" in m)
-            or ("Quad8Elem" in m)
-            or ("Tetra4Elem" in m)
-            or ("Tetra10Elem" in m)
-            or ("Penta6Elem" in m)
-            or ("Penta15Elem" in m)
-            or ("Hexa8Elem" in m)
-            or ("Hexa20Elem" in m)
-        ):
-
-            nds = m["Nodes"]
+        if any(key in m for key, element_type in FEMMESH_ELEMENT_KEYS):
             FreeCAD.Console.PrintLog("Found: elements\n")
-            for i in nds:
-                n = nds[i]
-                mesh.addNode(n[0], n[1], n[2], i)
-            elms_hexa8 = m["Hexa8Elem"]
-            for i in elms_hexa8:
-                e = elms_hexa8[i]
-                mesh.addVolume([e[0], e[1], e[2], e[3], e[4], e[5], e[6], e[7]], i)
-            elms_penta6 = m["Penta6Elem"]
-            for i in elms_penta6:
-                e = elms_penta6[i]
-                mesh.addVolume([e[0], e[1], e[2], e[3], e[4], e[5]], i)
-            elms_tetra4 = m["Tetra4Elem"]
-            for i in elms_tetra4:
-                e = elms_tetra4[i]
-                mesh.addVolume([e[0], e[1], e[2], e[3]], i)
-            elms_tetra10 = m["Tetra10Elem"]
-            for i in elms_tetra10:
-                e = elms_tetra10[i]
-                mesh.addVolume([e[0], e[1], e[2], e[3], e[4], e[5], e[6], e[7], e[8], e[9]], i)
-            elms_penta15 = m["Penta15Elem"]
-            for i in elms_penta15:
-                e = elms_penta15[i]
-                mesh.addVolume(
-                    [
-                        e[0],
-                        e[1],
-                        e[2],
-                        e[3],
-                        e[4],
-                        e[5],
-                        e[6],
-                        e[7],
-                        e[8],
-                        e[9],
-                        e[10],
-                        e[11],
-                        e[12],
-                        e[13],
-                        e[14],
-                    ],
-                    i,
-                )
-            elms_hexa20 = m["Hexa20Elem"]
-            for i in elms_hexa20:
-                e = elms_hexa20[i]
-                mesh.addVolume(
-                    [
-                        e[0],
-                        e[1],
-                        e[2],
-                        e[3],
-                        e[4],
-                        e[5],
-                        e[6],
-                        e[7],
-                        e[8],
-                        e[9],
-                        e[10],
-                        e[11],
-                        e[12],
-                        e[13],
-                        e[14],
-                        e[15],
-                        e[16],
-                        e[17],
-                        e[18],
-                        e[19],
-                    ],
-                    i,
-                )
-            elms_tria3 = m["Tria3Elem"]
-            for i in elms_tria3:
-                e = elms_tria3[i]
-                mesh.addFace([e[0], e[1], e[2]], i)
-            elms_tria6 = m["Tria6Elem"]
-            for i in elms_tria6:
-                e = elms_tria6[i]
-                mesh.addFace([e[0], e[1], e[2], e[3], e[4], e[5]], i)
-            elms_quad4 = m["Quad4Elem"]
-            for i in elms_quad4:
-                e = elms_quad4[i]
-                mesh.addFace([e[0], e[1], e[2], e[3]], i)
-            elms_quad8 = m["Quad8Elem"]
-            for i in elms_quad8:
-                e = elms_quad8[i]
-                mesh.addFace([e[0], e[1], e[2], e[3], e[4], e[5], e[6], e[7]], i)
-            elms_seg2 = m["Seg2Elem"]
-            for i in elms_seg2:
-                e = elms_seg2[i]
-                mesh.addEdge([e[0], e[1]], i)
-            elms_seg3 = m["Seg3Elem"]
-            for i in elms_seg3:
-                e = elms_seg3[i]
-                mesh.addEdge([e[0], e[1], e[2]], i)
-            Console.PrintLog(
-                "imported mesh: {} nodes, {} HEXA8, {} PENTA6, {} TETRA4, {} TETRA10, {} PENTA15\n".format(
-                    len(nds),
-                    len(elms_hexa8),
-                    len(elms_penta6),
-                    len(elms_tetra4),
-                    len(elms_tetra10),
-                    len(elms_penta15),
-                )
-            )
-            Console.PrintLog(
-                "imported mesh: {} "
-                "HEXA20, {} TRIA3, {} TRIA6, {} QUAD4, {} QUAD8, {} SEG2, {} SEG3\n".format(
-                    len(elms_hexa20),
-                    len(elms_tria3),
-                    len(elms_tria6),
-                    len(elms_quad4),
-                    len(elms_quad8),
-                    len(elms_seg2),
-                    len(elms_seg3),
-                )
-            )
+            return make_femmesh_from_arrays(get_mesh_arrays(m))
         else:
             Console.PrintError("No Elements found!\n")
     else:
         Console.PrintError("No Nodes found!\n")
+    return Fem.FemMesh()
+
+
+# mesh data element keys in the order they are added to the mesh by make_femmesh
+FEMMESH_ELEMENT_KEYS = (
+    ("Hexa8Elem", "Volume"),
+    ("Penta6Elem", "Volume"),
+    ("Tetra4Elem", "Volume"),
+    ("Tetra10Elem", "Volume"),
+    ("Penta15Elem", "Volume"),
+    ("Hexa20Elem", "Volume"),
+    ("Tria3Elem", "Face"),
+    ("Tria6Elem", "Face"),
+    ("Quad4Elem", "Face"),
+    ("Quad8Elem", "Face"),
+    ("Seg2Elem", "Edge"),
+    ("Seg3Elem", "Edge"),
+)
+
+
+def get_mesh_arrays(mesh_data):
+    """
+    converts FEM Mesh data of dicts {id: coordinates} and {id: element nodes}
+    into the FEM Mesh data of arrays used by make_femmesh_from_arrays
+    """
+    import numpy as np
+
+    def get_id_arrays(data, dtype):
+        ids = np.fromiter(data.keys(), dtype=np.int64, count=len(data))
+        values = np.array(list(map(tuple, data.values())), dtype=dtype)
+        return ids, values
+
+    mesh_arrays = {"Nodes": get_id_arrays(mesh_data["Nodes"], np.float64)}
+    for key, element_type in FEMMESH_ELEMENT_KEYS:
+        if mesh_data.get(key):
+            mesh_arrays[key] = get_id_arrays(mesh_data[key], np.int64)
+    return mesh_arrays
+
+
+def make_femmesh_from_arrays(mesh_data):
+    """
+    makes an FreeCAD FEM Mesh object from FEM Mesh data held in NumPy arrays
+    "Nodes" and the element keys of make_femmesh are pairs of arrays
+    (ids, coordinates) and (ids, element nodes), they are added to the mesh in bulk
+    """
+    import numpy as np
+    import Fem
+
+    mesh = Fem.FemMesh()
+    node_ids, node_coords = mesh_data["Nodes"]
+    if len(node_ids) == 0:
+        Console.PrintError("No Nodes found!\n")
+        return mesh
+    mesh.addNodes(np.ascontiguousarray(node_ids), np.ascontiguousarray(node_coords))
+    element_counts = []
+    for key, element_type in FEMMESH_ELEMENT_KEYS:
+        if key not in mesh_data:
+            continue
+        ele_ids, ele_nodes = mesh_data[key]
+        if len(ele_ids) > 0:
+            mesh.addElements(
+                element_type, np.ascontiguousarray(ele_ids), np.ascontiguousarray(ele_nodes)
+            )
+        element_counts.append(f"{len(ele_ids)} {key[:-4].upper()}")
+    if not element_counts:
+        Console.PrintError("No Elements found!\n")
+    Console.PrintLog(
+        "imported mesh: {} nodes, {}\n".format(len(node_ids), ", ".join(element_counts))
+    )
     return mesh
 
 
@@ -353,7 +291,17 @@ def make_dict_from_femmesh(femmesh):
 
 
 def fill_femresult_mechanical(res_obj, result_set):
-    """fills a FreeCAD FEM mechanical result object with result data"""
+    """
+    fills a FreeCAD FEM mechanical result object with result data
+    the result fields are dicts keyed by node number or pairs of NumPy arrays
+    (node numbers, values), see fill_femresult_mechanical_arrays
+    """
+    for key, value in result_set.items():
+        if key not in ("number", "time"):
+            if isinstance(value, tuple):
+                return fill_femresult_mechanical_arrays(res_obj, result_set)
+            break
+
     if "number" in result_set:
         eigenmode_number = result_set["number"]
     else:
@@ -490,3 +438,83 @@ def fill_femresult_mechanical(res_obj, result_set):
             res_obj.Time = step_time
 
     return res_obj
+
+
+def fill_femresult_mechanical_arrays(res_obj, result_set):
+    """
+    fills a FreeCAD FEM mechanical result object with result data held in NumPy arrays
+    as returned by importCcxFrdResults.read_frd_result_arrays, every result field is a
+    pair (node numbers, values), the values have one row per node for vector and tensor fields
+    """
+    eigenmode_number = result_set.get("number", 0)
+    if "time" in result_set:
+        step_time = round(result_set["time"], 2)
+
+    disp_count = None
+    if "disp" in result_set:
+        disp_nodes, disp = result_set["disp"]
+        disp_count = len(disp_nodes)
+        res_obj.DisplacementVectors = list(map(tuple, disp.tolist()))
+        res_obj.NodeNumbers = disp_nodes.tolist()
+
+        if "stress" in result_set:
+            # columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+            stress = result_set["stress"][1]
+            res_obj.NodeStressXX = stress[:, 0].tolist()
+            res_obj.NodeStressYY = stress[:, 1].tolist()
+            res_obj.NodeStressZZ = stress[:, 2].tolist()
+            res_obj.NodeStressXY = stress[:, 3].tolist()
+            res_obj.NodeStressXZ = stress[:, 4].tolist()
+            res_obj.NodeStressYZ = stress[:, 5].tolist()
+
+        if "strain" in result_set:
+            # columns (Exx, Eyy, Ezz, Exy, Exz, Eyz)
+            strain = result_set["strain"][1]
+            res_obj.NodeStrainXX = strain[:, 0].tolist()
+            res_obj.NodeStrainYY = strain[:, 1].tolist()
+            res_obj.NodeStrainZZ = strain[:, 2].tolist()
+            res_obj.NodeStrainXY = strain[:, 3].tolist()
+            res_obj.NodeStrainXZ = strain[:, 4].tolist()
+            res_obj.NodeStrainYZ = strain[:, 5].tolist()
+
+        if "peeq" in result_set:
+            peeq = result_set["peeq"][1]
+            if len(peeq) > 0:
+                if len(peeq) != disp_count:
+                    Console.PrintError("PEEQ seems to have extra nodes.\n")
+                res_obj.Peeq = peeq[:disp_count].tolist()
+
+        if eigenmode_number > 0:
+            res_obj.Eigenmode = eigenmode_number
+
+    if "temp" in result_set:
+        temp_nodes, temperature = result_set["temp"]
+        if len(temperature) > 0:
+            if disp_count is None:
+                res_obj.Temperature = temperature.tolist()
+                res_obj.NodeNumbers = temp_nodes.tolist()
+            else:
+                if len(temperature) != disp_count:
+                    Console.PrintError("Temperature seems to have extra nodes.\n")
+                res_obj.Temperature = temperature[:disp_count].tolist()
+            res_obj.Time = step_time
+
+    if "heatflux" in result_set:
+        heatflux = result_set["heatflux"][1]
+        if len(heatflux) > 0:
+            res_obj.HeatFlux = list(map(tuple, heatflux.tolist()))
+
+    if "mflow" in result_set:
+        mflow_nodes, mflow = result_set["mflow"]
+        if len(mflow) > 0:
+            res_obj.MassFlowRate = mflow.tolist()
+            res_obj.Time = step_time
+            res_obj.NodeNumbers = mflow_nodes.tolist()
+
+    if "npressure" in result_set:
+        npressure = result_set["npressure"][1]
+        if len(npressure) > 0:
+            res_obj.NetworkPressure = npressure.tolist()
+            res_obj.Time = step_time
+
+    return res_obj
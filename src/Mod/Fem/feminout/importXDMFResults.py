@@ -0,0 +1,603 @@
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Result import and export for XDMF file format"
+__author__ = "FreeCAD FEM developers"
+__url__ = "https://www.freecad.org"
+
+## @package importXDMFResults
+#  \ingroup FEM
+#  \brief FreeCAD Result import and export XDMF file library
+#
+#  The heavy data of XDMF files is kept in HDF5 files (h5py is needed), in binary
+#  files or in the XML file itself. Every data set is read into one NumPy array,
+#  the mesh and the result objects are filled from the arrays in bulk.
+
+import importlib.util
+import io
+import os
+from xml.etree import ElementTree as ET
+
+import numpy as np
+
+import FreeCAD
+from FreeCAD import Console
+
+from builtins import open as pyopen
+
+XINCLUDE = "{http://www.w3.org/2001/XInclude}include"
+
+# XDMF topology types { lower case topology type : (mesh data key, nodes per element, type id) }
+# the type id is the one of the Mixed topology, the node order of XDMF is the one of VTK
+XDMF_TOPOLOGY_TYPES = {
+    "polyline": ("Seg2Elem", 2, 2),
+    "edge_3": ("Seg3Elem", 3, 34),
+    "triangle": ("Tria3Elem", 3, 4),
+    "triangle_6": ("Tria6Elem", 6, 36),
+    "quadrilateral": ("Quad4Elem", 4, 5),
+    "quadrilateral_8": ("Quad8Elem", 8, 37),
+    "tetrahedron": ("Tetra4Elem", 4, 6),
+    "tetrahedron_10": ("Tetra10Elem", 10, 38),
+    "wedge": ("Penta6Elem", 6, 8),
+    "wedge_15": ("Penta15Elem", 15, 40),
+    "hexahedron": ("Hexa8Elem", 8, 9),
+    "hexahedron_20": ("Hexa20Elem", 20, 48),
+}
+
+# topology types written { (FemMesh element type, node count) : topology type }
+FEMMESH_TOPOLOGY_TYPES = {
+    ("Edge", 2): "Polyline",
+    ("Edge", 3): "Edge_3",
+    ("Face", 3): "Triangle",
+    ("Face", 6): "Triangle_6",
+    ("Face", 4): "Quadrilateral",
+    ("Face", 8): "Quadrilateral_8",
+    ("Volume", 4): "Tetrahedron",
+    ("Volume", 10): "Tetrahedron_10",
+    ("Volume", 6): "Wedge",
+    ("Volume", 15): "Wedge_15",
+    ("Volume", 8): "Hexahedron",
+    ("Volume", 20): "Hexahedron_20",
+}
+
+# FreeCAD node order of the VTK node order { mesh data key : order }
+# every order is its own inverse, thus it converts in both directions
+VTK_NODE_ORDER = {
+    "Tetra4Elem": [0, 2, 1, 3],
+    "Tetra10Elem": [0, 2, 1, 3, 6, 5, 4, 7, 9, 8],
+    "Hexa8Elem": [0, 3, 2, 1, 4, 7, 6, 5],
+    "Hexa20Elem": [0, 3, 2, 1, 4, 7, 6, 5, 11, 10, 9, 8, 15, 14, 13, 12, 16, 19, 18, 17],
+}
+
+# XDMF node attributes read into result fields { attribute name : result field key }
+# the names are the ones of the FreeCAD VTK export, see FemVTKTools.cpp
+XDMF_RESULT_FIELDS = {
+    "Displacement": "disp",
+    "Stress": "stress",
+    "Strain": "strain",
+    "Equivalent Plastic Strain": "peeq",
+    "Temperature": "temp",
+    "Heat Flux": "heatflux",
+}
+
+# columns (xx, yy, zz, xy, xz, yz) of the result fields of the XDMF tensor types
+TENSOR_COLUMNS = {
+    "Tensor6": [0, 3, 5, 1, 2, 4],  # xx, xy, xz, yy, yz, zz
+    "Tensor": [0, 4, 8, 1, 2, 5],  # row by row
+}
+
+# result object properties written { attribute name : (attribute type, properties) }
+RESULT_ATTRIBUTES = {
+    "Displacement": ("Vector", ("DisplacementVectors",)),
+    "Stress": (
+        "Tensor6",
+        (
+            "NodeStressXX",
+            "NodeStressXY",
+            "NodeStressXZ",
+            "NodeStressYY",
+            "NodeStressYZ",
+            "NodeStressZZ",
+        ),
+    ),
+    "Strain": (
+        "Tensor6",
+        (
+            "NodeStrainXX",
+            "NodeStrainXY",
+            "NodeStrainXZ",
+            "NodeStrainYY",
+            "NodeStrainYZ",
+            "NodeStrainZZ",
+        ),
+    ),
+    "von Mises Stress": ("Scalar", ("vonMises",)),
+    "Equivalent Plastic Strain": ("Scalar", ("Peeq",)),
+    "Temperature": ("Scalar", ("Temperature",)),
+    "Heat Flux": ("Vector", ("HeatFlux",)),
+}
+
+
+# ********* generic FreeCAD import and export methods *********
+def open(filename):
+    "called when freecad opens a file"
+    docname = os.path.splitext(os.path.basename(filename))[0]
+    insert(filename, docname)
+
+
+def insert(filename, docname):
+    "called when freecad wants to import a file"
+    try:
+        doc = FreeCAD.getDocument(docname)
+    except NameError:
+        doc = FreeCAD.newDocument(docname)
+    FreeCAD.ActiveDocument = doc
+    importXdmf(filename)
+
+
+def export(objectslist, filename):
+    "called when freecad exports result objects to xdmf"
+    res_objs = [obj for obj in objectslist if obj.isDerivedFrom("Fem::FemResultObject")]
+    if not res_objs or len(res_objs) != len(objectslist):
+        Console.PrintError("Select FEM result objects to export them to XDMF.\n")
+        return
+    if len({obj.Mesh.Name if obj.Mesh else None for obj in res_objs}) != 1:
+        Console.PrintError("The result objects exported to XDMF must share one result mesh.\n")
+        return
+    hdf5 = _has_h5py()
+    if not hdf5:
+        Console.PrintMessage(
+            "The Python module h5py is not installed, the data is written into the XDMF file.\n"
+        )
+    write_xdmf_results(res_objs, filename, hdf5=hdf5)
+
+
+# ********* module specific methods *********
+def importXdmf(filename, analysis=None, result_name_prefix="", field_names=None):
+    """
+    imports the node results of an XDMF file into result objects, one per time step
+
+    field_names: additional { attribute name : result field key } of the attributes
+    to read, for example {"u": "disp"} for the displacements of a FEniCS solution
+    """
+    import ObjectsFem
+    from . import importToolsFem
+    from femresult import resulttools
+
+    if analysis:
+        doc = analysis.Document
+    else:
+        doc = FreeCAD.ActiveDocument
+
+    m = read_xdmf_result_arrays(filename, field_names)
+    if len(m["Nodes"][0]) == 0:
+        Console.PrintError(f"Problem on XDMF file import. No nodes found in {filename}.\n")
+        return None
+
+    result_mesh_object = ObjectsFem.makeMeshResult(doc, f"{result_name_prefix}Results_Mesh")
+    result_mesh_object.FemMesh = importToolsFem.make_femmesh_from_arrays(m)
+    if not m["Results"]:
+        Console.PrintWarning(f"Nodes, but no node results found in {filename}.\n")
+
+    res_obj = None
+    for result_set in m["Results"]:
+        step_time = result_set["time"]
+        if len(m["Results"]) > 1 and np.isfinite(step_time):
+            results_name = f"{result_name_prefix}Time_{round(step_time, 2)}_Results"
+        else:
+            results_name = f"{result_name_prefix}Results"
+        res_obj = ObjectsFem.makeResultMechanical(doc, results_name)
+        res_obj.Mesh = result_mesh_object
+        importToolsFem.fill_femresult_mechanical_arrays(res_obj, result_set)
+        # fill DisplacementLengths, vonMises and principal stresses
+        res_obj = resulttools.add_derived_results(res_obj)
+        res_obj = resulttools.fill_femresult_stats(res_obj)
+        if analysis:
+            analysis.addObject(res_obj)
+        res_obj.touch()
+
+    if analysis:
+        analysis.addObject(result_mesh_object)
+    doc.recompute()
+    return res_obj
+
+
+def read_xdmf_result_arrays(filename, field_names=None):
+    """
+    reads the mesh and the node results of an XDMF file into NumPy arrays
+
+    Returns the FEM mesh data of arrays of importToolsFem.make_femmesh_from_arrays
+    with the key "Results", the list of result sets like the ones of
+    importCcxFrdResults.read_frd_result_arrays, one per time step.
+    The mesh is the one of the first grid with a topology, the node numbers are
+    1 to n in the order of the XDMF geometry.
+    """
+    result_fields = dict(XDMF_RESULT_FIELDS)
+    result_fields.update(field_names or {})
+    reader = _XdmfReader(filename)
+    try:
+        grids = reader.get_uniform_grids()
+        mesh_grid = next((grid for grid, time in grids if reader.find(grid, "Topology")), None)
+        if mesh_grid is None:
+            Console.PrintError(f"No grid with a topology found in {filename}.\n")
+            return {"Nodes": (np.empty(0, np.int64), np.empty((0, 3))), "Results": []}
+        m = reader.read_mesh(mesh_grid)
+        node_ids = m["Nodes"][0]
+
+        # result sets of the same time are merged, all of them if there is no time
+        result_sets = {}
+        for grid, time in grids:
+            for attribute in reader.find_all(grid, "Attribute"):
+                key = result_fields.get(attribute.get("Name"))
+                if key is None or attribute.get("Center", "Node") != "Node":
+                    continue
+                values = reader.read_attribute(attribute)
+                if len(values) != len(node_ids):
+                    Console.PrintError(
+                        "XDMF attribute {} has {} values for {} nodes, it is not read.\n".format(
+                            attribute.get("Name"), len(values), len(node_ids)
+                        )
+                    )
+                    continue
+                result_set = result_sets.setdefault(
+                    time, {"number": float("NaN"), "time": float("NaN") if time is None else time}
+                )
+                result_set[key] = (node_ids, values)
+        m["Results"] = list(result_sets.values())
+    finally:
+        reader.close()
+    return m
+
+
+class _XdmfReader:
+    # reads the elements and the data items of an XDMF file, HDF5 files are opened once
+
+    def __init__(self, filename):
+        self.base_dir = os.path.dirname(os.path.abspath(filename))
+        self.root = ET.parse(filename).getroot()
+        self.h5_files = {}
+
+    def close(self):
+        for h5_file in self.h5_files.values():
+            h5_file.close()
+        self.h5_files.clear()
+
+    def resolve(self, element):
+        # the element an XInclude or a reference points to
+        while True:
+            if element.tag == XINCLUDE:
+                path = element.get("xpointer", "")
+                if path.startswith("xpointer(") and path.endswith(")"):
+                    path = path[len("xpointer(") : -1]
+            elif element.get("Reference"):
+                path = element.get("Reference")
+                if path == "XML":
+                    path = (element.text or "").strip()
+            else:
+                return element
+            target = self.root.find("." + path[len("/Xdmf") :]) if path.startswith("/") else None
+            if target is None:
+                raise ValueError(f"XDMF reference {path} not found.")
+            element = target
+
+    def find_all(self, parent, tag):
+        found = []
+        for child in parent:
+            if child.tag == XINCLUDE or child.get("Reference"):
+                child = self.resolve(child)
+            if child.tag == tag:
+                found.append(child)
+        return found
+
+    def find(self, parent, tag):
+        found = self.find_all(parent, tag)
+        return found[0] if found else None
+
+    def get_uniform_grids(self):
+        # (grid, time) of all uniform grids, the ones in collections get the time of the grid
+        grids = []
+
+        def add_grids(parent):
+            for grid in self.find_all(parent, "Grid"):
+                if grid.get("GridType", "Uniform") == "Collection":
+                    add_grids(grid)
+                elif grid.get("GridType", "Uniform") == "Uniform":
+                    time = self.find(grid, "Time")
+                    if time is not None and time.get("Value") is not None:
+                        time = float(time.get("Value"))
+                    else:
+                        time = None
+                    grids.append((grid, time))
+
+        for domain in self.root.iter("Domain"):
+            add_grids(domain)
+        return grids
+
+    def read_mesh(self, grid):
+        geometry = self.find(grid, "Geometry")
+        geometry_type = geometry.get("GeometryType", geometry.get("Type", "XYZ")).upper()
+        items = self.find_all(geometry, "DataItem")
+        if geometry_type == "X_Y_Z":
+            coords = np.column_stack([self.read_data_item(item).reshape(-1) for item in items])
+        elif geometry_type in ("XYZ", "XY"):
+            coords = self.read_data_item(items[0]).reshape(-1, len(geometry_type))
+        else:
+            raise ValueError(f"XDMF geometry type {geometry_type} is not supported.")
+        node_coords = np.zeros((len(coords), 3), dtype=np.float64)
+        node_coords[:, : coords.shape[1]] = coords
+        m = {"Nodes": (np.arange(1, len(coords) + 1, dtype=np.int64), node_coords)}
+
+        topology = self.find(grid, "Topology")
+        topology_type = topology.get("TopologyType", topology.get("Type", "")).lower()
+        data = self.read_data_item(self.find(topology, "DataItem")).astype(np.int64).reshape(-1)
+        if topology_type == "mixed":
+            typed_nodes = _split_mixed_topology(data)
+        elif topology_type in XDMF_TOPOLOGY_TYPES:
+            key, count, type_id = XDMF_TOPOLOGY_TYPES[topology_type]
+            count = int(topology.get("NodesPerElement", count))
+            typed_nodes = [(key, data.reshape(-1, count))]
+        else:
+            raise ValueError(f"XDMF topology type {topology_type} is not supported.")
+
+        ele_id = 1
+        for key, nodes in typed_nodes:
+            if key in VTK_NODE_ORDER:
+                nodes = nodes[:, VTK_NODE_ORDER[key]]
+            ids = np.arange(ele_id, ele_id + len(nodes), dtype=np.int64)
+            ele_id += len(nodes)
+            if key in m:
+                ids = np.concatenate((m[key][0], ids))
+                nodes = np.concatenate((m[key][1], nodes))
+            # XDMF node indices start with 0, the node ids with 1
+            m[key] = (ids, nodes + 1)
+        return m
+
+    def read_attribute(self, attribute):
+        values = self.read_data_item(self.find(attribute, "DataItem"))
+        attribute_type = attribute.get("AttributeType", "Scalar")
+        if attribute_type == "Scalar":
+            return values.reshape(-1).astype(np.float64)
+        values = values.reshape(len(values), -1).astype(np.float64)
+        if attribute_type == "Vector" and values.shape[1] < 3:
+            # 2D vectors
+            values = np.column_stack((values, np.zeros((len(values), 3 - values.shape[1]))))
+        elif attribute_type in TENSOR_COLUMNS:
+            values = values[:, TENSOR_COLUMNS[attribute_type]]
+        return np.ascontiguousarray(values)
+
+    def read_data_item(self, item):
+        item = self.resolve(item)
+        if item.get("ItemType", "Uniform") != "Uniform":
+            raise ValueError(
+                "XDMF data items of type {} are not supported.".format(item.get("ItemType"))
+            )
+        dims = [int(d) for d in item.get("Dimensions", "-1").split()]
+        dtype = _get_data_item_dtype(item)
+        data_format = item.get("Format", "XML")
+        text = (item.text or "").strip()
+        if data_format == "XML":
+            # the text is read with full precision
+            data = np.fromstring(text, dtype=np.float64 if dtype.kind == "f" else dtype, sep=" ")
+        elif data_format == "HDF":
+            file_name, path = text.split(":", 1)
+            data = self.get_h5_file(file_name)[path][()]
+        elif data_format == "Binary":
+            if item.get("Endian", "Native") == "Big":
+                dtype = dtype.newbyteorder(">")
+            elif item.get("Endian", "Native") == "Little":
+                dtype = dtype.newbyteorder("<")
+            data = np.fromfile(
+                os.path.join(self.base_dir, text),
+                dtype=dtype,
+                count=int(np.prod(dims)) if -1 not in dims else -1,
+                offset=int(item.get("Seek", 0)),
+            )
+        else:
+            raise ValueError(f"XDMF data format {data_format} is not supported.")
+        return np.asarray(data).reshape(dims)
+
+    def get_h5_file(self, file_name):
+        h5_file = self.h5_files.get(file_name)
+        if h5_file is None:
+            h5py = _import_h5py()
+            h5_file = h5py.File(os.path.join(self.base_dir, file_name), "r")
+            self.h5_files[file_name] = h5_file
+        return h5_file
+
+
+def _get_data_item_dtype(item):
+    number_type = item.get("NumberType", item.get("DataType", "Float"))
+    precision = item.get("Precision", "4")
+    kind = {"Float": "f", "Int": "i", "UInt": "u", "Char": "i", "UChar": "u"}.get(number_type)
+    if kind is None:
+        raise ValueError(f"XDMF number type {number_type} is not supported.")
+    if number_type in ("Char", "UChar"):
+        precision = "1"
+    return np.dtype(f"{kind}{precision}")
+
+
+def _split_mixed_topology(data):
+    # splits the node indices of a Mixed topology into (mesh data key, nodes) runs of one type,
+    # a run is found at once, a type id is at every element length of the start of the run
+    types_by_id = {type_id: (key, count) for key, count, type_id in XDMF_TOPOLOGY_TYPES.values()}
+    typed_nodes = []
+    pos = 0
+    while pos < len(data):
+        type_id = int(data[pos])
+        if type_id == 1:
+            # Polyvertex, 1 and the node count before the nodes, they are not read
+            pos += 2 + int(data[pos + 1])
+            continue
+        if type_id not in types_by_id:
+            raise ValueError(f"XDMF Mixed topology type id {type_id} is not supported.")
+        key, count = types_by_id[type_id]
+        # a Polyline has its node count after the type id
+        size = count + 1 + (type_id == 2)
+        run = data[pos : pos + (len(data) - pos) // size * size].reshape(-1, size)
+        end = np.flatnonzero(run[:, 0] != type_id)
+        run = run[: end[0]] if len(end) else run
+        typed_nodes.append((key, run[:, size - count :]))
+        pos += len(run) * size
+    return typed_nodes
+
+
+def write_xdmf_results(res_objs, filename, hdf5=True):
+    """
+    writes the mesh and the node results of result objects sharing one mesh into an XDMF file
+
+    The result objects are written as a temporal collection of their times.
+    hdf5: keep the heavy data in an HDF5 file beside the XDMF file, h5py is needed,
+    else the data is written into the XDMF file.
+    """
+    from femmesh import meshtools
+
+    femmesh = res_objs[0].Mesh.FemMesh
+    node_coords, elements, node_ids = meshtools.compact_mesh_arrays(
+        *meshtools.get_femmesh_arrays(femmesh)
+    )
+    writer = _XdmfWriter(filename, hdf5)
+    try:
+        topology_type, element_count, topology = _get_xdmf_topology(elements)
+        grid_data = (
+            writer.add_data("Mesh/Geometry", node_coords),
+            writer.add_data("Mesh/Topology", topology),
+        )
+
+        root = ET.Element("Xdmf", Version="3.0")
+        domain = ET.SubElement(root, "Domain")
+        collection = ET.SubElement(
+            domain, "Grid", Name="Results", GridType="Collection", CollectionType="Temporal"
+        )
+        for index, res_obj in enumerate(res_objs):
+            grid = ET.SubElement(collection, "Grid", Name=res_obj.Name, GridType="Uniform")
+            ET.SubElement(grid, "Time", Value=repr(float(res_obj.Time)))
+            topology_element = ET.SubElement(grid, "Topology", TopologyType=topology_type)
+            topology_element.set("NumberOfElements", str(element_count))
+            writer.add_data_item(topology_element, *grid_data[1])
+            geometry = ET.SubElement(grid, "Geometry", GeometryType="XYZ")
+            writer.add_data_item(geometry, *grid_data[0])
+
+            node_index = None
+            if res_obj.NodeNumbers:
+                node_index = meshtools.renumber_nodes(node_ids, res_obj.NodeNumbers) - 1
+            for name, (attribute_type, props) in RESULT_ATTRIBUTES.items():
+                values = [getattr(res_obj, prop, None) for prop in props]
+                if node_index is None or not all(values):
+                    continue
+                values = np.column_stack([np.asarray(v, dtype=np.float64) for v in values])
+                if len(values) != len(node_index):
+                    continue
+                node_values = np.full((len(node_ids), values.shape[1]), np.nan)
+                node_values[node_index] = values
+                if attribute_type == "Scalar":
+                    node_values = node_values[:, 0]
+                attribute = ET.SubElement(
+                    grid, "Attribute", Name=name, AttributeType=attribute_type, Center="Node"
+                )
+                writer.add_data_item(
+                    attribute, *writer.add_data(f"Step_{index}/{name}", node_values)
+                )
+
+        with pyopen(filename, "wb") as f:
+            f.write(b'<?xml version="1.0"?>\n<!DOCTYPE Xdmf SYSTEM "Xdmf.dtd" []>\n')
+            ET.indent(root)
+            f.write(ET.tostring(root))
+    finally:
+        writer.close()
+    Console.PrintMessage(f"Results written to {filename}.\n")
+
+
+def _get_xdmf_topology(elements):
+    # topology type, element count and node indices of the elements,
+    # a Mixed topology for several types
+    blocks = []
+    for element_type, ids, nodes in elements:
+        topology_type = FEMMESH_TOPOLOGY_TYPES.get((element_type, nodes.shape[1]))
+        if topology_type is None:
+            Console.PrintWarning(
+                f"{len(ids)} {element_type} elements of {nodes.shape[1]} nodes are not written.\n"
+            )
+            continue
+        key, count, type_id = XDMF_TOPOLOGY_TYPES[topology_type.lower()]
+        if key in VTK_NODE_ORDER:
+            nodes = nodes[:, VTK_NODE_ORDER[key]]
+        blocks.append((topology_type, type_id, nodes - 1))
+    element_count = sum(len(nodes) for topology_type, type_id, nodes in blocks)
+    if len(blocks) == 1:
+        return blocks[0][0], element_count, blocks[0][2]
+    mixed = []
+    for topology_type, type_id, nodes in blocks:
+        columns = [np.full(len(nodes), type_id, dtype=np.int64)]
+        if type_id == 2:
+            columns.append(np.full(len(nodes), 2, dtype=np.int64))
+        mixed.append(np.column_stack(columns + [nodes]).reshape(-1))
+    topology = np.concatenate(mixed) if mixed else np.empty(0, dtype=np.int64)
+    return "Mixed", element_count, topology
+
+
+class _XdmfWriter:
+    # writes the data sets into the HDF5 file or formats them for the XML file
+
+    def __init__(self, filename, hdf5):
+        self.h5_file = None
+        if hdf5:
+            h5py = _import_h5py()
+            self.h5_name = os.path.splitext(os.path.basename(filename))[0] + ".h5"
+            self.h5_file = h5py.File(os.path.join(os.path.dirname(filename), self.h5_name), "w")
+
+    def close(self):
+        if self.h5_file is not None:
+            self.h5_file.close()
+
+    def add_data(self, path, data):
+        # returns the arguments of add_data_item of the data set
+        if self.h5_file is not None:
+            self.h5_file.create_dataset(path, data=data)
+            return data.shape, data.dtype, "HDF", f"{self.h5_name}:/{path}"
+        text = io.StringIO()
+        np.savetxt(text, data.reshape(len(data), -1), "%d" if data.dtype.kind in "iu" else "%.17g")
+        return data.shape, data.dtype, "XML", text.getvalue()
+
+    def add_data_item(self, parent, shape, dtype, data_format, text):
+        item = ET.SubElement(
+            parent,
+            "DataItem",
+            Dimensions=" ".join(str(d) for d in shape),
+            NumberType="Float" if dtype.kind == "f" else "Int",
+            Precision=str(dtype.itemsize),
+            Format=data_format,
+        )
+        item.text = text
+        return item
+
+
+def _has_h5py():
+    return importlib.util.find_spec("h5py") is not None
+
+
+def _import_h5py():
+    try:
+        import h5py
+    except ImportError:
+        Console.PrintError("The Python module h5py is needed to read and write HDF5 files.\n")
+        raise
+    return h5py
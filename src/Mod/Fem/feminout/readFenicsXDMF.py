@@ -33,20 +33,13 @@ from FreeCAD import Console
 
 
 def read_fenics_mesh_xdmf(xdmffilename):
+    """
+    returns the FEM mesh data of arrays of the first grid with a topology of an XDMF file,
+    see importToolsFem.make_femmesh_from_arrays
+    """
+    from .importXDMFResults import read_xdmf_result_arrays
 
-    Console.PrintMessage("Not operational, yet\n")
-
-    return {
-        "Nodes": {},
-        "Hexa8Elem": {},
-        "Penta6Elem": {},
-        "Tetra4Elem": {},
-        "Tetra10Elem": {},
-        "Penta15Elem": {},
-        "Hexa20Elem": {},
-        "Tria3Elem": {},
-        "Tria6Elem": {},
-        "Quad4Elem": {},
-        "Quad8Elem": {},
-        "Seg2Elem": {},
-    }
+    Console.PrintMessage(f"Read FEniCS mesh from XDMF file: {xdmffilename}\n")
+    mesh_data = read_xdmf_result_arrays(xdmffilename)
+    del mesh_data["Results"]
+    return mesh_data
@@ -32,8 +32,11 @@ __url__ = "https://www.freecad.org"
 ## @package FwmMesh2Mesh
 #  \ingroup FEM
 
+import hashlib
 import time
 
+import numpy as np
+
 import FreeCAD
 import Fem
 
@@ -88,172 +91,181 @@ face_dicts = {
     20: hexaFaces,
 }
 
+# faces of the face elements, tria3 and tria6 or quad4 and quad8 (ignoring mid-nodes)
+shellFaces = {
+    3: {1: [0, 1, 2]},
+    4: {1: [0, 1, 2, 3]},
+    6: {1: [0, 1, 2]},
+    8: {1: [0, 1, 2, 3]},
+}
 
-def femmesh_2_mesh(myFemMesh, myResults=None, myDispScale=1):
-    shiftBits = 20  # allows a million nodes, needs to be higher for more nodes in a FemMesh
+# the skins of the last FemMeshes, { mesh key : FemMeshSkin }
+_skin_cache = {}
+SKIN_CACHE_SIZE = 4
 
-    # This code generates a dict and a faceCode for each face of all elements
-    # All faceCodes are than sorted.
+
+def femmesh_2_mesh(myFemMesh, myResults=None, myDispScale=1):
+    # The faces of all elements are found by their sorted node ids. Faces which
+    # do not have a counterpart are the faces on the surface of the mesh.
 
     start_time = time.process_time()
-    faceCodeList = []
-    faceCodeDict = {}
-
-    if myFemMesh.VolumeCount > 0:
-        for ele in myFemMesh.Volumes:
-            element_nodes = myFemMesh.getElementNodes(ele)
-            # print("element_node: ", element_nodes)
-            faceDef = face_dicts[len(element_nodes)]
-
-            for key in faceDef:
-                nodeList = []
-                codeList = []
-                faceCode = 0
-                shifter = 0
-                for nodeIdx in faceDef[key]:
-                    nodeList.append(element_nodes[nodeIdx])
-                    codeList.append(element_nodes[nodeIdx])
-                codeList.sort()
-                for node in codeList:
-                    faceCode += node << shifter
-                    # x << n: x shifted left by n bits = Multiplication
-                    shifter += shiftBits
-                # print("codeList: ", codeList)
-                faceCodeDict[faceCode] = nodeList
-                faceCodeList.append(faceCode)
-    elif myFemMesh.FaceCount > 0:
-        for ele in myFemMesh.Faces:
-            element_nodes = myFemMesh.getElementNodes(ele)
-            # print("element_node: ", element_nodes)
-            if len(element_nodes) in [3, 6]:
-                faceDef = {1: [0, 1, 2]}
-            else:  # quad element
-                faceDef = {1: [0, 1, 2, 3]}
-
-            for key in faceDef:
-                nodeList = []
-                codeList = []
-                faceCode = 0
-                shifter = 0
-                for nodeIdx in faceDef[key]:
-                    nodeList.append(element_nodes[nodeIdx])
-                    codeList.append(element_nodes[nodeIdx])
-                codeList.sort()
-                for node in codeList:
-                    faceCode += node << shifter
-                    # x << n: x shifted left by n bits = Multiplication
-                    shifter += shiftBits
-                # print("codeList: ", codeList)
-                faceCodeDict[faceCode] = nodeList
-                faceCodeList.append(faceCode)
-
-    faceCodeList.sort()
-    allFaces = len(faceCodeList)
-    actFaceIdx = 0
-    singleFaces = []
-    # Here we search for faces, which do not have a counterpart.
-    # These are the faces on the surface of the mesh.
-    while actFaceIdx < allFaces:
-        if actFaceIdx < (allFaces - 1):
-            if faceCodeList[actFaceIdx] == faceCodeList[actFaceIdx + 1]:
-                actFaceIdx += 2
-            else:
-                # print("found a single Face: ", faceCodeList[actFaceIdx])
-                singleFaces.append(faceCodeList[actFaceIdx])
-                actFaceIdx += 1
-        else:
-            FreeCAD.Console.PrintMessage(f"Found a last Face: {faceCodeList[actFaceIdx]}\n")
-            singleFaces.append(faceCodeList[actFaceIdx])
-            actFaceIdx += 1
-
-    output_mesh = []
+    skin = get_femmesh_skin(myFemMesh)
+
+    displacements = None
     if myResults:
         FreeCAD.Console.PrintMessage(f"{myResults.Name}\n")
-        for myFace in singleFaces:
-            face_nodes = faceCodeDict[myFace]
-            dispVec0 = myResults.DisplacementVectors[myResults.NodeNumbers.index(face_nodes[0])]
-            dispVec1 = myResults.DisplacementVectors[myResults.NodeNumbers.index(face_nodes[1])]
-            dispVec2 = myResults.DisplacementVectors[myResults.NodeNumbers.index(face_nodes[2])]
-            triangle = [
-                myFemMesh.getNodeById(face_nodes[0]) + dispVec0 * myDispScale,
-                myFemMesh.getNodeById(face_nodes[1]) + dispVec1 * myDispScale,
-                myFemMesh.getNodeById(face_nodes[2]) + dispVec2 * myDispScale,
-            ]
-            output_mesh.extend(triangle)
-            # print("my triangle: ", triangle)
-            if len(face_nodes) == 4:
-                dispVec3 = myResults.DisplacementVectors[myResults.NodeNumbers.index(face_nodes[3])]
-                triangle = [
-                    myFemMesh.getNodeById(face_nodes[2]) + dispVec2 * myDispScale,
-                    myFemMesh.getNodeById(face_nodes[3]) + dispVec3 * myDispScale,
-                    myFemMesh.getNodeById(face_nodes[0]) + dispVec0 * myDispScale,
-                ]
-                output_mesh.extend(triangle)
-                # print("my 2. triangle: ", triangle)
-
-    else:
-        for myFace in singleFaces:
-            face_nodes = faceCodeDict[myFace]
-            triangle = [
-                myFemMesh.getNodeById(face_nodes[0]),
-                myFemMesh.getNodeById(face_nodes[1]),
-                myFemMesh.getNodeById(face_nodes[2]),
-            ]
-            output_mesh.extend(triangle)
-            # print("my triangle: ", triangle)
-            if len(face_nodes) == 4:
-                triangle = [
-                    myFemMesh.getNodeById(face_nodes[2]),
-                    myFemMesh.getNodeById(face_nodes[3]),
-                    myFemMesh.getNodeById(face_nodes[0]),
-                ]
-                output_mesh.extend(triangle)
-                # print("my 2. triangle: ", triangle)
+        displacements = get_skin_displacements(skin, myResults)
+    points = skin.get_points(displacements, myDispScale)
+    output_mesh = [FreeCAD.Vector(*point) for point in points.tolist()]
 
     end_time = time.process_time()
     FreeCAD.Console.PrintMessage(f"Mesh by surface search method: {end_time - start_time}\n")
     # call to mesh_2_femmesh to convert mesh to femmesh before return statement
-    mesh2femmesh = mesh_2_femmesh(myFemMesh, singleFaces, faceCodeDict)
+    mesh2femmesh = mesh_2_femmesh(myFemMesh, skin)
     return output_mesh
 
 
+class FemMeshSkin:
+    """
+    the surface of a FemMesh, the faces of its volume elements without a counterpart
+    or the face elements of a FemMesh without volume elements
+
+    node_ids: the sorted ids of the nodes on the surface
+    coordinates: their coordinates, array (n, 3)
+    triangles: the surface as triangles of indices into node_ids, array (m, 3),
+    quads are split into two triangles
+    """
+
+    def __init__(self, faces, femnode_ids, femnode_coordinates):
+        # faces: node ids of the surface faces in element node order, (k, 3) and (l, 4)
+        tria, quad = faces
+        quad_trias = np.stack((quad[:, [0, 1, 2]], quad[:, [2, 3, 0]]), axis=1).reshape(-1, 3)
+        triangle_nodes = np.concatenate((tria, quad_trias))
+        self.node_ids, triangles = np.unique(triangle_nodes, return_inverse=True)
+        self.triangles = triangles.reshape(-1, 3)
+        positions = np.searchsorted(femnode_ids, self.node_ids)
+        self.coordinates = femnode_coordinates[positions]
+
+    def get_triangle_nodes(self):
+        """node ids of the triangles, array (m, 3)"""
+        return self.node_ids[self.triangles]
+
+    def get_points(self, displacements=None, scale=1):
+        """
+        the corner points of the triangles one after the other, array (3 m, 3)
+        displacements: displacement vectors of the nodes in node_ids, array (n, 3)
+        """
+        coordinates = self.coordinates
+        if displacements is not None:
+            coordinates = coordinates + displacements * scale
+        return coordinates[self.triangles.ravel()]
+
+
+def get_femmesh_skin(femmesh):
+    """
+    returns the FemMeshSkin of femmesh, the skins of the last meshes are kept,
+    thus the skin of an unchanged mesh is found again for all of its results
+    """
+    femnodes = femmesh.Nodes
+    node_ids = np.fromiter(femnodes.keys(), dtype=np.int64, count=len(femnodes))
+    coordinates = np.array([tuple(v) for v in femnodes.values()], dtype=float).reshape(-1, 3)
+    order = np.argsort(node_ids)
+    node_ids = node_ids[order]
+    coordinates = coordinates[order]
+
+    if femmesh.VolumeCount > 0:
+        element_ids = femmesh.Volumes
+        element_faces = face_dicts
+    elif femmesh.FaceCount > 0:
+        element_ids = femmesh.Faces
+        element_faces = shellFaces
+    else:
+        element_ids = ()
+        element_faces = {}
+
+    # the element ids and node positions tell if the mesh is the same
+    key = hashlib.sha1()
+    key.update(node_ids.tobytes())
+    key.update(coordinates.tobytes())
+    key.update(np.array(element_ids, dtype=np.int64).tobytes())
+    key = key.hexdigest()
+    skin = _skin_cache.pop(key, None)
+    if skin is None:
+        elements = [femmesh.getElementNodes(ele) for ele in element_ids]
+        faces = get_single_faces(get_element_faces(elements, element_faces))
+        skin = FemMeshSkin(faces, node_ids, coordinates)
+    _skin_cache[key] = skin
+    while len(_skin_cache) > SKIN_CACHE_SIZE:
+        del _skin_cache[next(iter(_skin_cache))]
+    return skin
+
+
+def get_element_faces(elements, element_faces):
+    """
+    returns the node ids of all faces of the elements, (n, 3) for triangles
+    and (m, 4) for quads, elements is a list of the node ids of the elements
+    element_faces: faces of the elements by their node count, like face_dicts
+    """
+    faces = {3: [], 4: []}
+    node_counts = np.fromiter(map(len, elements), dtype=np.int64, count=len(elements))
+    for node_count in np.unique(node_counts).tolist():
+        element_nodes = np.array(
+            [nodes for nodes in elements if len(nodes) == node_count], dtype=np.int64
+        )
+        for face_nodes in element_faces[node_count].values():
+            faces[len(face_nodes)].append(element_nodes[:, face_nodes])
+    return [
+        np.concatenate(faces[size]) if faces[size] else np.empty((0, size), dtype=np.int64)
+        for size in (3, 4)
+    ]
+
+
+def get_single_faces(faces):
+    """
+    returns the faces without a counterpart sorted by their node ids, of faces found
+    an odd number of times one is returned, faces are node id arrays like get_element_faces
+    """
+    single_faces = []
+    for face_nodes in faces:
+        sorted_nodes = np.sort(face_nodes, axis=1)
+        # the highest node id is the primary sort key, see lexsort
+        order = np.lexsort(sorted_nodes.T)
+        sorted_nodes = sorted_nodes[order]
+        first = np.ones(len(sorted_nodes), dtype=bool)
+        first[1:] = (sorted_nodes[1:] != sorted_nodes[:-1]).any(axis=1)
+        starts = np.flatnonzero(first)
+        counts = np.diff(np.append(starts, len(sorted_nodes)))
+        # lexsort is stable, the last one of equal faces is the one of the last element
+        last = (starts + counts - 1)[counts % 2 == 1]
+        single_faces.append(face_nodes[order[last]])
+    return single_faces
+
+
+def get_skin_displacements(skin, result):
+    """displacement vectors of the result for the nodes of the skin, array (n, 3)"""
+    node_numbers = np.array(result.NodeNumbers, dtype=np.int64)
+    displacements = np.array([tuple(v) for v in result.DisplacementVectors], dtype=float).reshape(
+        -1, 3
+    )
+    order = np.argsort(node_numbers)
+    sorted_numbers = node_numbers[order]
+    positions = np.searchsorted(sorted_numbers, skin.node_ids)
+    found = positions < len(sorted_numbers)
+    found[found] = sorted_numbers[positions[found]] == skin.node_ids[found]
+    if not found.all():
+        node = skin.node_ids[np.flatnonzero(~found)[0]]
+        raise ValueError(f"Node {node} of the mesh surface has no result in {result.Name}")
+    return displacements[order[positions]]
+
+
 # additional function to convert mesh to femmesh
-def mesh_2_femmesh(myFemMesh, singleFaces, faceCodeDict):
+def mesh_2_femmesh(myFemMesh, skin):
     start_time = time.process_time()
     femmesh = Fem.FemMesh()
-    myfemmesh = myFemMesh.Nodes
-    # nodes contains the nodes that are used
-    nodes = {}
-    for myFace in singleFaces:
-        face_nodes = faceCodeDict[myFace]
-        for j in (0, 1, 2):
-            try:
-                nodes[face_nodes[j]] += 1
-            except:
-                nodes[face_nodes[j]] = 0
-        if len(face_nodes) == 4:
-            j = 3
-            try:
-                nodes[face_nodes[j]] += 1
-            except:
-                nodes[face_nodes[j]] = 0
-    sfNode = femmesh.addNode
-    sfFace = femmesh.addFace
-    for key in myFemMesh.Nodes:
-        mynode = myfemmesh[key]
-        try:
-            if nodes[key] >= 0:
-                sfNode(mynode[0], mynode[1], mynode[2], key)
-        except:
-            pass
-
-    output_mesh = []
-
-    for myFace in singleFaces:
-        face_nodes = faceCodeDict[myFace]
-        sfFace(face_nodes[0], face_nodes[1], face_nodes[2])
-        if len(face_nodes) == 4:
-            sfFace(face_nodes[2], face_nodes[3], face_nodes[0])
+    # only the nodes of the surface are used
+    femmesh.addNodes(skin.node_ids, skin.coordinates)
+    triangles = skin.get_triangle_nodes()
+    femmesh.addElements("Face", np.arange(1, len(triangles) + 1), triangles)
     obj = FreeCAD.ActiveDocument.addObject("Fem::FemMeshObject", "Mesh2Fem")
     obj.FemMesh = femmesh
     end_time = time.process_time()
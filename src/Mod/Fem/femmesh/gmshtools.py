@@ -52,6 +52,120 @@ class GmshError(Exception):
     pass
 
 
+# the BREP files written in the session { file path : (shape key, size, modification time) }
+_brep_files = {}
+
+# the FemMesh element type and the node order of the Gmsh element types of FreeCAD meshes
+# the node order is the one of the Gmsh VTK export followed by the VTK import of FemMesh
+GMSH_ELEMENT_TYPES = {
+    1: ("Edge", [0, 1]),  # seg2
+    8: ("Edge", [0, 1, 2]),  # seg3
+    2: ("Face", [0, 1, 2]),  # tria3
+    9: ("Face", [0, 1, 2, 3, 4, 5]),  # tria6
+    3: ("Face", [0, 1, 2, 3]),  # quad4
+    16: ("Face", [0, 1, 2, 3, 4, 5, 6, 7]),  # quad8
+    4: ("Volume", [0, 2, 1, 3]),  # tetra4
+    11: ("Volume", [0, 2, 1, 3, 6, 5, 4, 7, 8, 9]),  # tetra10
+    5: ("Volume", [0, 3, 2, 1, 4, 7, 6, 5]),  # hexa8
+    17: ("Volume", [0, 3, 2, 1, 4, 7, 6, 5, 9, 13, 11, 8, 17, 19, 18, 16, 10, 15, 14, 12]),
+    6: ("Volume", [0, 1, 2, 3, 4, 5]),  # penta6
+    18: ("Volume", [0, 1, 2, 3, 4, 5, 6, 9, 7, 12, 14, 13, 8, 10, 11]),  # penta15
+    7: ("Volume", [0, 3, 2, 1, 4]),  # pyra5
+    19: ("Volume", [0, 3, 2, 1, 4, 6, 10, 8, 5, 7, 12, 11, 9]),  # pyra13
+}
+GMSH_POINT_TYPE = 15
+GMSH_GROUP_TYPES = {0: "Node", 1: "Edge", 2: "Face", 3: "Volume"}
+
+
+def has_gmsh_api():
+    """True if the Gmsh Python API is switched on in the preferences and its module is importable"""
+    if not FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Gmsh").GetBool(
+        "UseGmshPythonApi", False
+    ):
+        return False
+    try:
+        import gmsh  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_shape_key(shape, placement):
+    """key of a shape for the BREP export cache
+
+    The hash code of a shape is the one of its topology data, which is kept
+    as long as the shape is not recomputed. Thus the key is only valid in the
+    session. The bounding box, the volume, the area and the counts of the
+    sub shapes guard against a reused hash code.
+    """
+    bb = shape.BoundBox
+    return repr(
+        (
+            shape.hashCode(),
+            shape.ShapeType,
+            (bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax),
+            shape.Volume,
+            shape.Area,
+            (len(shape.Solids), len(shape.Faces), len(shape.Edges), len(shape.Vertexes)),
+            tuple(placement.Matrix.A),
+        )
+    )
+
+
+def get_femmesh_from_gmsh(gmsh):
+    """makes a FemMesh of the mesh of the current model of the Gmsh Python API
+
+    The nodes and elements are numbered the way the VTK export of Gmsh does, thus
+    the mesh is the same as the one read from the VTK file Gmsh saves. The points
+    of the vertices are not added, their numbers are skipped. The physical groups
+    are added as mesh groups, the ones of vertices as node groups.
+    """
+    node_tags, coords, _ = gmsh.model.mesh.getNodes()
+    node_tags = np.asarray(node_tags, dtype=np.int64)
+    node_ids = np.zeros(node_tags.max() + 1 if len(node_tags) else 1, dtype=np.int64)
+    node_ids[node_tags] = np.arange(1, len(node_tags) + 1)
+    fem_mesh = Fem.FemMesh()
+    if not len(node_tags):
+        return fem_mesh
+    fem_mesh.addNodes(
+        np.arange(1, len(node_tags) + 1, dtype=np.int64),
+        np.ascontiguousarray(np.asarray(coords, dtype=np.float64).reshape(-1, 3)),
+    )
+
+    entity_elements = {}
+    next_id = 1
+    for dim, tag in gmsh.model.getEntities():
+        ele_types, ele_tags, ele_nodes = gmsh.model.mesh.getElements(dim, tag)
+        entity_ids = []
+        for ele_type, tags, nodes in zip(ele_types, ele_tags, ele_nodes):
+            ids = np.arange(next_id, next_id + len(tags), dtype=np.int64)
+            next_id += len(tags)
+            if ele_type in GMSH_ELEMENT_TYPES:
+                element_type, order = GMSH_ELEMENT_TYPES[ele_type]
+                nodes = node_ids[np.asarray(nodes, dtype=np.int64)].reshape(len(tags), -1)
+                fem_mesh.addElements(element_type, ids, np.ascontiguousarray(nodes[:, order]))
+                entity_ids.append(ids)
+            elif ele_type != GMSH_POINT_TYPE:
+                name = gmsh.model.mesh.getElementProperties(ele_type)[0]
+                Console.PrintWarning(f"  Gmsh element type {name} is not supported.\n")
+        entity_elements[(dim, tag)] = entity_ids
+
+    for dim, tag in gmsh.model.getPhysicalGroups():
+        name = gmsh.model.getPhysicalName(dim, tag) or str(tag)
+        if dim == 0:
+            ids = node_ids[np.asarray(gmsh.model.mesh.getNodesForPhysicalGroup(dim, tag)[0])]
+        else:
+            ids = [
+                entity_ids
+                for entity in gmsh.model.getEntitiesForPhysicalGroup(dim, tag)
+                for entity_ids in entity_elements[(dim, entity)]
+            ]
+            ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+        group = fem_mesh.addGroup(name, GMSH_GROUP_TYPES[dim])
+        fem_mesh.addGroupElements(group, ids.tolist())
+    return fem_mesh
+
+
 class GmshTools(ObjectTools):
 
     name = "Gmsh"
@@ -294,6 +408,67 @@ class GmshTools(ObjectTools):
         # for backward compatibility only
         self.run(True)
 
+    def run(self, blocking=False):
+        # blocking runs use the Gmsh Python API if available, the log task panel needs the process
+        if blocking and has_gmsh_api():
+            return self.run_gmsh_api()
+        return super().run(blocking)
+
+    def run_gmsh_api(self):
+        """meshes with the Gmsh Python API in the FreeCAD process
+
+        The geo file is the same as the one for the Gmsh binary, without meshing
+        and saving. It is opened by Gmsh in process, the mesh is generated and
+        its node and element arrays are added to the FemMesh, no mesh file is
+        written and read. Adaptive meshing by result views needs the Gmsh binary.
+        """
+        import gmsh
+
+        self.load_properties()
+        self.update_mesh_data()
+        if self.result_view_settings:
+            return super().run(True)
+        self.get_tmp_file_paths()
+        self.write_part_file()
+        self.write_geo(mesh_commands=False)
+
+        if not gmsh.isInitialized():
+            gmsh.initialize(readConfigFiles=False, interruptible=False)
+        log_level = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Gmsh").GetString(
+            "LogVerbosity", "3"
+        )
+        gmsh.option.setNumber("General.Verbosity", int(log_level))
+        gmsh.clear()
+        gmsh.logger.start()
+        self.error = False
+        try:
+            gmsh.open(self.model_file)
+            gmsh.model.mesh.generate(int(self.dimension))
+            if self.obj.CoherenceMesh:
+                gmsh.model.mesh.removeDuplicateNodes()
+            fem_mesh = get_femmesh_from_gmsh(gmsh)
+        except Exception as e:
+            Console.PrintError(f"Gmsh meshing failed: {e}\n")
+            self.error = True
+        finally:
+            for message in gmsh.logger.get():
+                if message.startswith("Error"):
+                    Console.PrintError(message + "\n")
+                elif message.startswith("Warning"):
+                    Console.PrintWarning(message + "\n")
+                else:
+                    Console.PrintLog(message + "\n")
+            gmsh.logger.stop()
+            gmsh.clear()
+
+        if self.error:
+            Console.PrintError("No mesh was created.\n")
+            return False
+        self.obj.FemMesh = fem_mesh
+        self.postprocess_groups()
+        Console.PrintMessage("  New mesh was added to the mesh object.\n")
+        return True
+
     def start_logs(self):
         Console.PrintLog("\nGmsh FEM mesh run is being started.\n")
         Console.PrintLog(
@@ -1602,12 +1777,45 @@ class GmshTools(ObjectTools):
     def write_part_file(self):
         global_pla = self.part_obj.getGlobalPlacement()
         geom = self.part_obj.getPropertyOfGeometry()
+        # the BREP file of an unchanged shape is not exported again
+        shape_key = get_shape_key(geom, global_pla)
+        if self._is_current_part_file(shape_key):
+            Console.PrintLog("  Geometry unchanged, the BREP file is reused.\n")
+            return
         # get partner shape
         geom_trans = geom.transformed(FreeCAD.Placement().Matrix)
         geom_trans.Placement = global_pla
         geom_trans.exportBrep(self.temp_file_geometry)
+        stat = os.stat(self.temp_file_geometry)
+        _brep_files[self.temp_file_geometry] = (shape_key, stat.st_size, stat.st_mtime_ns)
 
-    def write_geo(self):
+    def _is_current_part_file(self, shape_key):
+        # the BREP file of the shape is in the working directory or is copied from another one
+        for path, entry in list(_brep_files.items()):
+            if entry[0] != shape_key:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del _brep_files[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != entry[1:]:
+                del _brep_files[path]
+                continue
+            if path == self.temp_file_geometry:
+                return True
+            try:
+                shutil.copyfile(path, self.temp_file_geometry)
+            except OSError as e:
+                Console.PrintLog(f"  BREP file {path} not reused: {e}\n")
+                return False
+            stat = os.stat(self.temp_file_geometry)
+            _brep_files[self.temp_file_geometry] = (shape_key, stat.st_size, stat.st_mtime_ns)
+            return True
+        return False
+
+    def write_geo(self, mesh_commands=True):
+        # without mesh_commands the geo file does not mesh and save, used by the Gmsh Python API
         temp_dir = os.path.dirname(self.model_file)
         geo = open(self.model_file, "w")
         geo.write("// geo file for meshing with Gmsh meshing software created by FreeCAD\n")
@@ -1758,6 +1966,16 @@ class GmshTools(ObjectTools):
         geo.write("Mesh.SubdivisionAlgorithm = " + self.SubdivisionAlgorithm + ";\n")
         geo.write("\n")
 
+        if not mesh_commands:
+            if self.obj.CoherenceMesh:
+                geo.write(
+                    "Geometry.Tolerance = {}; // set geometrical "
+                    "tolerance (also used for merging nodes)\n".format(self.geotol)
+                )
+            geo.write("// meshing by the Gmsh Python API\n")
+            geo.close()
+            return
+
         geo.write("// meshing\n")
         # remove duplicate vertices
         # see https://forum.freecad.org/viewtopic.php?f=18&t=21571&start=20#p179443
@@ -0,0 +1,440 @@
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Element quality of a FEM mesh, computed for all elements of a kind at once.
+
+The quality measures of an element are:
+
+- jacobian ratio: the minimum divided by the maximum absolute determinant of
+  the Jacobian at the integration points. An element with a ratio of 0.0 or
+  less has a nonpositive Jacobian, CalculiX stops on such an element.
+  The Jacobian of a face is taken in direction of its normal at the center.
+- aspect ratio: the length of the longest corner edge divided by the length
+  of the shortest one.
+- skewness: the equiangular skewness of the corner angles of the (element)
+  faces, 0.0 for an equilateral triangle or a square, 1.0 for a degenerated one.
+- minimum dihedral angle: the smallest angle between two faces of a tetrahedron
+  in degrees, NaN for all other elements.
+
+Tetra4, tetra10, hexa8, hexa20, tria3, tria6, quad4 and quad8 elements are
+checked, all other elements are counted as unchecked.
+
+Example::
+
+    from femmesh import meshquality
+    report = meshquality.check_mesh_quality(doc.FEMMeshGmsh.FemMesh)
+    report.print_summary()
+    bad = report.get_bad_elements(max_aspect_ratio=10.0)
+"""
+
+__title__ = "FreeCAD FEM mesh quality"
+__author__ = "FreeCAD FEM developers"
+__url__ = "https://www.freecad.org"
+
+## \addtogroup FEM
+#  @{
+
+import numpy as np
+
+import FreeCAD
+
+from femmesh import meshtools
+
+# elements checked at once, bounds the memory of the Jacobian arrays
+CHUNK_SIZE = 100000
+
+# default limits of get_bad_elements
+MAX_ASPECT_RATIO = 20.0
+MAX_SKEWNESS = 0.95
+MIN_DIHEDRAL_ANGLE = 5.0
+
+_G2 = 1.0 / np.sqrt(3.0)
+_GAUSS_LINE = ((-_G2, 1.0), (_G2, 1.0))
+_TET_A = 0.5854101966249685
+_TET_B = 0.1381966011250105
+
+
+def _tetra_shape(p):
+    r, s, t = p[:, 0], p[:, 1], p[:, 2]
+    return np.stack((1.0 - r - s - t, r, s, t), axis=1)
+
+
+def _tetra10_shape(p):
+    L = _tetra_shape(p)
+    corners = L * (2.0 * L - 1.0)
+    edges = ((0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3))
+    mids = np.stack([4.0 * L[:, i] * L[:, j] for i, j in edges], axis=1)
+    return np.concatenate((corners, mids), axis=1)
+
+
+_HEXA_CORNERS = np.array(
+    [
+        (-1, -1, -1),
+        (1, -1, -1),
+        (1, 1, -1),
+        (-1, 1, -1),
+        (-1, -1, 1),
+        (1, -1, 1),
+        (1, 1, 1),
+        (-1, 1, 1),
+    ],
+    dtype=float,
+)
+_HEXA20_MIDS = np.array(
+    [(0, -1, -1), (1, 0, -1), (0, 1, -1), (-1, 0, -1), (0, -1, 1), (1, 0, 1), (0, 1, 1), (-1, 0, 1)]
+    + [(-1, -1, 0), (1, -1, 0), (1, 1, 0), (-1, 1, 0)],
+    dtype=float,
+)
+
+
+def _hexa_shape(p):
+    return np.prod(1.0 + p[:, None, :] * _HEXA_CORNERS[None, :, :], axis=2) / 8.0
+
+
+def _hexa20_shape(p):
+    a = p[:, None, :] * _HEXA_CORNERS[None, :, :]
+    corners = np.prod(1.0 + a, axis=2) * (a.sum(axis=2) - 2.0) / 8.0
+    m = _HEXA20_MIDS[None, :, :]
+    # the midside node factor is 1 - x^2 in its zero direction, 1 + x xi otherwise
+    factors = np.where(m == 0.0, 1.0 - p[:, None, :] ** 2, 1.0 + p[:, None, :] * m)
+    mids = np.prod(factors, axis=2) / 4.0
+    return np.concatenate((corners, mids), axis=1)
+
+
+def _tria_shape(p):
+    r, s = p[:, 0], p[:, 1]
+    return np.stack((1.0 - r - s, r, s), axis=1)
+
+
+def _tria6_shape(p):
+    L = _tria_shape(p)
+    corners = L * (2.0 * L - 1.0)
+    mids = np.stack([4.0 * L[:, i] * L[:, j] for i, j in ((0, 1), (1, 2), (2, 0))], axis=1)
+    return np.concatenate((corners, mids), axis=1)
+
+
+_QUAD_CORNERS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=float)
+_QUAD8_MIDS = np.array([(0, -1), (1, 0), (0, 1), (-1, 0)], dtype=float)
+
+
+def _quad_shape(p):
+    return np.prod(1.0 + p[:, None, :] * _QUAD_CORNERS[None, :, :], axis=2) / 4.0
+
+
+def _quad8_shape(p):
+    a = p[:, None, :] * _QUAD_CORNERS[None, :, :]
+    corners = np.prod(1.0 + a, axis=2) * (a.sum(axis=2) - 1.0) / 4.0
+    m = _QUAD8_MIDS[None, :, :]
+    factors = np.where(m == 0.0, 1.0 - p[:, None, :] ** 2, 1.0 + p[:, None, :] * m)
+    mids = np.prod(factors, axis=2) / 2.0
+    return np.concatenate((corners, mids), axis=1)
+
+
+def _get_gauss_points(dim):
+    return np.array(np.meshgrid(*dim * [[-_G2, _G2]], indexing="ij")).reshape(dim, -1).T
+
+
+_TETRA_GAUSS = np.array(
+    [(_TET_B, _TET_B, _TET_B), (_TET_A, _TET_B, _TET_B), (_TET_B, _TET_A, _TET_B)]
+    + [(_TET_B, _TET_B, _TET_A)]
+)
+_TRIA_GAUSS = np.array([(1 / 6, 1 / 6), (2 / 3, 1 / 6), (1 / 6, 2 / 3)])
+
+_TETRA_FACES = ((0, 1, 2), (0, 1, 3), (1, 2, 3), (0, 2, 3))
+_TETRA_EDGES = ((0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3))
+_HEXA_FACES = ((0, 1, 2, 3), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7))
+_HEXA_EDGES = (
+    (0, 1),
+    (1, 2),
+    (2, 3),
+    (3, 0),
+    (4, 5),
+    (5, 6),
+    (6, 7),
+    (7, 4),
+    (0, 4),
+    (1, 5),
+    (2, 6),
+    (3, 7),
+)
+
+
+# the element kinds checked { (FemMesh element type, node count) : kind }
+# a kind is (name, shape function, integration points, node order, corner faces, corner edges)
+# the node order gives the nodes in the order of the shape functions (CalculiX order)
+ELEMENT_KINDS = {
+    ("Volume", 4): ("tetra4", _tetra_shape, _TETRA_GAUSS, [1, 0, 2, 3], _TETRA_FACES, _TETRA_EDGES),
+    ("Volume", 10): (
+        "tetra10",
+        _tetra10_shape,
+        _TETRA_GAUSS,
+        [1, 0, 2, 3, 4, 6, 5, 8, 7, 9],
+        _TETRA_FACES,
+        _TETRA_EDGES,
+    ),
+    ("Volume", 8): (
+        "hexa8",
+        _hexa_shape,
+        _get_gauss_points(3),
+        [7, 4, 5, 6, 3, 0, 1, 2],
+        _HEXA_FACES,
+        _HEXA_EDGES,
+    ),
+    ("Volume", 20): (
+        "hexa20",
+        _hexa20_shape,
+        _get_gauss_points(3),
+        [7, 4, 5, 6, 3, 0, 1, 2, 15, 12, 13, 14, 11, 8, 9, 10, 19, 16, 17, 18],
+        _HEXA_FACES,
+        _HEXA_EDGES,
+    ),
+    ("Face", 3): ("tria3", _tria_shape, _TRIA_GAUSS, None, ((0, 1, 2),), ((0, 1), (1, 2), (2, 0))),
+    ("Face", 6): ("tria6", _tria6_shape, _TRIA_GAUSS, None, ((0, 1, 2),), ((0, 1), (1, 2), (2, 0))),
+    ("Face", 4): (
+        "quad4",
+        _quad_shape,
+        _get_gauss_points(2),
+        None,
+        ((0, 1, 2, 3),),
+        ((0, 1), (1, 2), (2, 3), (3, 0)),
+    ),
+    ("Face", 8): (
+        "quad8",
+        _quad8_shape,
+        _get_gauss_points(2),
+        None,
+        ((0, 1, 2, 3),),
+        ((0, 1), (1, 2), (2, 3), (3, 0)),
+    ),
+}
+
+# the derivatives of the shape functions at the integration points { name : array }
+_shape_derivatives = {}
+
+
+def _get_shape_derivatives(name, shape, points):
+    # central differences, they are exact for the at most quadratic terms in each direction
+    dN = _shape_derivatives.get(name)
+    if dN is None:
+        h = 1e-4
+        dN = np.stack(
+            [
+                (shape(points + h * e) - shape(points - h * e)) / (2.0 * h)
+                for e in np.eye(points.shape[1])
+            ],
+            axis=1,
+        )
+        _shape_derivatives[name] = dN
+    return dN
+
+
+class MeshQualityReport:
+    """the quality measures of the checked elements of a mesh, see the module documentation
+
+    The measures are NumPy arrays in the order of element_ids, kinds gives the
+    element kind name of every element.
+    """
+
+    def __init__(self):
+        self.element_ids = np.empty(0, dtype=np.int64)
+        self.kinds = np.empty(0, dtype=object)
+        self.jacobian_ratio = np.empty(0)
+        self.aspect_ratio = np.empty(0)
+        self.skewness = np.empty(0)
+        self.min_dihedral_angle = np.empty(0)
+        self.unchecked_count = 0
+        self.check_time = 0.0
+
+    def __len__(self):
+        return len(self.element_ids)
+
+    def add(self, name, ids, jacobian_ratio, aspect_ratio, skewness, min_dihedral_angle):
+        self.element_ids = np.concatenate((self.element_ids, ids))
+        self.kinds = np.concatenate((self.kinds, np.full(len(ids), name, dtype=object)))
+        self.jacobian_ratio = np.concatenate((self.jacobian_ratio, jacobian_ratio))
+        self.aspect_ratio = np.concatenate((self.aspect_ratio, aspect_ratio))
+        self.skewness = np.concatenate((self.skewness, skewness))
+        self.min_dihedral_angle = np.concatenate((self.min_dihedral_angle, min_dihedral_angle))
+
+    def get_nonpositive_jacobian_elements(self):
+        """sorted list of the ids of the elements with a nonpositive Jacobian"""
+        return sorted(self.element_ids[self.jacobian_ratio <= 0.0].tolist())
+
+    def is_valid(self):
+        """True if no element has a nonpositive Jacobian"""
+        return not np.any(self.jacobian_ratio <= 0.0)
+
+    def get_bad_elements(
+        self,
+        max_aspect_ratio=MAX_ASPECT_RATIO,
+        max_skewness=MAX_SKEWNESS,
+        min_dihedral_angle=MIN_DIHEDRAL_ANGLE,
+    ):
+        """sorted list of the ids of the elements with a nonpositive Jacobian or a measure
+        beyond one of the limits"""
+        with np.errstate(invalid="ignore"):
+            bad = (
+                (self.jacobian_ratio <= 0.0)
+                | (self.aspect_ratio > max_aspect_ratio)
+                | (self.skewness > max_skewness)
+                | (self.min_dihedral_angle < min_dihedral_angle)
+            )
+        return sorted(self.element_ids[bad].tolist())
+
+    def get_summary(self):
+        """text with the element count and the worst measures of every element kind"""
+        lines = [
+            "Mesh quality: {} elements checked, {} unchecked, in {:.3f} seconds.".format(
+                len(self), self.unchecked_count, self.check_time
+            )
+        ]
+        for name in dict.fromkeys(self.kinds.tolist()):
+            mask = self.kinds == name
+            line = (
+                "    {}: {} elements, min jacobian ratio {:.3g}, max aspect ratio {:.3g}, "
+                "max skewness {:.3g}".format(
+                    name,
+                    np.count_nonzero(mask),
+                    self.jacobian_ratio[mask].min(),
+                    self.aspect_ratio[mask].max(),
+                    self.skewness[mask].max(),
+                )
+            )
+            if name.startswith("tetra"):
+                line += ", min dihedral angle {:.3g}".format(self.min_dihedral_angle[mask].min())
+            lines.append(line)
+        nonpositive = np.count_nonzero(self.jacobian_ratio <= 0.0)
+        if nonpositive:
+            lines.append(f"    {nonpositive} elements with a nonpositive Jacobian.")
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self):
+        if self.is_valid():
+            FreeCAD.Console.PrintMessage(self.get_summary())
+        else:
+            FreeCAD.Console.PrintWarning(self.get_summary())
+
+
+def check_mesh_quality(femmesh, chunk_size=CHUNK_SIZE):
+    """returns the MeshQualityReport of all elements of the FemMesh"""
+    import time
+
+    start = time.perf_counter()
+    node_ids, node_coords, elements = meshtools.get_femmesh_arrays(femmesh)
+    report = check_mesh_arrays_quality(node_ids, node_coords, elements, chunk_size)
+    report.check_time = time.perf_counter() - start
+    return report
+
+
+def check_mesh_arrays_quality(node_ids, node_coords, elements, chunk_size=CHUNK_SIZE):
+    """returns the MeshQualityReport of mesh arrays, see meshtools.get_femmesh_arrays"""
+    report = MeshQualityReport()
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    order = np.argsort(node_ids, kind="stable")
+    sorted_ids = node_ids[order]
+    coords = np.asarray(node_coords, dtype=np.float64)[order]
+    for element_type, ids, nodes in elements:
+        kind = ELEMENT_KINDS.get((element_type, nodes.shape[1]))
+        if kind is None:
+            report.unchecked_count += len(ids)
+            continue
+        name, shape, points, node_order, faces, edges = kind
+        if node_order is not None:
+            nodes = nodes[:, node_order]
+        for start in range(0, len(ids), chunk_size):
+            # node coordinates of the elements, (elements, nodes, 3)
+            index = meshtools.renumber_nodes(sorted_ids, nodes[start : start + chunk_size]) - 1
+            X = coords[index]
+            report.add(
+                name,
+                ids[start : start + chunk_size],
+                _get_jacobian_ratio(X, _get_shape_derivatives(name, shape, points)),
+                _get_aspect_ratio(X, edges),
+                _get_skewness(X, faces),
+                _get_min_dihedral_angle(X) if name.startswith("tetra") else np.full(len(X), np.nan),
+            )
+    return report
+
+
+def _get_jacobian_ratio(X, dN):
+    # Jacobians at the integration points, (elements, points, dim, 3)
+    J = np.einsum("pdn,enk->epdk", dN, X)
+    if J.shape[2] == 3:
+        det = np.linalg.det(J)
+    else:
+        # faces: the area Jacobian in direction of the normal at the center
+        normals = np.cross(J[:, :, 0, :], J[:, :, 1, :])
+        center = normals.sum(axis=1)
+        center /= np.maximum(np.linalg.norm(center, axis=1), 1e-300)[:, None]
+        det = np.einsum("epk,ek->ep", normals, center)
+    scale = np.abs(det).max(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = det.min(axis=1) / scale
+    return np.where(scale > 0.0, ratio, 0.0)
+
+
+def _get_aspect_ratio(X, edges):
+    i, j = np.array(edges).T
+    lengths = np.linalg.norm(X[:, j] - X[:, i], axis=2)
+    shortest = lengths.min(axis=1)
+    with np.errstate(divide="ignore"):
+        return np.where(shortest > 0.0, lengths.max(axis=1) / shortest, np.inf)
+
+
+def _get_skewness(X, faces):
+    # corner angles of all faces, in degrees
+    angles = []
+    for face in faces:
+        corners = np.array(face)
+        prev = X[:, np.roll(corners, 1)] - X[:, corners]
+        next = X[:, np.roll(corners, -1)] - X[:, corners]
+        angles.append(_get_angles(prev, next))
+    angles = np.concatenate(angles, axis=1)
+    equal = 60.0 if len(faces[0]) == 3 else 90.0
+    return np.maximum(
+        (angles.max(axis=1) - equal) / (180.0 - equal), (equal - angles.min(axis=1)) / equal
+    )
+
+
+def _get_min_dihedral_angle(X):
+    # angle at the edge (i, j) between the faces (i, j, k) and (i, j, l)
+    angles = []
+    for i, j in _TETRA_EDGES:
+        k, m = [n for n in range(4) if n not in (i, j)]
+        e = X[:, j] - X[:, i]
+        e /= np.maximum(np.linalg.norm(e, axis=1), 1e-300)[:, None]
+        u = X[:, k] - X[:, i]
+        v = X[:, m] - X[:, i]
+        u -= np.einsum("ek,ek->e", u, e)[:, None] * e
+        v -= np.einsum("ek,ek->e", v, e)[:, None] * e
+        angles.append(_get_angles(u[:, None], v[:, None]))
+    return np.concatenate(angles, axis=1).min(axis=1)
+
+
+def _get_angles(a, b):
+    # angles between the vectors of the last axis, in degrees
+    norms = np.linalg.norm(a, axis=-1) * np.linalg.norm(b, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cos = np.einsum("...k,...k->...", a, b) / norms
+    return np.degrees(np.arccos(np.clip(np.nan_to_num(cos, nan=1.0), -1.0, 1.0)))
+
+
+##  @}
@@ -0,0 +1,161 @@
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FreeCAD FEM mesh sets cache"
+__author__ = "FreeCAD FEM developers"
+__url__ = "https://www.freecad.org"
+
+## \addtogroup FEM
+#  @{
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+import FreeCAD
+
+from femmesh import meshtools
+from femtools import femutils
+
+# the caches of the analyses of the session
+# { (document name, analysis name) : MeshSetsCache }
+_analysis_caches = {}
+
+
+class MeshSetsCache:
+    """cache of the node sets and element sets the reference shapes resolve to
+
+    The sets are keyed on (mesh hash, reference shape hash, set type).
+    The set type is "Node" for node sets and starts with "Element" for
+    element sets, it contains the digest of the subelement masks used.
+    Only the sets of one mesh are kept, if the mesh changes the cache is cleared.
+    If a file_name is given the cache is read from and saved to this file.
+    """
+
+    version = 1
+
+    def __init__(self, file_name=""):
+        self.file_name = file_name
+        self.mesh_hash = ""
+        self.sets = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.file_name:
+            self.load()
+
+    def set_mesh(self, mesh_hash):
+        if mesh_hash != self.mesh_hash:
+            self.mesh_hash = mesh_hash
+            self.sets = {}
+
+    def get(self, ref_hash, set_type):
+        key = self._get_key(ref_hash, set_type)
+        # the sets getter may run its steps in threads, the counters are shared
+        with self._lock:
+            if key in self.sets:
+                self.hits += 1
+                return self.sets[key]
+            self.misses += 1
+        return None
+
+    def add(self, ref_hash, set_type, value):
+        self.sets[self._get_key(ref_hash, set_type)] = value
+
+    def load(self):
+        if not os.path.isfile(self.file_name):
+            return
+        try:
+            with open(self.file_name) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            FreeCAD.Console.PrintWarning(f"Mesh sets cache {self.file_name} not read: {e}\n")
+            return
+        if data.get("version") == self.version:
+            self.mesh_hash = data["mesh"]
+            self.sets = data["sets"]
+
+    def save(self):
+        if not self.file_name:
+            return
+        data = {"version": self.version, "mesh": self.mesh_hash, "sets": self.sets}
+        try:
+            with open(self.file_name, "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            FreeCAD.Console.PrintWarning(f"Mesh sets cache {self.file_name} not saved: {e}\n")
+
+    def _get_key(self, ref_hash, set_type):
+        return f"{self.mesh_hash}:{ref_hash}:{set_type}"
+
+
+def get_analysis_cache(analysis):
+    """returns the MeshSetsCache of the analysis
+
+    The cache lives as long as the session. If the document is saved and the
+    preference KeepMeshSetsCache is set, the cache is kept in the file
+    MeshSets.json in the directory beside the document named by the analysis
+    label and thus is available on later sessions or for other processes too.
+    """
+    key = (analysis.Document.Name, analysis.Name)
+    file_name = ""
+    keep = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/General").GetBool(
+        "KeepMeshSetsCache", False
+    )
+    if keep and analysis.Document.FileName:
+        file_name = os.path.join(femutils.get_beside_dir(analysis), "MeshSets.json")
+    cache = _analysis_caches.get(key)
+    if cache is None or cache.file_name != file_name:
+        cache = MeshSetsCache(file_name)
+        _analysis_caches[key] = cache
+    return cache
+
+
+def get_femmesh_hash(femnodes_mesh, femnodes_ele_table):
+    """the mesh hash is the digest of the node coordinates and the element table"""
+    digest = hashlib.sha1(femnodes_ele_table.digest.encode())
+    digest.update(np.array([tuple(femnodes_mesh[n]) for n in femnodes_ele_table.node_ids.tolist()]))
+    return digest.hexdigest()
+
+
+def get_refshape_hash(references):
+    """the reference shape hash is the digest of the breps of the reference
+    sub shapes at their global placement, see meshtools.get_femnodes_by_refshape()
+    """
+    digest = hashlib.sha1()
+    for ref_obj, sub_refs in references:
+        for sub_ref in sub_refs:
+            sub_shape = meshtools.sub_shape_at_global_placement(ref_obj, sub_ref)
+            digest.update(sub_shape.ShapeType.encode())
+            digest.update(sub_shape.exportBrepToString().encode())
+    return digest.hexdigest()
+
+
+def get_masks_hash(*masks):
+    """digest of the subelement masks, they define the element sets of subelements"""
+    return hashlib.sha1(json.dumps(masks, sort_keys=True).encode()).hexdigest()
+
+
+##  @}
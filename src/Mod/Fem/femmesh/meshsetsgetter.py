@@ -32,6 +32,7 @@ import time
 
 import FreeCAD
 
+from femmesh import meshsetscache
 from femmesh import meshtools
 from femtools.femutils import type_of_obj
 
@@ -94,6 +95,9 @@ class MeshSetsGetter:
         self.femelement_edges_table = {}
         self.femelement_count_test = True
         self.mat_geo_sets = []
+        self.sets_cache = None
+        self.sets_cache_element_type = ""
+        self.workers = 1
 
         # subelements masks
         self.edge_masks = {
@@ -215,7 +219,15 @@ class MeshSetsGetter:
     # ********************************************************************************************
     # get all known sets
 
-    def get_mesh_sets(self):
+    def get_mesh_sets(self, workers=None):
+        """get all known sets
+
+        The sets of the material and element geometry element sets are got first,
+        they fill the face and edge tables of the mesh. All other steps only read
+        the mesh tables and write into their own femobj dicts, thus they are run
+        on a pool of threads if workers > 1. The number of workers is taken from
+        the FEM general preferences if not given, it is 1 (serial) by default.
+        """
 
         FreeCAD.Console.PrintMessage("\n")  # because of time print in separate line
         FreeCAD.Console.PrintMessage(
@@ -225,45 +237,156 @@ class MeshSetsGetter:
             "MeshSetsGetter: Get mesh data for "
             "node sets (groups), surface sets (groups) and element sets (groups)\n"
         )
+        if workers is None:
+            workers = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/General").GetInt(
+                "MeshSetsWorkers", 1
+            )
+        # the node load tables of the force constraints use the same workers
+        self.workers = workers
+
+        time_start = time.perf_counter()
 
-        time_start = time.process_time()
+        # node and element sets of unchanged reference shapes on an unchanged mesh
+        # are taken from the sets cache of the analysis
+        if self.mesh_object:
+            self.sets_cache = meshsetscache.get_analysis_cache(self.analysis)
+            self.sets_cache.set_mesh(
+                meshsetscache.get_femmesh_hash(self.femnodes_mesh, self.femnodes_ele_table)
+            )
+            self.sets_cache_element_type = "Element" + meshsetscache.get_masks_hash(
+                self.face_masks, self.edge_masks
+            )
+            cache_hits = self.sets_cache.hits
 
         # materials and element geometry element sets getter
-        self.get_element_sets_material_and_femelement_geometry()
-        self.get_materials_elements()
-        self.get_shell_elements()
-        self.get_beam_elements()
-        self.get_rotation1D_elements()
-
-        # constraints element sets getter
-        self.get_constraints_centrif_elements()
-        self.get_constraints_bodyheatsource_elements()
-
-        # constraints node sets getter
-        self.get_constraints_fixed_nodes()
-        self.get_constraints_displacement_nodes()
-        self.get_constraints_rigidbody_nodes()
-        self.get_constraints_planerotation_nodes()
-
-        # constraints surface sets getter
-        self.get_constraints_contact_faces()
-        self.get_constraints_tie_faces()
-        self.get_constraints_sectionprint_faces()
-        self.get_constraints_transform_nodes()
-        self.get_constraints_temperature_nodes()
-        self.get_constraints_initialtemperature_nodes()
-        self.get_constraints_electrostatic_nodes()
-        self.get_constraints_electricchargedensity_nodes()
-
-        # constraints sets with constraint data
-        self.get_constraints_force_nodeloads()
-        self.get_constraints_pressure_faces()
-        self.get_constraints_heatflux_faces()
-        self.get_constraints_electrostatic_faces()
-        self.get_constraints_electricchargedensity_faces()
-
-        setstime = round((time.process_time() - time_start), 3)
-        FreeCAD.Console.PrintMessage(f"Getting mesh data time: {setstime} seconds.\n")
+        step_times = [
+            self._run_sets_step(
+                ("material and geometry", [self.get_element_sets_material_and_femelement_geometry])
+            )
+        ]
+
+        # the mesh tables are read by all steps, they need to exist before the steps are run
+        self._load_tables()
+        steps = [step for step in self.get_sets_steps() if step[1]]
+        if workers > 1 and len(steps) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                step_times.extend(executor.map(self._run_sets_step, steps))
+        else:
+            step_times.extend(map(self._run_sets_step, steps))
+
+        if self.sets_cache is not None:
+            self.sets_cache.save()
+            cache_hits = self.sets_cache.hits - cache_hits
+            FreeCAD.Console.PrintMessage(f"Mesh sets taken from cache: {cache_hits}\n")
+
+        setstime = round((time.perf_counter() - time_start), 3)
+        FreeCAD.Console.PrintMessage(
+            f"Getting mesh data time: {setstime} seconds, "
+            f"{len(step_times)} steps on {max(1, min(workers, len(steps)))} workers.\n"
+        )
+        for name, steptime in step_times:
+            FreeCAD.Console.PrintMessage(f"    {name}: {round(steptime, 3)} seconds\n")
+
+    def get_sets_steps(self):
+        """the steps of get_mesh_sets besides the material and element geometry sets
+
+        Every step is a tuple (name, getters), the getters of a step are called
+        one after the other. The getters of the node sets of fixed, displacement
+        and rigid body constraints are one step, they add to the constraint
+        conflict nodes in this order. Steps of constraints not in the analysis
+        have no getters.
+        """
+        m = self.member
+        steps = [
+            ("materials", [self.get_materials_elements], m.mats_linear),
+            ("shell thickness", [self.get_shell_elements], m.geos_shellthickness),
+            ("beam section", [self.get_beam_elements], m.geos_beamsection),
+            ("beam rotation", [self.get_rotation1D_elements], m.geos_beamrotation),
+            ("centrif", [self.get_constraints_centrif_elements], m.cons_centrif),
+            (
+                "body heat source",
+                [self.get_constraints_bodyheatsource_elements],
+                m.cons_bodyheatsource,
+            ),
+            (
+                "fixed, displacement and rigid body",
+                [
+                    self.get_constraints_fixed_nodes,
+                    self.get_constraints_displacement_nodes,
+                    self.get_constraints_rigidbody_nodes,
+                ],
+                m.cons_fixed + m.cons_displacement + m.cons_rigidbody,
+            ),
+            ("plane rotation", [self.get_constraints_planerotation_nodes], m.cons_planerotation),
+            ("contact", [self.get_constraints_contact_faces], m.cons_contact),
+            ("tie", [self.get_constraints_tie_faces], m.cons_tie),
+            ("section print", [self.get_constraints_sectionprint_faces], m.cons_sectionprint),
+            ("transform", [self.get_constraints_transform_nodes], m.cons_transform),
+            ("temperature", [self.get_constraints_temperature_nodes], m.cons_temperature),
+            (
+                "initial temperature",
+                [self.get_constraints_initialtemperature_nodes],
+                m.cons_initialtemperature,
+            ),
+            (
+                "electrostatic",
+                [
+                    self.get_constraints_electrostatic_nodes,
+                    self.get_constraints_electrostatic_faces,
+                ],
+                m.cons_electrostatic,
+            ),
+            (
+                "electric charge density",
+                [
+                    self.get_constraints_electricchargedensity_nodes,
+                    self.get_constraints_electricchargedensity_faces,
+                ],
+                m.cons_electricchargedensity,
+            ),
+            ("force", [self.get_constraints_force_nodeloads], m.cons_force),
+            ("pressure", [self.get_constraints_pressure_faces], m.cons_pressure),
+            ("heat flux", [self.get_constraints_heatflux_faces], m.cons_heatflux),
+        ]
+        return [(name, getters if femobjs else []) for name, getters, femobjs in steps]
+
+    def _run_sets_step(self, step):
+        name, getters = step
+        step_start = time.perf_counter()
+        for getter in getters:
+            getter()
+        return (name, time.perf_counter() - step_start)
+
+    # ********************************************************************************************
+    # ********************************************************************************************
+    # sets cache
+    def _get_femnodes(self, femobj):
+        # node sets from mesh group data are not cached, they are not geometric searched
+        if self.sets_cache is None or self.femmesh.GroupCount:
+            return meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+        ref_hash = meshsetscache.get_refshape_hash(femobj["Object"].References)
+        nodes = self.sets_cache.get(ref_hash, "Node")
+        if nodes is None:
+            nodes = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            self.sets_cache.add(ref_hash, "Node", nodes)
+        return list(nodes)
+
+    def _get_ref_elements(self, ref_pair):
+        if self.sets_cache is None:
+            return meshtools.get_elements(self, ref_pair, self.face_masks, self.edge_masks)
+        feat, sub_ref = ref_pair
+        sub = (feat, (sub_ref,))
+        ref_hash = meshsetscache.get_refshape_hash([sub])
+        elements = self.sets_cache.get(ref_hash, self.sets_cache_element_type)
+        if elements is None:
+            result = meshtools.get_elements(self, ref_pair, self.face_masks, self.edge_masks)
+            # (sub, elements, is_sub_element), the sub holds the document object
+            if len(result) == 3:
+                self.sets_cache.add(ref_hash, self.sets_cache_element_type, result[1:])
+            return result
+        return (sub, list(elements[0]), elements[1])
 
     # ********************************************************************************************
     # ********************************************************************************************
@@ -275,7 +398,7 @@ class MeshSetsGetter:
         for femobj in self.member.cons_fixed:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            femobj["Nodes"] = self._get_femnodes(femobj)
             # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
             for node in femobj["Nodes"]:
                 self.constraint_conflict_nodes.append(node)
@@ -310,7 +433,7 @@ class MeshSetsGetter:
         for femobj in self.member.cons_rigidbody:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            femobj["Nodes"] = self._get_femnodes(femobj)
             # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
             for node in femobj["Nodes"]:
                 self.constraint_conflict_nodes.append(node)
@@ -322,7 +445,7 @@ class MeshSetsGetter:
         for femobj in self.member.cons_displacement:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            femobj["Nodes"] = self._get_femnodes(femobj)
             # add nodes to constraint_conflict_nodes, needed by constraint plane rotation
             for node in femobj["Nodes"]:
                 self.constraint_conflict_nodes.append(node)
@@ -334,7 +457,7 @@ class MeshSetsGetter:
         for femobj in self.member.cons_planerotation:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            femobj["Nodes"] = self._get_femnodes(femobj)
 
     def get_constraints_transform_nodes(self):
         if not self.member.cons_transform:
@@ -343,7 +466,7 @@ class MeshSetsGetter:
         for femobj in self.member.cons_transform:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            femobj["Nodes"] = self._get_femnodes(femobj)
 
     def get_constraints_temperature_nodes(self):
         if not self.member.cons_temperature:
@@ -352,7 +475,7 @@ class MeshSetsGetter:
         for femobj in self.member.cons_temperature:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            femobj["Nodes"] = self._get_femnodes(femobj)
 
     def get_constraints_initialtemperature_nodes(self):
         if not self.member.cons_initialtemperature:
@@ -361,7 +484,7 @@ class MeshSetsGetter:
         for femobj in self.member.cons_initialtemperature:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            femobj["Nodes"] = self._get_femnodes(femobj)
 
     def get_constraints_fluidsection_nodes(self):
         if not self.member.geos_fluidsection:
@@ -370,7 +493,7 @@ class MeshSetsGetter:
         for femobj in self.member.geos_fluidsection:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             print_obj_info(femobj["Object"])
-            femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(self.femmesh, femobj)
+            femobj["Nodes"] = self._get_femnodes(femobj)
 
     def get_constraints_electrostatic_nodes(self):
         if not self.member.cons_electrostatic:
@@ -380,9 +503,7 @@ class MeshSetsGetter:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             if femobj["Object"].BoundaryCondition == "Dirichlet":
                 print_obj_info(femobj["Object"])
-                femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                    self.femmesh, femobj
-                )
+                femobj["Nodes"] = self._get_femnodes(femobj)
 
     def get_constraints_electricchargedensity_nodes(self):
         if not self.member.cons_electricchargedensity:
@@ -392,9 +513,7 @@ class MeshSetsGetter:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
             if femobj["Object"].Concentrated:
                 print_obj_info(femobj["Object"])
-                femobj["Nodes"] = meshtools.get_femnodes_by_femobj_with_references(
-                    self.femmesh, femobj
-                )
+                femobj["Nodes"] = self._get_femnodes(femobj)
 
     def get_constraints_force_nodeloads(self):
         if not self.member.cons_force:
@@ -449,11 +568,19 @@ class MeshSetsGetter:
                 )
             elif femobj["RefShapeType"] == "Edge":  # line load on edges
                 femobj["NodeLoadTable"] = meshtools.get_force_obj_edge_nodeload_table(
-                    self.femmesh, self.femelement_table, self.femnodes_mesh, frc_obj
+                    self.femmesh,
+                    self.femelement_table,
+                    self.femnodes_mesh,
+                    frc_obj,
+                    workers=self.workers,
                 )
             elif femobj["RefShapeType"] == "Face":  # area load on faces
                 femobj["NodeLoadTable"] = meshtools.get_force_obj_face_nodeload_table(
-                    self.femmesh, self.femelement_table, self.femnodes_mesh, frc_obj
+                    self.femmesh,
+                    self.femelement_table,
+                    self.femnodes_mesh,
+                    frc_obj,
+                    workers=self.workers,
                 )
 
     # ********************************************************************************************
@@ -463,7 +590,7 @@ class MeshSetsGetter:
         result = []
         ref_data = meshtools.pair_obj_reference(obj.References)
         for ref_pair in ref_data:
-            result.append(meshtools.get_elements(self, ref_pair, self.face_masks, self.edge_masks))
+            result.append(self._get_ref_elements(ref_pair))
 
         return result
 
@@ -27,6 +27,9 @@ __url__ = "https://www.freecad.org"
 ## \addtogroup FEM
 #  @{
 
+import hashlib
+import itertools
+
 import numpy as np
 
 import FreeCAD
@@ -171,6 +174,104 @@ def get_femelement_edges_table(femmesh, edges_only=None):
 
 
 # ************************************************************************************************
+class FemNodesEleTable:
+    """node to element incidence index of a femelement_table in compressed sparse row layout
+
+    node_ids: sorted node ids
+    offsets: the incidences of node_ids[i] are stored in offsets[i]:offsets[i + 1]
+    elements: index of the incident element in element_ids
+    positions: position of the node in the incident element
+    element_ids: element ids in the order of the femelement_table
+    element_node_counts: number of nodes of each element
+    digest: digest of the node ids and the element table, set by get_femnodes_ele_table()
+
+    The index can be used like the former femnodes_ele_table dict
+    {nodeID : [[eleID, NodePosition], [], ...], nodeID : [[], [], ...], ...}
+    but the bit patterns of node sets are evaluated on the arrays,
+    see get_bit_pattern_dict() and get_femelements_by_femnodes_bin()
+    """
+
+    def __init__(self, node_ids, element_ids, element_node_counts, connectivity):
+        self.node_ids = node_ids
+        self.element_ids = element_ids
+        self.element_node_counts = element_node_counts
+        self.digest = ""
+        node_index = np.searchsorted(node_ids, connectivity)
+        unknown = (node_index == len(node_ids)) | (
+            node_ids[np.minimum(node_index, len(node_ids) - 1)] != connectivity
+        )
+        if unknown.any():
+            raise KeyError(int(connectivity[unknown][0]))
+        element_index = np.repeat(np.arange(len(element_ids)), element_node_counts)
+        element_starts = np.cumsum(element_node_counts) - element_node_counts
+        local_index = np.arange(len(connectivity)) - np.repeat(element_starts, element_node_counts)
+        # stable sort keeps the element order and the node position order of each node
+        order = np.argsort(node_index, kind="stable")
+        self.elements = element_index[order]
+        self.positions = local_index[order]
+        self.offsets = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(node_index, minlength=len(node_ids)), out=self.offsets[1:])
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __iter__(self):
+        return iter(self.node_ids.tolist())
+
+    def __contains__(self, node):
+        i = np.searchsorted(self.node_ids, node)
+        return i < len(self.node_ids) and self.node_ids[i] == node
+
+    def __getitem__(self, node):
+        if node not in self:
+            raise KeyError(node)
+        i = np.searchsorted(self.node_ids, node)
+        incidences = slice(self.offsets[i], self.offsets[i + 1])
+        return [
+            [ele, 1 << pos]
+            for ele, pos in zip(
+                self.element_ids[self.elements[incidences]].tolist(),
+                self.positions[incidences].tolist(),
+            )
+        ]
+
+    def get_bit_patterns(self, node_set):
+        """returns the indices in element_ids of all elements with at least one node
+        in node_set and their bit pattern, the corresponding bit is set for every
+        node of the element which is in node_set
+        """
+        nodes = np.unique(np.fromiter(node_set, dtype=np.int64))
+        i = np.searchsorted(self.node_ids, nodes)
+        i = i[i < len(self.node_ids)]
+        i = i[np.isin(self.node_ids[i], nodes, assume_unique=True)]
+        starts = self.offsets[i]
+        counts = self.offsets[i + 1] - starts
+        shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        incidences = shift + np.arange(len(shift))
+        elements = self.elements[incidences]
+        # every bit is set at most once per element, thus the sum is the bitwise or
+        patterns = np.bincount(
+            elements,
+            weights=np.left_shift(1, self.positions[incidences]),
+            minlength=len(self.element_ids),
+        )
+        charged = np.flatnonzero(patterns)
+        return charged, patterns[charged].astype(np.int64)
+
+    def get_femelements_by_femnodes(self, node_set):
+        """returns the ids of all elements with all their nodes in node_set"""
+        charged, patterns = self.get_bit_patterns(node_set)
+        complete = patterns == np.left_shift(1, self.element_node_counts[charged]) - 1
+        return self.element_ids[charged[complete]].tolist()
+
+
+# cache of the FemNodesEleTable of the recently used meshes
+# the key is the digest of the node ids and the element table
+# thus a modified mesh does not get a stale incidence index
+FEMNODES_ELE_TABLE_CACHE_SIZE = 4
+_femnodes_ele_table_cache = {}
+
+
 def get_femnodes_ele_table(femnodes_mesh, femelement_table):
     """the femnodes_ele_table contains for each node its membership in elements
     {nodeID : [[eleID, NodePosition], [], ...], nodeID : [[], [], ...], ...}
@@ -186,16 +287,33 @@ def get_femnodes_ele_table(femnodes_mesh, femelement_table):
     volume or face or edgemesh the femnodes_ele_table only
     has either volume or face or edge elements
     see get_femelement_table()
+    The table is a FemNodesEleTable, it is built once per mesh and
+    returned from a cache as long as the mesh is not modified.
     """
-    femnodes_ele_table = {}  # node_dict in ulrichs class
-    for n in femnodes_mesh:  # initialize it with sorted node keys and empty lists
-        femnodes_ele_table[n] = []
-    for ele in femelement_table:
-        ele_list = femelement_table[ele]
-        pos = int(1)
-        for ele_node in ele_list:
-            femnodes_ele_table[ele_node].append([ele, pos])
-            pos = pos << 1
+    node_ids = np.sort(np.fromiter(femnodes_mesh, dtype=np.int64, count=len(femnodes_mesh)))
+    element_ids = np.fromiter(femelement_table, dtype=np.int64, count=len(femelement_table))
+    element_node_counts = np.fromiter(
+        map(len, femelement_table.values()), dtype=np.int64, count=len(femelement_table)
+    )
+    connectivity = np.fromiter(
+        itertools.chain.from_iterable(femelement_table.values()),
+        dtype=np.int64,
+        count=element_node_counts.sum(),
+    )
+    digest = hashlib.sha1()
+    for a in (node_ids, element_ids, element_node_counts, connectivity):
+        digest.update(np.int64(len(a)).tobytes())
+        digest.update(a.tobytes())
+    key = digest.hexdigest()
+    femnodes_ele_table = _femnodes_ele_table_cache.pop(key, None)
+    if femnodes_ele_table is None:
+        femnodes_ele_table = FemNodesEleTable(
+            node_ids, element_ids, element_node_counts, connectivity
+        )
+        femnodes_ele_table.digest = key
+        while len(_femnodes_ele_table_cache) >= FEMNODES_ELE_TABLE_CACHE_SIZE:
+            del _femnodes_ele_table_cache[next(iter(_femnodes_ele_table_cache))]
+    _femnodes_ele_table_cache[key] = femnodes_ele_table
     return femnodes_ele_table
 
 
@@ -220,7 +338,19 @@ def get_bit_pattern_dict(femelement_table, femnodes_ele_table, node_set):
     or has this element a face we are searching for?
     The number in the ele_dict is organized as a bit array.
     The corresponding bit is set, if the node of the node_set is contained in the element.
+    If femnodes_ele_table is a FemNodesEleTable only the elements with at least one node
+    in node_set are contained, all others have no bit set and thus can not match any mask.
     """
+    if isinstance(femnodes_ele_table, FemNodesEleTable):
+        charged, patterns = femnodes_ele_table.get_bit_patterns(node_set)
+        return {
+            ele: [len_ele, bits]
+            for ele, len_ele, bits in zip(
+                femnodes_ele_table.element_ids[charged].tolist(),
+                femnodes_ele_table.element_node_counts[charged].tolist(),
+                patterns.tolist(),
+            )
+        }
     bit_pattern_dict = get_copy_of_empty_femelement_table(femelement_table)
     # # initializing the bit_pattern_dict
     for ele in femelement_table:
@@ -356,6 +486,8 @@ def get_femelements_by_femnodes_bin(femelement_table, femnodes_ele_table, node_l
     blind fast binary search, but works for volumes only
     """
     FreeCAD.Console.PrintMessage("binary search: get_femelements_by_femnodes_bin\n")
+    if isinstance(femnodes_ele_table, FemNodesEleTable):
+        return femnodes_ele_table.get_femelements_by_femnodes(node_list)
     vol_masks = {4: 15, 6: 63, 8: 255, 10: 1023, 15: 32767, 20: 1048575}
     # Now we are looking for nodes inside of the Volumes = filling the bit_pattern_dict
     bit_pattern_dict = get_bit_pattern_dict(femelement_table, femnodes_ele_table, node_list)
@@ -375,6 +507,7 @@ def get_femelements_by_femnodes_std(femelement_table, node_list):
     e: elementlist
     nodes: nodelist"""
     FreeCAD.Console.PrintMessage("std search: get_femelements_by_femnodes_std\n")
+    node_list = set(node_list)
     e = []  # elementlist
     for elementID in sorted(femelement_table):
         nodecount = 0
@@ -401,6 +534,7 @@ def get_femvolumeelements_by_femfacenodes(femelement_table, node_list):
         --> if exact 6 or 8 element nodes are in node_list --> add femelement
     e: elementlist
     nodes: nodelist"""
+    node_list = set(node_list)
     e = []  # elementlist
     for elementID in sorted(femelement_table):
         nodecount = 0
@@ -784,7 +918,8 @@ def get_force_obj_vertex_nodeload_table(femmesh, frc_obj):
 # get_force_obj_edge_nodeload_table
 # get_ref_edgenodes_table
 # get_ref_edgenodes_lengths
-def get_force_obj_edge_nodeload_table(femmesh, femelement_table, femnodes_mesh, frc_obj):
+def get_force_obj_edge_nodeload_table(femmesh, femelement_table, femnodes_mesh, frc_obj, workers=1):
+    # with workers > 1 the node lengths of the ref edges are calculated in a thread pool
     # force_obj_node_load_table:
     #     [
     #         ("refshape_name.elemname", node_load_table),
@@ -809,6 +944,8 @@ def get_force_obj_edge_nodeload_table(femmesh, femelement_table, femnodes_mesh,
     if sum_ref_edge_length != 0:
         force_quantity = FreeCAD.Units.Quantity(frc_obj.Force.getValueAs("N"))
         force_per_sum_ref_edge_length = force_quantity / sum_ref_edge_length
+    ref_edges = []
+    edge_tables = []
     for o, elem_tup in frc_obj.References:
         for elem in elem_tup:
             ref_edge = o.Shape.getElement(elem)
@@ -816,37 +953,39 @@ def get_force_obj_edge_nodeload_table(femmesh, femelement_table, femnodes_mesh,
             # edge_table:
             #     { meshedgeID : ( nodeID, ... , nodeID ) }
             edge_table = get_ref_edgenodes_table(femmesh, femelement_table, ref_edge)
-
-            # node_length_table:
-            #     [ (nodeID, length), ... , (nodeID, length) ]
-            # some nodes will have more than one entry
-            node_length_table = get_ref_edgenodes_lengths(femnodes_mesh, edge_table)
-
-            # node_sum_length_table:
-            #     { nodeID : Length, ... , nodeID : Length }
-            # LengthSum for each node, one entry for each node
-            node_sum_length_table = get_ref_shape_node_sum_geom_table(node_length_table)
-
-            # node_load_table:
-            #     { nodeID : NodeLoad, ... , nodeID : NodeLoad }
-            # NodeLoad for each node, one entry for each node
-            node_load_table = {}
-            sum_node_lengths = 0  # for debugging
-            for node in node_sum_length_table:
-                sum_node_lengths += node_sum_length_table[node]  # for debugging
-                node_load_table[node] = node_sum_length_table[node] * force_per_sum_ref_edge_length
-            ratio_refedge_lengths = sum_node_lengths / ref_edge.Length
-            if ratio_refedge_lengths < 0.99 or ratio_refedge_lengths > 1.01:
+            if (not femnodes_mesh) or (not edge_table):
                 FreeCAD.Console.PrintError(
-                    "Error on: " + frc_obj.Name + " --> " + o.Name + "." + elem + "\n"
+                    "Error in get_ref_edgenodes_lengths(): Empty femnodes_mesh or edge_table!\n"
                 )
-                FreeCAD.Console.PrintMessage(f"  sum_node_lengths: {sum_node_lengths}\n")
-                FreeCAD.Console.PrintMessage(f"  refedge_length: {ref_edge.Length}\n")
-                bad_refedge = ref_edge
-            sum_ref_edge_node_length += sum_node_lengths
+            ref_edges.append((o, elem, ref_edge))
+            edge_tables.append(get_element_table_node_arrays(femnodes_mesh, edge_table))
+
+    # node_sum_lengths:
+    #     ( [ nodeID, ... , nodeID ], [ Length, ... , Length ] )
+    # LengthSum for each node, one entry for each node
+    node_sum_lengths = map_ref_shapes(get_node_sum_length_arrays, edge_tables, workers)
+
+    for (o, elem, ref_edge), (nodes, lengths) in zip(ref_edges, node_sum_lengths):
+        # node_load_table:
+        #     { nodeID : NodeLoad, ... , nodeID : NodeLoad }
+        # NodeLoad for each node, one entry for each node
+        node_load_table = {}
+        sum_node_lengths = 0  # for debugging
+        for node, length in zip(nodes.tolist(), lengths.tolist()):
+            sum_node_lengths += length  # for debugging
+            node_load_table[node] = length * force_per_sum_ref_edge_length
+        ratio_refedge_lengths = sum_node_lengths / ref_edge.Length
+        if ratio_refedge_lengths < 0.99 or ratio_refedge_lengths > 1.01:
+            FreeCAD.Console.PrintError(
+                "Error on: " + frc_obj.Name + " --> " + o.Name + "." + elem + "\n"
+            )
+            FreeCAD.Console.PrintMessage(f"  sum_node_lengths: {sum_node_lengths}\n")
+            FreeCAD.Console.PrintMessage(f"  refedge_length: {ref_edge.Length}\n")
+            bad_refedge = ref_edge
+        sum_ref_edge_node_length += sum_node_lengths
 
-            elem_info_string = "node loads on shape: " + o.Name + ":" + elem
-            force_obj_node_load_table.append((elem_info_string, node_load_table))
+        elem_info_string = "node loads on shape: " + o.Name + ":" + elem
+        force_obj_node_load_table.append((elem_info_string, node_load_table))
 
     for ref_shape in force_obj_node_load_table:
         for node in ref_shape[1]:
@@ -917,7 +1056,7 @@ def get_force_obj_edge_nodeload_table(femmesh, femelement_table, femnodes_mesh,
 # ************************************************************************************************
 def get_ref_edgenodes_table(femmesh, femelement_table, refedge):
     edge_table = {}  # { meshedgeID : ( nodeID, ... , nodeID ) }
-    refedge_nodes = femmesh.getNodesByEdge(refedge)
+    refedge_nodes = set(femmesh.getNodesByEdge(refedge))
     if is_solid_femmesh(femmesh):
         refedge_fem_volumeelements = []
         # if at least two nodes of a femvolumeelement are in
@@ -984,42 +1123,36 @@ def get_ref_edgenodes_lengths(femnodes_mesh, edge_table):
             "Error in get_ref_edgenodes_lengths(): Empty femnodes_mesh or edge_table!\n"
         )
         return []
-    node_length_table = []
-    mesh_edge_length = 0
-    # FreeCAD.Console.PrintMessage("{}\n".format(len(edge_table)))
-    for me in edge_table:
-        femmesh_edgetype = len(edge_table[me])
-        if femmesh_edgetype == 2:  # 2 node femmesh edge
-            # end_node_length = mesh_edge_length / 2
-            #    ______
-            #  P1      P2
-            P1 = femnodes_mesh[edge_table[me][0]]
-            P2 = femnodes_mesh[edge_table[me][1]]
-            edge_vec = P2 - P1
-            mesh_edge_length = edge_vec.Length
-            # FreeCAD.Console.PrintMessage("{}\n".format(mesh_edge_length))
-            end_node_length = mesh_edge_length / 2.0
-            node_length_table.append((edge_table[me][0], end_node_length))
-            node_length_table.append((edge_table[me][1], end_node_length))
-
-        elif femmesh_edgetype == 3:  # 3 node femmesh edge
-            # end_node_length = mesh_edge_length / 6
-            # middle_node_length = mesh_edge_length * 2 / 3
-            #   _______ _______
-            # P1       P3      P2
-            P1 = femnodes_mesh[edge_table[me][0]]
-            P2 = femnodes_mesh[edge_table[me][1]]
-            P3 = femnodes_mesh[edge_table[me][2]]
-            edge_vec1 = P3 - P1
-            edge_vec2 = P2 - P3
-            mesh_edge_length = edge_vec1.Length + edge_vec2.Length
-            # FreeCAD.Console.PrintMessage("{} --> {}\n".format(me, mesh_edge_length))
-            end_node_length = mesh_edge_length / 6.0
-            middle_node_length = mesh_edge_length * 2.0 / 3.0
-            node_length_table.append((edge_table[me][0], end_node_length))
-            node_length_table.append((edge_table[me][1], end_node_length))
-            node_length_table.append((edge_table[me][2], middle_node_length))
-    return node_length_table
+    nodes, lengths = get_node_geom_arrays(
+        get_element_table_node_arrays(femnodes_mesh, edge_table), get_edgenodes_lengths_array
+    )
+    return list(zip(nodes.tolist(), lengths.tolist()))
+
+
+def get_edgenodes_lengths_array(P):
+    """node lengths of mesh edges, P are the node coordinates (edges, edge nodes, 3)
+    returns the node lengths (edges, edge nodes) or None for not supported edges
+    """
+    femmesh_edgetype = P.shape[1]
+    if femmesh_edgetype == 2:  # 2 node femmesh edge
+        # end_node_length = mesh_edge_length / 2
+        #    ______
+        #  P1      P2
+        mesh_edge_length = get_vector_lengths(P[:, 1] - P[:, 0])
+        end_node_length = mesh_edge_length / 2.0
+        return np.column_stack((end_node_length, end_node_length))
+    elif femmesh_edgetype == 3:  # 3 node femmesh edge
+        # end_node_length = mesh_edge_length / 6
+        # middle_node_length = mesh_edge_length * 2 / 3
+        #   _______ _______
+        # P1       P3      P2
+        mesh_edge_length = get_vector_lengths(P[:, 2] - P[:, 0]) + get_vector_lengths(
+            P[:, 1] - P[:, 2]
+        )
+        end_node_length = mesh_edge_length / 6.0
+        middle_node_length = mesh_edge_length * 2.0 / 3.0
+        return np.column_stack((end_node_length, end_node_length, middle_node_length))
+    return None
 
 
 # ***** Face loads *******************************************************************************
@@ -1027,7 +1160,8 @@ def get_ref_edgenodes_lengths(femnodes_mesh, edge_table):
 # get_ref_facenodes_table
 # get_ref_facenodes_areas
 # build_mesh_faces_of_volume_elements
-def get_force_obj_face_nodeload_table(femmesh, femelement_table, femnodes_mesh, frc_obj):
+def get_force_obj_face_nodeload_table(femmesh, femelement_table, femnodes_mesh, frc_obj, workers=1):
+    # with workers > 1 the node areas of the ref faces are calculated in a thread pool
     # force_obj_node_load_table:
     #     [
     #         ("refshape_name.elemname",node_load_table),
@@ -1052,43 +1186,46 @@ def get_force_obj_face_nodeload_table(femmesh, femelement_table, femnodes_mesh,
     if sum_ref_face_area != 0:
         force_quantity = FreeCAD.Units.Quantity(frc_obj.Force.getValueAs("N"))
         force_per_sum_ref_face_area = force_quantity / sum_ref_face_area
+    ref_faces = []
+    face_tables = []
     for o, elem_tup in frc_obj.References:
         for elem in elem_tup:
             ref_face = sub_shape_at_global_placement(o, elem)
 
             # face_table:
             #    { meshfaceID : ( nodeID, ... , nodeID ) }
+            # serial, the FemMesh queries and the loops of get_ref_facenodes_table hold the GIL
             face_table = get_ref_facenodes_table(femmesh, femelement_table, ref_face)
+            if (not femnodes_mesh) or (not face_table):
+                FreeCAD.Console.PrintError("Error: Empty femnodes_mesh or face_table!\n")
+            ref_faces.append((o, elem, ref_face))
+            face_tables.append(get_element_table_node_arrays(femnodes_mesh, face_table))
+
+    # node_sum_areas:
+    #    ( [ nodeID, ... , nodeID ], [ Area, ... , Area ] )
+    # AreaSum for each node, one entry for each node
+    node_sum_areas = map_ref_shapes(get_node_sum_area_arrays, face_tables, workers)
+
+    for (o, elem, ref_face), (nodes, areas) in zip(ref_faces, node_sum_areas):
+        # node_load_table:
+        #    { nodeID : NodeLoad, ... , nodeID : NodeLoad }
+        # NodeLoad for each node, one entry for each node
+        node_load_table = {}
+        sum_node_areas = 0  # for debugging
+        for node, area in zip(nodes.tolist(), areas.tolist()):
+            sum_node_areas += area  # for debugging
+            node_load_table[node] = area * force_per_sum_ref_face_area
+        ratio_refface_areas = sum_node_areas / ref_face.Area
+        if ratio_refface_areas < 0.99 or ratio_refface_areas > 1.01:
+            FreeCAD.Console.PrintError(
+                "Error on: " + frc_obj.Name + " --> " + o.Name + "." + elem + "\n"
+            )
+            FreeCAD.Console.PrintMessage(f"  sum_node_areas: {sum_node_areas}\n")
+            FreeCAD.Console.PrintMessage(f"  ref_face_area:  {ref_face.Area}\n")
+        sum_ref_face_node_area += sum_node_areas
 
-            # node_area_table:
-            #    [ (nodeID, Area), ... , (nodeID, Area) ]
-            # some nodes will have more than one entry
-            node_area_table = get_ref_facenodes_areas(femnodes_mesh, face_table)
-
-            # node_sum_area_table:
-            #    { nodeID : Area, ... , nodeID : Area }
-            # AreaSum for each node, one entry for each node
-            node_sum_area_table = get_ref_shape_node_sum_geom_table(node_area_table)
-
-            # node_load_table:
-            #    { nodeID : NodeLoad, ... , nodeID : NodeLoad }
-            # NodeLoad for each node, one entry for each node
-            node_load_table = {}
-            sum_node_areas = 0  # for debugging
-            for node in node_sum_area_table:
-                sum_node_areas += node_sum_area_table[node]  # for debugging
-                node_load_table[node] = node_sum_area_table[node] * force_per_sum_ref_face_area
-            ratio_refface_areas = sum_node_areas / ref_face.Area
-            if ratio_refface_areas < 0.99 or ratio_refface_areas > 1.01:
-                FreeCAD.Console.PrintError(
-                    "Error on: " + frc_obj.Name + " --> " + o.Name + "." + elem + "\n"
-                )
-                FreeCAD.Console.PrintMessage(f"  sum_node_areas: {sum_node_areas}\n")
-                FreeCAD.Console.PrintMessage(f"  ref_face_area:  {ref_face.Area}\n")
-            sum_ref_face_node_area += sum_node_areas
-
-            elem_info_string = "node loads on shape: " + o.Name + ":" + elem
-            force_obj_node_load_table.append((elem_info_string, node_load_table))
+        elem_info_string = "node loads on shape: " + o.Name + ":" + elem
+        force_obj_node_load_table.append((elem_info_string, node_load_table))
 
     for ref_shape in force_obj_node_load_table:
         for node in ref_shape[1]:
@@ -1129,7 +1266,7 @@ def get_ref_facenodes_table(femmesh, femelement_table, ref_face):
             # they are not sorted, we just have the nodes.
             # We need to sort them according to the
             # shell mesh notation of tria3, tria6, quad4, quad8
-            ref_face_nodes = femmesh.getNodesByFace(ref_face)
+            ref_face_nodes = set(femmesh.getNodesByFace(ref_face))
             # try to use getccxVolumesByFace() to get the volume ids
             # of element with elementfaces on the ref_face
             # --> should work for tetra4 and tetra10
@@ -1172,7 +1309,7 @@ def get_ref_facenodes_table(femmesh, femelement_table, ref_face):
             for mf in faces:
                 face_table[mf] = femmesh.getElementNodes(mf)
     elif is_face_femmesh(femmesh):
-        ref_face_nodes = femmesh.getNodesByFace(ref_face)
+        ref_face_nodes = set(femmesh.getNodesByFace(ref_face))
         ref_face_elements = get_femelements_by_femnodes_std(femelement_table, ref_face_nodes)
         for mf in ref_face_elements:
             face_table[mf] = femelement_table[mf]
@@ -1194,138 +1331,108 @@ def get_ref_facenodes_areas(femnodes_mesh, face_table):
     if (not femnodes_mesh) or (not face_table):
         FreeCAD.Console.PrintError("Error: Empty femnodes_mesh or face_table!\n")
         return []
-    node_area_table = []
-    mesh_face_area = 0
-    for mf in face_table:
-        femmesh_facetype = len(face_table[mf])
-        # nodes in face_table need to be in the right node order for the following calculations
-        if femmesh_facetype == 3:  # 3 node femmesh face triangle
-            # corner_node_area = mesh_face_area / 3.0
-            #      P3
-            #      /\
-            #     /  \
-            #    /____\
-            #  P1      P2
-            P1 = femnodes_mesh[face_table[mf][0]]
-            P2 = femnodes_mesh[face_table[mf][1]]
-            P3 = femnodes_mesh[face_table[mf][2]]
-
-            mesh_face_area = get_triangle_area(P1, P2, P3)
-            corner_node_area = mesh_face_area / 3.0
-
-            node_area_table.append((face_table[mf][0], corner_node_area))
-            node_area_table.append((face_table[mf][1], corner_node_area))
-            node_area_table.append((face_table[mf][2], corner_node_area))
-
-        elif femmesh_facetype == 4:  # 4 node femmesh face quad
-            # corner_node_area = mesh_face_area / 4.0
-            #  P4_______P3
-            #    |     /|
-            #    | t2 / |
-            #    |   /  |
-            #    |  /   |
-            #    | / t1 |
-            #    |/_____|
-            #  P1       P2
-            P1 = femnodes_mesh[face_table[mf][0]]
-            P2 = femnodes_mesh[face_table[mf][1]]
-            P3 = femnodes_mesh[face_table[mf][2]]
-            P4 = femnodes_mesh[face_table[mf][3]]
-
-            mesh_face_t1_area = get_triangle_area(P1, P2, P3)
-            mesh_face_t2_area = get_triangle_area(P1, P3, P4)
-            mesh_face_area = mesh_face_t1_area + mesh_face_t2_area
-            corner_node_area = mesh_face_area / 4.0
-
-            node_area_table.append((face_table[mf][0], corner_node_area))
-            node_area_table.append((face_table[mf][1], corner_node_area))
-            node_area_table.append((face_table[mf][2], corner_node_area))
-            node_area_table.append((face_table[mf][3], corner_node_area))
-
-        elif femmesh_facetype == 6:  # 6 node femmesh face triangle
-            # corner_node_area = 0
-            # middle_node_area = mesh_face_area / 3.0
-            #         P3
-            #         /\
-            #        /t3\
-            #       /    \
-            #     P6------P5
-            #     / \ t4 / \
-            #    /t1 \  /t2 \
-            #   /_____\/_____\
-            # P1      P4      P2
-            P1 = femnodes_mesh[face_table[mf][0]]
-            P2 = femnodes_mesh[face_table[mf][1]]
-            P3 = femnodes_mesh[face_table[mf][2]]
-            P4 = femnodes_mesh[face_table[mf][3]]
-            P5 = femnodes_mesh[face_table[mf][4]]
-            P6 = femnodes_mesh[face_table[mf][5]]
-
-            mesh_face_t1_area = get_triangle_area(P1, P4, P6)
-            mesh_face_t2_area = get_triangle_area(P2, P5, P4)
-            mesh_face_t3_area = get_triangle_area(P3, P6, P5)
-            mesh_face_t4_area = get_triangle_area(P4, P5, P6)
-            mesh_face_area = (
-                mesh_face_t1_area + mesh_face_t2_area + mesh_face_t3_area + mesh_face_t4_area
-            )
-            middle_node_area = mesh_face_area / 3.0
-
-            node_area_table.append((face_table[mf][0], 0))
-            node_area_table.append((face_table[mf][1], 0))
-            node_area_table.append((face_table[mf][2], 0))
-            node_area_table.append((face_table[mf][3], middle_node_area))
-            node_area_table.append((face_table[mf][4], middle_node_area))
-            node_area_table.append((face_table[mf][5], middle_node_area))
-
-        elif femmesh_facetype == 8:  # 8 node femmesh face quad
-            # corner_node_area = -mesh_face_area / 12.0  (negative!)
-            # mid-side nodes = mesh_face_area / 3.0
-            #  P4_________P7________P3
-            #    |      / |  \      |
-            #    | t4 /   |    \ t3 |
-            #    |  /     |      \  |
-            #    |/       |        \|
-            #  P8|    t5  |   t6    |P6
-            #    |\       |       / |
-            #    |  \     |     /   |
-            #    | t1 \   |   /  t2 |
-            #    |______\_|_/_______|
-            #  P1         P5        P2
-            P1 = femnodes_mesh[face_table[mf][0]]
-            P2 = femnodes_mesh[face_table[mf][1]]
-            P3 = femnodes_mesh[face_table[mf][2]]
-            P4 = femnodes_mesh[face_table[mf][3]]
-            P5 = femnodes_mesh[face_table[mf][4]]
-            P6 = femnodes_mesh[face_table[mf][5]]
-            P7 = femnodes_mesh[face_table[mf][6]]
-            P8 = femnodes_mesh[face_table[mf][7]]
-
-            mesh_face_t1_area = get_triangle_area(P1, P5, P8)
-            mesh_face_t2_area = get_triangle_area(P5, P2, P6)
-            mesh_face_t3_area = get_triangle_area(P6, P3, P7)
-            mesh_face_t4_area = get_triangle_area(P7, P4, P8)
-            mesh_face_t5_area = get_triangle_area(P5, P7, P8)
-            mesh_face_t6_area = get_triangle_area(P5, P6, P7)
-            mesh_face_area = (
-                mesh_face_t1_area
-                + mesh_face_t2_area
-                + mesh_face_t3_area
-                + mesh_face_t4_area
-                + mesh_face_t5_area
-                + mesh_face_t6_area
-            )
-            corner_node_area = -mesh_face_area / 12.0
-            middle_node_area = mesh_face_area / 3.0
+    nodes, areas = get_node_geom_arrays(
+        get_element_table_node_arrays(femnodes_mesh, face_table), get_facenodes_areas_array
+    )
+    return list(zip(nodes.tolist(), areas.tolist()))
 
-            node_area_table.append((face_table[mf][0], corner_node_area))
-            node_area_table.append((face_table[mf][1], corner_node_area))
-            node_area_table.append((face_table[mf][2], corner_node_area))
-            node_area_table.append((face_table[mf][3], corner_node_area))
-            node_area_table.append((face_table[mf][4], middle_node_area))
-            node_area_table.append((face_table[mf][5], middle_node_area))
-            node_area_table.append((face_table[mf][6], middle_node_area))
-            node_area_table.append((face_table[mf][7], middle_node_area))
-    return node_area_table
+
+def get_facenodes_areas_array(P):
+    """node areas of mesh faces, P are the node coordinates (faces, face nodes, 3)
+    returns the node areas (faces, face nodes) or None for not supported faces
+    nodes of the faces need to be in the right node order for the following calculations
+    """
+    femmesh_facetype = P.shape[1]
+    P1, P2, P3 = P[:, 0], P[:, 1], P[:, 2]
+    if femmesh_facetype == 3:  # 3 node femmesh face triangle
+        # corner_node_area = mesh_face_area / 3.0
+        #      P3
+        #      /\
+        #     /  \
+        #    /____\
+        #  P1      P2
+        mesh_face_area = get_triangle_areas(P1, P2, P3)
+        corner_node_area = mesh_face_area / 3.0
+        return np.repeat(corner_node_area[:, None], 3, axis=1)
+
+    elif femmesh_facetype == 4:  # 4 node femmesh face quad
+        # corner_node_area = mesh_face_area / 4.0
+        #  P4_______P3
+        #    |     /|
+        #    | t2 / |
+        #    |   /  |
+        #    |  /   |
+        #    | / t1 |
+        #    |/_____|
+        #  P1       P2
+        P4 = P[:, 3]
+        mesh_face_t1_area = get_triangle_areas(P1, P2, P3)
+        mesh_face_t2_area = get_triangle_areas(P1, P3, P4)
+        mesh_face_area = mesh_face_t1_area + mesh_face_t2_area
+        corner_node_area = mesh_face_area / 4.0
+        return np.repeat(corner_node_area[:, None], 4, axis=1)
+
+    elif femmesh_facetype == 6:  # 6 node femmesh face triangle
+        # corner_node_area = 0
+        # middle_node_area = mesh_face_area / 3.0
+        #         P3
+        #         /\
+        #        /t3\
+        #       /    \
+        #     P6------P5
+        #     / \ t4 / \
+        #    /t1 \  /t2 \
+        #   /_____\/_____\
+        # P1      P4      P2
+        P4, P5, P6 = P[:, 3], P[:, 4], P[:, 5]
+        mesh_face_t1_area = get_triangle_areas(P1, P4, P6)
+        mesh_face_t2_area = get_triangle_areas(P2, P5, P4)
+        mesh_face_t3_area = get_triangle_areas(P3, P6, P5)
+        mesh_face_t4_area = get_triangle_areas(P4, P5, P6)
+        mesh_face_area = (
+            mesh_face_t1_area + mesh_face_t2_area + mesh_face_t3_area + mesh_face_t4_area
+        )
+        middle_node_area = mesh_face_area / 3.0
+        node_areas = np.zeros((len(P), 6))
+        node_areas[:, 3:] = middle_node_area[:, None]
+        return node_areas
+
+    elif femmesh_facetype == 8:  # 8 node femmesh face quad
+        # corner_node_area = -mesh_face_area / 12.0  (negative!)
+        # mid-side nodes = mesh_face_area / 3.0
+        #  P4_________P7________P3
+        #    |      / |  \      |
+        #    | t4 /   |    \ t3 |
+        #    |  /     |      \  |
+        #    |/       |        \|
+        #  P8|    t5  |   t6    |P6
+        #    |\       |       / |
+        #    |  \     |     /   |
+        #    | t1 \   |   /  t2 |
+        #    |______\_|_/_______|
+        #  P1         P5        P2
+        P4, P5, P6, P7, P8 = P[:, 3], P[:, 4], P[:, 5], P[:, 6], P[:, 7]
+        mesh_face_t1_area = get_triangle_areas(P1, P5, P8)
+        mesh_face_t2_area = get_triangle_areas(P5, P2, P6)
+        mesh_face_t3_area = get_triangle_areas(P6, P3, P7)
+        mesh_face_t4_area = get_triangle_areas(P7, P4, P8)
+        mesh_face_t5_area = get_triangle_areas(P5, P7, P8)
+        mesh_face_t6_area = get_triangle_areas(P5, P6, P7)
+        mesh_face_area = (
+            mesh_face_t1_area
+            + mesh_face_t2_area
+            + mesh_face_t3_area
+            + mesh_face_t4_area
+            + mesh_face_t5_area
+            + mesh_face_t6_area
+        )
+        corner_node_area = -mesh_face_area / 12.0
+        middle_node_area = mesh_face_area / 3.0
+        node_areas = np.empty((len(P), 8))
+        node_areas[:, :4] = corner_node_area[:, None]
+        node_areas[:, 4:] = middle_node_area[:, None]
+        return node_areas
+    return None
 
 
 # ************************************************************************************************
@@ -1486,14 +1593,91 @@ def build_mesh_faces_of_volume_elements(face_table, femelement_table):
 def get_ref_shape_node_sum_geom_table(node_geom_table):
     # shape could be Edge or Face, geom could be length or area
     # sum of length or area for each node of the ref_shape
-    node_sum_geom_table = {}
-    for n, A in node_geom_table:
-        # FreeCAD.Console.PrintMessage("{} --> {}\n".format(n, A))
-        if n in node_sum_geom_table:
-            node_sum_geom_table[n] = node_sum_geom_table[n] + A
-        else:
-            node_sum_geom_table[n] = A
-    return node_sum_geom_table
+    if not node_geom_table:
+        return {}
+    nodes, geoms = zip(*node_geom_table)
+    nodes, sums = get_node_sum_geom_arrays(np.array(nodes), np.array(geoms, dtype=float))
+    return dict(zip(nodes.tolist(), sums.tolist()))
+
+
+def get_node_sum_geom_arrays(nodes, geoms):
+    """sum of length or area for each node
+    returns the nodes in the order of their first entry and their sums
+    the geoms of a node are added in the order of their entries
+    thus the sums are the same as added one by one
+    """
+    unique_nodes, first_entry, inverse = np.unique(nodes, return_index=True, return_inverse=True)
+    sums = np.zeros(len(unique_nodes))
+    np.add.at(sums, inverse, geoms)
+    order = np.argsort(first_entry)
+    return unique_nodes[order], sums[order]
+
+
+def get_node_sum_length_arrays(edge_node_arrays):
+    nodes, lengths = get_node_geom_arrays(edge_node_arrays, get_edgenodes_lengths_array)
+    return get_node_sum_geom_arrays(nodes, lengths)
+
+
+def get_node_sum_area_arrays(face_node_arrays):
+    nodes, areas = get_node_geom_arrays(face_node_arrays, get_facenodes_areas_array)
+    return get_node_sum_geom_arrays(nodes, areas)
+
+
+def get_element_table_node_arrays(femnodes_mesh, element_table):
+    """node ids and node coordinates of the elements of an edge or face table
+    grouped by the number of nodes of the elements
+    { node_count : ( element_positions, element_nodes, element_node_coordinates ) }
+    the element positions are the positions of the elements in the element_table
+    """
+    elements = list(element_table.values())
+    node_counts = np.fromiter(map(len, elements), dtype=np.int64, count=len(elements))
+    element_nodes = np.fromiter(
+        itertools.chain.from_iterable(elements), dtype=np.int64, count=node_counts.sum()
+    )
+    nodes, inverse = np.unique(element_nodes, return_inverse=True)
+    coordinates = np.array([tuple(femnodes_mesh[n]) for n in nodes.tolist()], dtype=float)
+    coordinates = coordinates.reshape(len(nodes), 3)
+    starts = np.cumsum(node_counts) - node_counts
+    node_arrays = {}
+    for node_count in np.unique(node_counts).tolist():
+        positions = np.flatnonzero(node_counts == node_count)
+        index = starts[positions, None] + np.arange(node_count)
+        node_arrays[node_count] = (positions, element_nodes[index], coordinates[inverse[index]])
+    return node_arrays
+
+
+def get_node_geom_arrays(element_node_arrays, geom_function):
+    """nodes and their length or area of all elements of get_element_table_node_arrays()
+    in the order of the elements in the element table and the nodes in the elements
+    geom_function returns the geoms of the element nodes or None for not supported elements
+    """
+    positions = []
+    nodes = []
+    geoms = []
+    for node_count, (element_positions, element_nodes, coordinates) in element_node_arrays.items():
+        element_geoms = geom_function(coordinates)
+        if element_geoms is None:
+            continue
+        positions.append(np.repeat(element_positions, node_count))
+        nodes.append(element_nodes.ravel())
+        geoms.append(element_geoms.ravel())
+    if not nodes:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    # stable sort keeps the node order inside the elements
+    order = np.argsort(np.concatenate(positions), kind="stable")
+    return np.concatenate(nodes)[order], np.concatenate(geoms)[order]
+
+
+def map_ref_shapes(function, ref_shape_arrays, workers=1):
+    """map function on the arrays of the ref shapes, the numpy array functions
+    release the GIL, thus the ref shapes are split on a pool of threads if workers > 1
+    """
+    if workers > 1 and len(ref_shape_arrays) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, ref_shape_arrays))
+    return list(map(function, ref_shape_arrays))
 
 
 # ************************************************************************************************
@@ -1897,6 +2081,26 @@ def get_triangle_area(P1, P2, P3):
     return 0.5 * vec3.Length
 
 
+def get_triangle_areas(P1, P2, P3):
+    """get_triangle_area() for arrays of points, the same floating point operations are used"""
+    vec1 = P2 - P1
+    vec2 = P3 - P1
+    vec3 = np.column_stack(
+        (
+            vec1[:, 1] * vec2[:, 2] - vec1[:, 2] * vec2[:, 1],
+            vec1[:, 2] * vec2[:, 0] - vec1[:, 0] * vec2[:, 2],
+            vec1[:, 0] * vec2[:, 1] - vec1[:, 1] * vec2[:, 0],
+        )
+    )
+    return 0.5 * get_vector_lengths(vec3)
+
+
+def get_vector_lengths(vecs):
+    """FreeCAD.Vector.Length for an array of vectors, sqrt(x * x + y * y + z * z)"""
+    x, y, z = vecs[:, 0], vecs[:, 1], vecs[:, 2]
+    return np.sqrt(x * x + y * y + z * z)
+
+
 # ************************************************************************************************
 def sortlistoflistvalues(listoflists):
     new_list = []
@@ -2135,61 +2339,144 @@ def use_correct_fluidinout_ele_def(FluidInletoutlet_ele, fileName, fluid_inout_n
 
 
 # ************************************************************************************************
+# node ids renumbered at once by renumber_nodes, bounds the memory of the temporary arrays
+RENUMBER_CHUNK_SIZE = 1 << 20
+
+# the order of the element types in a compacted mesh
+COMPACT_ELEMENT_TYPES = ("Edge", "Face", "Volume")
+
+
 def compact_mesh(old_femmesh):
     """
     removes all gaps in node and element ids, start ids with 1
     returns a tuple (FemMesh, node_assignment_map, element_assignment_map)
     """
-    node_map = {}  # {old_node_id: new_node_id, ...}
-    elem_map = {}  # {old_elem_id: new_elem_id, ...}
-    old_nodes = old_femmesh.Nodes
-    import Fem
+    node_ids, node_coords, elements = get_femmesh_arrays(old_femmesh)
+    node_coords, new_elements, old_node_ids = compact_mesh_arrays(node_ids, node_coords, elements)
+    new_mesh = make_femmesh_of_arrays(node_coords, new_elements)
+
+    # {old_node_id: new_node_id, ...}, {old_elem_id: new_elem_id, ...}
+    node_map = dict(zip(old_node_ids.tolist(), range(1, len(old_node_ids) + 1)))
+    elem_map = {}
+    for old_element, new_element in zip(_get_sorted_elements(elements), new_elements):
+        elem_map.update(zip(old_element[1].tolist(), new_element[1].tolist()))
+    return (new_mesh, node_map, elem_map)
 
-    new_mesh = Fem.FemMesh()
 
-    if old_nodes:
-        for i, n in enumerate(old_nodes):
-            nid = i + 1
-            new_mesh.addNode(old_nodes[n].x, old_nodes[n].y, old_nodes[n].z, nid)
-            node_map[n] = nid
-
-    # element id is one id for Edges, Faces and Volumes
-    # thus should not start with 0 for each element type
-    # because this will give an error for mixed meshes
-    # because the id is used already
-    # https://forum.freecad.org/viewtopic.php?t=48215
+def get_femmesh_arrays(femmesh):
+    """
+    returns the node ids, the node coordinates and the elements of a FemMesh as NumPy arrays
+    the elements are a list of tuples (element type, element ids, element nodes),
+    one tuple per element type (Edge, Face, Volume) and node count
+    """
+    nodes = femmesh.Nodes
+    node_ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+    node_coords = np.array([tuple(v) for v in nodes.values()], dtype=np.float64).reshape(-1, 3)
+    elements = []
+    for element_type, ele_ids in zip(
+        COMPACT_ELEMENT_TYPES, (femmesh.Edges, femmesh.Faces, femmesh.Volumes)
+    ):
+        by_node_count = {}
+        for ele_id in ele_ids:
+            ele_nodes = femmesh.getElementNodes(ele_id)
+            by_node_count.setdefault(len(ele_nodes), ([], []))
+            by_node_count[len(ele_nodes)][0].append(ele_id)
+            by_node_count[len(ele_nodes)][1].append(ele_nodes)
+        for ids, ele_nodes in by_node_count.values():
+            elements.append(
+                (element_type, np.array(ids, dtype=np.int64), np.array(ele_nodes, dtype=np.int64))
+            )
+    return node_ids, node_coords, elements
+
+
+def compact_mesh_arrays(node_ids, node_coords, elements):
+    """
+    removes all gaps in node and element ids of mesh arrays, start ids with 1
+    elements is a list of tuples (element type, element ids, element nodes), see get_femmesh_arrays
+    the new node ids keep the order of the old ones, the new element ids keep the order
+    of the old ones in the element type order Edge, Face, Volume
+    returns (node_coords, elements, old_node_ids) of the compacted mesh,
+    the new id of the node old_node_ids[i] is i + 1
+    """
+    order = np.argsort(node_ids, kind="stable")
+    old_node_ids = np.asarray(node_ids, dtype=np.int64)[order]
+    node_coords = np.asarray(node_coords, dtype=np.float64)[order]
+
+    new_elements = []
     ele_id = 1
-    if old_femmesh.Edges:
-        for ed in old_femmesh.Edges:
-            old_elem_nodes = old_femmesh.getElementNodes(ed)
-            new_elemnodes = []
-            for old_node_id in old_elem_nodes:
-                new_elemnodes.append(node_map[old_node_id])
-            new_mesh.addEdge(new_elemnodes, ele_id)
-            elem_map[ed] = ele_id
-            ele_id += 1
-    if old_femmesh.Faces:
-        for fa in old_femmesh.Faces:
-            ele_id += 1
-            old_elem_nodes = old_femmesh.getElementNodes(fa)
-            new_elemnodes = []
-            for old_node_id in old_elem_nodes:
-                new_elemnodes.append(node_map[old_node_id])
-            new_mesh.addFace(new_elemnodes, ele_id)
-            elem_map[fa] = ele_id
-            ele_id += 1
-    if old_femmesh.Volumes:
-        for vo in old_femmesh.Volumes:
-            old_elem_nodes = old_femmesh.getElementNodes(vo)
-            new_elemnodes = []
-            for old_node_id in old_elem_nodes:
-                new_elemnodes.append(node_map[old_node_id])
-            new_mesh.addVolume(new_elemnodes, ele_id)
-            elem_map[vo] = ele_id
-            ele_id += 1
-
-    # may be return another value if the mesh was compacted, just check last map entries
-    return (new_mesh, node_map, elem_map)
+    sorted_elements = _get_sorted_elements(elements)
+    for element_type in COMPACT_ELEMENT_TYPES:
+        typed = [(ids, nodes) for t, ids, nodes in sorted_elements if t == element_type]
+        if not typed:
+            continue
+        # the element ids of all node counts of the type are numbered together
+        all_ids = np.concatenate([ids for ids, nodes in typed])
+        new_ids = np.empty(len(all_ids), dtype=np.int64)
+        new_ids[np.argsort(all_ids, kind="stable")] = np.arange(
+            ele_id, ele_id + len(all_ids), dtype=np.int64
+        )
+        ele_id += len(all_ids)
+        offset = 0
+        for ids, nodes in typed:
+            new_elements.append(
+                (
+                    element_type,
+                    new_ids[offset : offset + len(ids)],
+                    renumber_nodes(old_node_ids, nodes),
+                )
+            )
+            offset += len(ids)
+    return node_coords, new_elements, old_node_ids
+
+
+def _get_sorted_elements(elements):
+    # the elements of compact_mesh_arrays and their new ids are in the element type order
+    return [
+        element
+        for element_type in COMPACT_ELEMENT_TYPES
+        for element in elements
+        if element[0] == element_type
+    ]
+
+
+def renumber_nodes(old_node_ids, nodes):
+    """
+    returns the new node ids of an array of old node ids
+    old_node_ids is sorted, the new id of the node old_node_ids[i] is i + 1
+    the nodes are renumbered in chunks, the memory used besides the result is bounded
+    """
+    old_node_ids = np.asarray(old_node_ids, dtype=np.int64)
+    nodes = np.asarray(nodes, dtype=np.int64)
+    new_nodes = np.empty(nodes.shape, dtype=np.int64)
+    flat_nodes = nodes.reshape(-1)
+    flat_new_nodes = new_nodes.reshape(-1)
+    if flat_nodes.size and not len(old_node_ids):
+        raise ValueError("Node ids to renumber which are not in the mesh.")
+    last = len(old_node_ids) - 1
+    for start in range(0, len(flat_nodes), RENUMBER_CHUNK_SIZE):
+        chunk = flat_nodes[start : start + RENUMBER_CHUNK_SIZE]
+        index = np.searchsorted(old_node_ids, chunk)
+        np.minimum(index, last, out=index)
+        if not np.array_equal(old_node_ids[index], chunk):
+            raise ValueError("Node ids to renumber which are not in the mesh.")
+        flat_new_nodes[start : start + len(chunk)] = index + 1
+    return new_nodes
+
+
+def make_femmesh_of_arrays(node_coords, elements):
+    """
+    returns a FemMesh of a compacted mesh of compact_mesh_arrays, the node ids are 1 to n
+    """
+    import Fem
+
+    new_mesh = Fem.FemMesh()
+    if len(node_coords):
+        new_mesh.addNodes(
+            np.arange(1, len(node_coords) + 1, dtype=np.int64), np.ascontiguousarray(node_coords)
+        )
+    for element_type, ids, nodes in elements:
+        new_mesh.addElements(element_type, np.ascontiguousarray(ids), np.ascontiguousarray(nodes))
+    return new_mesh
 
 
 # ************************************************************************************************
@@ -61,6 +61,8 @@ class ResultMechanical(base_fempythonobject.BaseFemPythonObject):
         )
         obj.setPropertyStatus("EigenmodeFrequency", "LockDynamic")
 
+        self.add_result_store_properties(obj)
+
         # node results
         # set read only or hide a property:
         # https://forum.freecad.org/viewtopic.php?f=18&t=13460&start=10#p108072
@@ -232,7 +234,36 @@ class ResultMechanical(base_fempythonobject.BaseFemPythonObject):
         zero_list = 26 * [0]
         obj.Stats = zero_list
 
+    def add_result_store_properties(self, obj):
+        # lazy results, see femresult/resultstore.py
+        obj.addProperty(
+            "App::PropertyPath",
+            "ResultStore",
+            "Base",
+            "Directory of the on-disk result store, node data is loaded on demand",
+            1,
+        )
+        obj.setPropertyStatus("ResultStore", "LockDynamic")
+        obj.addProperty(
+            "App::PropertyInteger",
+            "ResultStoreIndex",
+            "Base",
+            "Index of the result set in the result store",
+            1,
+        )
+        obj.setPropertyStatus("ResultStoreIndex", "LockDynamic")
+
+    def onChanged(self, obj, prop):
+        # the cached node values and statistics of the property are outdated
+        from femresult import resulttools
+
+        resulttools.clear_result_stats(obj, prop)
+
     def onDocumentRestored(self, obj):
+        # migrate old result objects, the on-disk result store was added later
+        if not hasattr(obj, "ResultStore"):
+            self.add_result_store_properties(obj)
+
         # migrate old result objects, because property "StressValues"
         # was renamed to "vonMises" in commit 8b68ab7
         if hasattr(obj, "StressValues") is True:
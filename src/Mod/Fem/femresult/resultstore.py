@@ -0,0 +1,281 @@
+# ***************************************************************************
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""On-disk columnar store of the result sets of a transient or multi step analysis.
+
+Every result field of every result set is kept as NumPy .npy files in the store
+directory, one file for the node numbers and one file for the values. The files
+are opened memory mapped, thus only the pages used are read from disk. Node
+numbers equal to the ones of the field written before are not written again.
+
+A lazy result object only keeps the store directory and its result set index.
+Its node data is loaded with load_result if it is needed, for example by the
+result task panel or by a pipeline, and freed again with unload_result.
+
+The pipeline of a store shows one result set at a time. It knows its store
+directory and the index of the result set shown, show_pipeline_result loads
+the result set of a lazy result object into the pipelines of its store.
+"""
+
+__title__ = "Fem on-disk result store"
+__author__ = "FreeCAD FEM developers"
+__url__ = "https://www.freecad.org"
+
+## \addtogroup FEM
+#  @{
+
+import json
+import os
+
+import numpy as np
+
+import FreeCAD
+
+MANIFEST_NAME = "results.json"
+
+# the opened stores { store directory : ResultStore }
+_stores = {}
+
+
+class ResultStore:
+    """the result sets of a store directory, their fields are memory mapped arrays"""
+
+    version = 1
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != self.version:
+            raise ValueError(f"Result store {store_dir} has an unknown version")
+        self.result_sets = manifest["result_sets"]
+        self.node_numbers_file = manifest.get("node_numbers")
+
+    def __len__(self):
+        return len(self.result_sets)
+
+    def get_result_set(self, index):
+        """returns the result set like read_frd_result_arrays, but with memory mapped arrays"""
+        entry = self.result_sets[index]
+        result_set = {
+            "number": _get_float(entry["number"]),
+            "time": _get_float(entry["time"]),
+        }
+        for key, (ids_file, values_file) in entry["fields"].items():
+            result_set[key] = (self._load(ids_file), self._load(values_file))
+        return result_set
+
+    def get_node_numbers(self):
+        """the node numbers of the compacted result mesh, None if the mesh was not compacted"""
+        if self.node_numbers_file is None:
+            return None
+        return self._load(self.node_numbers_file)
+
+    def _load(self, file_name):
+        return np.load(os.path.join(self.store_dir, file_name), mmap_mode="r")
+
+
+def write_result_store(store_dir, result_sets):
+    """writes the result sets of an iterable into the store directory
+
+    The result sets are written one after the other, thus a generator
+    like importCcxFrdResults.iter_frd_result_arrays never holds more than
+    one result set in memory. Returns the number of result sets written.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = {"version": ResultStore.version, "result_sets": []}
+    last_ids = None
+    last_ids_file = None
+    for index, result_set in enumerate(result_sets):
+        entry = {
+            "number": _get_json_float(result_set.get("number")),
+            "time": _get_json_float(result_set.get("time")),
+            "fields": {},
+        }
+        for key, value in result_set.items():
+            if key in ("number", "time"):
+                continue
+            ids, values = value
+            if last_ids is None or not np.array_equal(ids, last_ids):
+                last_ids = ids
+                last_ids_file = f"{index:05d}_{key}_ids.npy"
+                np.save(os.path.join(store_dir, last_ids_file), ids)
+            values_file = f"{index:05d}_{key}.npy"
+            np.save(os.path.join(store_dir, values_file), values)
+            entry["fields"][key] = (last_ids_file, values_file)
+        manifest["result_sets"].append(entry)
+    _save_manifest(store_dir, manifest)
+    _stores.pop(store_dir, None)
+    return len(manifest["result_sets"])
+
+
+def set_node_numbers(store_dir, node_numbers):
+    """keeps the node numbers of the compacted result mesh in the store"""
+    np.save(os.path.join(store_dir, "node_numbers.npy"), np.asarray(node_numbers, np.int64))
+    with open(os.path.join(store_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    manifest["node_numbers"] = "node_numbers.npy"
+    _save_manifest(store_dir, manifest)
+    _stores.pop(store_dir, None)
+
+
+def get_store(store_dir):
+    """returns the ResultStore of the store directory, every store is opened once"""
+    store = _stores.get(store_dir)
+    if store is None:
+        store = _stores[store_dir] = ResultStore(store_dir)
+    return store
+
+
+def is_lazy(res_obj):
+    return bool(getattr(res_obj, "ResultStore", ""))
+
+
+def set_lazy(res_obj, store_dir, index):
+    """makes res_obj a lazy result object of the result set index of the store"""
+    res_obj.ResultStore = store_dir
+    res_obj.ResultStoreIndex = index
+
+
+def is_loaded(res_obj):
+    return bool(res_obj.NodeNumbers)
+
+
+def load_result(res_obj):
+    """fills the node data of a lazy result object from its store
+
+    Nothing is done for result objects which are not lazy or already loaded.
+    Returns True if the node data was loaded.
+    """
+    if not is_lazy(res_obj) or is_loaded(res_obj):
+        return False
+    from feminout import importToolsFem
+    from . import resulttools
+
+    store = get_store(res_obj.ResultStore)
+    importToolsFem.fill_femresult_mechanical(
+        res_obj, store.get_result_set(res_obj.ResultStoreIndex)
+    )
+    node_numbers = store.get_node_numbers()
+    if node_numbers is not None:
+        res_obj.NodeNumbers = node_numbers.tolist()
+    resulttools.add_derived_results(res_obj)
+    return True
+
+
+def unload_result(res_obj):
+    """frees the node data of a lazy result object, the statistics are kept"""
+    if not is_lazy(res_obj):
+        return
+    for prop in res_obj.PropertiesList:
+        if res_obj.getGroupOfProperty(prop) == "NodeData":
+            setattr(res_obj, prop, [])
+    res_obj.NodeNumbers = []
+
+
+def set_pipeline_store(pipeline_obj, store_dir, index):
+    """makes pipeline_obj a pipeline of the store, which shows the result set index"""
+    if not hasattr(pipeline_obj, "ResultStore"):
+        pipeline_obj.addProperty(
+            "App::PropertyPath",
+            "ResultStore",
+            "Base",
+            "Directory of the on-disk result store of the result sets shown",
+            1,
+        )
+        pipeline_obj.addProperty(
+            "App::PropertyInteger",
+            "ResultStoreIndex",
+            "Base",
+            "Index of the result set of the result store shown",
+            1,
+        )
+    pipeline_obj.ResultStore = store_dir
+    pipeline_obj.ResultStoreIndex = index
+
+
+def get_store_pipelines(res_obj):
+    """returns the pipelines of the store of a lazy result object"""
+    if not is_lazy(res_obj):
+        return []
+    return [
+        obj
+        for obj in res_obj.Document.Objects
+        if obj.isDerivedFrom("Fem::FemPostPipeline")
+        and getattr(obj, "ResultStore", "") == res_obj.ResultStore
+    ]
+
+
+def load_pipeline_result(pipeline_obj, res_obj):
+    """loads the result set of a lazy result object into a pipeline
+
+    The node data is only held in the result object while it is converted.
+    """
+    loaded = load_result(res_obj)
+    try:
+        pipeline_obj.load(res_obj)
+    finally:
+        if loaded:
+            unload_result(res_obj)
+    if hasattr(pipeline_obj, "ResultStoreIndex"):
+        pipeline_obj.ResultStoreIndex = res_obj.ResultStoreIndex
+
+
+def show_pipeline_result(res_obj):
+    """shows the result set of a lazy result object in the pipelines of its store
+
+    Returns the pipelines which were switched to the result set.
+    """
+    pipelines = [
+        pipeline_obj
+        for pipeline_obj in get_store_pipelines(res_obj)
+        if pipeline_obj.ResultStoreIndex != res_obj.ResultStoreIndex
+    ]
+    for pipeline_obj in pipelines:
+        load_pipeline_result(pipeline_obj, res_obj)
+        pipeline_obj.recomputeChildren()
+        pipeline_obj.recompute()
+        if FreeCAD.GuiUp:
+            pipeline_obj.ViewObject.updateColorBars()
+    return pipelines
+
+
+def _get_json_float(value):
+    # json has no NaN, the result sets use NaN for no eigenmode number and no time
+    if value is None or value != value:
+        return None
+    return value
+
+
+def _get_float(value):
+    return float("NaN") if value is None else value
+
+
+def _save_manifest(store_dir, manifest):
+    file_name = os.path.join(store_dir, MANIFEST_NAME)
+    try:
+        with open(file_name + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(file_name + ".tmp", file_name)
+    except OSError as e:
+        FreeCAD.Console.PrintError(f"Result store manifest {file_name} not written: {e}\n")
+        raise
+
+
+##  @}
@@ -33,6 +33,27 @@ import FreeCAD
 
 from femtools.femutils import is_of_type
 
+# the node data of the result types, in the order of the Stats property
+# { result type : (property name, vector component) }
+RESULT_TYPES = {
+    "U1": ("DisplacementVectors", 0),
+    "U2": ("DisplacementVectors", 1),
+    "U3": ("DisplacementVectors", 2),
+    "Uabs": ("DisplacementLengths", None),
+    "Sabs": ("vonMises", None),
+    "MaxPrin": ("PrincipalMax", None),
+    "MidPrin": ("PrincipalMed", None),
+    "MinPrin": ("PrincipalMin", None),
+    "MaxShear": ("MaxShear", None),
+    "Peeq": ("Peeq", None),
+    "Temp": ("Temperature", None),
+    "MFlow": ("MassFlowRate", None),
+    "NPress": ("NetworkPressure", None),
+}
+
+# the percentiles of the result statistics
+STATS_PERCENTILES = (5, 25, 50, 75, 95)
+
 
 def purge_result_objects(analysis):
     """Removes all result objects and result meshes from an analysis group.
@@ -169,15 +190,7 @@ def show_result(resultobj, result_type="Sabs", limit=None):
         reset_mesh_color(resultobj.Mesh)
         return
     if resultobj:
-        if result_type == "Sabs":
-            values = resultobj.vonMises
-        elif result_type == "Uabs":
-            values = resultobj.DisplacementLengths
-        # TODO: the result object does have more result types to show, implement them
-        else:
-            match = {"U1": 0, "U2": 1, "U3": 2}
-            d = zip(*resultobj.DisplacementVectors)
-            values = list(d[match[result_type]])
+        values = get_result_stats(resultobj).get_values(result_type)
         show_color_by_scalar_with_cutoff(resultobj, values, limit)
     else:
         FreeCAD.Console.PrintError("Error, No result object given.\n")
@@ -190,7 +203,7 @@ def show_color_by_scalar_with_cutoff(resultobj, values, limit=None):
     ----------
     resultobj : Fem::ResultMechanical
         FreeCAD FEM mechanical result object
-    values : list of floats
+    values : list of floats or NumPy array
         the values to be colored and cutoff
         has to be the same length as resultobj.NodeNumbers
         resultobj.NodeNumbers has to be present in the resultobj
@@ -200,12 +213,9 @@ def show_color_by_scalar_with_cutoff(resultobj, values, limit=None):
     """
 
     if limit:
-        filtered_values = []
-        for v in values:
-            if v > limit:
-                filtered_values.append(limit)
-            else:
-                filtered_values.append(v)
+        filtered_values = np.minimum(np.asarray(values, dtype=np.float64), limit).tolist()
+    elif isinstance(values, np.ndarray):
+        filtered_values = values.tolist()
     else:
         filtered_values = values
     if FreeCAD.GuiUp:
@@ -214,6 +224,96 @@ def show_color_by_scalar_with_cutoff(resultobj, values, limit=None):
         resultobj.Mesh.ViewObject.setNodeColorByScalars(resultobj.NodeNumbers, filtered_values)
 
 
+class ResultStats:
+    """node values and statistics of the result types of a result object
+
+    The node data of a property is read from the result object once and kept
+    as NumPy array. The statistics of a result type are computed from it on
+    first use and kept too. The entries of a property are dropped if the
+    property changes, see clear_result_stats.
+    """
+
+    def __init__(self, res_obj):
+        self.res_obj = res_obj
+        self.arrays = {}
+        self.stats = {}
+
+    def get_values(self, result_type):
+        """the node values of the result type as NumPy array, in the order of NodeNumbers"""
+        prop, component = RESULT_TYPES[result_type]
+        values = self.arrays.get(prop)
+        if values is None:
+            values = np.asarray(getattr(self.res_obj, prop), dtype=np.float64)
+            if component is not None:
+                values = values.reshape(-1, 3)
+            self.arrays[prop] = values
+        if component is not None:
+            return values[:, component]
+        return values
+
+    def get_stats(self, result_type):
+        """dict of min, max, mean and the STATS_PERCENTILES of the result type
+
+        All values are 0.0 for a result type without node data.
+        """
+        stats = self.stats.get(result_type)
+        if stats is None:
+            values = self.get_values(result_type)
+            if len(values):
+                # min and max are the percentiles 0 and 100, all in one partition
+                q = np.percentile(values, (0, *STATS_PERCENTILES, 100)).tolist()
+                mean = float(values.mean())
+            else:
+                q = [0.0] * (len(STATS_PERCENTILES) + 2)
+                mean = 0.0
+            stats = {
+                "min": q[0],
+                "max": q[-1],
+                "mean": mean,
+                "percentiles": dict(zip(STATS_PERCENTILES, q[1:-1])),
+            }
+            self.stats[result_type] = stats
+        return stats
+
+    def clear(self, prop=None):
+        """drops the entries of the property prop, all entries if prop is None"""
+        if prop is None:
+            self.arrays = {}
+            self.stats = {}
+            return
+        self.arrays.pop(prop, None)
+        for result_type, (type_prop, component) in RESULT_TYPES.items():
+            if type_prop == prop:
+                self.stats.pop(result_type, None)
+
+
+def get_result_stats(res_obj):
+    """returns the ResultStats of the result object
+
+    It is kept by the Proxy of the result object and goes with it, e.g. if the
+    result object is deleted or its document is closed. A result object
+    without Proxy gets a new one on each call.
+    """
+    proxy = getattr(res_obj, "Proxy", None)
+    result_stats = getattr(proxy, "result_stats", None)
+    if result_stats is None or result_stats.res_obj is not res_obj:
+        result_stats = ResultStats(res_obj)
+        if proxy is not None:
+            proxy.result_stats = result_stats
+    return result_stats
+
+
+def clear_result_stats(res_obj, prop=None):
+    """drops the cached node values and statistics of the property prop of the result object
+
+    Called by the result object if a property changes, all entries are
+    dropped if prop is None.
+    """
+    result_stats = getattr(getattr(res_obj, "Proxy", None), "result_stats", None)
+    if result_stats is not None:
+        result_stats.clear(prop)
+
+
 def get_stats(res_obj, result_type):
     """Returns minimum and maximum value for provided result type
 
@@ -304,77 +404,13 @@ def fill_femresult_stats(res_obj):
     """
 
     FreeCAD.Console.PrintLog("Calculate stats list for result obj: " + res_obj.Name + "\n")
-    # set stats values to 0, they may not exist in res_obj
-    x_min = y_min = z_min = x_max = y_max = z_max = 0
-    a_max = a_min = s_max = s_min = 0
-    p1_min = p1_max = p2_min = p2_max = p3_min = p3_max = 0
-    ms_min = ms_max = peeq_min = peeq_max = 0
-    temp_min = temp_max = 0
-    mflow_min = mflow_max = npress_min = npress_max = 0
-
-    if res_obj.DisplacementVectors:
-        x_max, y_max, z_max = map(max, zip(*res_obj.DisplacementVectors))
-        x_min, y_min, z_min = map(min, zip(*res_obj.DisplacementVectors))
-    if res_obj.DisplacementLengths:
-        a_min = min(res_obj.DisplacementLengths)
-        a_max = max(res_obj.DisplacementLengths)
-    if res_obj.vonMises:
-        s_min = min(res_obj.vonMises)
-        s_max = max(res_obj.vonMises)
-    if res_obj.PrincipalMax:
-        p1_min = min(res_obj.PrincipalMax)
-        p1_max = max(res_obj.PrincipalMax)
-    if res_obj.PrincipalMed:
-        p2_min = min(res_obj.PrincipalMed)
-        p2_max = max(res_obj.PrincipalMed)
-    if res_obj.PrincipalMin:
-        p3_min = min(res_obj.PrincipalMin)
-        p3_max = max(res_obj.PrincipalMin)
-    if res_obj.MaxShear:
-        ms_min = min(res_obj.MaxShear)
-        ms_max = max(res_obj.MaxShear)
-    if res_obj.Peeq:
-        peeq_min = min(res_obj.Peeq)
-        peeq_max = max(res_obj.Peeq)
-    if res_obj.Temperature:
-        temp_min = min(res_obj.Temperature)
-        temp_max = max(res_obj.Temperature)
-    if res_obj.MassFlowRate:
-        # DisplacementVectors is empty, no_of_values needs to be set
-        mflow_min = min(res_obj.MassFlowRate)
-        mflow_max = max(res_obj.MassFlowRate)
-    if res_obj.NetworkPressure:
-        npress_min = min(res_obj.NetworkPressure)
-        npress_max = max(res_obj.NetworkPressure)
-
-    res_obj.Stats = [
-        x_min,
-        x_max,
-        y_min,
-        y_max,
-        z_min,
-        z_max,
-        a_min,
-        a_max,
-        s_min,
-        s_max,
-        p1_min,
-        p1_max,
-        p2_min,
-        p2_max,
-        p3_min,
-        p3_max,
-        ms_min,
-        ms_max,
-        peeq_min,
-        peeq_max,
-        temp_min,
-        temp_max,
-        mflow_min,
-        mflow_max,
-        npress_min,
-        npress_max,
-    ]
+    # the stats of result types without values are 0, they may not exist in res_obj
+    result_stats = get_result_stats(res_obj)
+    stats = []
+    for result_type in RESULT_TYPES:
+        type_stats = result_stats.get_stats(result_type)
+        stats.extend((type_stats["min"], type_stats["max"]))
+    res_obj.Stats = stats
     """
     stat_types = [
         "U1",
@@ -412,18 +448,8 @@ def add_disp_apps(res_obj):
 
 
 def add_von_mises(res_obj):
-    mstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ,
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        mstress.append(calculate_von_mises((Sxx, Syy, Szz, Sxy, Sxz, Syz)))
-    res_obj.vonMises = mstress
+    stress = get_stress_tensor_array(res_obj)
+    res_obj.vonMises = calculate_von_mises_array(stress).tolist()
     FreeCAD.Console.PrintLog("Added von Mises stress.\n")
     return res_obj
 
@@ -433,28 +459,14 @@ def add_principal_stress_std(res_obj):
     # TODO may be use only one container for principal stresses in result object
     # https://forum.freecad.org/viewtopic.php?f=18&t=33106&p=416006#p416006
     # but which one is better
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ,
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        prin1, prin2, prin3, shear = calculate_principal_stress_std((Sxx, Syy, Szz, Sxy, Sxz, Syz))
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+    stress = get_stress_tensor_array(res_obj)
+    prinstress1, prinstress2, prinstress3, shearstress = calculate_principal_stress_std_array(
+        stress
+    ).T
+    res_obj.PrincipalMax = prinstress1.tolist()
+    res_obj.PrincipalMed = prinstress2.tolist()
+    res_obj.PrincipalMin = prinstress3.tolist()
+    res_obj.MaxShear = shearstress.tolist()
     FreeCAD.Console.PrintLog("Added standard principal stresses and max shear values.\n")
 
     #
@@ -506,20 +518,18 @@ def calculate_csr(ps1, ps2, ps3, alpha, beta, res_obj):
             unless available from extensive research experiments
             T = pressure / von Mises stress (stress triaxiality)
     """
-    csr = []  # critical strain ratio
-    nsr = len(ps1)  # number of stress results
-    for i in range(nsr):
-        p = (ps1[i] + ps2[i] + ps3[i]) / 3.0  # pressure
-        svm = np.sqrt(
-            1.5 * (ps1[i] - p) ** 2 + 1.5 * (ps2[i] - p) ** 2 + 1.5 * (ps3[i] - p) ** 2
-        )  # von Mises stress: https://en.wikipedia.org/wiki/Von_Mises_yield_criterion
-        if svm != 0.0:
-            T = p / svm  # stress triaxiality
-        else:
-            T = 0.0
-        critical_strain = alpha * np.exp(-beta * T)  # critical strain
-        csr.append(abs(res_obj.Peeq[i]) / critical_strain)  # critical strain ratio
-    return csr
+    ps1 = np.asarray(ps1, dtype=float)
+    ps2 = np.asarray(ps2, dtype=float)
+    ps3 = np.asarray(ps3, dtype=float)
+    p = (ps1 + ps2 + ps3) / 3.0  # pressure
+    svm = np.sqrt(
+        1.5 * (ps1 - p) ** 2 + 1.5 * (ps2 - p) ** 2 + 1.5 * (ps3 - p) ** 2
+    )  # von Mises stress: https://en.wikipedia.org/wiki/Von_Mises_yield_criterion
+    with np.errstate(divide="ignore", invalid="ignore"):
+        T = np.where(svm != 0.0, p / svm, 0.0)  # stress triaxiality
+    critical_strain = alpha * np.exp(-beta * T)  # critical strain
+    peeq = np.asarray(res_obj.Peeq[: len(ps1)], dtype=float)
+    return (np.abs(peeq) / critical_strain).tolist()  # critical strain ratio
 
 
 def get_concrete_nodes(res_obj):
@@ -572,29 +582,6 @@ def add_principal_stress_reinforced(res_obj):
     #
     ic = get_concrete_nodes(res_obj)
 
-    #
-    # calculate principal and max Shear and fill them in res_obj
-    #
-    # saved into PS1Vector, PS2Vector, PS3Vector
-    # TODO may be use only one container for principal stresses in result object
-    # https://forum.freecad.org/viewtopic.php?f=18&t=33106&p=416006#p416006
-    # but which one is better
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    ps1v = []
-    ps2v = []
-    ps3v = []
-    #
-    # additional arrays to hold reinforcement ratios
-    # and mohr coulomb stress
-    #
-    rhx = []
-    rhy = []
-    rhz = []
-    moc = []
-
     # material parameter
     for obj in res_obj.getParentGroup().Group:
         if is_of_type(obj, "Fem::MaterialReinforced"):
@@ -611,65 +598,47 @@ def add_principal_stress_reinforced(res_obj):
     # print(matrix_cs)
     # print(reinforce_yield)
 
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ,
+    #
+    # calculate principal and max Shear and fill them in res_obj
+    #
+    # saved into PS1Vector, PS2Vector, PS3Vector
+    # TODO may be use only one container for principal stresses in result object
+    # https://forum.freecad.org/viewtopic.php?f=18&t=33106&p=416006#p416006
+    # but which one is better
+    stress = get_stress_tensor_array(res_obj)
+    prin, shearstress, psv = calculate_principal_stress_reinforced_array(stress)
+    prinstress1, prinstress2, prinstress3 = prin.T
+
+    #
+    # reinforcement ratios and mohr coulomb criterion
+    # for concrete scxx etc. are affected by
+    # reinforcement (see calculate_rho(stress_tensor)). for all other
+    # materials scxx etc. are the original stresses
+    #
+    concrete = ic[: len(stress)] == 1
+    rho = np.zeros((len(stress), 3))
+    rho[concrete] = calculate_rho_array(stress[concrete], reinforce_yield)
+    moc = np.zeros(len(stress))
+    moc[concrete] = calculate_mohr_coulomb_array(
+        prinstress1[concrete], prinstress3[concrete], matrix_af, matrix_cs
     )
-    for isv, stress_tensor in enumerate(iterator):
-
-        rhox = 0.0
-        rhoy = 0.0
-        rhoz = 0.0
-        mc = 0.0
-
-        if ic[isv] == 1:
-            #
-            # for concrete scxx etc. are affected by
-            # reinforcement (see calculate_rho(stress_tensor)). for all other
-            # materials scxx etc. are the original stresses
-            #
-            rhox, rhoy, rhoz = calculate_rho(stress_tensor, reinforce_yield)
-
-        prin1, prin2, prin3, shear, psv = calculate_principal_stress_reinforced(stress_tensor)
-
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-        ps1v.append(psv[0])
-        ps2v.append(psv[1])
-        ps3v.append(psv[2])
-
-        #
-        # reinforcement ratios and mohr coulomb criterion
-        #
-        rhx.append(rhox)
-        rhy.append(rhoy)
-        rhz.append(rhoz)
-        if ic[isv] == 1:
-            mc = calculate_mohr_coulomb(prin1, prin3, matrix_af, matrix_cs)
-        moc.append(mc)
-
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+
+    res_obj.PrincipalMax = prinstress1.tolist()
+    res_obj.PrincipalMed = prinstress2.tolist()
+    res_obj.PrincipalMin = prinstress3.tolist()
+    res_obj.MaxShear = shearstress.tolist()
     #
     # additional concrete and principal stress plot
     # results for use in _ViewProviderFemResultMechanical
     #
-    res_obj.ReinforcementRatio_x = rhx
-    res_obj.ReinforcementRatio_y = rhy
-    res_obj.ReinforcementRatio_z = rhz
-    res_obj.MohrCoulomb = moc
+    res_obj.ReinforcementRatio_x = rho[:, 0].tolist()
+    res_obj.ReinforcementRatio_y = rho[:, 1].tolist()
+    res_obj.ReinforcementRatio_z = rho[:, 2].tolist()
+    res_obj.MohrCoulomb = moc.tolist()
 
-    res_obj.PS1Vector = ps1v
-    res_obj.PS2Vector = ps2v
-    res_obj.PS3Vector = ps3v
+    res_obj.PS1Vector = list(map(tuple, psv[:, 0].tolist()))
+    res_obj.PS2Vector = list(map(tuple, psv[:, 1].tolist()))
+    res_obj.PS3Vector = list(map(tuple, psv[:, 2].tolist()))
 
     FreeCAD.Console.PrintLog(
         "Added reinforcement principal stresses and max shear values as well as "
@@ -678,33 +647,97 @@ def add_principal_stress_reinforced(res_obj):
     return res_obj
 
 
-def compact_result(res_obj):
+def add_derived_results(res_obj):
+    """
+    fills the results calculated from the result fields: displacement lengths,
+    von Mises stress and the principal stresses, the reinforced principal stresses
+    are added too if the analysis of res_obj has a reinforced material
+    """
+    res_obj = add_disp_apps(res_obj)
+    res_obj = add_von_mises(res_obj)
+    if res_obj.getParentGroup():
+        for obj in res_obj.getParentGroup().Group:
+            if is_of_type(obj, "Fem::MaterialReinforced"):
+                FreeCAD.Console.PrintLog(
+                    "Reinforced material object detected, "
+                    "reinforced principal stresses and standard principal "
+                    "stresses will be added.\n"
+                )
+                add_principal_stress_reinforced(res_obj)
+                return res_obj
+        FreeCAD.Console.PrintLog(
+            "No reinforced material object detected, "
+            "standard principal stresses will be added.\n"
+        )
+    else:
+        # if a pure frd file was opened no analysis and thus no parent group
+        FreeCAD.Console.PrintLog(
+            "No Analysis detected, standard principal stresses will be added.\n"
+        )
+    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
+    return add_principal_stress_std(res_obj)
+
+
+def compact_result(res_obj, mesh_data=None):
     """
     compacts result.Mesh and appropriate result.NodeNumbers
+    mesh_data: the FEM Mesh data of arrays result.Mesh was made of,
+    see importToolsFem.make_femmesh_from_arrays, if given the mesh is not read back
     """
     # as workaround for https://www.freecad.org/tracker/view.php?id=2873
+    from femmesh import meshtools
 
-    # get compact mesh data
-    from femmesh.meshtools import compact_mesh
-
-    compact_femmesh_data = compact_mesh(res_obj.Mesh.FemMesh)
-    compact_femmesh = compact_femmesh_data[0]
-    node_map = compact_femmesh_data[1]
-    # FreeCAD result obj does not support elem results ATM
-    # elem_map = compact_femmesh_data[2]
+    # get mesh arrays
+    if mesh_data is None:
+        node_ids, node_coords, elements = meshtools.get_femmesh_arrays(res_obj.Mesh.FemMesh)
+    else:
+        from feminout.importToolsFem import FEMMESH_ELEMENT_KEYS
+
+        node_ids, node_coords = mesh_data["Nodes"]
+        elements = [
+            (element_type, *mesh_data[key])
+            for key, element_type in FEMMESH_ELEMENT_KEYS
+            if key in mesh_data and len(mesh_data[key][0])
+        ]
+
+    # one permutation of the node ids for the mesh and the result node numbers
+    node_coords, elements, old_node_ids = meshtools.compact_mesh_arrays(
+        node_ids, node_coords, elements
+    )
 
     # set result mesh
-    res_obj.Mesh.FemMesh = compact_femmesh
+    res_obj.Mesh.FemMesh = meshtools.make_femmesh_of_arrays(node_coords, elements)
 
     # set result node numbers
-    new_node_numbers = []
-    for old_node_id in res_obj.NodeNumbers:
-        new_node_numbers.append(node_map[old_node_id])
-    res_obj.NodeNumbers = new_node_numbers
+    res_obj.NodeNumbers = meshtools.renumber_nodes(old_node_ids, res_obj.NodeNumbers).tolist()
 
     return res_obj
 
 
+def get_stress_tensor_array(res_obj):
+    """Returns the nodal stress tensors of a result object as (N, 6) array.
+
+    The columns are (Sxx, Syy, Szz, Sxy, Sxz, Syz) like the stress_tensor
+    of the calculate methods.
+    """
+    return np.column_stack(
+        (
+            res_obj.NodeStressXX,
+            res_obj.NodeStressYY,
+            res_obj.NodeStressZZ,
+            res_obj.NodeStressXY,
+            res_obj.NodeStressXZ,
+            res_obj.NodeStressYZ,
+        )
+    ).astype(float)
+
+
+def get_stress_tensor_matrices(stress):
+    """Returns the symmetric (N, 3, 3) stress matrices of an (N, 6) stress array."""
+    # https://forum.freecad.org/viewtopic.php?f=18&t=24637&start=10#p240408
+    return stress[:, [[0, 3, 4], [3, 1, 5], [4, 5, 2]]]
+
+
 def calculate_von_mises(stress_tensor):
     """Calculate Von mises stress.
     See http://en.wikipedia.org/wiki/Von_Mises_yield_criterion
@@ -721,6 +754,19 @@ def calculate_von_mises(stress_tensor):
     return von_mises
 
 
+def calculate_von_mises_array(stress):
+    """Calculate Von mises stress for all rows of an (N, 6) stress array.
+
+    see calculate_von_mises, rows with NaN give NaN
+    """
+    normal = stress[:, :3]
+    shear = stress[:, 3:]
+    deviator = normal - normal.mean(axis=1, keepdims=True)
+    return np.sqrt(
+        1.5 * np.einsum("ij,ij->i", deviator, deviator) + 3.0 * np.einsum("ij,ij->i", shear, shear)
+    )
+
+
 def calculate_principal_stress_std(stress_tensor):
     # if NaN is inside the array, which can happen on Calculix frd result files return NaN
     # https://forum.freecad.org/viewtopic.php?f=22&t=33911&start=10#p284229
@@ -746,6 +792,22 @@ def calculate_principal_stress_std(stress_tensor):
     return (eigvals[0], eigvals[1], eigvals[2], maxshear)
 
 
+def calculate_principal_stress_std_array(stress):
+    """Calculate principal stresses for all rows of an (N, 6) stress array.
+
+    Returns an (N, 4) array with the columns (prin1, prin2, prin3, maxshear),
+    see calculate_principal_stress_std. Rows with NaN give NaN.
+    """
+    result = np.full((len(stress), 4), np.nan)
+    valid = ~np.isnan(stress).any(axis=1)
+    if valid.any():
+        # eigvalsh returns ascending eigenvalues
+        eigvals = np.linalg.eigvalsh(get_stress_tensor_matrices(stress[valid]))[:, ::-1]
+        result[valid, :3] = eigvals
+        result[valid, 3] = (eigvals[:, 0] - eigvals[:, 2]) / 2.0
+    return result
+
+
 def calculate_principal_stress_reinforced(stress_tensor):
     """Calculate principal stress vectors and values.
 
@@ -796,6 +858,34 @@ def calculate_principal_stress_reinforced(stress_tensor):
     )
 
 
+def calculate_principal_stress_reinforced_array(stress):
+    """Calculate principal stress values and vectors for all rows of an (N, 6) stress array.
+
+    Returns the principal stresses as (N, 3) array in descending order, the max shear
+    as (N,) array and the principal stress vectors as (N, 3, 3) array, where [:, i] is
+    the vector of principal stress i, see calculate_principal_stress_reinforced.
+    Rows with NaN give NaN.
+    """
+    prin = np.full((len(stress), 3), np.nan)
+    maxshear = np.full(len(stress), np.nan)
+    psv = np.full((len(stress), 3, 3), np.nan)
+    valid = ~np.isnan(stress).any(axis=1)
+    if valid.any():
+        eigenvalues, eigenvectors = np.linalg.eig(get_stress_tensor_matrices(stress[valid]))
+        # suppress complex eigenvalue and vectors, see calculate_principal_stress_reinforced
+        eigenvalues = eigenvalues.real
+        eigenvectors = eigenvectors.real * eigenvalues[:, np.newaxis, :]
+
+        idx = np.argsort(eigenvalues, axis=1)[:, ::-1]
+        eigenvalues = np.take_along_axis(eigenvalues, idx, axis=1)
+        eigenvectors = np.take_along_axis(eigenvectors, idx[:, np.newaxis, :], axis=2)
+
+        prin[valid] = eigenvalues
+        maxshear[valid] = (eigenvalues[:, 0] - eigenvalues[:, 2]) / 2.0
+        psv[valid] = np.swapaxes(eigenvectors, 1, 2)
+    return prin, maxshear, psv
+
+
 def calculate_rho(stress_tensor, fy):
     """Calculation of Reinforcement Ratios and Concrete Stresses
     (in accordance with http://heronjournal.nl/53-4/3.pdf)
@@ -954,6 +1044,119 @@ def calculate_rho(stress_tensor, fy):
     return rhox[eqmin], rhoy[eqmin], rhoz[eqmin]
 
 
+def calculate_rho_array(stress, fy):
+    """Calculation of Reinforcement Ratios for all rows of an (N, 6) stress array.
+
+    Returns an (N, 3) array with the columns (rhox, rhoy, rhoz), see calculate_rho.
+    The solutions are evaluated for all rows at once and the one with the
+    minimal reinforcement sum is taken per row.
+    """
+
+    sxx, syy, szz, sxy, sxz, syz = stress.T
+
+    rhox = np.zeros((len(stress), 15))
+    rhoy = np.zeros((len(stress), 15))
+    rhoz = np.zeros((len(stress), 15))
+
+    i3 = sxx * syy * szz + 2 * sxy * sxz * syz - sxx * syz**2 - syy * sxz**2 - szz * sxy**2
+
+    # the solutions with a zero divisor are kept at zero like in calculate_rho
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Solution (5)
+        d = sxx * syy - sxy**2
+        rhoz[:, 0] = np.where(d != 0.0, i3 / d / fy, 0.0)
+
+        # Solution (6)
+        d = sxx * szz - sxz**2
+        rhoy[:, 1] = np.where(d != 0.0, i3 / d / fy, 0.0)
+
+        # Solution (7)
+        d = syy * szz - syz**2
+        rhox[:, 2] = np.where(d != 0.0, i3 / d / fy, 0.0)
+
+        # Solution (9)
+        nonzero = sxx != 0.0
+        fc = sxz * sxy / sxx - syz
+        fxy = sxy**2 / sxx
+        fxz = sxz**2 / sxx
+        rhoy[:, 3] = np.where(nonzero, (syy - fxy + fc) / fy, 0.0)
+        rhoz[:, 3] = np.where(nonzero, (szz - fxz + fc) / fy, 0.0)
+        rhoy[:, 4] = np.where(nonzero, (syy - fxy - fc) / fy, 0.0)
+        rhoz[:, 4] = np.where(nonzero, (szz - fxz - fc) / fy, 0.0)
+
+        # Solution (10)
+        nonzero = syy != 0.0
+        fc = syz * sxy / syy - sxz
+        fxy = sxy**2 / syy
+        fyz = syz**2 / syy
+        rhox[:, 5] = np.where(nonzero, (sxx - fxy + fc) / fy, 0.0)
+        rhoz[:, 5] = np.where(nonzero, (szz - fyz + fc) / fy, 0.0)
+        rhox[:, 6] = np.where(nonzero, (sxx - fxy - fc) / fy, 0.0)
+        rhoz[:, 6] = np.where(nonzero, (szz - fyz - fc) / fy, 0.0)
+
+        # Solution (11)
+        nonzero = szz != 0.0
+        fc = sxz * syz / szz - sxy
+        fxz = sxz**2 / szz
+        fyz = syz**2 / szz
+        rhox[:, 7] = np.where(nonzero, (sxx - fxz + fc) / fy, 0.0)
+        rhoy[:, 7] = np.where(nonzero, (syy - fyz + fc) / fy, 0.0)
+        rhox[:, 8] = np.where(nonzero, (sxx - fxz - fc) / fy, 0.0)
+        rhoy[:, 8] = np.where(nonzero, (syy - fyz - fc) / fy, 0.0)
+
+        # Solution (13)
+        rhox[:, 9] = (sxx + sxy + sxz) / fy
+        rhoy[:, 9] = (syy + sxy + syz) / fy
+        rhoz[:, 9] = (szz + sxz + syz) / fy
+
+        # Solution (14)
+        rhox[:, 10] = (sxx + sxy - sxz) / fy
+        rhoy[:, 10] = (syy + sxy - syz) / fy
+        rhoz[:, 10] = (szz - sxz - syz) / fy
+
+        # Solution (15)
+        rhox[:, 11] = (sxx - sxy - sxz) / fy
+        rhoy[:, 11] = (syy - sxy + syz) / fy
+        rhoz[:, 11] = (szz - sxz + syz) / fy
+
+        # Solution (16)
+        rhox[:, 12] = (sxx - sxy + sxz) / fy
+        rhoy[:, 12] = (syy - sxy - syz) / fy
+        rhoz[:, 12] = (szz + sxz - syz) / fy
+
+        # Solution (17)
+        rhox[:, 13] = np.where(syz != 0.0, (sxx - sxy * sxz / syz) / fy, 0.0)
+        rhoy[:, 13] = np.where(sxz != 0.0, (syy - sxy * syz / sxz) / fy, 0.0)
+        rhoz[:, 13] = np.where(sxy != 0.0, (szz - sxz * syz / sxy) / fy, 0.0)
+
+    # Concrete Stresses
+    sxx, syy, szz, sxy, sxz, syz = stress.T[:, :, np.newaxis]
+    scxx = sxx - rhox * fy
+    scyy = syy - rhoy * fy
+    sczz = szz - rhoz * fy
+    ic1 = scxx + scyy + sczz
+    ic2 = scxx * scyy + scyy * sczz + sczz * scxx - sxy**2 - sxz**2 - syz**2
+    ic3 = scxx * scyy * sczz + 2 * sxy * sxz * syz - scxx * syz**2 - scyy * sxz**2 - sczz * sxy**2
+    rsum = rhox + rhoy + rhoz
+
+    admissible = (
+        (rhox >= -1.0e-10)
+        & (rhoy >= -1.0e-10)
+        & (rhoz > -1.0e-10)
+        & (ic1 <= 1.0e-6)
+        & (ic2 >= -1.0e-6)
+        & (ic3 <= 1.0e-6)
+        & (rsum > 0.0)
+        & (rsum < 1.0e9)
+    )
+    # argmin takes the first minimum like the strict comparison in calculate_rho
+    eqmin = np.argmin(np.where(admissible, rsum, np.inf), axis=1)
+    eqmin[~admissible.any(axis=1)] = 14
+
+    rows = np.arange(len(stress))
+    return np.column_stack((rhox[rows, eqmin], rhoy[rows, eqmin], rhoz[rows, eqmin]))
+
+
 def calculate_mohr_coulomb(prin1, prin3, phi, fck):
     """Calculation of Mohr Coulomb yield criterion to judge
     concrete crushing and shear failure.
@@ -974,6 +1177,19 @@ def calculate_mohr_coulomb(prin1, prin3, phi, fck):
     return mc_stress
 
 
+def calculate_mohr_coulomb_array(prin1, prin3, phi, fck):
+    """Calculation of Mohr Coulomb yield criterion for arrays of principal stresses.
+
+    see calculate_mohr_coulomb
+    """
+
+    coh = fck * (1 - np.sin(phi)) / 2 / np.cos(phi)
+
+    mc_stress = (prin1 - prin3) + (prin1 + prin3) * np.sin(phi) - 2.0 * coh * np.cos(phi)
+
+    return np.where(mc_stress < 0.0, 0.0, mc_stress)
+
+
 def calculate_disp_abs(displacements):
     # see https://forum.freecad.org/viewtopic.php?f=18&t=33106&start=100#p296657
     return [np.linalg.norm(nd) for nd in displacements]
@@ -0,0 +1,191 @@
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FreeCAD FEM solver CalculiX input section cache"
+__author__ = "FreeCAD FEM developers"
+__url__ = "https://www.freecad.org"
+
+## \addtogroup FEM
+#  @{
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+import FreeCAD
+
+# the section files written in the session, they are reused in other directories
+# { key : (file path, size, modification time) }
+_section_files = {}
+
+
+class SectionCache:
+    """cache of the include files of a split CalculiX input file
+
+    Every include file (section) has a key, the digest of everything its content
+    is made of. The keys of the sections written into a directory are kept in the
+    file <mesh name>_sections.json in this directory. A section is only written
+    if there is no file with its key, either in the directory from a previous run
+    or in another directory written in this session, which is linked or copied.
+    A section file changed since it was written is never reused. A section
+    which is not current is removed before it is written, thus the linked files
+    of other directories are never changed.
+    """
+
+    version = 1
+
+    def __init__(self, dir_name, mesh_name):
+        self.dir_name = dir_name
+        self.file_name = os.path.join(dir_name, mesh_name + "_sections.json")
+        self.sections = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def is_current(self, section_file, key):
+        """True if the file section_file with the content of key is in the directory"""
+        path = os.path.join(self.dir_name, section_file)
+        entry = self.sections.get(section_file)
+        if entry and entry[0] == key and _is_unchanged(path, entry[1:]):
+            self.hits += 1
+            return True
+
+        known = _section_files.get(key)
+        if known and known[0] != path and _is_unchanged(known[0], known[1:]):
+            try:
+                if os.path.lexists(path):
+                    os.remove(path)
+                try:
+                    os.link(known[0], path)
+                except OSError:
+                    shutil.copyfile(known[0], path)
+            except OSError as e:
+                FreeCAD.Console.PrintLog(f"Section {known[0]} not reused: {e}\n")
+            else:
+                self.add(section_file, key)
+                self.hits += 1
+                return True
+
+        self.discard(section_file)
+        self.misses += 1
+        return False
+
+    def discard(self, section_file):
+        """removes the file section_file, to be called before it is written anew
+
+        The file may be linked with the file of another directory. It is removed
+        instead of truncated by the writer, thus the other file is kept.
+        """
+        self.sections.pop(section_file, None)
+        path = os.path.join(self.dir_name, section_file)
+        try:
+            if os.path.lexists(path):
+                os.remove(path)
+        except OSError as e:
+            FreeCAD.Console.PrintWarning(f"Section {path} not removed: {e}\n")
+
+    def add(self, section_file, key):
+        """to be called after the file section_file with the content of key was written"""
+        path = os.path.join(self.dir_name, section_file)
+        stat = os.stat(path)
+        self.sections[section_file] = (key, stat.st_size, stat.st_mtime_ns)
+        _section_files[key] = (path, stat.st_size, stat.st_mtime_ns)
+
+    def load(self):
+        if not os.path.isfile(self.file_name):
+            return
+        try:
+            with open(self.file_name) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            FreeCAD.Console.PrintWarning(f"Section cache {self.file_name} not read: {e}\n")
+            return
+        if data.get("version") == self.version:
+            self.sections = {name: tuple(entry) for name, entry in data["sections"].items()}
+
+    def save(self):
+        data = {"version": self.version, "sections": self.sections}
+        try:
+            with open(self.file_name, "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            FreeCAD.Console.PrintWarning(f"Section cache {self.file_name} not saved: {e}\n")
+
+
+def _is_unchanged(path, stat_entry):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return (stat.st_size, stat.st_mtime_ns) == tuple(stat_entry)
+
+
+def get_key(*parts):
+    """digest of the parts, NumPy arrays and lists of int are hashed by their data"""
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, (list, tuple)) and part and all(isinstance(p, int) for p in part):
+            part = np.array(part, dtype=np.int64)
+        if isinstance(part, np.ndarray):
+            digest.update(str(part.dtype).encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_object_key(obj):
+    """digest of the property values of a document object"""
+    values = []
+    for prop in obj.PropertiesList:
+        if prop in ("ExpressionEngine", "Proxy", "Shape", "Label2", "Visibility"):
+            continue
+        try:
+            values.append((prop, _get_plain_value(getattr(obj, prop))))
+        except Exception:
+            continue
+    return get_key(obj.Name, values)
+
+
+def _get_plain_value(value):
+    # the repr of a document object does not tell which one it is, its name does
+    if isinstance(value, (list, tuple)):
+        return [_get_plain_value(v) for v in value]
+    if hasattr(value, "TypeId") and hasattr(value, "Name"):
+        return value.Name
+    return value
+
+
+def get_femobj_key(femobj):
+    """digest of a femobj dict of the mesh sets getter and the properties of its object"""
+    parts = [get_object_key(femobj["Object"])]
+    for name in sorted(femobj):
+        if name != "Object":
+            parts.extend((name, femobj[name]))
+    return get_key(*parts)
+
+
+##  @}
@@ -26,12 +26,34 @@ __author__ = "Bernd Hahnebach"
 __url__ = "https://www.freecad.org"
 
 
+from os.path import join
+
+from . import sectioncache
+
+
 def write_femelement_matgeosets(f, ccxwriter):
 
     # write mat_geo_sets to file
     f.write("\n{}\n".format(59 * "*"))
     f.write("** Element sets for materials and FEM element type (solid, shell, beam, fluid)\n")
 
+    if ccxwriter.split_inpfile:
+        file_name_split = ccxwriter.mesh_name + "_Element_sets_material_geometry.inp"
+        f.write(f"*INCLUDE,INPUT={file_name_split}\n")
+        key_parts = ["matgeosets"]
+        for matgeoset in ccxwriter.mat_geo_sets:
+            key_parts.extend((matgeoset["ccx_elset_name"], matgeoset["ccx_elset"]))
+        key = sectioncache.get_key(*key_parts)
+        if not ccxwriter.section_cache.is_current(file_name_split, key):
+            with open(join(ccxwriter.dir_name, file_name_split), "w") as inpfile_split:
+                write_matgeosets(inpfile_split, ccxwriter)
+            ccxwriter.section_cache.add(file_name_split, key)
+    else:
+        write_matgeosets(f, ccxwriter)
+
+
+def write_matgeosets(f, ccxwriter):
+
     for matgeoset in ccxwriter.mat_geo_sets:
 
         f.write("*ELSET,ELSET={}\n".format(matgeoset["ccx_elset_name"]))
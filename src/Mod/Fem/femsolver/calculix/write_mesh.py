@@ -29,6 +29,7 @@ __url__ = "https://www.freecad.org"
 from os.path import join
 
 from femmesh import meshtools
+from . import sectioncache
 
 
 def write_mesh(ccxwriter):
@@ -72,14 +73,32 @@ def write_mesh(ccxwriter):
         file_name_split = ccxwriter.mesh_name + "_" + write_name + ".inp"
         ccxwriter.femmesh_file = join(ccxwriter.dir_name, file_name_split)
 
-        ccxwriter.femmesh.writeABAQUS(
-            ccxwriter.femmesh_file,
-            element_param,
-            group_param,
-            volVariant=vol_variant,
-            faceVariant=face_variant,
-            edgeVariant=edge_variant,
-        )
+        # the mesh file is changed afterwards for fluid inlet and outlet elements
+        key = None
+        if not ccxwriter.member.geos_fluidsection:
+            key = sectioncache.get_key(
+                write_name,
+                ccxwriter.mesh_hash,
+                element_param,
+                group_param,
+                vol_variant,
+                face_variant,
+                edge_variant,
+            )
+        if key is None:
+            # the mesh file is changed in place, a linked file of a previous run is removed
+            ccxwriter.section_cache.discard(file_name_split)
+        if key is None or not ccxwriter.section_cache.is_current(file_name_split, key):
+            ccxwriter.femmesh.writeABAQUS(
+                ccxwriter.femmesh_file,
+                element_param,
+                group_param,
+                volVariant=vol_variant,
+                faceVariant=face_variant,
+                edgeVariant=edge_variant,
+            )
+            if key is not None:
+                ccxwriter.section_cache.add(file_name_split, key)
 
         inpfile = open(ccxwriter.file_name, "w", encoding="utf-8")
         inpfile.write("{}\n".format(59 * "*"))
@@ -61,10 +61,12 @@ from . import write_femelement_material
 from . import write_femelement_matgeosets
 from . import write_footer
 from . import write_mesh
+from . import sectioncache
 from . import write_amplitude
 from . import write_step_equation
 from . import write_step_output
 from .. import writerbase
+from femmesh import meshsetscache
 from femtools import constants
 
 # Interesting forum topic: https://forum.freecad.org/viewtopic.php?&t=48451
@@ -138,6 +140,16 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             FreeCAD.Console.PrintMessage("One monster input file.\n")
             self.split_inpfile = False
 
+        # unchanged include files of a split input file are not written again
+        if self.split_inpfile:
+            self.section_cache = sectioncache.SectionCache(self.dir_name, self.mesh_name)
+            self.mesh_hash = meshsetscache.get_femmesh_hash(
+                self.meshdatagetter.femnodes_mesh, self.meshdatagetter.femnodes_ele_table
+            )
+            self.constraints_context_key = None
+        else:
+            self.section_cache = None
+
         # mesh
         inpfile = write_mesh.write_mesh(self)
 
@@ -222,6 +234,14 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # close file
         inpfile.close()
 
+        if self.section_cache is not None:
+            self.section_cache.save()
+            FreeCAD.Console.PrintMessage(
+                "Input file sections reused: {}, written: {}\n".format(
+                    self.section_cache.hits, self.section_cache.misses
+                )
+            )
+
         writetime = round((time.process_time() - time_start), 3)
         FreeCAD.Console.PrintMessage(f"Writing time CalculiX input file: {writetime} seconds.\n")
 
@@ -232,5 +252,33 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             FreeCAD.Console.PrintError("Problems on writing input file, check report prints.\n\n")
             return ""
 
+    # ********************************************************************************************
+    # key of a constraint mesh sets include file for the section cache
+    def get_constraints_meshsets_key(self, femobjs, con_module):
+        if self.constraints_context_key is None:
+            # besides its own mesh sets the mesh data of a constraint depends on the
+            # materials and element geometries, the rigid body reference nodes on
+            # the position in the analysis and the plane rotation on the conflict nodes
+            self.constraints_context_key = sectioncache.get_key(
+                self.analysis_type,
+                self.mesh_hash,
+                getattr(self.solver_obj, "ElectromagneticMode", ""),
+                [obj.Name for obj in self.analysis.Group],
+                [
+                    sectioncache.get_object_key(femobj["Object"])
+                    for femobj in (
+                        self.member.mats_linear
+                        + self.member.geos_beamsection
+                        + self.member.geos_shellthickness
+                    )
+                ],
+                self.constraint_conflict_nodes,
+            )
+        return sectioncache.get_key(
+            con_module.__name__,
+            self.constraints_context_key,
+            *[sectioncache.get_femobj_key(femobj) for femobj in femobjs],
+        )
+
 
 ##  @}
@@ -27,8 +27,11 @@ __url__ = "https://www.freecad.org"
 
 
 from PySide.QtCore import QProcess, QProcessEnvironment
+import hashlib
+import json
 import os
 import re
+import time
 
 import FreeCAD
 
@@ -38,6 +41,10 @@ from .. import settings
 from femtools import membertools
 from femtools.objecttools import ObjectTools
 
+# the state of the ElmerGrid mesh files in the working directory, the mesh key and the files
+_GRID_STATE_NAME = "mesh_export.json"
+_GRID_STATE_VERSION = 1
+
 
 class ElmerTools(ObjectTools):
 
@@ -51,11 +58,40 @@ class ElmerTools(ObjectTools):
     def prepare(self):
         w = writer.Writer(self.obj, self.obj.WorkingDirectory)
         w.write_solver_input()
+        timing = dict(w.timing)
 
+        start = time.perf_counter()
         mesh = w.getMesh()
         mesh_file = os.path.join(self.obj.WorkingDirectory, "mesh.unv")
         mesh.FemMesh.write(mesh_file)
+        num_proc = self.fem_param.GetGroup("Elmer").GetInt("NumberOfTasks", 1)
+        mesh_key = self._get_mesh_key(mesh_file, num_proc)
+        timing["Mesh file"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if self._is_current_grid(mesh_key):
+            FreeCAD.Console.PrintMessage("Mesh unchanged, the ElmerGrid mesh files are reused.\n")
+            grid_step = "ElmerGrid (skipped)"
+        else:
+            grid_step = "ElmerGrid"
+            self._run_elmergrid(mesh_file, num_proc, mesh_key)
+        timing[grid_step] = time.perf_counter() - start
+
+        FreeCAD.Console.PrintMessage(
+            "Elmer input time: {:.3f} seconds.\n".format(sum(timing.values()))
+        )
+        for step, seconds in timing.items():
+            FreeCAD.Console.PrintMessage(f"    {step}: {seconds:.3f} seconds\n")
+
+        self.model_file = os.path.join(self.obj.WorkingDirectory, writer._SIF_NAME)
+        handled = w.getHandledConstraints()
+        allConstraints = membertools.get_member(self.analysis, "Fem::Constraint")
+        for obj in set(allConstraints) - handled:
+            FreeCAD.Console.PrintWarning(f"Ignored constraint {obj.Label}")
 
+    def _run_elmergrid(self, mesh_file, num_proc, mesh_key):
+        # the mesh export state is removed first, a failed run is never reused
+        self._remove_grid_state()
         grid_bin = settings.get_binary("ElmerGrid")
         env = QProcessEnvironment.systemEnvironment()
         p = QProcess()
@@ -64,18 +100,76 @@ class ElmerTools(ObjectTools):
         grid_args = ["8", "2", mesh_file, "-out", self.obj.WorkingDirectory]
         p.start(grid_bin, grid_args)
         p.waitForFinished(-1)
-        num_proc = self.fem_param.GetGroup("Elmer").GetInt("NumberOfTasks", 1)
+        success = p.exitStatus() == QProcess.NormalExit and p.exitCode() == 0
         if num_proc > 1:
             # MPI parallel computing version
             grid_args.extend(["-partdual", "-metiskway", str(num_proc)])
             p.start(grid_bin, grid_args)
             p.waitForFinished(-1)
+            success = success and p.exitStatus() == QProcess.NormalExit and p.exitCode() == 0
+        if success:
+            self._save_grid_state(mesh_key, num_proc)
 
-        self.model_file = os.path.join(self.obj.WorkingDirectory, writer._SIF_NAME)
-        handled = w.getHandledConstraints()
-        allConstraints = membertools.get_member(self.analysis, "Fem::Constraint")
-        for obj in set(allConstraints) - handled:
-            FreeCAD.Console.PrintWarning(f"Ignored constraint {obj.Label}")
+    def _get_mesh_key(self, mesh_file, num_proc):
+        # digest of the mesh file and the partitioning, the ElmerGrid files are made of
+        digest = hashlib.sha1(f"{_GRID_STATE_VERSION}:{num_proc}:".encode())
+        with open(mesh_file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _get_grid_files(self, num_proc):
+        # the files ElmerGrid writes, mesh.* and the partitioning directory
+        work_dir = self.obj.WorkingDirectory
+        files = [f for f in os.listdir(work_dir) if f.startswith("mesh.") and f != "mesh.unv"]
+        part_dir = f"partitioning.{num_proc}"
+        if num_proc > 1 and os.path.isdir(os.path.join(work_dir, part_dir)):
+            files.extend(
+                os.path.join(part_dir, f) for f in os.listdir(os.path.join(work_dir, part_dir))
+            )
+        return files
+
+    def _is_current_grid(self, mesh_key):
+        # True if the ElmerGrid files of the mesh key exist and were not changed since
+        state_file = os.path.join(self.obj.WorkingDirectory, _GRID_STATE_NAME)
+        if not os.path.isfile(state_file):
+            return False
+        try:
+            with open(state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            FreeCAD.Console.PrintLog(f"Mesh export state {state_file} not read: {e}\n")
+            return False
+        if state.get("version") != _GRID_STATE_VERSION or state.get("key") != mesh_key:
+            return False
+        if not state["files"]:
+            return False
+        for name, stat_entry in state["files"].items():
+            try:
+                stat = os.stat(os.path.join(self.obj.WorkingDirectory, name))
+            except OSError:
+                return False
+            if [stat.st_size, stat.st_mtime_ns] != stat_entry:
+                return False
+        return True
+
+    def _save_grid_state(self, mesh_key, num_proc):
+        files = {}
+        for name in self._get_grid_files(num_proc):
+            stat = os.stat(os.path.join(self.obj.WorkingDirectory, name))
+            files[name] = [stat.st_size, stat.st_mtime_ns]
+        state = {"version": _GRID_STATE_VERSION, "key": mesh_key, "files": files}
+        state_file = os.path.join(self.obj.WorkingDirectory, _GRID_STATE_NAME)
+        try:
+            with open(state_file, "w") as f:
+                json.dump(state, f)
+        except OSError as e:
+            FreeCAD.Console.PrintWarning(f"Mesh export state {state_file} not saved: {e}\n")
+
+    def _remove_grid_state(self):
+        state_file = os.path.join(self.obj.WorkingDirectory, _GRID_STATE_NAME)
+        if os.path.isfile(state_file):
+            os.remove(state_file)
 
     def compute(self):
         self._clear_results()
@@ -281,6 +281,9 @@ class _Writer:
         self._idMgr = idManager
         self._sections = sections
         self._stream = stream
+        # the pieces are collected and written to the stream at once
+        self._buffer = []
+        self._write = self._buffer.append
 
     def write(self):
         firstSection, *sortedSections = sorted(
@@ -288,24 +291,26 @@ class _Writer:
         )
         self._writeSection(firstSection)
         for s in sortedSections:
-            self._stream.write(_NEWLINE)
+            self._write(_NEWLINE)
             self._writeSection(s)
+        self._stream.write("".join(self._buffer))
+        self._buffer.clear()
 
     def _writeSection(self, s):
         self._writeSectionHeader(s)
         self._writeSectionBody(s)
         self._writeSectionFooter(s)
-        self._stream.write(_NEWLINE)
+        self._write(_NEWLINE)
 
     def _writeSectionHeader(self, s):
-        self._stream.write(s.name)
+        self._write(s.name)
         if isNumbered(s):
-            self._stream.write(_WHITESPACE)
-            self._stream.write(str(self._idMgr.getId(s)))
+            self._write(_WHITESPACE)
+            self._write(str(self._idMgr.getId(s)))
 
     def _writeSectionFooter(self, s):
-        self._stream.write(_NEWLINE)
-        self._stream.write(_SECTION_DELIM)
+        self._write(_NEWLINE)
+        self._write(_SECTION_DELIM)
 
     def _writeSectionBody(self, s):
         for key in sorted(s.keys()):  # def keys() from class sifio.Section is called
@@ -313,21 +318,21 @@ class _Writer:
 
     def _writeAttribute(self, key, data):
         if isinstance(data, Section):
-            self._stream.write(_NEWLINE)
+            self._write(_NEWLINE)
             self._writeScalarAttr(key, data)
         elif isinstance(data, FileAttr):
-            self._stream.write(_NEWLINE)
+            self._write(_NEWLINE)
             self._writeFileAttr(key, data)
         elif self._isCollection(data):
             if len(data) == 1:
                 scalarData = self._getOnlyElement(data)
-                self._stream.write(_NEWLINE)
+                self._write(_NEWLINE)
                 self._writeScalarAttr(key, scalarData)
             elif len(data) > 1:
-                self._stream.write(_NEWLINE)
+                self._write(_NEWLINE)
                 self._writeArrAttr(key, data)
         else:
-            self._stream.write(_NEWLINE)
+            self._write(_NEWLINE)
             self._writeScalarAttr(key, data)
 
     def _getOnlyElement(self, collection):
@@ -352,61 +357,61 @@ class _Writer:
         attrType = self._getAttrTypeScalar(data)
         if attrType is None:
             raise ValueError("Unsupported data type: %s" % type(data))
-        self._stream.write(_INDENT)
-        self._stream.write(key)
-        self._stream.write(_WHITESPACE)
-        self._stream.write("=")
-        self._stream.write(_WHITESPACE)
+        self._write(_INDENT)
+        self._write(key)
+        self._write(_WHITESPACE)
+        self._write("=")
+        self._write(_WHITESPACE)
         # check if we have a variable string
         if attrType is _TYPE_STRING:
             if data.startswith("Variable"):
                 attrType = _TYPE_VARIABLE
         if attrType is not _TYPE_VARIABLE:
-            self._stream.write(attrType)
-            self._stream.write(_WHITESPACE)
+            self._write(attrType)
+            self._write(_WHITESPACE)
         output = self._preprocess(data, type(data))
         # in case of a variable the output must be without the quatoation marks
         if attrType is _TYPE_VARIABLE:
             output = output.lstrip('"')
             # we cannot use rstrip because there are two subsequent " at the end
             output = output[:-1]
-        self._stream.write(output)
+        self._write(output)
 
     def _writeArrAttr(self, key, data):
         attrType = self._getAttrTypeArr(data)
-        self._stream.write(_INDENT)
-        self._stream.write(key)
-        self._stream.write("(%d)" % len(data))
-        self._stream.write(_WHITESPACE)
-        self._stream.write("=")
-        self._stream.write(_WHITESPACE)
+        self._write(_INDENT)
+        self._write(key)
+        self._write("(%d)" % len(data))
+        self._write(_WHITESPACE)
+        self._write("=")
+        self._write(_WHITESPACE)
         # check if we have a variable string
         if attrType is _TYPE_STRING:
             if data.startswith("Variable"):
                 attrType = _TYPE_VARIABLE
         if attrType is not _TYPE_VARIABLE:
-            self._stream.write(attrType)
+            self._write(attrType)
         for val in data:
-            self._stream.write(_WHITESPACE)
+            self._write(_WHITESPACE)
             output = self._preprocess(val, type(val))
             # in case of a variable the output must be without the quatoation marks
             if attrType is _TYPE_VARIABLE:
                 output = output.lstrip('"')
                 # we cannot use rstrip because there are two subsequent " at the end
                 output = output[:-1]
-            self._stream.write(output)
+            self._write(output)
 
     def _writeFileAttr(self, key, data):
-        self._stream.write(_INDENT)
-        self._stream.write(key)
-        self._stream.write(_WHITESPACE)
-        self._stream.write("=")
-        self._stream.write(_WHITESPACE)
-        self._stream.write(_TYPE_FILE)
+        self._write(_INDENT)
+        self._write(key)
+        self._write(_WHITESPACE)
+        self._write("=")
+        self._write(_WHITESPACE)
+        self._write(_TYPE_FILE)
         for val in data.split("/"):
             if val:
-                self._stream.write(_WHITESPACE)
-                self._stream.write('"%s"' % val)
+                self._write(_WHITESPACE)
+                self._write('"%s"' % val)
 
     def _getSifDataType(self, dataType):
         if issubclass(dataType, Section):
@@ -34,6 +34,7 @@ import os
 import os.path
 import subprocess
 import tempfile
+import time
 from platform import system
 
 from FreeCAD import Console
@@ -89,6 +90,8 @@ class Writer:
         self._usedVarNames = set()
         self._builder = sifio.Builder()
         self._handledObjects = set()
+        # { step : seconds } of write_solver_input
+        self.timing = {}
         self._handleUnits()
         self._handleConstants()
 
@@ -111,9 +114,13 @@ class Writer:
         self._addOutputSolver()
 
     def write_solver_input(self):
+        start = time.perf_counter()
         self._writeBlocks()
+        self.timing["Sif sections"] = time.perf_counter() - start
+        start = time.perf_counter()
         self._writeSif()
         self._writeStartinfo()
+        self.timing["Sif file"] = time.perf_counter() - start
 
     def _handleUnits(self):
         # Elmer solver writer no longer uses FreeCAD unit system
@@ -696,6 +703,7 @@ class Writer:
 
     def _writeSif(self):
         sifPath = os.path.join(self.directory, _SIF_NAME)
+        # the sif is formatted in memory by sifio and written at once
         with open(sifPath, "w") as fstream:
             sif = sifio.Sif(self._builder)
             sif.write(fstream)
@@ -73,6 +73,13 @@ DONE = 4
 _machines = {}
 _dirTypes = {}
 
+# the solvers implemented by a solver tool
+SOLVER_TOOLS = {
+    "Fem::SolverElmer": elmertools.ElmerTools,
+    "Fem::SolverCalculiX": calculixtools.CalculiXTools,
+    "Fem::SolverZ88": z88tools.Z88Tools,
+}
+
 
 def run_fem_solver(solver, working_dir=None, blocking=False):
     """Execute *solver* of the solver framework.
@@ -105,18 +112,10 @@ def run_fem_solver(solver, working_dir=None, blocking=False):
         use a :class:`Machine`.
     """
 
-    tool = None
     if working_dir:
         solver.WorkingDirectory = working_dir
 
-    match solver.Proxy.Type:
-        case "Fem::SolverElmer":
-            tool = elmertools.ElmerTools(solver)
-        case "Fem::SolverCalculiX":
-            tool = calculixtools.CalculiXTools(solver)
-        case "Fem::SolverZ88":
-            tool = z88tools.Z88Tools(solver)
-
+    tool = get_solver_tool(solver)
     if tool is not None:
         # Redirect process error to report view
         print_error = lambda: App.Console.PrintError(
@@ -204,6 +203,19 @@ def run_fem_solver(solver, working_dir=None, blocking=False):
                     display(machine.report, "Run Report", error_message)
 
 
+def get_solver_tool(solver):
+    """Return a new solver tool of *solver* or ``None``.
+
+    Solver tools (see :class:`femtools.objecttools.ObjectTools`) write the
+    input files, run the solver binary in a ``QProcess`` and load the results.
+    ``None`` is returned for solvers not implemented by a solver tool.
+    """
+    tool_class = SOLVER_TOOLS.get(solver.Proxy.Type)
+    if tool_class is None:
+        return None
+    return tool_class(solver)
+
+
 def getMachine(solver, path=None):
     """Get or create :class:`Machine` using caching mechanism.
 
@@ -0,0 +1,315 @@
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Events of the solver output, parsed while the solver runs.
+
+A SolverLog is fed with the output text of a solver as it is read from the
+process. Every complete line is given to the log parser of the solver, which
+keeps the state of the run (step, increment, iteration, solver time) and
+returns the kind of event of the line, if any. The events are kept in the log
+and sent to the slots of signalEvent.
+
+The events and a summary of a run are kept in the result objects, thus the
+solver performance of runs can be compared later on, see store_log and load_log.
+"""
+
+__title__ = "FreeCAD FEM solver log"
+__author__ = "FreeCAD FEM developers"
+__url__ = "https://www.freecad.org"
+
+## \addtogroup FEM
+#  @{
+
+import collections
+import json
+import re
+import time
+
+from . import signal
+
+# time: wall clock seconds since the log was started
+# kind: "step", "increment", "residual", "converged", "memory" or "finished"
+# memory: in MB, NaN if not known
+LogEvent = collections.namedtuple(
+    "LogEvent",
+    ("time", "kind", "step", "increment", "iteration", "solver_time", "residual", "memory"),
+)
+
+_NUM = r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eEdD][-+]?\d+)?)"
+
+_MEMORY = re.compile(r"memory\D*?" + _NUM + r"\s*(bytes|kb|mb|gb|kib|mib|gib)\b", re.IGNORECASE)
+_MEMORY_UNITS = {"bytes": 1.0 / 1024**2, "kb": 1.0 / 1024, "mb": 1.0, "gb": 1024.0}
+
+
+def _get_float(text):
+    # Fortran output may use D as exponent
+    return float(text.replace("D", "E").replace("d", "e"))
+
+
+class LogParser:
+    """parses output lines of a solver, keeps the state of the run
+
+    The patterns are tuples (compiled regular expression, method name), the
+    method of the first matching pattern gets the match and returns the kind
+    of the event of the line or None.
+    """
+
+    name = ""
+    patterns = ()
+
+    def __init__(self):
+        self.step = 0
+        self.increment = 0
+        self.iteration = 0
+        self.solver_time = float("NaN")
+        self.residual = float("NaN")
+        self.memory = float("NaN")
+
+    def parse_line(self, line):
+        """returns the kind of the event of the line, None if the line has no event"""
+        line = line.strip()
+        if not line:
+            return None
+        for pattern, method in self.patterns:
+            match = pattern.search(line)
+            if match:
+                return getattr(self, method)(match)
+        match = _MEMORY.search(line)
+        if match:
+            unit = match.group(2).lower().replace("i", "")
+            self.memory = _get_float(match.group(1)) * _MEMORY_UNITS[unit]
+            return "memory"
+        return None
+
+    def on_step(self, match):
+        self.step = int(match.group(1))
+        self.increment = 0
+        self.iteration = 0
+        return "step"
+
+    def on_increment(self, match):
+        self.increment = int(match.group(1))
+        self.iteration = 0
+        return "increment"
+
+    def on_iteration(self, match):
+        self.iteration = int(match.group(1))
+        return None
+
+    def on_solver_time(self, match):
+        self.solver_time = _get_float(match.group(1))
+        return None
+
+    def on_residual(self, match):
+        self.residual = _get_float(match.group(1))
+        return "residual"
+
+    def on_converged(self, match):
+        return "converged"
+
+    def on_finished(self, match):
+        return "finished"
+
+
+class CalculiXLogParser(LogParser):
+    """the stdout of ccx"""
+
+    name = "CalculiX"
+    patterns = (
+        (re.compile(r"^STEP\s+(\d+)"), "on_step"),
+        (re.compile(r"^increment (\d+) attempt"), "on_increment"),
+        (re.compile(r"^actual total time=\s*" + _NUM), "on_solver_time"),
+        (re.compile(r"^iteration (\d+)"), "on_iteration"),
+        (re.compile(r"^largest residual \w+=\s*" + _NUM), "on_residual"),
+        (re.compile(r"^convergence$"), "on_converged"),
+        (re.compile(r"^Job finished"), "on_finished"),
+    )
+
+
+class ElmerLogParser(LogParser):
+    """the stdout of ElmerSolver, the residual is the relative change of the solution"""
+
+    name = "Elmer"
+    patterns = (
+        (re.compile(r"^MAIN: Time:\s*(\d+)/\d+\s+" + _NUM), "on_time_step"),
+        (re.compile(r"^MAIN: Steady state iteration:\s*(\d+)"), "on_iteration"),
+        (
+            re.compile(r"^ComputeChange: [NS]S \(ITER=(\d+)\) \(NRM,RELC\): \(\s*\S+\s+" + _NUM),
+            "on_change",
+        ),
+        (re.compile(r"SOLVER TOTAL TIME\(CPU,REAL\)"), "on_finished"),
+    )
+
+    def on_time_step(self, match):
+        self.solver_time = _get_float(match.group(2))
+        return self.on_increment(match)
+
+    def on_change(self, match):
+        self.iteration = int(match.group(1))
+        self.residual = _get_float(match.group(2))
+        return "residual"
+
+
+class Z88LogParser(LogParser):
+    """the stdout of z88r, only the iterative solvers SICCG and SORCG print a residual"""
+
+    name = "Z88"
+    patterns = (
+        (
+            re.compile(r"^Iteration\s*(?:Nr\.?)?\s*(\d+)\D.*?\beps\w*\s*[:=]?\s*" + _NUM, re.I),
+            "on_solver_iteration",
+        ),
+        (re.compile(r"^Z88R\b.*\b(?:done|finished|ended)\b", re.I), "on_finished"),
+    )
+
+    def on_solver_iteration(self, match):
+        self.iteration = int(match.group(1))
+        self.residual = _get_float(match.group(2))
+        return "residual"
+
+
+class SolverLog:
+    """the events of the output of a solver run, see the module documentation"""
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.events = []
+        self.signalEvent = set()
+        self.start_time = time.perf_counter()
+        self.stop_time = None
+        self._rest = ""
+
+    def feed(self, text):
+        """parses the complete lines of the text, the rest is kept for the next text"""
+        lines = (self._rest + text).split("\n")
+        self._rest = lines.pop()
+        for line in lines:
+            self._parse(line)
+
+    def close(self):
+        """parses the last line, the log is complete"""
+        if self._rest:
+            self._parse(self._rest)
+            self._rest = ""
+        if self.stop_time is None:
+            self.stop_time = time.perf_counter()
+
+    def _parse(self, line):
+        kind = self.parser.parse_line(line)
+        if kind is None:
+            return
+        p = self.parser
+        event = LogEvent(
+            time.perf_counter() - self.start_time,
+            kind,
+            p.step,
+            p.increment,
+            p.iteration,
+            p.solver_time,
+            p.residual,
+            p.memory,
+        )
+        self.events.append(event)
+        signal.notify(self.signalEvent, event)
+
+    def get_events(self, kind):
+        return [event for event in self.events if event.kind == kind]
+
+    def get_summary(self):
+        """dict of the numbers of a run to compare it with other runs"""
+        residuals = self.get_events("residual")
+        memory = [event.memory for event in self.events if event.memory == event.memory]
+        stop_time = self.stop_time if self.stop_time is not None else time.perf_counter()
+        return {
+            "solver": self.parser.name,
+            "wall_time": stop_time - self.start_time,
+            "steps": max([event.step for event in self.events], default=0),
+            "increments": len(self.get_events("increment")),
+            "iterations": len(residuals),
+            "final_residual": residuals[-1].residual if residuals else float("NaN"),
+            "max_memory": max(memory, default=float("NaN")),
+        }
+
+    def to_json(self):
+        # one list per event field, NaN is written as null
+        columns = {
+            field: [None if value != value else value for value in values]
+            for field, values in zip(LogEvent._fields, zip(*self.events))
+        }
+        return json.dumps({"summary": self.get_summary(), "events": columns})
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        log = cls(LogParser())
+        log.parser.name = data["summary"]["solver"]
+        columns = data["events"]
+        if columns:
+            rows = zip(*(columns[field] for field in LogEvent._fields))
+            log.events = [
+                LogEvent(*[float("NaN") if value is None else value for value in row])
+                for row in rows
+            ]
+        log.start_time = 0.0
+        log.stop_time = data["summary"]["wall_time"]
+        return log
+
+
+# the log parsers of the solvers { solver name : log parser class }
+LOG_PARSERS = {
+    CalculiXLogParser.name: CalculiXLogParser,
+    ElmerLogParser.name: ElmerLogParser,
+    Z88LogParser.name: Z88LogParser,
+}
+
+
+def make_log(solver_name):
+    """returns a new SolverLog of the solver, None if there is no log parser of the solver"""
+    parser = LOG_PARSERS.get(solver_name)
+    return SolverLog(parser()) if parser else None
+
+
+def store_log(obj, log):
+    """keeps the log in the properties SolverLog and SolverLogSummary of a result object"""
+    if not hasattr(obj, "SolverLog"):
+        obj.addProperty(
+            "App::PropertyString",
+            "SolverLog",
+            "Solver",
+            "Events of the solver output",
+            0,
+            True,
+            True,
+        )
+        obj.addProperty(
+            "App::PropertyMap", "SolverLogSummary", "Solver", "Summary of the solver run", 0, True
+        )
+    obj.SolverLog = log.to_json()
+    obj.SolverLogSummary = {key: str(value) for key, value in log.get_summary().items()}
+
+
+def load_log(obj):
+    """returns the SolverLog kept in a result object, None if there is none"""
+    text = getattr(obj, "SolverLog", "")
+    return SolverLog.from_json(text) if text else None
+
+
+##  @}
@@ -0,0 +1,300 @@
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Run a solver for many variations of the analysis.
+
+A parameter sweep runs one solver for a list of cases. A case is a set of
+property overrides of document objects, for example load values or shell
+thicknesses. Every case gets its own working directory inside the sweep
+directory. The input files are written one case after the other, because
+this needs the document, but the solver binaries of the cases run in parallel
+in a bounded number of processes. The results of every case are loaded into
+own result objects as soon as its solver has finished.
+
+The state of the cases is kept in the manifest file ``sweep.json`` in the
+sweep directory. If a sweep is run again with the same sweep directory, the
+cases already finished are skipped, thus a killed sweep restarts where it
+stopped. The results of finished cases which are not in the document any
+more, for example because the sweep runs in a new document, are loaded again
+from the case working directories.
+
+Example::
+
+    from femsolver import sweep
+    cases = {
+        "force_1kN": {"ConstraintForce.Force": "1 kN"},
+        "force_2kN": {"ConstraintForce.Force": "2 kN"},
+    }
+    sweep.run_sweep(doc.SolverCalculiX, cases, "/tmp/force_sweep", max_processes=2)
+"""
+
+__title__ = "FreeCAD FEM solver parameter sweep"
+__author__ = "FreeCAD FEM developers"
+__url__ = "https://www.freecad.org"
+
+import json
+import os
+import time
+
+from PySide import QtCore
+
+import FreeCAD as App
+
+from . import run
+
+MANIFEST_NAME = "sweep.json"
+
+# milliseconds to wait for one solver process before looking at the next one
+WAIT_INTERVAL = 100
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def run_sweep(solver, cases, sweep_dir, max_processes=2):
+    """Run *solver* for all *cases* and return the :class:`Sweep`.
+
+    :param solver:
+        A solver implemented by a solver tool, see :func:`run.get_solver_tool`.
+
+    :param cases:
+        Either a dict ``{case name: overrides}`` or a list of overrides, the
+        cases of a list are named ``case_000``, ``case_001`` and so on. The
+        overrides of a case are a dict ``{"ObjectName.Property": value}``.
+
+    :param sweep_dir:
+        The directory of the manifest file and the case working directories.
+
+    :param max_processes:
+        The maximum number of solver processes running at the same time. Keep
+        in mind the solvers may use several threads each.
+    """
+    sweep = Sweep(solver, cases, sweep_dir, max_processes)
+    sweep.run()
+    return sweep
+
+
+class Sweep:
+    """Runs a solver for a list of cases of property overrides.
+
+    See the module documentation and :func:`run_sweep`.
+    """
+
+    def __init__(self, solver, cases, sweep_dir, max_processes=2):
+        if solver.Proxy.Type not in run.SOLVER_TOOLS:
+            raise ValueError(f"Solver {solver.Label} is not supported by the parameter sweep")
+        self.solver = solver
+        self.doc = solver.Document
+        if isinstance(cases, dict):
+            self.cases = dict(cases)
+        else:
+            self.cases = {f"case_{i:03d}": overrides for i, overrides in enumerate(cases)}
+        self.sweep_dir = sweep_dir
+        self.max_processes = max(1, max_processes)
+        self.manifest_file = os.path.join(sweep_dir, MANIFEST_NAME)
+        self.manifest = {}
+        self.results = {}
+        self._running = {}
+        self._originals = {}
+
+    def run(self):
+        os.makedirs(self.sweep_dir, exist_ok=True)
+        self._load_manifest()
+        todo = [name for name in self.cases if self.manifest[name]["state"] != DONE]
+        reload = [name for name in self.cases if name not in todo and not self._has_results(name)]
+        App.Console.PrintMessage(
+            f"Parameter sweep: {len(self.cases)} cases, {len(self.cases) - len(todo)} "
+            f"already done, {self.max_processes} processes\n"
+        )
+
+        working_dir = self.solver.WorkingDirectory
+        results = self.solver.Results
+        start = time.time()
+        try:
+            for name in reload:
+                if not self._reload_case(name):
+                    todo.append(name)
+            for name in todo:
+                while len(self._running) >= self.max_processes:
+                    self._wait_for_finished()
+                self._start_case(name)
+            while self._running:
+                self._wait_for_finished()
+        finally:
+            for process, (name, tool, case_start) in self._running.items():
+                process.kill()
+                process.waitForFinished(-1)
+                self._set_state(name, FAILED)
+            self._running = {}
+            self._restore_overrides()
+            self.solver.WorkingDirectory = working_dir
+            self.solver.Results = results + [
+                res for case_results in self.results.values() for res in case_results
+            ]
+            self.doc.recompute()
+
+        failed = [name for name in self.cases if self.manifest[name]["state"] == FAILED]
+        App.Console.PrintMessage(
+            "Parameter sweep finished in {:.1f} s, {} failed cases{}\n".format(
+                time.time() - start,
+                len(failed),
+                ": " + ", ".join(failed) if failed else "",
+            )
+        )
+
+    def _start_case(self, name):
+        case_dir = os.path.join(self.sweep_dir, name)
+        os.makedirs(case_dir, exist_ok=True)
+        self._apply_overrides(self.cases[name])
+        self.doc.recompute()
+
+        self.solver.WorkingDirectory = case_dir
+        tool = run.get_solver_tool(self.solver)
+        # the results are loaded by the sweep, not by the tool
+        tool.process.finished.disconnect(tool._process_finished)
+        try:
+            tool.prepare()
+        except Exception as e:
+            App.Console.PrintError(f"Parameter sweep case {name}: input not written: {e}\n")
+            self._set_state(name, FAILED)
+            return
+        self._set_state(name, RUNNING)
+        tool.compute()
+        self._running[tool.process] = (name, tool, time.time())
+
+    def _wait_for_finished(self):
+        # waitForFinished works without an event loop, thus in FreeCADCmd too
+        while True:
+            for process in list(self._running):
+                finished = process.state() == QtCore.QProcess.NotRunning
+                if finished or process.waitForFinished(WAIT_INTERVAL):
+                    self._finish_case(process)
+                    return
+
+    def _finish_case(self, process):
+        name, tool, case_start = self._running.pop(process)
+        self.manifest[name]["solve_time"] = round(time.time() - case_start, 3)
+        # the finished slot of the tool is disconnected, its solver log is completed here
+        tool.read_output()
+        if tool.solver_log is not None:
+            tool.solver_log.close()
+        if (
+            process.error() == QtCore.QProcess.FailedToStart
+            or process.exitStatus() != QtCore.QProcess.NormalExit
+            or process.exitCode() != 0
+        ):
+            App.Console.PrintError(
+                f"Parameter sweep case {name}: solver failed with exit code {process.exitCode()}\n"
+            )
+            self._set_state(name, FAILED)
+            return
+        self._load_results(name, tool)
+        self._set_state(name, DONE)
+
+    def _load_results(self, name, tool):
+        # new result objects are created for an empty Results list
+        self.solver.WorkingDirectory = os.path.join(self.sweep_dir, name)
+        self.solver.Results = []
+        tool.update_properties()
+        tool._store_solver_log()
+        self.results[name] = self.solver.Results
+        for res in self.results[name]:
+            res.Label = f"{res.Label}_{name}"
+        self.manifest[name]["results"] = [res.Name for res in self.results[name]]
+
+    def _has_results(self, name):
+        names = self.manifest[name].get("results")
+        return bool(names) and all(self.doc.getObject(obj_name) for obj_name in names)
+
+    def _reload_case(self, name):
+        # the results of a case done in an earlier run are loaded from its working directory,
+        # a case without results runs again
+        self.solver.WorkingDirectory = os.path.join(self.sweep_dir, name)
+        tool = run.get_solver_tool(self.solver)
+        try:
+            self._load_results(name, tool)
+        except Exception as e:
+            App.Console.PrintWarning(f"Parameter sweep case {name}: results not loaded: {e}\n")
+            self.results.pop(name, None)
+        if not self.results.get(name):
+            self.results.pop(name, None)
+            self._set_state(name, PENDING)
+            return False
+        self._save_manifest()
+        return True
+
+    def _apply_overrides(self, overrides):
+        for key, value in overrides.items():
+            obj_name, prop = key.split(".", 1)
+            obj = self.doc.getObject(obj_name)
+            if obj is None:
+                raise ValueError(f"Parameter sweep: object {obj_name} not found")
+            if key not in self._originals:
+                self._originals[key] = getattr(obj, prop)
+            setattr(obj, prop, value)
+        # properties overridden in earlier cases only get their original value
+        for key, value in self._originals.items():
+            if key not in overrides:
+                obj_name, prop = key.split(".", 1)
+                setattr(self.doc.getObject(obj_name), prop, value)
+
+    def _restore_overrides(self):
+        self._apply_overrides({})
+        self._originals = {}
+
+    def _load_manifest(self):
+        manifest = {}
+        if os.path.isfile(self.manifest_file):
+            try:
+                with open(self.manifest_file) as f:
+                    manifest = json.load(f).get("cases", {})
+            except (OSError, ValueError) as e:
+                App.Console.PrintWarning(f"Parameter sweep manifest not read: {e}\n")
+        self.manifest = {}
+        for name, overrides in self.cases.items():
+            entry = manifest.get(name, {})
+            # a case is only done if it was done with the same overrides
+            if entry.get("overrides") != self._dump_overrides(overrides):
+                entry = {}
+            # a case running when the sweep was killed has to run again
+            if entry.get("state") != DONE:
+                entry = {"overrides": self._dump_overrides(overrides), "state": PENDING}
+            self.manifest[name] = entry
+        self._save_manifest()
+
+    def _set_state(self, name, state):
+        self.manifest[name]["state"] = state
+        self._save_manifest()
+
+    def _save_manifest(self):
+        data = {"solver": self.solver.Name, "cases": self.manifest}
+        tmp_file = self.manifest_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(data, f, indent=2)
+        # replace in one step, a killed sweep never leaves a broken manifest
+        os.replace(tmp_file, self.manifest_file)
+
+    @staticmethod
+    def _dump_overrides(overrides):
+        # values are compared by their string, thus Quantities work too
+        return {key: str(value) for key, value in overrides.items()}
@@ -82,6 +82,8 @@ class FemInputWriter:
         self.ccx_efaces = "Efaces"
         self.ccx_eedges = "Eedges"
         self.mat_geo_sets = mat_geo_sets
+        # include files cache of a split input file, set by the writers supporting it
+        self.section_cache = None
         if self.mesh_object:
             self.femmesh = self.mesh_object.FemMesh
         else:
@@ -173,9 +175,17 @@ class FemInputWriter:
         if self.split_inpfile is True:
             file_name_split = f"{self.mesh_name}_{write_name}.inp"
             f.write(f"*INCLUDE,INPUT={file_name_split}\n")
+            # writers with a section cache only write changed include files
+            key = None
+            if self.section_cache is not None:
+                key = self.get_constraints_meshsets_key(femobjs, con_module)
+                if self.section_cache.is_current(file_name_split, key):
+                    return
             inpfile_split = open(join(self.dir_name, file_name_split), "w")
             constraint_sets_loop_writing(inpfile_split, femobjs, write_before, write_after)
             inpfile_split.close()
+            if key is not None:
+                self.section_cache.add(file_name_split, key)
         else:
             constraint_sets_loop_writing(f, femobjs, write_before, write_after)
 
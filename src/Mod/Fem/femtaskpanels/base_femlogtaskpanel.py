@@ -106,11 +106,8 @@ class _BaseLogTaskPanel(base_femtaskpanel._BaseTaskPanel, ABC):
             QtCore.SIGNAL("finished(int,QProcess::ExitStatus)"),
             self.stop_timer,
         )
-        QtCore.QObject.connect(
-            self.tool.process,
-            QtCore.SIGNAL("readyReadStandardOutput()"),
-            self.write_output,
-        )
+        # the tool reads the output to parse it into the solver log
+        self.tool.signalOutput.add(self.write_output)
         QtCore.QObject.connect(
             self.tool.process,
             QtCore.SIGNAL("readyReadStandardError()"),
@@ -162,11 +159,8 @@ class _BaseLogTaskPanel(base_femtaskpanel._BaseTaskPanel, ABC):
             case _:
                 self.write_log("Process failed\n", QtGui.QColor(getOutputWinColor("Error")))
 
-    def write_output(self):
-        self.write_log(
-            self.tool.process.readAllStandardOutput().data().decode("utf-8"),
-            QtGui.QColor(getOutputWinColor("Logging")),
-        )
+    def write_output(self, text):
+        self.write_log(text, QtGui.QColor(getOutputWinColor("Logging")))
 
     def write_error(self):
         self.write_log(
@@ -213,6 +207,7 @@ class _BaseLogTaskPanel(base_femtaskpanel._BaseTaskPanel, ABC):
         self.timer.stop()
         QtGui.QApplication.restoreOverrideCursor()
         self.set_object_params()
+        self.tool.signalOutput.discard(self.write_output)
         return super().accept()
 
     def reject(self):
@@ -225,6 +220,7 @@ class _BaseLogTaskPanel(base_femtaskpanel._BaseTaskPanel, ABC):
             self.tool.process.kill()
             FreeCAD.Console.PrintWarning("Process aborted\n")
         else:
+            self.tool.signalOutput.discard(self.write_output)
             return super().reject()
 
     def clicked(self, button):
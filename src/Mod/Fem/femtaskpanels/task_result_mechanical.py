@@ -318,10 +318,10 @@ class _TaskPanel:
     # check if the results len is not 0 on any selected method
 
     def abs_displacement_selected(self, state):
-        if len(self.result_obj.DisplacementLengths) > 0:
+        if len(self.get_result_values("Uabs")) > 0:
             self.result_selected(
                 "Uabs",
-                self.result_obj.DisplacementLengths,
+                self.get_result_values("Uabs"),
                 "mm",
                 translate("FEM", "Displacement magnitude"),
             )
@@ -330,34 +330,34 @@ class _TaskPanel:
             self.none_selected(True)
 
     def x_displacement_selected(self, state):
-        if len(self.result_obj.DisplacementVectors) > 0:
-            res_disp_u1 = self.get_scalar_disp_list(self.result_obj.DisplacementVectors, 0)
+        if len(self.get_result_values("U1")) > 0:
+            res_disp_u1 = self.get_result_values("U1")
             self.result_selected("U1", res_disp_u1, "mm", translate("FEM", "Displacement X"))
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def y_displacement_selected(self, state):
-        if len(self.result_obj.DisplacementVectors) > 0:
-            res_disp_u2 = self.get_scalar_disp_list(self.result_obj.DisplacementVectors, 1)
+        if len(self.get_result_values("U2")) > 0:
+            res_disp_u2 = self.get_result_values("U2")
             self.result_selected("U2", res_disp_u2, "mm", translate("FEM", "Displacement Y"))
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def z_displacement_selected(self, state):
-        if len(self.result_obj.DisplacementVectors) > 0:
-            res_disp_u3 = self.get_scalar_disp_list(self.result_obj.DisplacementVectors, 2)
+        if len(self.get_result_values("U3")) > 0:
+            res_disp_u3 = self.get_result_values("U3")
             self.result_selected("U3", res_disp_u3, "mm", translate("FEM", "Displacement Z"))
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def vm_stress_selected(self, state):
-        if len(self.result_obj.vonMises) > 0:
+        if len(self.get_result_values("Sabs")) > 0:
             self.result_selected(
                 "Sabs",
-                self.result_obj.vonMises,
+                self.get_result_values("Sabs"),
                 "MPa",
                 translate("FEM", "von Mises stress"),
             )
@@ -366,10 +366,10 @@ class _TaskPanel:
             self.none_selected(True)
 
     def max_shear_selected(self, state):
-        if len(self.result_obj.MaxShear) > 0:
+        if len(self.get_result_values("MaxShear")) > 0:
             self.result_selected(
                 "MaxShear",
-                self.result_obj.MaxShear,
+                self.get_result_values("MaxShear"),
                 "MPa",
                 translate("FEM", "Maximum shear stress (Tresca)"),
             )
@@ -378,10 +378,10 @@ class _TaskPanel:
             self.none_selected(True)
 
     def max_prin_selected(self, state):
-        if len(self.result_obj.PrincipalMax) > 0:
+        if len(self.get_result_values("MaxPrin")) > 0:
             self.result_selected(
                 "MaxPrin",
-                self.result_obj.PrincipalMax,
+                self.get_result_values("MaxPrin"),
                 "MPa",
                 translate("FEM", "Maximum principal stress"),
             )
@@ -390,10 +390,10 @@ class _TaskPanel:
             self.none_selected(True)
 
     def temperature_selected(self, state):
-        if len(self.result_obj.Temperature) > 0:
+        if len(self.get_result_values("Temp")) > 0:
             self.result_selected(
                 "Temp",
-                self.result_obj.Temperature,
+                self.get_result_values("Temp"),
                 "K",
                 translate("FEM", "Temperature"),
             )
@@ -402,10 +402,10 @@ class _TaskPanel:
             self.none_selected(True)
 
     def massflowrate_selected(self, state):
-        if len(self.result_obj.MassFlowRate) > 0:
+        if len(self.get_result_values("MFlow")) > 0:
             self.result_selected(
                 "MFlow",
-                self.result_obj.MassFlowRate,
+                self.get_result_values("MFlow"),
                 "kg/s",
                 translate("FEM", "Mass flow rate"),
             )
@@ -414,10 +414,10 @@ class _TaskPanel:
             self.none_selected(True)
 
     def networkpressure_selected(self, state):
-        if len(self.result_obj.NetworkPressure) > 0:
+        if len(self.get_result_values("NPress")) > 0:
             self.result_selected(
                 "NPress",
-                self.result_obj.NetworkPressure,
+                self.get_result_values("NPress"),
                 "MPa",
                 translate("FEM", "Network pressure"),
             )
@@ -426,10 +426,10 @@ class _TaskPanel:
             self.none_selected(True)
 
     def min_prin_selected(self, state):
-        if len(self.result_obj.PrincipalMin) > 0:
+        if len(self.get_result_values("MinPrin")) > 0:
             self.result_selected(
                 "MinPrin",
-                self.result_obj.PrincipalMin,
+                self.get_result_values("MinPrin"),
                 "MPa",
                 translate("FEM", "Minimum principal stress"),
             )
@@ -438,10 +438,10 @@ class _TaskPanel:
             self.none_selected(True)
 
     def peeq_selected(self, state):
-        if len(self.result_obj.Peeq) > 0:
+        if len(self.get_result_values("Peeq")) > 0:
             self.result_selected(
                 "Peeq",
-                self.result_obj.Peeq,
+                self.get_result_values("Peeq"),
                 "",
                 translate("FEM", "Equivalent plastic strain"),
             )
@@ -596,11 +596,9 @@ class _TaskPanel:
         # finally we must recompute the result_obj
         self.result_obj.Document.recompute()
 
-    def get_scalar_disp_list(self, vector_list, axis):
-        # list is needed, as zib-object is not subscriptable in py3
-        d = list(zip(*self.result_obj.DisplacementVectors))
-        scalar_list = list(d[axis])
-        return scalar_list
+    def get_result_values(self, type_name):
+        # the node values are cached per result object, switching the result type is cheap
+        return resulttools.get_result_stats(self.result_obj).get_values(type_name)
 
     def result_selected(self, res_type, res_values, res_unit, res_title):
         self.results_name = res_title
@@ -629,6 +627,8 @@ class _TaskPanel:
         self.set_label(self.result_obj.Label, self.results_name)
         QApplication.setOverrideCursor(Qt.WaitCursor)
         if self.suitable_results:
+            if isinstance(res_values, np.ndarray):
+                res_values = res_values.tolist()
             self.mesh_obj.ViewObject.setNodeColorByScalars(self.result_obj.NodeNumbers, res_values)
         self.set_result_stats(res_unit, minm, maxm)
         QtGui.QApplication.restoreOverrideCursor()
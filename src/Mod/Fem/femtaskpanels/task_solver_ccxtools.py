@@ -40,6 +40,7 @@ import FreeCAD
 import FreeCADGui
 
 import FemGui
+from femsolver import solverlog
 from femtools.femutils import getOutputWinColor
 
 
@@ -78,6 +79,7 @@ class _TaskPanel:
         self.Timer.start(300)
 
         self.fem_console_message = ""
+        self.calculix_stdout = ""
 
         self.CCX_pipeline = None
         self.CCX_mesh_visibility = False
@@ -123,6 +125,9 @@ class _TaskPanel:
             self.select_buckling_analysis,
         )
         QtCore.QObject.connect(self.Calculix, QtCore.SIGNAL("started()"), self.calculixStarted)
+        QtCore.QObject.connect(
+            self.Calculix, QtCore.SIGNAL("readyReadStandardOutput()"), self.readCalculixStdout
+        )
         QtCore.QObject.connect(
             self.Calculix,
             QtCore.SIGNAL("stateChanged(QProcess::ProcessState)"),
@@ -183,19 +188,22 @@ class _TaskPanel:
         self.form.textEdit_Output.setText(self.fem_console_message)
         self.form.textEdit_Output.moveCursor(QtGui.QTextCursor.End)
 
-    def printCalculiXstdout(self):
+    def readCalculixStdout(self):
+        # the stdout is parsed into the solver log while CalculiX runs
+        # https://forum.freecad.org/viewtopic.php?f=18&t=39195
+        # convert QByteArray to a binary string an decode it to "utf-8"
+        out = self.Calculix.readAllStandardOutput().data().decode("utf-8", "replace")
+        self.calculix_stdout += out
+        if self.fea.solver_log is not None:
+            self.fea.solver_log.feed(out)
 
-        out = self.Calculix.readAllStandardOutput()
-        # print(type(out))
-        # <class 'PySide2.QtCore.QByteArray'>
+    def printCalculiXstdout(self):
 
-        if out.isEmpty():
+        out = self.calculix_stdout
+        if not out:
             self.femConsoleMessage("CalculiX stdout is empty", "Error")
             return False
 
-        # https://forum.freecad.org/viewtopic.php?f=18&t=39195
-        # convert QByteArray to a binary string an decode it to "utf-8"
-        out = out.data().decode()  # "utf-8" can be omitted
         out = os.linesep.join([s for s in out.splitlines() if s])
         out = out.replace("\n", "<br>")
         # print(out)
@@ -232,6 +240,8 @@ class _TaskPanel:
         # print("calculixStarted()")
         FreeCAD.Console.PrintLog(f"calculix state: {self.Calculix.state()}\n")
         self.form.pb_run_ccx.setText("Stop CalculiX")
+        self.calculix_stdout = ""
+        self.fea.solver_log = solverlog.make_log("CalculiX")
 
     def calculixStateChanged(self, newState):
         if newState == QtCore.QProcess.ProcessState.Starting:
@@ -254,6 +264,11 @@ class _TaskPanel:
 
         self.form.pb_run_ccx.setText("Re-run CalculiX")
 
+        # the log is kept in the result objects by load_results
+        self.readCalculixStdout()
+        if self.fea.solver_log is not None:
+            self.fea.solver_log.close()
+
         if exitStatus != QtCore.QProcess.ExitStatus.NormalExit:
             return
 
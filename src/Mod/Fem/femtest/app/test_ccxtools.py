@@ -266,6 +266,137 @@ class TestCcxTools(unittest.TestCase):
         setup(self.document, "ccxtools")
         self.input_file_writing_test(get_namefromdef("test_"))
 
+    # ********************************************************************************************
+    def test_constraint_tie_mesh_sets_cache(self):
+        from femexamples.constraint_tie import setup
+        from femmesh import meshsetscache
+
+        setup(self.document, "ccxtools")
+        base_name = "constraint_tie"
+        analysis_dir = testtools.get_fem_test_tmp_dir(self.pre_dir_name + base_name + "_cache")
+        self.input_file_writing_test(base_name, analysis_dir=analysis_dir, test_end=True)
+
+        # the second run takes all sets from the cache and writes the same input file
+        sets_cache = meshsetscache.get_analysis_cache(self.document.Analysis)
+        hits = sets_cache.hits
+        misses = sets_cache.misses
+        self.input_file_writing_test(base_name, analysis_dir=analysis_dir, test_end=True)
+        self.assertEqual(sets_cache.misses, misses)
+        self.assertTrue(sets_cache.hits > hits)
+
+    # ********************************************************************************************
+    def test_constraint_tie_split_input_sections(self):
+        import os
+        from femexamples.constraint_tie import setup
+
+        setup(self.document, "ccxtools")
+        self.document.CalculiXCcxTools.SplitInputWriter = True
+        analysis_dir = testtools.get_fem_test_tmp_dir(self.pre_dir_name + "constraint_tie_split")
+        fea = ccxtools.FemToolsCcx(
+            self.document.Analysis, self.document.CalculiXCcxTools, test_mode=True
+        )
+        fea.update_objects()
+        fea.setup_working_dir(analysis_dir)
+        sections = {
+            name: join(analysis_dir, f"{self.mesh_name}_{name}.inp")
+            for name in ("femesh", "constraints_fixed_node_sets", "constraints_force_node_loads")
+        }
+
+        def get_mtimes():
+            return {name: os.stat(file).st_mtime_ns for name, file in sections.items()}
+
+        def write_inp_file():
+            fea.write_inp_file()
+            # the writer returns the main input file, an empty name if writing failed
+            self.assertEqual(fea.inp_file_name, join(analysis_dir, self.mesh_name + ".inp"))
+            self.assertTrue(os.path.isfile(fea.inp_file_name))
+            for file in sections.values():
+                self.assertTrue(os.path.isfile(file), file)
+
+        write_inp_file()
+        mtimes = get_mtimes()
+        with open(sections["constraints_force_node_loads"]) as f:
+            force_loads = f.read()
+
+        # nothing changed, no include file is written again
+        write_inp_file()
+        self.assertEqual(get_mtimes(), mtimes)
+
+        # only the include file of the changed force is written again
+        self.document.Force.Force = "20000.0 N"
+        self.document.recompute()
+        write_inp_file()
+        new_mtimes = get_mtimes()
+        self.assertEqual(new_mtimes["femesh"], mtimes["femesh"])
+        self.assertEqual(
+            new_mtimes["constraints_fixed_node_sets"], mtimes["constraints_fixed_node_sets"]
+        )
+        with open(sections["constraints_force_node_loads"]) as f:
+            self.assertNotEqual(f.read(), force_loads)
+
+    # ********************************************************************************************
+    def test_section_cache_linked_sections(self):
+        from femsolver.calculix import sectioncache
+
+        dirs = [testtools.get_fem_test_tmp_dir(self.pre_dir_name + "section_cache") for i in (1, 2)]
+        section_file = self.mesh_name + "_femesh.inp"
+        # unique keys, the section files written in the session are kept by the module
+        key_a, key_b = (dirs[0] + "_a", dirs[0] + "_b")
+
+        def write_section(cache, key, text):
+            if not cache.is_current(section_file, key):
+                with open(join(cache.dir_name, section_file), "w") as f:
+                    f.write(text)
+                cache.add(section_file, key)
+
+        # the second directory reuses the section of the first one
+        caches = [sectioncache.SectionCache(dir_name, self.mesh_name) for dir_name in dirs]
+        for cache in caches:
+            write_section(cache, key_a, "section a\n")
+        self.assertEqual((caches[0].misses, caches[1].hits), (1, 1))
+
+        # the changed section of the first directory does not change the second one
+        write_section(caches[0], key_b, "section b\n")
+        with open(join(dirs[0], section_file)) as f:
+            self.assertEqual(f.read(), "section b\n")
+        with open(join(dirs[1], section_file)) as f:
+            self.assertEqual(f.read(), "section a\n")
+        self.assertTrue(caches[1].is_current(section_file, key_a))
+
+        # a section written without key is not written into the reused file either
+        write_section(caches[1], key_b, "section b\n")
+        self.assertEqual(caches[1].hits, 3)
+        caches[1].discard(section_file)
+        with open(join(dirs[1], section_file), "w") as f:
+            f.write("section c\n")
+        with open(join(dirs[0], section_file)) as f:
+            self.assertEqual(f.read(), "section b\n")
+
+    # ********************************************************************************************
+    def test_constraint_tie_mesh_sets_workers(self):
+        from femexamples.constraint_tie import setup
+
+        setup(self.document, "ccxtools")
+        (sequential, sequential_nodes), (parallel, parallel_nodes) = self.get_mesh_sets_members()
+        self.assertTrue(sequential_nodes)
+        self.assertEqual(parallel_nodes, sequential_nodes)
+        for name in ("mats_linear", "cons_fixed", "cons_force", "cons_tie"):
+            self.assertEqual(getattr(parallel, name), getattr(sequential, name), name)
+
+    # ********************************************************************************************
+    def test_ccx_cantilever_faceload_mesh_sets_workers(self):
+        from femexamples.ccx_cantilever_faceload import setup
+
+        setup(self.document, "ccxtools", test_mode=True)
+        self.node_loads_workers_test("Face")
+
+    # ********************************************************************************************
+    def test_square_pipe_end_twisted_edgeforces_mesh_sets_workers(self):
+        from femexamples.square_pipe_end_twisted_edgeforces import setup
+
+        setup(self.document, "ccxtools")
+        self.node_loads_workers_test("Edge")
+
     # ********************************************************************************************
     def test_constraint_transform_beam_hinged(self):
         from femexamples.constraint_transform_beam_hinged import setup
@@ -336,6 +467,71 @@ class TestCcxTools(unittest.TestCase):
         setup(self.document, "ccxtools", test_mode=True)
         self.input_file_writing_test(get_namefromdef("test_"))
 
+    # ********************************************************************************************
+    def test_solver_log(self):
+        # the ccx output is parsed in pieces as it is read from the process
+        from femsolver import solverlog
+
+        ccx_stdout = (
+            " STEP            1\n\n"
+            " increment 1 attempt 1 \n"
+            " actual total time=5.000000e-01\n\n"
+            " iteration 1\n\n"
+            " largest residual force= 1.234500e+01 in node 12 and dof 2\n"
+            " no convergence\n\n"
+            " iteration 2\n\n"
+            " largest residual force= 2.000000e-04 in node 3 and dof 1\n"
+            " convergence\n\n"
+            " Job finished"
+        )
+        log = solverlog.make_log("CalculiX")
+        for start in range(0, len(ccx_stdout), 17):
+            log.feed(ccx_stdout[start : start + 17])
+        log.close()
+        self.assertEqual(
+            [event.kind for event in log.events],
+            ["step", "increment", "residual", "residual", "converged", "finished"],
+        )
+        residual = log.get_events("residual")[-1]
+        self.assertEqual((residual.step, residual.increment, residual.iteration), (1, 1, 2))
+        self.assertEqual((residual.solver_time, residual.residual), (0.5, 2e-4))
+
+        summary = solverlog.SolverLog.from_json(log.to_json()).get_summary()
+        self.assertEqual(summary["iterations"], 2)
+        self.assertEqual(summary["final_residual"], 2e-4)
+
+    # ********************************************************************************************
+    def get_mesh_sets_members(self, workers=(1, 4)):
+        from femmesh import meshsetscache
+        from femmesh import meshsetsgetter
+        from femtools import membertools
+
+        members = []
+        for count in workers:
+            # the sets are searched in the mesh by all runs, not taken from the cache
+            meshsetscache._analysis_caches.clear()
+            member = membertools.AnalysisMember(self.document.Analysis)
+            getter = meshsetsgetter.MeshSetsGetter(
+                self.document.Analysis,
+                self.document.CalculiXCcxTools,
+                self.document.Mesh,
+                member,
+            )
+            getter.get_mesh_sets(workers=count)
+            self.assertEqual(getter.workers, count)
+            members.append((member, getter.constraint_conflict_nodes))
+        return members
+
+    # ********************************************************************************************
+    def node_loads_workers_test(self, ref_shape_type):
+        # the node loads of the thread pool are bit-identical to the serial ones
+        (sequential, _), (parallel, _) = self.get_mesh_sets_members()
+        self.assertTrue(sequential.cons_force)
+        for seq_force, par_force in zip(sequential.cons_force, parallel.cons_force):
+            self.assertEqual(seq_force["RefShapeType"], ref_shape_type)
+            self.assertTrue(seq_force["NodeLoadTable"])
+            self.assertEqual(par_force["NodeLoadTable"], seq_force["NodeLoadTable"])
+
     # ********************************************************************************************
     def input_file_writing_test(
         self,
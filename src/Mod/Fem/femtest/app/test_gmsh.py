@@ -25,15 +25,20 @@ __url__ = "https://www.freecad.org"
 
 import unittest
 import importlib
+import importlib.util
+import os
 import shutil
 from os.path import join
 
+import numpy as np
+
 import FreeCAD
 
 import Fem
 from femexamples import manager
 from femtools.femutils import is_derived_from
 from femmesh import gmshtools
+from femmesh import meshtools
 from . import support_utils as testtools
 from .support_utils import fcc_print
 
@@ -346,6 +351,24 @@ class TestGMSHTransfinite(TestGMSHBase):
             # this exception is thrown if gmsh is not available. We pass in this case
             pass
 
+    def test_GMSHBrepCache(self):
+        # the BREP file of unchanged geometry is not exported again
+        self.load_example_file("gmsh_transfinite_manual")
+        gmsh = self.get_gmsh_objects()[0]
+        tool = gmshtools.GmshTools(gmsh)
+        tool.load_properties()
+        tool.get_tmp_file_paths()
+        tool.write_part_file()
+        stat = os.stat(tool.temp_file_geometry)
+        tool.write_part_file()
+        self.assertEqual(stat.st_mtime_ns, os.stat(tool.temp_file_geometry).st_mtime_ns)
+
+        # a changed file is exported again
+        with open(tool.temp_file_geometry, "a") as f:
+            f.write("\n")
+        tool.write_part_file()
+        self.assertEqual(stat.st_size, os.stat(tool.temp_file_geometry).st_size)
+
 
 class TestGMSHRefinements(TestGMSHBase):
     fcc_print("import TestGMSHRefinements")
@@ -373,3 +396,71 @@ class TestGMSHRefinements(TestGMSHBase):
         except gmshtools.GmshError:
             # this exception is thrown if gmsh is not available. We pass in this case
             pass
+
+
+class TestGMSHPythonApi(TestGMSHBase):
+    fcc_print("import TestGMSHPythonApi")
+
+    # ********************************************************************************************
+    def test_00print(self):
+        # since method name starts with 00 this will be run first
+        # this test just prints a line with stars
+
+        fcc_print(
+            "\n{0}\n{1} run FEM TestGMSHPythonApi tests {2}\n{0}".format(
+                100 * "*", 10 * "*", 57 * "*"
+            )
+        )
+
+    # ********************************************************************************************
+    @unittest.skipUnless(importlib.util.find_spec("gmsh"), "the Gmsh Python API is not installed")
+    def test_GMSHPythonApiMesh(self):
+        # the mesh of the Gmsh Python API is the one read from the file of the Gmsh binary,
+        # the node order of the elements included
+        param = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Gmsh")
+        use_gmsh_api = param.GetBool("UseGmshPythonApi", False)
+        param.SetBool("UseGmshPythonApi", False)  # execute_gmsh() runs the Gmsh binary
+        try:
+            for name in (
+                "ccx_cantilever_ele_seg3",
+                "ccx_cantilever_ele_tria6",
+                "ccx_cantilever_ele_quad8",
+                "ccx_cantilever_faceload",
+                "gmsh_transfinite_manual",
+            ):
+                with self.subTest(example=name):
+                    FreeCAD.closeDocument(self.document.Name)
+                    self.document = FreeCAD.newDocument(self.__class__.__name__)
+                    self.load_example_file(name)
+                    for gmsh in self.get_gmsh_objects():
+                        try:
+                            self.execute_gmsh(gmsh)
+                        except gmshtools.GmshError:
+                            self.skipTest("the Gmsh binary is not available")
+                        binary_elements = self.get_element_node_coords(gmsh.FemMesh)
+
+                        self.assertTrue(gmshtools.GmshTools(gmsh).run_gmsh_api())
+                        api_elements = self.get_element_node_coords(gmsh.FemMesh)
+
+                        self.assertEqual(sorted(binary_elements), sorted(api_elements))
+                        for key, coords in binary_elements.items():
+                            self.assertTrue(
+                                np.allclose(coords, api_elements[key], atol=1e-6),
+                                f"{name}: {key} elements differ",
+                            )
+        finally:
+            param.SetBool("UseGmshPythonApi", use_gmsh_api)
+
+    def get_element_node_coords(self, femmesh):
+        # { (element type, node count) : the node coordinates of the elements, sorted }
+        # the node and element numbers of the meshes may differ, the node order must not
+        node_ids, node_coords, elements = meshtools.get_femmesh_arrays(femmesh)
+        index = np.zeros(node_ids.max() + 1, dtype=np.int64)
+        index[node_ids] = np.arange(len(node_ids))
+        result = {}
+        for element_type, _, ele_nodes in elements:
+            coords = node_coords[index[ele_nodes]].round(6)
+            flat = coords.reshape(len(coords), -1)
+            order = np.lexsort(flat.T[::-1])
+            result[(element_type, ele_nodes.shape[1])] = coords[order]
+        return result
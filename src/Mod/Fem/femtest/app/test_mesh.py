@@ -129,6 +129,126 @@ class TestMeshCommon(unittest.TestCase):
             edge_data, expected_edges, "Edges of Python created seg3 element are unexpected"
         )
 
+    # ********************************************************************************************
+    def test_mesh_bulk_python(self):
+        import numpy as np
+
+        mesh = Fem.FemMesh()
+        mesh.addNodes(
+            np.array([1, 2, 3, 4, 5]),
+            np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=float),
+        )
+        mesh.addElements("Volume", np.array([10, 11]), np.array([[1, 2, 3, 4], [2, 3, 4, 5]]))
+        mesh.addElements("Face", np.array([20], dtype=np.int32), np.array([[1, 2, 3]]))
+        mesh.addElements("Edge", np.array([30]), np.array([[4, 5]]))
+
+        expected = Fem.FemMesh()
+        for node_id, (x, y, z) in enumerate(
+            [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 1)], 1
+        ):
+            expected.addNode(x, y, z, node_id)
+        expected.addVolume([1, 2, 3, 4], 10)
+        expected.addVolume([2, 3, 4, 5], 11)
+        expected.addFace([1, 2, 3], 20)
+        expected.addEdge([4, 5], 30)
+
+        self.assertEqual(mesh.Nodes, expected.Nodes)
+        self.assertEqual(
+            [(e, mesh.getElementNodes(e)) for e in mesh.Elements],
+            [(e, expected.getElementNodes(e)) for e in expected.Elements],
+        )
+        self.assertEqual(
+            (mesh.EdgeCount, mesh.FaceCount, mesh.VolumeCount),
+            (expected.EdgeCount, expected.FaceCount, expected.VolumeCount),
+        )
+        with self.assertRaises(ValueError):
+            mesh.addElements("Volume", np.array([12]), np.array([1, 2, 3, 4]))
+        with self.assertRaises(TypeError):
+            mesh.addElements("Edge", np.array([31.0]), np.array([[1, 2]]))
+
+    # ********************************************************************************************
+    def test_femmesh_skin(self):
+        from types import SimpleNamespace
+        from femmesh import femmesh2mesh
+
+        # node ids above the former limit of one million nodes
+        first_id = 5000000
+        mesh = Fem.FemMesh()
+        for node_id, (x, y, z) in enumerate(
+            [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 1)], first_id
+        ):
+            mesh.addNode(x, y, z, node_id)
+        mesh.addVolume([first_id + i for i in (0, 1, 2, 3)], 1)
+        mesh.addVolume([first_id + i for i in (1, 2, 3, 4)], 2)
+
+        # the common face of the two tetras is not on the surface
+        skin = femmesh2mesh.get_femmesh_skin(mesh)
+        self.assertEqual(skin.node_ids.tolist(), list(range(first_id, first_id + 5)))
+        self.assertEqual(len(skin.triangles), 6)
+        common_face = sorted(first_id + i for i in (1, 2, 3))
+        for triangle in skin.get_triangle_nodes().tolist():
+            self.assertNotEqual(sorted(triangle), common_face)
+        self.assertIs(femmesh2mesh.get_femmesh_skin(mesh), skin)
+
+        # the displaced surface uses the same skin
+        result = SimpleNamespace(
+            Name="Result",
+            NodeNumbers=list(range(first_id, first_id + 5)),
+            DisplacementVectors=5 * [FreeCAD.Vector(0, 0, 1)],
+        )
+        points = femmesh2mesh.femmesh_2_mesh(mesh, result, 2)
+        self.assertEqual(len(points), 18)
+        self.assertEqual(
+            [p.z for p in points], [p.z + 2 for p in femmesh2mesh.femmesh_2_mesh(mesh)]
+        )
+
+    # ********************************************************************************************
+    def test_compact_mesh(self):
+        from femmesh import meshtools
+
+        mesh = Fem.FemMesh()
+        for node_id, (x, y, z) in zip(
+            (3, 7, 8, 20, 21), [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 1)]
+        ):
+            mesh.addNode(x, y, z, node_id)
+        mesh.addVolume([3, 7, 8, 20], 40)
+        mesh.addVolume([7, 8, 20, 21], 42)
+        mesh.addFace([3, 7, 8], 10)
+        mesh.addEdge([20, 21], 5)
+
+        new_mesh, node_map, elem_map = meshtools.compact_mesh(mesh)
+        self.assertEqual(node_map, {3: 1, 7: 2, 8: 3, 20: 4, 21: 5})
+        self.assertEqual(elem_map, {5: 1, 10: 2, 40: 3, 42: 4})
+        self.assertEqual(new_mesh.getElementNodes(4), (2, 3, 4, 5))
+        self.assertEqual(new_mesh.Nodes[5], mesh.Nodes[21])
+        self.assertEqual(meshtools.renumber_nodes([3, 7, 8, 20, 21], [21, 3]).tolist(), [5, 1])
+        with self.assertRaises(ValueError):
+            meshtools.renumber_nodes([3, 7, 8, 20, 21], [4])
+
+    # ********************************************************************************************
+    def test_mesh_quality(self):
+        from femmesh import meshquality
+
+        mesh = Fem.FemMesh()
+        for node_id, (x, y, z) in enumerate(
+            [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 0, -1)], 1
+        ):
+            mesh.addNode(x, y, z, node_id)
+        # FreeCAD node order of a valid tetra
+        mesh.addVolume([2, 1, 3, 4], 1)
+        # same node order, the fourth node on the other side, thus inverted
+        mesh.addVolume([2, 1, 3, 5], 2)
+        mesh.addEdge([1, 2], 3)
+
+        report = meshquality.check_mesh_quality(mesh)
+        self.assertEqual(len(report), 2)
+        self.assertEqual(report.unchecked_count, 1)
+        self.assertFalse(report.is_valid())
+        self.assertEqual(report.get_nonpositive_jacobian_elements(), [2])
+        self.assertAlmostEqual(report.jacobian_ratio[report.element_ids == 1][0], 1.0)
+        self.assertAlmostEqual(report.aspect_ratio[0], 2**0.5)
+        self.assertEqual(report.get_bad_elements(), [2])
+
     # ********************************************************************************************
     def test_unv_save_load(self):
         tetra10 = Fem.FemMesh()
@@ -386,6 +506,35 @@ class TestMeshEleTetra10(unittest.TestCase):
 
         self.compare_mesh_files(femmesh_testfile, femmesh_outfile, file_extension)
 
+    # ********************************************************************************************
+    def test_tetra10_inp_include(self):
+        # tetra10 element: reading an inp mesh file of nested includes by Python in chunks
+        from os.path import basename
+        from os.path import dirname
+
+        from feminout import importInpMesh
+
+        file_extension = "inp"
+        outfile, testfile = self.get_file_paths(file_extension)
+        self.femmesh.writeABAQUS(outfile, 1, False)  # write the mesh
+        include_file = join(dirname(outfile), "include_mesh.inp")
+        main_file = join(dirname(outfile), "main_mesh.inp")
+        with open(include_file, "w") as f:
+            f.write(f"** include of an include\n*INCLUDE, INPUT={basename(outfile)}\n")
+        with open(main_file, "w") as f:
+            f.write(f"*INCLUDE, INPUT={basename(include_file)}\n*STEP\n*STATIC\n*END STEP\n")
+
+        femmesh_outfile = importInpMesh.read(main_file)
+        femmesh_testfile = Fem.read(testfile)  # read the mesh from test mesh
+        self.compare_mesh_files(femmesh_testfile, femmesh_outfile, file_extension)
+
+        # chunks of one line, the element lines are continued in the next chunk
+        chunks = list(importInpMesh.iter_inp_mesh_chunks(main_file, chunk_size=1))
+        self.assertEqual(
+            [(key, ids.tolist()) for key, ids, values in chunks],
+            [("Nodes", [node]) for node in sorted(self.femmesh.Nodes)] + [("Tetra10Elem", [1])],
+        )
+
     # ********************************************************************************************
     def test_tetra10_unv(self):
         # tetra10 element: reading from and writing to unv mesh file format
@@ -605,6 +754,33 @@ class TestMeshGroups(unittest.TestCase):
             ),
         )
 
+    def test_binary_mesh_file(self):
+        """
+        Create the mesh from the binary file of an example mesh and compare
+        it with the mesh created by the Python module.
+        """
+        from femexamples.meshes import generate_mesh
+        from femexamples.meshes.mesh_canticcx_tetra10 import create_elements
+        from femexamples.meshes.mesh_canticcx_tetra10 import create_nodes
+
+        expected = generate_mesh.mesh_from_existing(create_nodes, create_elements)
+        result = generate_mesh.mesh_from_file("mesh_canticcx_tetra10")
+
+        def get_mesh_data(fm):
+            return {
+                "nodes": {n: tuple(v) for n, v in fm.Nodes.items()},
+                "elements": {e: fm.getElementNodes(e) for e in fm.Elements},
+                "edges": fm.Edges,
+                "faces": fm.Faces,
+                "volumes": fm.Volumes,
+                "groups": [
+                    (fm.getGroupName(g), fm.getGroupElementType(g), fm.getGroupElements(g))
+                    for g in fm.Groups
+                ],
+            }
+
+        self.assertEqual(get_mesh_data(expected), get_mesh_data(result))
+
     def test_group_vtk_handling(self):
         """
         See if groups can be exported and imported correctly to and from vtk files
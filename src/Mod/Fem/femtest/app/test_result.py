@@ -25,6 +25,9 @@ __title__ = "Results FEM unit tests"
 __author__ = "Bernd Hahnebach"
 __url__ = "https://www.freecad.org"
 
+import importlib.util
+import math
+import os
 import unittest
 from os.path import join
 
@@ -179,6 +182,42 @@ class TestResult(unittest.TestCase):
             # fcc_print("Case{}: {}".format(i + 1 , rhores))
             self.assertEqual(rhores, case[1], f"Calculated rho are not the expected Case{i + 1}.")
 
+    # ********************************************************************************************
+    def test_stress_batch(self):
+        # the batch methods give the values of the per node methods, NaN rows give NaN
+        import numpy as np
+        from femresult import resulttools
+
+        stress = np.array(
+            [
+                self.get_stress_values(),
+                (2.000, -2.000, 5.000, 6.000, -4.000, 2.000),
+                (-1.000, -7.000, 10.000, 0.000, 0.000, 5.000),
+                (0.000, 0.000, 0.000, 10.000, 8.000, 7.000),
+                (15.000, 0.000, 0.000, 0.000, 0.000, 0.000),
+                (1.000, float("NaN"), 3.000, 10.000, -8.000, 7.000),
+            ]
+        )
+        mises = resulttools.calculate_von_mises_array(stress)
+        prin_std = resulttools.calculate_principal_stress_std_array(stress)
+        prin, shear, vectors = resulttools.calculate_principal_stress_reinforced_array(stress)
+        rho = resulttools.calculate_rho_array(stress[:-1], 500)
+        for i, stress_tensor in enumerate(stress[:-1].tolist()):
+            self.assertAlmostEqual(
+                mises[i], resulttools.calculate_von_mises(np.array(stress_tensor)), places=9
+            )
+            self.assertEqual(
+                tuple(prin_std[i]), resulttools.calculate_principal_stress_std(stress_tensor)
+            )
+            prin_rc = resulttools.calculate_principal_stress_reinforced(stress_tensor)
+            self.assertEqual(tuple(prin[i]), prin_rc[:3])
+            self.assertEqual(shear[i], prin_rc[3])
+            self.assertEqual(tuple(map(tuple, vectors[i].tolist())), prin_rc[4])
+            self.assertEqual(tuple(rho[i]), resulttools.calculate_rho(stress_tensor, 500))
+        self.assertTrue(np.isnan(mises[-1]))
+        self.assertTrue(np.isnan(prin_std[-1]).all())
+        self.assertTrue(np.isnan(prin[-1]).all())
+
     # ********************************************************************************************
     def test_disp_abs(self):
         expected_dispabs = 87.302986
@@ -191,3 +230,246 @@ class TestResult(unittest.TestCase):
         self.assertEqual(
             disp_abs, expected_dispabs, "Calculated displacement abs are not the expected values."
         )
+
+    # ********************************************************************************************
+    def test_frd_array_reader(self):
+        # compares the array frd reader with the line reader and prints the read times
+        import time
+        from feminout.importCcxFrdResults import read_frd_result
+        from feminout.importCcxFrdResults import read_frd_result_arrays
+
+        test_dir = join(testtools.get_fem_test_home_dir(), "calculix")
+        for frd_name in ("box_static.frd", "box_frequency.frd"):
+            frd_file = join(test_dir, frd_name)
+            time_start = time.perf_counter()
+            line_data = read_frd_result(frd_file)
+            time_line = time.perf_counter() - time_start
+            time_start = time.perf_counter()
+            array_data = read_frd_result_arrays(frd_file)
+            time_array = time.perf_counter() - time_start
+            fcc_print(
+                "{}: line reader {:.4f} s, array reader {:.4f} s".format(
+                    frd_name, time_line, time_array
+                )
+            )
+
+            node_ids, node_coords = array_data["Nodes"]
+            self.assertEqual(list(line_data["Nodes"]), node_ids.tolist())
+            self.assertEqual(
+                [tuple(v) for v in line_data["Nodes"].values()],
+                [tuple(v) for v in node_coords.tolist()],
+            )
+            for key in line_data:
+                if key.endswith("Elem"):
+                    ele_ids, ele_nodes = array_data[key]
+                    self.assertEqual(
+                        line_data[key],
+                        dict(zip(ele_ids.tolist(), map(tuple, ele_nodes.tolist()))),
+                        f"{frd_name}: {key} differ",
+                    )
+
+            self.assertEqual(len(line_data["Results"]), len(array_data["Results"]))
+            for line_set, array_set in zip(line_data["Results"], array_data["Results"]):
+                self.assertEqual(sorted(line_set), sorted(array_set))
+                # the number of a static result set is NaN in both readers
+                line_number, array_number = line_set["number"], array_set["number"]
+                self.assertTrue(
+                    line_number == array_number
+                    or (math.isnan(line_number) and math.isnan(array_number)),
+                    f"{frd_name}: number {line_number} != {array_number}",
+                )
+                for key in ("disp", "stress", "strain"):
+                    nodes, values = array_set[key]
+                    self.assertEqual(list(line_set[key]), nodes.tolist())
+                    self.assertEqual(
+                        [tuple(v) for v in line_set[key].values()],
+                        [tuple(v) for v in values.tolist()],
+                        f"{frd_name}: {key} differ",
+                    )
+
+    # ********************************************************************************************
+    def test_frd_result_store(self):
+        # the result sets of the result store are the ones of the array reader
+        import numpy as np
+        from feminout.importCcxFrdResults import iter_frd_result_arrays
+        from feminout.importCcxFrdResults import read_frd_result_arrays
+        from femresult import resultstore
+
+        test_dir = join(testtools.get_fem_test_home_dir(), "calculix")
+        for frd_name in ("box_static.frd", "box_frequency.frd"):
+            frd_file = join(test_dir, frd_name)
+            store_dir = testtools.get_fem_test_tmp_dir("result_store_" + frd_name[:-4])
+            mesh_data = {}
+            count = resultstore.write_result_store(
+                store_dir, iter_frd_result_arrays(frd_file, mesh_data)
+            )
+            array_data = read_frd_result_arrays(frd_file)
+            self.assertEqual(list(mesh_data), list(array_data)[:-1])
+            self.assertEqual(count, len(array_data["Results"]))
+
+            store = resultstore.get_store(store_dir)
+            self.assertEqual(len(store), count)
+            for index, array_set in enumerate(array_data["Results"]):
+                store_set = store.get_result_set(index)
+                self.assertEqual(sorted(store_set), sorted(array_set))
+                for key in ("disp", "stress", "strain"):
+                    self.assertTrue(np.array_equal(store_set[key][0], array_set[key][0]))
+                    self.assertTrue(
+                        np.array_equal(store_set[key][1], array_set[key][1]),
+                        f"{frd_name}: {key} differ",
+                    )
+
+    # ********************************************************************************************
+    def test_frd_lazy_import(self):
+        # the lazy result objects load the node data of the result objects of a full import
+        import shutil
+        import ObjectsFem
+        from feminout import importCcxFrdResults
+        from femresult import resultstore
+        from femtools.femutils import is_of_type
+
+        frd_file = join(testtools.get_fem_test_tmp_dir("result_lazy_import"), "box_frequency.frd")
+        shutil.copyfile(
+            join(testtools.get_fem_test_home_dir(), "calculix", "box_frequency.frd"), frd_file
+        )
+
+        def import_results(lazy_results):
+            analysis = ObjectsFem.makeAnalysis(self.document)
+            importCcxFrdResults.importFrd(
+                frd_file, analysis, array_reader=True, lazy_results=lazy_results
+            )
+            return [obj for obj in analysis.Group if is_of_type(obj, "Fem::ResultMechanical")]
+
+        lazy_results = import_results(True)
+        full_results = import_results(False)
+        self.assertGreater(len(lazy_results), 1)
+        self.assertEqual(len(lazy_results), len(full_results))
+
+        # the lazy result objects share one result mesh and hold no node data
+        self.assertEqual(len({res.Mesh.Name for res in lazy_results}), 1)
+        for lazy_res, full_res in zip(lazy_results, full_results):
+            self.assertTrue(resultstore.is_lazy(lazy_res))
+            self.assertFalse(resultstore.is_loaded(lazy_res))
+            self.assertEqual(lazy_res.Stats, full_res.Stats)
+
+            self.assertTrue(resultstore.load_result(lazy_res))
+            self.assertFalse(resultstore.load_result(lazy_res))
+            self.assertEqual(lazy_res.NodeNumbers, full_res.NodeNumbers)
+            self.assertEqual(lazy_res.DisplacementVectors, full_res.DisplacementVectors)
+            self.assertEqual(lazy_res.vonMises, full_res.vonMises)
+
+            resultstore.unload_result(lazy_res)
+            self.assertFalse(resultstore.is_loaded(lazy_res))
+            self.assertEqual(lazy_res.DisplacementVectors, [])
+            self.assertEqual(lazy_res.Stats, full_res.Stats)
+
+        if "BUILD_FEM_VTK" not in FreeCAD.__cmake__:
+            return
+        # the pipeline of the store shows the last result set and switches to another one
+        (pipeline,) = resultstore.get_store_pipelines(lazy_results[0])
+        self.assertEqual(pipeline.ResultStoreIndex, len(lazy_results) - 1)
+        self.assertEqual(resultstore.show_pipeline_result(lazy_results[0]), [pipeline])
+        self.assertEqual(pipeline.ResultStoreIndex, 0)
+        self.assertFalse(resultstore.is_loaded(lazy_results[0]))
+        self.assertEqual(resultstore.show_pipeline_result(lazy_results[0]), [])
+
+    # ********************************************************************************************
+    def test_result_stats(self):
+        # the cached statistics are the ones of the node data and follow its changes
+        import ObjectsFem
+        from femresult import resulttools
+
+        res_obj = ObjectsFem.makeResultMechanical(self.document)
+        res_obj.NodeNumbers = [1, 2, 3, 4]
+        res_obj.DisplacementVectors = [
+            FreeCAD.Vector(1.0, -2.0, 0.5),
+            FreeCAD.Vector(-3.0, 4.0, 0.0),
+            FreeCAD.Vector(2.0, 0.0, -1.5),
+            FreeCAD.Vector(0.0, 1.0, 2.5),
+        ]
+        res_obj.vonMises = [10.0, 40.0, 20.0, 30.0]
+        resulttools.fill_femresult_stats(res_obj)
+        self.assertEqual(resulttools.get_stats(res_obj, "U1"), (-3.0, 2.0))
+        self.assertEqual(resulttools.get_stats(res_obj, "U3"), (-1.5, 2.5))
+        self.assertEqual(resulttools.get_stats(res_obj, "Sabs"), (10.0, 40.0))
+        self.assertEqual(resulttools.get_stats(res_obj, "Temp"), (0.0, 0.0))
+
+        stats = resulttools.get_result_stats(res_obj).get_stats("Sabs")
+        self.assertAlmostEqual(stats["mean"], 25.0)
+        self.assertAlmostEqual(stats["percentiles"][50], 25.0)
+
+        res_obj.vonMises = [5.0, 15.0, 25.0, 35.0]
+        stats = resulttools.get_result_stats(res_obj).get_stats("Sabs")
+        self.assertEqual((stats["min"], stats["max"]), (5.0, 35.0))
+        self.assertEqual(
+            resulttools.get_result_stats(res_obj).get_values("U2").tolist(),
+            [-2.0, 4.0, 0.0, 1.0],
+        )
+
+        # a new result object of the same name, e.g. after purging the results, gets its own
+        name = res_obj.Name
+        self.document.removeObject(name)
+        res_obj = ObjectsFem.makeResultMechanical(self.document, name)
+        self.assertEqual(res_obj.Name, name)
+        res_obj.NodeNumbers = [1, 2]
+        res_obj.vonMises = [1.0, 3.0]
+        stats = resulttools.get_result_stats(res_obj).get_stats("Sabs")
+        self.assertEqual((stats["min"], stats["max"]), (1.0, 3.0))
+
+    # ********************************************************************************************
+    def test_xdmf_result(self):
+        # the mesh and the node results of a result object written to XDMF are read back
+        from feminout.importXDMFResults import write_xdmf_results
+
+        m, res_obj = self._make_box_static_result()
+        xdmf_file = join(testtools.get_fem_test_tmp_dir("result_xdmf"), "box_static.xdmf")
+        # without HDF5 file, h5py is not needed
+        write_xdmf_results([res_obj], xdmf_file, hdf5=False)
+        self._check_xdmf_result(xdmf_file, m)
+
+        # the export writes an HDF5 file only if h5py is installed
+        from feminout import importXDMFResults
+
+        xdmf_file = join(testtools.get_fem_test_tmp_dir("result_xdmf_export"), "box_static.xdmf")
+        importXDMFResults.export([res_obj], xdmf_file)
+        self._check_xdmf_result(xdmf_file, m)
+
+    # ********************************************************************************************
+    @unittest.skipUnless(importlib.util.find_spec("h5py"), "h5py is not installed")
+    def test_xdmf_result_hdf5(self):
+        # the heavy data written to an HDF5 file beside the XDMF file is read back
+        from feminout.importXDMFResults import write_xdmf_results
+
+        m, res_obj = self._make_box_static_result()
+        xdmf_file = join(testtools.get_fem_test_tmp_dir("result_xdmf_hdf5"), "box_static.xdmf")
+        write_xdmf_results([res_obj], xdmf_file, hdf5=True)
+        self.assertTrue(os.path.isfile(os.path.splitext(xdmf_file)[0] + ".h5"))
+        self._check_xdmf_result(xdmf_file, m)
+
+    def _make_box_static_result(self):
+        import ObjectsFem
+        from feminout import importToolsFem
+        from feminout.importCcxFrdResults import read_frd_result_arrays
+
+        frd_file = join(testtools.get_fem_test_home_dir(), "calculix", "box_static.frd")
+        m = read_frd_result_arrays(frd_file)
+        res_obj = ObjectsFem.makeResultMechanical(self.document)
+        res_obj.Mesh = ObjectsFem.makeMeshResult(self.document)
+        res_obj.Mesh.FemMesh = importToolsFem.make_femmesh_from_arrays(m)
+        importToolsFem.fill_femresult_mechanical_arrays(res_obj, m["Results"][-1])
+        return m, res_obj
+
+    def _check_xdmf_result(self, xdmf_file, m):
+        import numpy as np
+        from feminout.importXDMFResults import read_xdmf_result_arrays
+
+        xdmf_data = read_xdmf_result_arrays(xdmf_file)
+        order = np.argsort(m["Nodes"][0])
+        self.assertTrue(np.allclose(xdmf_data["Nodes"][1], m["Nodes"][1][order]))
+        self.assertEqual(len(xdmf_data["Results"]), 1)
+        for key in ("disp", "stress", "strain"):
+            node_ids, values = m["Results"][-1][key]
+            self.assertTrue(
+                np.allclose(xdmf_data["Results"][0][key][1], values[np.argsort(node_ids)]),
+                f"{key} differ",
+            )
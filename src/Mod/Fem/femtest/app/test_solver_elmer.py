@@ -25,8 +25,10 @@ __title__ = "Solver elmer FEM unit tests"
 __author__ = "Bernd Hahnebach"
 __url__ = "https://www.freecad.org"
 
+import os
 import unittest
 from os.path import join
+from unittest import mock
 
 import FreeCAD
 
@@ -171,6 +173,50 @@ class TestSolverElmer(unittest.TestCase):
         setup(self.document, "elmer", test_mode=True)
         self.input_file_writing_test(get_namefromdef("test_"))
 
+    # ********************************************************************************************
+    def test_elmergrid_reuse(self):
+        from femexamples.ccx_cantilever_faceload import setup
+        from femsolver.elmer import elmertools
+
+        setup(self.document, "elmer", test_mode=True)
+        self.document.recompute()
+        solver = self.document.SolverElmer
+        solver.WorkingDirectory = testtools.get_fem_test_tmp_dir(
+            self.pre_dir_name + "elmergrid_reuse"
+        )
+        grid_file = join(solver.WorkingDirectory, "mesh.header")
+        tool = elmertools.ElmerTools(solver)
+        grid_keys = []
+
+        def run_elmergrid(mesh_file, num_proc, mesh_key):
+            # stands in for ElmerGrid, writes one of its mesh files
+            grid_keys.append(mesh_key)
+            with open(grid_file, "w") as f:
+                f.write(mesh_key)
+            tool._save_grid_state(mesh_key, num_proc)
+
+        with mock.patch.object(tool, "_run_elmergrid", side_effect=run_elmergrid):
+            tool.prepare()
+            self.assertEqual(len(grid_keys), 1)
+
+            # the mesh is unchanged, the ElmerGrid files are reused
+            tool.prepare()
+            self.assertEqual(len(grid_keys), 1)
+
+            # the mesh is changed, ElmerGrid is run again
+            femmesh = self.document.Mesh.FemMesh.copy()
+            femmesh.addNode(0.0, 0.0, 1000.0)
+            self.document.Mesh.FemMesh = femmesh
+            tool.prepare()
+            self.assertEqual(len(grid_keys), 2)
+            self.assertNotEqual(grid_keys[1], grid_keys[0])
+
+            # an ElmerGrid file is missing, ElmerGrid is run again
+            os.remove(grid_file)
+            tool.prepare()
+            self.assertEqual(len(grid_keys), 3)
+            self.assertEqual(grid_keys[2], grid_keys[1])
+
     # ********************************************************************************************
     def input_file_writing_test(self, base_name):
         self.document.recompute()
@@ -0,0 +1,237 @@
+# ***************************************************************************
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Solver parameter sweep FEM unit tests"
+__author__ = "FreeCAD FEM developers"
+__url__ = "https://www.freecad.org"
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from PySide import QtCore
+
+import FreeCAD
+
+import ObjectsFem
+from femsolver import run
+from femsolver import sweep
+from . import support_utils as testtools
+from .support_utils import fcc_print
+
+
+class _FakeSignal:
+    def disconnect(self, slot):
+        pass
+
+
+class _FakeProcess:
+    """a solver process which has finished with the exit code as soon as it is started"""
+
+    def __init__(self):
+        self.finished = _FakeSignal()
+        self.exit_code = None
+
+    def state(self):
+        return QtCore.QProcess.NotRunning
+
+    def waitForFinished(self, msecs):
+        return True
+
+    def error(self):
+        return QtCore.QProcess.UnknownError
+
+    def exitStatus(self):
+        return QtCore.QProcess.NormalExit
+
+    def exitCode(self):
+        return self.exit_code
+
+    def kill(self):
+        pass
+
+
+class _FakeTool:
+    """a solver tool of the sweep case of the working directory of the solver"""
+
+    def __init__(self, test, solver):
+        self.test = test
+        self.solver = solver
+        self.name = os.path.basename(solver.WorkingDirectory)
+        self.process = _FakeProcess()
+        self.solver_log = None
+
+    def _process_finished(self, code, status):
+        pass
+
+    def read_output(self):
+        pass
+
+    def prepare(self):
+        if self.name in self.test.not_written:
+            raise ValueError("no mesh")
+        self.test.prepared[self.name] = self.solver.Document.Load.Force
+
+    def compute(self):
+        self.process.exit_code = 1 if self.name in self.test.failing else 0
+
+    def update_properties(self):
+        res = self.solver.Document.addObject("App::FeaturePython", "Result")
+        self.solver.Results = self.solver.Results + [res]
+
+    def _store_solver_log(self):
+        self.test.logs_stored.append(self.name)
+
+
+class TestSolverSweep(unittest.TestCase):
+    fcc_print("import TestSolverSweep")
+
+    # ********************************************************************************************
+    def setUp(self):
+        # setUp is executed before every test
+
+        # new document
+        self.document = FreeCAD.newDocument(self.__class__.__name__)
+        load = self.document.addObject("App::FeaturePython", "Load")
+        load.addProperty("App::PropertyFloat", "Force")
+        load.Force = 1.0
+        self.solver = ObjectsFem.makeSolverCalculiX(self.document)
+        self.solver.WorkingDirectory = "original_dir"
+        self.document.recompute()
+
+        self.sweep_dir = testtools.get_fem_test_tmp_dir("solver_sweep")
+
+        # the cases of the sweep, { case name : overrides }
+        self.cases = {
+            "case_000": {"Load.Force": 10.0},
+            "case_001": {"Load.Force": 20.0},
+            "case_002": {"Load.Force": 30.0},
+        }
+        # the cases prepared by the fake tools, { case name : Force at prepare }
+        self.prepared = {}
+        self.logs_stored = []
+        self.failing = set()
+        self.not_written = set()
+
+    # ********************************************************************************************
+    def tearDown(self):
+        # tearDown is executed after every test
+        FreeCAD.closeDocument(self.document.Name)
+
+    # ********************************************************************************************
+    def test_00print(self):
+        # since method name starts with 00 this will be run first
+        # this test just prints a line with stars
+
+        fcc_print(
+            "\n{0}\n{1} run FEM TestSolverSweep tests {2}\n{0}".format(
+                100 * "*", 10 * "*", 59 * "*"
+            )
+        )
+
+    # ********************************************************************************************
+    def test_sweep_cases(self):
+        self.failing = {"case_001"}
+        self.not_written = {"case_002"}
+        result = self.run_sweep()
+
+        self.assertEqual(self.prepared, {"case_000": 10.0, "case_001": 20.0})
+        self.assertEqual(
+            self.get_states(),
+            {"case_000": sweep.DONE, "case_001": sweep.FAILED, "case_002": sweep.FAILED},
+        )
+        # only the results and the solver log of the finished case are loaded
+        self.assertEqual(list(result.results), ["case_000"])
+        self.assertEqual(self.logs_stored, ["case_000"])
+        self.assertEqual([res.Label for res in self.solver.Results], ["Result_case_000"])
+
+        # the overrides and the working directory are restored
+        self.assertEqual(self.document.Load.Force, 1.0)
+        self.assertEqual(self.solver.WorkingDirectory, "original_dir")
+
+    # ********************************************************************************************
+    def test_sweep_resume(self):
+        self.failing = {"case_001"}
+        self.run_sweep()
+
+        # the failed case runs again, the finished cases are skipped
+        self.failing = set()
+        self.prepared = {}
+        self.run_sweep()
+        self.assertEqual(self.prepared, {"case_001": 20.0})
+        self.assertEqual(set(self.get_states().values()), {sweep.DONE})
+
+        # a finished case with changed overrides runs again
+        self.cases["case_002"] = {"Load.Force": 35.0}
+        self.prepared = {}
+        self.run_sweep()
+        self.assertEqual(self.prepared, {"case_002": 35.0})
+
+    # ********************************************************************************************
+    def test_sweep_resume_killed(self):
+        self.run_sweep()
+
+        # a case running when the sweep was killed runs again
+        manifest_file = os.path.join(self.sweep_dir, sweep.MANIFEST_NAME)
+        with open(manifest_file) as f:
+            data = json.load(f)
+        data["cases"]["case_000"]["state"] = sweep.RUNNING
+        with open(manifest_file, "w") as f:
+            json.dump(data, f)
+
+        self.prepared = {}
+        self.run_sweep()
+        self.assertEqual(self.prepared, {"case_000": 10.0})
+        self.assertEqual(self.get_states()["case_000"], sweep.DONE)
+
+    # ********************************************************************************************
+    def test_sweep_resume_load_results(self):
+        self.run_sweep()
+        for res in self.solver.Results:
+            if res.Label.endswith("_case_000"):
+                self.document.removeObject(res.Name)
+
+        # the finished case without result objects does not run again, its results are loaded
+        self.prepared = {}
+        result = self.run_sweep()
+        self.assertEqual(self.prepared, {})
+        self.assertEqual(list(result.results), ["case_000"])
+        self.assertTrue(result.results["case_000"][0].Label.endswith("_case_000"))
+        self.assertEqual(len(self.solver.Results), 3)
+
+        # the manifest knows the new result objects, nothing is loaded again
+        result = self.run_sweep()
+        self.assertEqual(result.results, {})
+        self.assertEqual(len(self.solver.Results), 3)
+
+    # ********************************************************************************************
+    def run_sweep(self):
+        with mock.patch.object(
+            run, "get_solver_tool", side_effect=lambda solver: _FakeTool(self, solver)
+        ):
+            return sweep.run_sweep(self.solver, self.cases, self.sweep_dir, max_processes=2)
+
+    # ********************************************************************************************
+    def get_states(self):
+        with open(os.path.join(self.sweep_dir, sweep.MANIFEST_NAME)) as f:
+            return {name: case["state"] for name, case in json.load(f)["cases"].items()}
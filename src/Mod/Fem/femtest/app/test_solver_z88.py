@@ -96,6 +96,42 @@ class TestSolverZ88(unittest.TestCase):
         setup(self.document, "z88", test_mode=True)
         self.inputfile_writing_test(get_namefromdef("test_"))
 
+    # ********************************************************************************************
+    def test_solver_log(self):
+        # the stdout of "z88r -c -sorcg", the output is parsed in pieces as it is read
+        from femsolver import solverlog
+
+        z88r_stdout = (
+            "Z88R Version 15OS\n"
+            "Start Z88R\n"
+            "Z88R: reading Z88DYN.TXT\n"
+            "Z88R: reading Z88I1.TXT\n"
+            "Z88R: 147 nodes, 20 elements, 441 degrees of freedom\n"
+            "Z88R: allocated memory 12.5 MB\n"
+            "Z88R: start SORCG solver\n"
+            "Iteration Nr.     1  Eps = 1.000000E+00\n"
+            "Iteration Nr.     2  Eps = 3.125000E-02\n"
+            "Iteration Nr.     3  Eps = 4.000000E-08\n"
+            "Z88R: writing Z88O2.TXT\n"
+            "Z88R: writing Z88O3.TXT\n"
+            "Z88R done"
+        )
+        log = solverlog.make_log("Z88")
+        for start in range(0, len(z88r_stdout), 23):
+            log.feed(z88r_stdout[start : start + 23])
+        log.close()
+        self.assertEqual(
+            [event.kind for event in log.events],
+            ["memory", "residual", "residual", "residual", "finished"],
+        )
+        residual = log.get_events("residual")[-1]
+        self.assertEqual((residual.iteration, residual.residual), (3, 4e-8))
+
+        summary = log.get_summary()
+        self.assertEqual(summary["solver"], "Z88")
+        self.assertEqual(summary["iterations"], 3)
+        self.assertEqual(summary["max_memory"], 12.5)
+
     # ********************************************************************************************
     def inputfile_writing_test(self, base_name):
         self.document.recompute()
@@ -33,12 +33,14 @@ import os
 import sys
 import subprocess
 import shutil
+import threading
 from traceback import format_exception_only
 
 import FreeCAD
 
 from femtools import femutils
 from femtools import membertools
+from femsolver import solverlog
 from femsolver.calculix.calculixutils import define_masks
 
 from PySide import QtCore  # there might be a special reason this is not guarded ?!?
@@ -92,6 +94,8 @@ class FemToolsCcx(QtCore.QRunnable, QtCore.QObject):
         self.ccx_binary_present = False
         self.analysis = None
         self.solver = None
+        # the events of the ccx output, see femsolver.solverlog
+        self.solver_log = None
 
         # TODO if something will go wrong in __init__ do not continue,
         # but do not raise a exception, break in a smarter way
@@ -510,9 +514,22 @@ class FemToolsCcx(QtCore.QRunnable, QtCore.QObject):
             shell=False,
             env=_env,
         )
-        self.ccx_stdout, self.ccx_stderr = p.communicate()
-        self.ccx_stdout = self.ccx_stdout.decode()
-        self.ccx_stderr = self.ccx_stderr.decode()
+        # the stdout lines are parsed into the solver log while ccx runs,
+        # stderr is read beside to not block ccx on a full pipe
+        stderr = []
+        stderr_thread = threading.Thread(target=lambda: stderr.append(p.stderr.read()))
+        stderr_thread.start()
+        self.solver_log = solverlog.make_log("CalculiX")
+        stdout = []
+        for line in iter(p.stdout.readline, b""):
+            line = line.decode()
+            stdout.append(line)
+            self.solver_log.feed(line)
+        p.wait()
+        stderr_thread.join()
+        self.solver_log.close()
+        self.ccx_stdout = "".join(stdout)
+        self.ccx_stderr = stderr[0].decode()
         os.putenv("OMP_NUM_THREADS", ont_backup)
         QtCore.QDir.setCurrent(cwd)
         return p.returncode
@@ -761,6 +778,10 @@ class FemToolsCcx(QtCore.QRunnable, QtCore.QObject):
             importCcxFrdResults.importFrd(
                 frd_result_file, self.analysis, "CCX_", self.solver.AnalysisType
             )
+            if self.solver_log is not None:
+                for m in self.analysis.Group:
+                    if m.isDerivedFrom("Fem::FemResultObject"):
+                        solverlog.store_log(m, self.solver_log)
             for m in self.analysis.Group:
                 if m.isDerivedFrom("Fem::FemResultObject"):
                     self.results_present = True
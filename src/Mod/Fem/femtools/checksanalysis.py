@@ -75,6 +75,18 @@ def check_member_for_solver_calculix(analysis, solver, mesh, member):
                 "FEM mesh has neither volume nor shell or edge elements. "
                 "Provide a FEM mesh with elements.\n"
             )
+        if FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Ccx").GetBool(
+            "CheckMeshQuality", True
+        ):
+            from femmesh import meshquality
+
+            report = meshquality.check_mesh_quality(mesh.FemMesh)
+            bad_elements = report.get_nonpositive_jacobian_elements()
+            if bad_elements:
+                message += (
+                    "FEM mesh has {} elements with a nonpositive Jacobian, "
+                    "the first ones are: {}.\n".format(len(bad_elements), bad_elements[:10])
+                )
 
     # material linear and nonlinear
     if not member.mats_linear:
@@ -33,6 +33,9 @@ import tempfile
 
 import FreeCAD
 
+from femsolver import signal
+from femsolver import solverlog
+
 
 class ObjectTools(ABC):
     """Abstract base class for the work with solvers and meshers"""
@@ -44,8 +47,13 @@ class ObjectTools(ABC):
         self.process = QProcess()
         self.analysis = obj.getParentGroup()
         self.fem_param = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem")
+        # the output is read once, by the tool, see read_output
+        self.solver_log = None
+        self.signalOutput = set()
         self._create_working_directory()
 
+        self.process.started.connect(self._process_started)
+        self.process.readyReadStandardOutput.connect(self.read_output)
         self.process.finished.connect(self._process_finished)
 
     def _create_working_directory(self):
@@ -92,6 +100,33 @@ class ObjectTools(ABC):
             return self.process.waitForFinished(-1)
         return None
 
+    def read_output(self):
+        """
+        reads the available standard output of the process, parses it into the solver log
+        and sends it to the slots of signalOutput
+        """
+        text = self.process.readAllStandardOutput().data().decode("utf-8", "replace")
+        if not text:
+            return
+        if self.solver_log is not None:
+            self.solver_log.feed(text)
+        signal.notify(self.signalOutput, text)
+
+    def _process_started(self):
+        self.solver_log = solverlog.make_log(self.name)
+
     def _process_finished(self, code, status):
+        self.read_output()
+        if self.solver_log is not None:
+            self.solver_log.close()
         if status == QProcess.ExitStatus.NormalExit and code == 0:
             self.update_properties()
+            self._store_solver_log()
+
+    def _store_solver_log(self):
+        # the events of the run are kept in the result pipelines of the solver
+        if self.solver_log is None:
+            return
+        for res in getattr(self.obj, "Results", []):
+            if res.isDerivedFrom("Fem::FemPostPipeline"):
+                solverlog.store_log(res, self.solver_log)
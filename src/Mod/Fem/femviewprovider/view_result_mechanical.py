@@ -32,9 +32,11 @@ __url__ = "https://www.freecad.org"
 #  \ingroup FEM
 #  \brief view provider for mechanical ResultObjectPython
 
+import FreeCAD
 import FreeCADGui
 
 from PySide import QtGui
+from femresult import resultstore
 from femtaskpanels import task_result_mechanical
 from . import view_base_femconstraint
 
@@ -47,6 +49,18 @@ class VPResultMechanical(view_base_femconstraint.VPBaseFemConstraint):
     def setEdit(self, vobj, mode=0):
         # is mesh visible
         self.visibility = self.Object.Mesh.ViewObject.Visibility
+        # the node data of lazy results is only held while the task panel is open
+        try:
+            self.loaded = resultstore.load_result(self.Object)
+            # the pipelines of the store switch to the result set of the task panel
+            resultstore.show_pipeline_result(self.Object)
+        except (OSError, ValueError) as e:
+            # a moved or broken store, the panel is opened with the statistics only
+            resultstore.unload_result(self.Object)
+            self.loaded = False
+            FreeCAD.Console.PrintWarning(
+                f"Node data of {self.Object.Label} not loaded from its result store: {e}\n"
+            )
         return view_base_femconstraint.VPBaseFemConstraint.setEdit(
             self,
             vobj,
@@ -59,6 +73,9 @@ class VPResultMechanical(view_base_femconstraint.VPBaseFemConstraint):
         # hide the mesh if it was not visible
         if not self.visibility:
             self.Object.Mesh.ViewObject.hide()
+        if getattr(self, "loaded", False):
+            resultstore.unload_result(self.Object)
+            self.loaded = False
         return True
 
     def claimChildren(self):